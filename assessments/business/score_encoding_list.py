@@ -25,7 +25,6 @@
 ##############################################################################
 import copy
 from decimal import Decimal, Context, Inexact
-import unicodedata
 
 from django.db import transaction
 
@@ -72,8 +71,8 @@ def get_scores_encoding_list(user, **kwargs):
         enrollments = enrollments.filter(id__in=enrollments_ids)
 
     # Append deadline/deadline_tutor for each exam enrollments
+    # Already sorted by the database
     enrollments = _append_session_exam_deadline(list(enrollments))
-    enrollments = sort_encodings(enrollments)
 
     return ScoresEncodingList(**{
         'academic_year': current_academic_year,
@@ -276,6 +275,7 @@ def sort_encodings(exam_enrollments):
      1. offerYear.acronym
      2. student.lastname
      3. sutdent.firstname
+    The names are compared on the sort key stored on the person (without accents nor spaces, in upper case).
     :param exam_enrollments: List of examEnrollments to sort
     :return:
     """
@@ -283,24 +283,6 @@ def sort_encodings(exam_enrollments):
         learn_unit_acronym = key.learning_unit_enrollment.learning_unit_year.acronym
         off_enroll = key.learning_unit_enrollment.offer_enrollment
         acronym = off_enroll.offer_year.acronym
-        last_name = off_enroll.student.person.last_name
-        first_name = off_enroll.student.person.first_name
-        last_name = _normalize_string(last_name) if last_name else None
-        first_name = _normalize_string(first_name) if first_name else None
-        return "%s %s %s %s" % (learn_unit_acronym if learn_unit_acronym else '',
-                                acronym if acronym else '',
-                                last_name.upper() if last_name else '',
-                                first_name.upper() if first_name else '')
+        return learn_unit_acronym or '', acronym or '', off_enroll.student.person.sort_key
 
     return sorted(exam_enrollments, key=lambda k: _sort(k))
-
-
-def _normalize_string(string):
-    """
-    Remove accents in the string passed in parameter.
-    For example : 'é - è' ==> 'e - e'  //  'àç' ==> 'ac'
-    :param string: The string to normalize.
-    :return: The normalized string
-    """
-    string = string.replace(" ", "")
-    return ''.join((c for c in unicodedata.normalize('NFD', string) if unicodedata.category(c) != 'Mn'))
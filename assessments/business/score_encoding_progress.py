@@ -50,6 +50,7 @@ def find_related_tutors(user, academic_year, session_exam_number):
                                                                       academic_year=academic_year,
                                                                       offers_year=offer_year_ids,
                                                                       with_session_exam_deadline=False)\
+                                            .order_by()\
                                             .distinct('learning_unit_enrollment__learning_unit_year')\
                                             .values_list('learning_unit_enrollment__learning_unit_year_id', flat=True))
 
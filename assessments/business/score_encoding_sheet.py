@@ -23,37 +23,86 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import collections
+import copy
+
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
 from django.utils.translation import ugettext as _
-from attribution.models import attribution
-from base.models import entity as entity_model, entity_version as entity_version, person_address, session_exam_calendar, offer_year_entity
-from base.models.exam_enrollment import justification_label_authorized, get_deadline
+from attribution.models.attribution import Attribution
+from base.models import entity_version as entity_version
+from base.models.entity import Entity
+from base.models.entity_version import EntityVersion
+from base.models.enums import academic_calendar_type
+from base.models.exam_enrollment import justification_label_authorized
+from base.models.offer_year_calendar import OfferYearCalendar
+from base.models.offer_year_entity import OfferYearEntity
+from base.models.person_address import PersonAddress
+from base.models.session_exam_deadline import SessionExamDeadline
 from assessments.business.score_encoding_list import sort_encodings
 from assessments.models import score_sheet_address
 from assessments.models.enums.score_sheet_address_choices import *
 from base.business import entity_version as entity_version_business
 from base.models.enums.person_address_type import PersonAddressType
 
+# Related objects of the exam enrollments used by the score sheets
+EXAM_ENROLLMENT_RELATED_OBJECTS = (
+    'session_exam__learning_unit_year__academic_year',
+    'session_exam__learning_unit_year__learning_container_year',
+    'learning_unit_enrollment__learning_unit_year',
+    'learning_unit_enrollment__offer_enrollment__offer_year',
+    'learning_unit_enrollment__offer_enrollment__student__person',
+)
+
+PARENT_ENTITY_ADDRESS_CHOICES = {
+    ENTITY_MANAGEMENT: ENTITY_MANAGEMENT_PARENT,
+    ENTITY_ADMINISTRATION: ENTITY_ADMINISTRATION_PARENT,
+}
+
 
 def get_score_sheet_address(off_year):
-    address = score_sheet_address.get_from_offer_year(off_year)
-    entity_id = None
-    if address is None:
-        address = off_year.id
-    else:
+    off_year_id = getattr(off_year, 'pk', off_year)
+    return get_score_sheet_addresses([off_year_id])[off_year_id]
+
+
+def get_score_sheet_addresses(off_year_ids):
+    """
+    Return the score sheet address of each offer year by offer year id, with a fixed number of queries.
+    The address is either customized or the one of an entity of the offer year.
+    """
+    addresses_by_offer_year = {
+        address.offer_year_id: address for address in score_sheet_address.ScoreSheetAddress.objects.filter(
+            offer_year__in=off_year_ids
+        ).select_related('country')
+    }
+    entity_addresses = {off_year_id: address for off_year_id, address in addresses_by_offer_year.items()
+                        if not address.customized}
+
+    maps_by_offer_year, last_versions = _get_maps_offer_year_entity_type_with_entity(entity_addresses.keys())
+    entity_ids_selected = {
+        off_year_id: maps_by_offer_year[off_year_id].get(address.entity_address_choice)
+        for off_year_id, address in entity_addresses.items()
+    }
+    last_versions.update(_find_last_versions(set(entity_ids_selected.values()) - set(last_versions)))
+    entities = Entity.objects.select_related('country').in_bulk(
+        [entity_id for entity_id in entity_ids_selected.values() if entity_id]
+    )
+
+    result = {}
+    for off_year_id in off_year_ids:
+        address = addresses_by_offer_year.get(off_year_id)
+        entity_id = None
         if address and not address.customized:
-            map_offer_year_entity_type_with_entity_id = _get_map_offer_year_entity_type_with_entity(off_year)
-            entity_id = map_offer_year_entity_type_with_entity_id[address.entity_address_choice]
-            ent_version = entity_version.get_last_version(entity_id)
-            entity = entity_model.get_by_internal_id(entity_id)
-            if not entity: # Case no address found for this entity
-                entity = entity_model.Entity()
+            entity_id = entity_ids_selected[off_year_id]
+            ent_version = last_versions.get(entity_id)
             email = address.email
-            address = entity
-            address.recipient = '{} - {}'.format(ent_version.acronym, ent_version.title)
+            # Case no address found for this entity
+            address = copy.copy(entities[entity_id]) if entity_id in entities else Entity()
+            address.recipient = '{} - {}'.format(ent_version.acronym, ent_version.title) if ent_version else ''
             address.email = email
-    return {'entity_id_selected': entity_id,
-            'address': _get_address_as_dict(address)}
+        result[off_year_id] = {'entity_id_selected': entity_id,
+                               'address': _get_address_as_dict(address)}
+    return result
 
 
 def _get_address_as_dict(address):
@@ -65,16 +114,33 @@ def _get_address_as_dict(address):
 
 
 def _get_map_offer_year_entity_type_with_entity(off_year):
-    off_year_entity_manag = offer_year_entity.get_from_offer_year_and_type(off_year, ENTITY_MANAGEMENT)
-    entity_version_management = entity_version.get_last_version(off_year_entity_manag.entity)
-    off_year_entity_admin = offer_year_entity.get_from_offer_year_and_type(off_year, ENTITY_ADMINISTRATION)
-    entity_version_admin = entity_version.get_last_version(off_year_entity_admin.entity)
-    return {
-        ENTITY_MANAGEMENT: entity_version_management.entity_id,
-        ENTITY_MANAGEMENT_PARENT: entity_version_management.parent_id,
-        ENTITY_ADMINISTRATION: entity_version_admin.entity_id,
-        ENTITY_ADMINISTRATION_PARENT: entity_version_admin.parent_id,
-    }
+    maps_by_offer_year, _last_versions = _get_maps_offer_year_entity_type_with_entity([off_year.id])
+    return maps_by_offer_year[off_year.id]
+
+
+def _get_maps_offer_year_entity_type_with_entity(off_year_ids):
+    """ Return the entity id of each address choice by offer year id, and the last versions of these entities """
+    offer_year_entities = list(OfferYearEntity.objects.filter(
+        offer_year__in=off_year_ids, type__in=PARENT_ENTITY_ADDRESS_CHOICES.keys()
+    ).values_list('offer_year_id', 'type', 'entity_id'))
+    last_versions = _find_last_versions({entity_id for _off_year_id, _type, entity_id in offer_year_entities})
+
+    maps_by_offer_year = collections.defaultdict(dict)
+    for off_year_id, a_type, entity_id in offer_year_entities:
+        ent_version = last_versions.get(entity_id)
+        if ent_version:
+            maps_by_offer_year[off_year_id][a_type] = ent_version.entity_id
+            maps_by_offer_year[off_year_id][PARENT_ENTITY_ADDRESS_CHOICES[a_type]] = ent_version.parent_id
+    return maps_by_offer_year, last_versions
+
+
+def _find_last_versions(entity_ids):
+    entity_ids = [entity_id for entity_id in entity_ids if entity_id]
+    if not entity_ids:
+        return {}
+    # Ordered by start date: the last version of each entity overrides the previous ones
+    return {ent_version.entity_id: ent_version
+            for ent_version in EntityVersion.objects.filter(entity__in=entity_ids).order_by('start_date')}
 
 
 def get_map_entity_with_offer_year_entity_type(off_year):
@@ -99,12 +165,91 @@ def get_entity_version_choices(offer_year):
     return set(entity_versions + [entity_version.get_last_version(ent.parent) for ent in entity_versions])
 
 
+class ScoresSheetContext:
+    """
+    Data of the score sheets which is not held by the exam enrollments: the scores responsibles and their addresses,
+    the deliberation dates and the addresses of the programs, and the deadlines of the students.
+    It is loaded for all the exam enrollments at once, with a fixed number of queries.
+    """
+
+    def __init__(self, exam_enrollments):
+        learning_unit_year_ids = {enrollment.session_exam.learning_unit_year_id for enrollment in exam_enrollments}
+        off_year_ids = {enrollment.learning_unit_enrollment.offer_enrollment.offer_year_id
+                        for enrollment in exam_enrollments}
+        offer_enrollment_ids = {enrollment.learning_unit_enrollment.offer_enrollment_id
+                                for enrollment in exam_enrollments}
+        number_sessions = {enrollment.session_exam.number_session for enrollment in exam_enrollments}
+
+        self.responsibles = _find_responsibles(learning_unit_year_ids)
+        self.professional_addresses = _find_professional_addresses(
+            {responsible.person_id for responsible in self.responsibles.values()}
+        )
+        self.deliberation_dates = _find_deliberation_dates(off_year_ids, number_sessions)
+        self.addresses = {off_year_id: _serialize_address(address['address'])
+                          for off_year_id, address in get_score_sheet_addresses(off_year_ids).items()}
+        self.deadlines = _find_deadlines(offer_enrollment_ids, number_sessions)
+
+    def get_deadline(self, exam_enrollment):
+        exam_deadline = self.deadlines.get(
+            (exam_enrollment.learning_unit_enrollment.offer_enrollment_id, exam_enrollment.session_exam.number_session)
+        )
+        if exam_deadline:
+            return exam_deadline.deadline_tutor_computed if exam_deadline.deadline_tutor_computed else \
+                exam_deadline.deadline
+        return None
+
+
+def _find_responsibles(learning_unit_year_ids):
+    attributions = Attribution.objects.filter(
+        learning_unit_year__in=learning_unit_year_ids, score_responsible=True
+    ).select_related('tutor__person').order_by('tutor_id')
+    responsibles = {}
+    for an_attribution in attributions:
+        responsibles.setdefault(an_attribution.learning_unit_year_id, an_attribution.tutor)
+    return responsibles
+
+
+def _find_professional_addresses(person_ids):
+    addresses = PersonAddress.objects.filter(
+        person__in=person_ids, label=PersonAddressType.PROFESSIONAL.value
+    ).order_by('id')
+    addresses_by_person = {}
+    for address in addresses:
+        addresses_by_person.setdefault(address.person_id, address)
+    return addresses_by_person
+
+
+def _find_deliberation_dates(off_year_ids, number_sessions):
+    offer_year_calendars = OfferYearCalendar.objects.filter(
+        offer_year__in=off_year_ids,
+        academic_calendar__reference=academic_calendar_type.DELIBERATION,
+        academic_calendar__sessionexamcalendar__number_session__in=number_sessions,
+    ).order_by('id').values_list(
+        'offer_year_id', 'academic_calendar__sessionexamcalendar__number_session', 'start_date'
+    )
+    deliberation_dates = {}
+    for off_year_id, number_session, start_date in offer_year_calendars:
+        deliberation_dates.setdefault((off_year_id, number_session), start_date)
+    return deliberation_dates
+
+
+def _find_deadlines(offer_enrollment_ids, number_sessions):
+    return {
+        (exam_deadline.offer_enrollment_id, exam_deadline.number_session): exam_deadline
+        for exam_deadline in SessionExamDeadline.objects.filter(
+            offer_enrollment__in=offer_enrollment_ids, number_session__in=number_sessions
+        )
+    }
+
+
 def scores_sheet_data(exam_enrollments, tutor=None):
     date_format = str(_('date_format'))
+    exam_enrollments = list(exam_enrollments)
+    prefetch_related_objects(exam_enrollments, *EXAM_ENROLLMENT_RELATED_OBJECTS)
     exam_enrollments = sort_encodings(exam_enrollments)
+    context = ScoresSheetContext(exam_enrollments)
     data = {'tutor_global_id': tutor.person.global_id if tutor else ''}
-    now = timezone.now()
-    data['publication_date'] = '%s/%s/%s' % (now.day, now.month, now.year)
+    data['publication_date'] = get_publication_date()
     data['institution'] = str(_('ucl_denom_location'))
     data['link_to_regulation'] = str(_('link_to_RGEE'))
     data['justification_legend'] = _('justification_legend') % justification_label_authorized()
@@ -120,13 +265,12 @@ def scores_sheet_data(exam_enrollments, tutor=None):
         # We can take the first element of the list 'exam_enrollments' to get the learning_unit_yr
         # because all exam_enrollments have the same learningUnitYear
         learning_unit_yr = exam_enrollments[0].session_exam.learning_unit_year
-        scores_responsible = attribution.find_responsible(learning_unit_yr.id)
+        scores_responsible = context.responsibles.get(learning_unit_yr.id)
         scores_responsible_address = None
         person = None
         if scores_responsible:
             person = scores_responsible.person
-            scores_responsible_address = person_address.get_by_label(scores_responsible.person,
-                                                                     PersonAddressType.PROFESSIONAL.value)
+            scores_responsible_address = context.professional_addresses.get(person.id)
 
         learn_unit_year_dict['academic_year'] = str(learning_unit_yr.academic_year)
 
@@ -160,7 +304,7 @@ def scores_sheet_data(exam_enrollments, tutor=None):
             exam_enrollment = list_enrollments[0]
             off_year = exam_enrollment.learning_unit_enrollment.offer_enrollment.offer_year
             number_session = exam_enrollment.session_exam.number_session
-            deliberation_date = session_exam_calendar.find_deliberation_date(number_session, off_year)
+            deliberation_date = context.deliberation_dates.get((off_year.id, number_session))
             if deliberation_date:
                 deliberation_date = deliberation_date.strftime(date_format)
             else:
@@ -168,7 +312,7 @@ def scores_sheet_data(exam_enrollments, tutor=None):
 
             program = {'acronym': exam_enrollment.learning_unit_enrollment.offer_enrollment.offer_year.acronym,
                        'deliberation_date': deliberation_date,
-                       'address': _get_serialized_address(off_year)}
+                       'address': dict(context.addresses[off_year.id])}
             enrollments = []
             for exam_enrol in list_enrollments:
                 student = exam_enrol.learning_unit_enrollment.student
@@ -180,7 +324,7 @@ def scores_sheet_data(exam_enrollments, tutor=None):
                         score = str(int(exam_enrol.score_final))
 
                 # Compute deadline score encoding
-                deadline = get_deadline(exam_enrol)
+                deadline = context.get_deadline(exam_enrol)
                 if deadline:
                     deadline = deadline.strftime(date_format)
 
@@ -202,8 +346,16 @@ def scores_sheet_data(exam_enrollments, tutor=None):
     return data
 
 
+def get_publication_date():
+    now = timezone.now()
+    return '%s/%s/%s' % (now.day, now.month, now.year)
+
+
 def _get_serialized_address(off_year):
-    address = get_score_sheet_address(off_year)['address']
+    return _serialize_address(get_score_sheet_address(off_year)['address'])
+
+
+def _serialize_address(address):
     country = address.get('country')
     address['country'] = country.name if country else ''
     return address
@@ -216,7 +368,7 @@ def _group_by_learning_unit_year_id(exam_enrollments):
     """
     enrollments_by_learn_unit = {}  # {<learning_unit_year_id> : [<ExamEnrollment>]}
     for exam_enroll in exam_enrollments:
-        key = exam_enroll.session_exam.learning_unit_year.id
+        key = exam_enroll.session_exam.learning_unit_year_id
         if key not in enrollments_by_learn_unit.keys():
             enrollments_by_learn_unit[key] = [exam_enroll]
         else:
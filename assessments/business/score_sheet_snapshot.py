@@ -0,0 +1,163 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import hashlib
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import translation
+
+from assessments.business import score_encoding_sheet
+from attribution.models.attribution import Attribution
+from base.models import exam_enrollment
+from base.models.learning_unit_enrollment import LearningUnitEnrollment
+from base.utils.cache import cache
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+SNAPSHOT_TIMEOUT = 60 * 60
+PREFIX_SNAPSHOT_KEY = 'score_sheet_snapshot'
+PREFIX_VERSION_KEY = 'score_sheet_snapshot_version'
+
+
+def get_scores_sheet_data(tutor, academic_year, number_session):
+    """
+    Return the data of the score sheets of a tutor for a session.
+
+    The data is computed once and kept in cache. Its key is made of the versions of the learning unit years of the
+    tutor: a new version is stamped on a learning unit year when one of its exam enrollments, deadlines, scores
+    responsibles or program addresses changes, and a new attribution changes the learning unit years of the tutor.
+    """
+    learning_unit_year_ids = sorted(Attribution.objects.filter(
+        tutor=tutor, learning_unit_year__academic_year=academic_year
+    ).values_list('learning_unit_year_id', flat=True).distinct())
+    key = _get_snapshot_key(tutor.id, number_session, learning_unit_year_ids)
+
+    data = _get_from_cache(key)
+    if data is None:
+        exam_enrollments = list(exam_enrollment.find_for_score_encodings(
+            number_session, tutor=tutor, learning_unit_year_ids=learning_unit_year_ids, academic_year=academic_year
+        ))
+        data = score_encoding_sheet.scores_sheet_data(exam_enrollments, tutor=tutor)
+        _set_in_cache(key, data)
+    else:
+        data['publication_date'] = score_encoding_sheet.get_publication_date()
+    return data
+
+
+def _get_snapshot_key(tutor_id, number_session, learning_unit_year_ids):
+    versions = _get_versions(learning_unit_year_ids)
+    stamp = ','.join('{}:{}'.format(luy_id, versions.get(_get_version_key(luy_id), ''))
+                     for luy_id in learning_unit_year_ids)
+    return "_".join([
+        PREFIX_SNAPSHOT_KEY, str(tutor_id), str(number_session), str(translation.get_language()),
+        hashlib.md5(stamp.encode()).hexdigest()
+    ])
+
+
+def _get_versions(learning_unit_year_ids):
+    try:
+        return cache.get_many([_get_version_key(luy_id) for luy_id in learning_unit_year_ids])
+    except Exception:
+        logger.exception('An error occurred with cache system')
+        return {}
+
+
+def _get_version_key(learning_unit_year_id):
+    return "_".join([PREFIX_VERSION_KEY, str(learning_unit_year_id)])
+
+
+def _get_from_cache(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+        return None
+
+
+def _set_in_cache(key, data):
+    try:
+        cache.set(key, data, timeout=SNAPSHOT_TIMEOUT)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+def invalidate_learning_unit_years(learning_unit_year_ids):
+    """ Stamp a new version on the learning unit years: the snapshots of their tutors are computed again """
+    try:
+        cache.set_many({_get_version_key(luy_id): uuid.uuid4().hex for luy_id in learning_unit_year_ids},
+                       timeout=None)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+def invalidate_on_commit(learning_unit_year_ids=(), offer_enrollment_ids=(), offer_year_ids=()):
+    """
+    Stamp a new version on the learning unit years once the transaction is committed, in order not to let a snapshot
+    be computed again from the previous data.
+
+    The changes of a transaction are gathered: the learning unit years of its offer enrollments and offer years are
+    found with one query and stamped at once after the commit.
+    """
+    pending_invalidation = _get_pending_invalidation()
+    if pending_invalidation is None:
+        pending_invalidation = _PendingInvalidation()
+        pending_invalidation.add(learning_unit_year_ids, offer_enrollment_ids, offer_year_ids)
+        transaction.on_commit(pending_invalidation)
+    else:
+        pending_invalidation.add(learning_unit_year_ids, offer_enrollment_ids, offer_year_ids)
+
+
+def _get_pending_invalidation():
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    # The callbacks of a rolled back transaction are discarded with their invalidations
+    return next((func for _, func in connection.run_on_commit if isinstance(func, _PendingInvalidation)), None)
+
+
+class _PendingInvalidation:
+    def __init__(self):
+        self.learning_unit_year_ids = set()
+        self.offer_enrollment_ids = set()
+        self.offer_year_ids = set()
+
+    def add(self, learning_unit_year_ids, offer_enrollment_ids, offer_year_ids):
+        self.learning_unit_year_ids.update(learning_unit_year_ids)
+        self.offer_enrollment_ids.update(offer_enrollment_ids)
+        self.offer_year_ids.update(offer_year_ids)
+
+    def __call__(self):
+        learning_unit_year_ids = set(self.learning_unit_year_ids)
+        if self.offer_enrollment_ids or self.offer_year_ids:
+            learning_unit_year_ids.update(LearningUnitEnrollment.objects.filter(
+                Q(offer_enrollment__in=self.offer_enrollment_ids) |
+                Q(offer_enrollment__offer_year__in=self.offer_year_ids)
+            ).values_list('learning_unit_year_id', flat=True))
+        if learning_unit_year_ids:
+            invalidate_learning_unit_years(learning_unit_year_ids)
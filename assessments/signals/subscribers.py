@@ -23,9 +23,14 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
-from assessments.business import scores_encodings_deadline
+from assessments.business import scores_encodings_deadline, score_sheet_snapshot
+from assessments.models.score_sheet_address import ScoreSheetAddress
+from attribution.models.attribution import Attribution
+from base.models.exam_enrollment import ExamEnrollment
+from base.models.session_exam_deadline import SessionExamDeadline
 from base.signals import publisher
 
 
@@ -42,3 +47,28 @@ def compute_student_score_encoding_deadline(sender, **kwargs):
 @receiver(publisher.compute_all_scores_encodings_deadlines)
 def compute_all_scores_encodings_deadlines(sender, **kwargs):
     scores_encodings_deadline.recompute_all_deadlines(kwargs['academic_calendar'])
+
+
+@receiver(post_save, sender=ExamEnrollment)
+@receiver(post_delete, sender=ExamEnrollment)
+def invalidate_scores_sheet_snapshots_of_exam_enrollment(sender, instance, **kwargs):
+    score_sheet_snapshot.invalidate_on_commit(learning_unit_year_ids=[instance.session_exam.learning_unit_year_id])
+
+
+@receiver(post_save, sender=SessionExamDeadline)
+@receiver(post_delete, sender=SessionExamDeadline)
+def invalidate_scores_sheet_snapshots_of_deadline(sender, instance, **kwargs):
+    score_sheet_snapshot.invalidate_on_commit(offer_enrollment_ids=[instance.offer_enrollment_id])
+
+
+@receiver(post_save, sender=Attribution)
+@receiver(post_delete, sender=Attribution)
+def invalidate_scores_sheet_snapshots_of_scores_responsible(sender, instance, **kwargs):
+    if instance.learning_unit_year_id:
+        score_sheet_snapshot.invalidate_on_commit(learning_unit_year_ids=[instance.learning_unit_year_id])
+
+
+@receiver(post_save, sender=ScoreSheetAddress)
+@receiver(post_delete, sender=ScoreSheetAddress)
+def invalidate_scores_sheet_snapshots_of_address(sender, instance, **kwargs):
+    score_sheet_snapshot.invalidate_on_commit(offer_year_ids=[instance.offer_year_id])
@@ -25,8 +25,11 @@
 ##############################################################################
 import datetime
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from django.utils.translation import ugettext
 from assessments.business import score_encoding_sheet
 from assessments.models.enums import score_sheet_address_choices
 from assessments.tests.factories.score_sheet_address import ScoreSheetAddressFactory
@@ -45,6 +48,7 @@ from base.tests.factories.offer_year import OfferYearFactory
 from base.tests.factories.offer_year_entity import OfferYearEntityFactory
 from base.tests.factories.person import PersonFactory
 from base.tests.factories.person_address import PersonAddressFactory
+from base.tests.factories.session_exam_deadline import SessionExamDeadlineFactory
 from base.tests.factories.session_examen import SessionExamFactory
 from base.tests.factories.student import StudentFactory
 from base.tests.factories.tutor import TutorFactory
@@ -168,6 +172,38 @@ class ScoreSheetDataTest(TestCase):
         self.assertEqual(score_responsible['last_name'], "Durant")
         self.assertEqual(score_responsible['address']['city'], "Louvain-la-neuve")
 
+    def test_scores_sheet_data_deadline(self):
+        exam_enrollment = ExamEnrollment.objects.get(learning_unit_enrollment__offer_enrollment__student=self.student_1)
+        SessionExamDeadlineFactory(offer_enrollment=exam_enrollment.learning_unit_enrollment.offer_enrollment,
+                                   number_session=1, deadline=datetime.date(2018, 6, 20), deadline_tutor=2,
+                                   deliberation_date=None)
+
+        data_computed = score_encoding_sheet.scores_sheet_data(ExamEnrollment.objects.all())
+
+        enrollments = data_computed['learning_unit_years'][0]['programs'][0]['enrollments']
+        deadlines = {enrollment['registration_id']: enrollment['deadline'] for enrollment in enrollments}
+        self.assertEqual(deadlines[self.student_1.registration_id],
+                         datetime.date(2018, 6, 18).strftime(ugettext('date_format')))
+        self.assertEqual(deadlines[self.student_2.registration_id], '')
+
+    def test_scores_sheet_data_number_of_queries_is_fixed(self):
+        with CaptureQueriesContext(connection) as queries_with_one_learning_unit:
+            score_encoding_sheet.scores_sheet_data(ExamEnrollment.objects.all())
+
+        for acronym in ('LBIR1200', 'LBIR1300'):
+            learning_unit_year = LearningUnitYearFactory(academic_year=self.academic_year, acronym=acronym)
+            _create_attribution(learning_unit_year, person=PersonFactory(), is_score_responsible=True)
+            offer_enrollment = OfferEnrollmentFactory(offer_year=OfferYearFactory(academic_year=self.academic_year))
+            ExamEnrollmentFactory(
+                learning_unit_enrollment=LearningUnitEnrollmentFactory(offer_enrollment=offer_enrollment,
+                                                                       learning_unit_year=learning_unit_year),
+                session_exam=SessionExamFactory(number_session=1, learning_unit_year=learning_unit_year)
+            )
+
+        with self.assertNumQueries(len(queries_with_one_learning_unit)):
+            data_computed = score_encoding_sheet.scores_sheet_data(ExamEnrollment.objects.all())
+        self.assertEqual(len(data_computed['learning_unit_years']), 3)
+
 
 def _create_attribution(learning_unit_year, person, is_score_responsible=False):
     # Create tutor
@@ -0,0 +1,132 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from assessments.business import score_sheet_snapshot
+from assessments.tests.factories.score_sheet_address import ScoreSheetAddressFactory
+from attribution.tests.factories.attribution import AttributionFactory
+from base.tests.factories.academic_year import AcademicYearFactory
+from base.tests.factories.exam_enrollment import ExamEnrollmentFactory
+from base.tests.factories.learning_unit_enrollment import LearningUnitEnrollmentFactory
+from base.tests.factories.learning_unit_year import LearningUnitYearFactory
+from base.tests.factories.session_exam_deadline import SessionExamDeadlineFactory
+from base.tests.factories.session_examen import SessionExamFactory
+from base.utils.cache import cache
+
+
+@mock.patch('assessments.business.score_sheet_snapshot.transaction.on_commit', side_effect=lambda func: func())
+class TestGetScoresSheetData(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.academic_year = AcademicYearFactory()
+        cls.learning_unit_year = LearningUnitYearFactory(academic_year=cls.academic_year, decimal_scores=False)
+        cls.attribution = AttributionFactory(learning_unit_year=cls.learning_unit_year, score_responsible=True)
+        cls.tutor = cls.attribution.tutor
+        cls.session_exam = SessionExamFactory(number_session=1, learning_unit_year=cls.learning_unit_year)
+
+    def setUp(self):
+        cache.clear()
+        self.learning_unit_enrollment = LearningUnitEnrollmentFactory(learning_unit_year=self.learning_unit_year)
+
+    def _get_scores_sheet_data(self):
+        return score_sheet_snapshot.get_scores_sheet_data(self.tutor, self.academic_year, 1)
+
+    def _get_enrollments(self, data):
+        return data['learning_unit_years'][0]['programs'][0]['enrollments']
+
+    def test_snapshot_cached(self, mock_on_commit):
+        ExamEnrollmentFactory(learning_unit_enrollment=self.learning_unit_enrollment, session_exam=self.session_exam)
+        data = self._get_scores_sheet_data()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self._get_scores_sheet_data(), data)
+
+    def test_snapshot_invalidated_when_exam_enrollment_saved(self, mock_on_commit):
+        exam_enrollment = ExamEnrollmentFactory(learning_unit_enrollment=self.learning_unit_enrollment,
+                                                session_exam=self.session_exam, score_final=None)
+        self._get_scores_sheet_data()
+
+        exam_enrollment.score_final = 15
+        exam_enrollment.save()
+
+        self.assertEqual(self._get_enrollments(self._get_scores_sheet_data())[0]['score'], '15')
+
+    def test_snapshot_invalidated_when_deadline_saved(self, mock_on_commit):
+        ExamEnrollmentFactory(learning_unit_enrollment=self.learning_unit_enrollment, session_exam=self.session_exam)
+        self.assertEqual(self._get_enrollments(self._get_scores_sheet_data())[0]['deadline'], '')
+
+        SessionExamDeadlineFactory(offer_enrollment=self.learning_unit_enrollment.offer_enrollment, number_session=1)
+
+        self.assertNotEqual(self._get_enrollments(self._get_scores_sheet_data())[0]['deadline'], '')
+
+    def test_snapshot_invalidated_when_scores_responsible_changed(self, mock_on_commit):
+        ExamEnrollmentFactory(learning_unit_enrollment=self.learning_unit_enrollment, session_exam=self.session_exam)
+        data = self._get_scores_sheet_data()
+        self.assertNotEqual(data['learning_unit_years'][0]['scores_responsible']['last_name'], '')
+
+        self.attribution.score_responsible = False
+        self.attribution.save()
+
+        data = self._get_scores_sheet_data()
+        self.assertEqual(data['learning_unit_years'][0]['scores_responsible']['last_name'], '')
+
+    def test_snapshot_invalidated_when_score_sheet_address_saved(self, mock_on_commit):
+        ExamEnrollmentFactory(learning_unit_enrollment=self.learning_unit_enrollment, session_exam=self.session_exam)
+        address = ScoreSheetAddressFactory(offer_year=self.learning_unit_enrollment.offer_enrollment.offer_year)
+        self._get_scores_sheet_data()
+
+        address.email = 'scores@example.com'
+        address.save()
+
+        data = self._get_scores_sheet_data()
+        self.assertEqual(data['learning_unit_years'][0]['programs'][0]['address']['address']['email'],
+                         'scores@example.com')
+
+
+class TestInvalidateOnCommit(TestCase):
+    """ The callbacks registered in a TestCase are never run: they are looked for in the connection """
+
+    def _get_pending_invalidations(self):
+        return [func for _, func in connection.run_on_commit
+                if isinstance(func, score_sheet_snapshot._PendingInvalidation)]
+
+    def test_changes_of_a_transaction_invalidated_at_once(self):
+        learning_unit_enrollments = [LearningUnitEnrollmentFactory() for _ in range(3)]
+        for learning_unit_enrollment in learning_unit_enrollments:
+            SessionExamDeadlineFactory(offer_enrollment=learning_unit_enrollment.offer_enrollment)
+
+        pending_invalidations = self._get_pending_invalidations()
+        self.assertEqual(len(pending_invalidations), 1)
+
+        cache.clear()
+        with self.assertNumQueries(1):
+            pending_invalidations[0]()
+        for learning_unit_enrollment in learning_unit_enrollments:
+            version_key = score_sheet_snapshot._get_version_key(learning_unit_enrollment.learning_unit_year_id)
+            self.assertIsNotNone(cache.get(version_key))
@@ -38,6 +38,7 @@ from assessments.business.score_encoding_list import ScoresEncodingList
 from assessments.tests.views.test_upload_xls_utils import generate_exam_enrollments
 from base.models.enums import exam_enrollment_justification_type
 from base.tests.mixin.academic_year import AcademicYearMockMixin
+from base.tests.mixin.query_budget import QueryBudgetMixin
 from base.tests.mixin.session_exam_calendar import SessionExamCalendarMockMixin
 
 from base.tests.models import test_exam_enrollment, test_offer_enrollment, \
@@ -170,7 +171,7 @@ class TestOnlineEncodingTransaction(MixinSetupOnlineEncoding, TransactionTestCas
         self.assert_exam_enrollments(self.enrollments[1], None, None, None, None)
 
 
-class OnlineEncodingTest(MixinSetupOnlineEncoding, TestCase):
+class OnlineEncodingTest(MixinSetupOnlineEncoding, QueryBudgetMixin, TestCase):
     def test_filter_enrollments_by_offer_year(self):
         enrollments = self.enrollments
 
@@ -180,6 +181,23 @@ class OnlineEncodingTest(MixinSetupOnlineEncoding, TestCase):
 
         self.assertListEqual(expected, actual, "Should only return enrollments for the first offer year")
 
+    def test_online_encoding_query_budget(self):
+        self.client.force_login(self.tutor.person.user)
+        url = reverse('online_encoding', args=[self.learning_unit_year.id])
+
+        def add_enrollments():
+            for enrollment in list(self.enrollments):
+                offer_enrollment = test_offer_enrollment.create_offer_enrollment(
+                    StudentFactory(), enrollment.learning_unit_enrollment.offer_enrollment.offer_year
+                )
+                learning_unit_enrollment = test_learning_unit_enrollment.create_learning_unit_enrollment(
+                    offer_enrollment=offer_enrollment, learning_unit_year=self.learning_unit_year
+                )
+                test_exam_enrollment.create_exam_enrollment(enrollment.session_exam, learning_unit_enrollment)
+
+        self.assertQueryCountDoesNotGrow('online_encoding', lambda: self.client.get(url), add_enrollments)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
     def test_tutor_encoding_with_a_student(self):
         self.client.force_login(self.tutor.person.user)
         url = reverse('online_encoding_form', args=[self.learning_unit_year.id])
@@ -382,7 +400,8 @@ class OutsideEncodingPeriodTest(AcademicYearMockMixin, SessionExamCalendarMockMi
         self.assertEqual(messages[1].message, _('outside_scores_encodings_period_closest_session') % (2, start_date_str))
 
 
-class GetScoreEncodingViewProgramManagerTest(AcademicYearMockMixin, SessionExamCalendarMockMixin, TestCase):
+class GetScoreEncodingViewProgramManagerTest(AcademicYearMockMixin, SessionExamCalendarMockMixin, QueryBudgetMixin,
+                                              TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='score_encoding', password='score_encoding')
         self.person = PersonFactory(user=self.user)
@@ -450,6 +469,26 @@ class GetScoreEncodingViewProgramManagerTest(AcademicYearMockMixin, SessionExamC
         context = response.context[-1]
         self.assertEqual(len(context['notes_list']), 3)
 
+    def test_get_score_encoding_query_budget(self):
+        url = reverse('scores_encoding')
+
+        def add_learning_units_with_exam():
+            for offer_year in (self.offer_year_bio2ma, self.offer_year_bio2ma, self.offer_year_bio2bac):
+                learning_unit_year = LearningUnitYearFactory(academic_year=offer_year.academic_year)
+                session_exam = test_session_exam.create_session_exam(number_session.ONE, learning_unit_year,
+                                                                     offer_year)
+                offer_enrollment = test_offer_enrollment.create_offer_enrollment(StudentFactory(), offer_year)
+                learning_unit_enrollment = test_learning_unit_enrollment.create_learning_unit_enrollment(
+                    offer_enrollment=offer_enrollment, learning_unit_year=learning_unit_year
+                )
+                test_exam_enrollment.create_exam_enrollment(session_exam, learning_unit_enrollment)
+
+        self.assertQueryCountDoesNotGrow('scores_encoding', lambda: self.client.get(url),
+                                         add_learning_units_with_exam)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context[-1]['notes_list']), 6)
+
     def _create_context_exam_enrollment(self):
         self.students = []
         for index in range(0, 20):
@@ -42,17 +42,19 @@ from psycopg2._psycopg import OperationalError as PsycopOperationalError, Interf
 import time
 
 from assessments.business import score_encoding_progress, score_encoding_list, score_encoding_export
-from assessments.business import score_encoding_sheet
+from assessments.business import score_encoding_sheet, score_sheet_snapshot
 from attribution import models as mdl_attr
 from base import models as mdl
-from base.utils import send_mail
+from base.utils import send_mail, queue_publisher
 from base.views import layout
 from osis_common.document import paper_sheet
-from osis_common.queue.queue_sender import send_message
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
 queue_exception_logger = logging.getLogger(settings.QUEUE_EXCEPTION_LOGGER)
 
+SCORES_SHEETS_MAX_RETRIES = 3
+SCORES_SHEETS_RETRY_BACKOFF = 0.5
+
 
 def _is_inside_scores_encodings_period(user):
     return mdl.session_exam_calendar.current_session_exam()
@@ -615,46 +617,44 @@ def _get_score_encoding_list_with_only_enrollment_modified(request, learning_uni
 
 
 def get_json_data_scores_sheets(tutor_global_id):
-    try:
-        person = mdl.person.find_by_global_id(tutor_global_id)
-        tutor = mdl.tutor.find_by_person(person)
-        number_session = mdl.session_exam_calendar.find_session_exam_number()
-        academic_yr = mdl.academic_year.current_academic_year()
-
-        if tutor:
-            exam_enrollments = list(mdl.exam_enrollment.find_for_score_encodings(number_session,
-                                                                                 tutor=tutor,
-                                                                                 academic_year=academic_yr))
-            return score_encoding_sheet.scores_sheet_data(exam_enrollments, tutor=tutor)
-        else:
-
+    for attempt in range(SCORES_SHEETS_MAX_RETRIES + 1):
+        try:
+            return _get_json_data_scores_sheets(tutor_global_id)
+        except (PsycopOperationalError, PsycopInterfaceError, DjangoOperationalError, DjangoInterfaceError):
+            queue_exception_logger.error('Postgres Error during get_json_data_scores_sheets on global_id {} '
+                                         '(attempt {})'.format(tutor_global_id, attempt + 1))
+            trace = traceback.format_exc()
+            queue_exception_logger.error(trace)
+            if attempt < SCORES_SHEETS_MAX_RETRIES:
+                # The broken connection is closed in the finally clause: let the database recover meanwhile
+                time.sleep(SCORES_SHEETS_RETRY_BACKOFF * 2 ** attempt)
+        except Exception:
+            logger.warning(
+                '(Not PostgresError) during get_json_data_scores_sheets on global_id {}'.format(tutor_global_id)
+            )
+            trace = traceback.format_exc()
+            logger.error(trace)
             return {}
-    except (PsycopOperationalError, PsycopInterfaceError, DjangoOperationalError, DjangoInterfaceError):
-        queue_exception_logger.error('Postgres Error during get_json_data_scores_sheets on global_id {} => retried'.format(tutor_global_id))
-        trace = traceback.format_exc()
-        queue_exception_logger.error(trace)
-        return get_json_data_scores_sheets(tutor_global_id)
-    except Exception:
-        logger.warning('(Not PostgresError) during get_json_data_scores_sheets on global_id {}'.format(tutor_global_id))
-        trace = traceback.format_exc()
-        logger.error(trace)
+        finally:
+            close_old_connections()
+    queue_exception_logger.error('Giving up get_json_data_scores_sheets on global_id {}'.format(tutor_global_id))
+    return {}
+
+
+def _get_json_data_scores_sheets(tutor_global_id):
+    person = mdl.person.find_by_global_id(tutor_global_id)
+    tutor = mdl.tutor.find_by_person(person)
+    if not tutor:
         return {}
-    finally:
-        close_old_connections()
+    number_session = mdl.session_exam_calendar.find_session_exam_number()
+    academic_yr = mdl.academic_year.current_academic_year()
+    return score_sheet_snapshot.get_scores_sheet_data(tutor, academic_yr, number_session)
 
 
 def send_json_scores_sheets_to_response_queue(global_id):
     data = get_json_data_scores_sheets(global_id)
-    credentials = pika.PlainCredentials(settings.QUEUES.get('QUEUE_USER'),
-                                        settings.QUEUES.get('QUEUE_PASSWORD'))
-    rabbit_settings = pika.ConnectionParameters(settings.QUEUES.get('QUEUE_URL'),
-                                                settings.QUEUES.get('QUEUE_PORT'),
-                                                settings.QUEUES.get('QUEUE_CONTEXT_ROOT'),
-                                                credentials)
     try:
-        connect = pika.BlockingConnection(rabbit_settings)
-        channel = connect.channel()
         queue_name = settings.QUEUES.get('QUEUES_NAME').get('SCORE_ENCODING_PDF_RESPONSE')
-        send_message(queue_name, data, connect, channel)
+        queue_publisher.publisher.publish(queue_name, data)
     except (RuntimeError, pika.exceptions.ConnectionClosed, pika.exceptions.ChannelClosed, pika.exceptions.AMQPError):
         logger.exception('Could not send back scores_sheets json in response queue for global_id {}'.format(global_id))
@@ -30,7 +30,7 @@ from decimal import Decimal
 
 from attribution import models as mdl_attribution
 from django.conf import settings
-from osis_common.queue import queue_sender
+from base.utils import queue_publisher
 
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
@@ -41,7 +41,7 @@ def publish_to_portal(global_ids=None):
     queue_name = settings.QUEUES.get('QUEUES_NAME', {}).get('APPLICATION_OSIS_PORTAL')
     if queue_name:
         try:
-            queue_sender.send_message(queue_name, tutor_application_list)
+            queue_publisher.publisher.publish(queue_name, tutor_application_list)
         except (RuntimeError, pika.exceptions.ConnectionClosed, pika.exceptions.ChannelClosed,
                  pika.exceptions.AMQPError):
             logger.exception('Could not recompute attributions for portal...')
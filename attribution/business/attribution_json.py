@@ -32,10 +32,9 @@ from django.conf import settings
 from django.db.models import Prefetch
 from django.utils import timezone
 
-from osis_common.queue import queue_sender
-
 from attribution import models as mdl_attribution
 from base import models as mdl_base
+from base.utils import queue_publisher
 
 
 logger = logging.getLogger(settings.DEFAULT_LOGGER)
@@ -47,7 +46,7 @@ def publish_to_portal(global_ids=None):
 
     if queue_name:
         try:
-            queue_sender.send_message(queue_name, attribution_list)
+            queue_publisher.publisher.publish(queue_name, attribution_list)
         except (RuntimeError, pika.exceptions.ConnectionClosed, pika.exceptions.ChannelClosed,
                  pika.exceptions.AMQPError):
             logger.exception('Could not recompute attributions for portal...')
@@ -28,7 +28,7 @@ from django.core.exceptions import PermissionDenied
 from attribution import models as mdl_attr
 from attribution.models.attribution import search_by_learning_unit_this_year
 from base import models as mdl_base
-from base.models.entity_manager import find_entities_with_descendants_from_entity_managers
+from base.models.entity_manager import find_managed_entity_ids
 
 
 def get_learning_unit_year_managed_by_user_from_id(user, learning_unit_year_id):
@@ -39,16 +39,12 @@ def get_learning_unit_year_managed_by_user_from_id(user, learning_unit_year_id):
 
 
 def _is_user_manager_of_entity_allocation_of_learning_unit_year(user, a_learning_unit_year):
-    entities_manager = mdl_base.entity_manager.find_by_user(user)
-    entities_with_descendants = find_entities_with_descendants_from_entity_managers(entities_manager)
-    return a_learning_unit_year.allocation_entity in entities_with_descendants
+    allocation_entity = a_learning_unit_year.allocation_entity
+    return allocation_entity is not None and allocation_entity.id in find_managed_entity_ids(user)
 
 
-def search_attributions(academic_year, entities_manager=None, course_code=None, learning_unit_title=None,
+def search_attributions(academic_year, entity_ids=None, course_code=None, learning_unit_title=None,
                         tutor=None, summary_responsible=None):
-    if entities_manager is None:
-        entities_manager = []
-    entities_with_descendants = find_entities_with_descendants_from_entity_managers(entities_manager)
     learning_unit_year_attributions_queryset = search_by_learning_unit_this_year(
         course_code,
         learning_unit_title,
@@ -56,7 +52,7 @@ def search_attributions(academic_year, entities_manager=None, course_code=None,
     )
     attributions = mdl_attr.attribution.filter_attributions(
         attributions_queryset=learning_unit_year_attributions_queryset,
-        entities=entities_with_descendants,
+        entities=entity_ids,
         tutor=tutor,
         responsible=summary_responsible,
     )
@@ -30,6 +30,7 @@ from osis_common.document import xls_build
 from attribution.business import attribution_charge_new
 from base.business.learning_unit import get_entity_acronym
 from base.business.xls import get_name_or_username
+from base.business.xls_stream import StreamingWorkbook
 
 WORKSHEET_TITLE = 'learning_units'
 XLS_FILENAME = 'learning_units_and_attributions_filename'
@@ -67,18 +68,6 @@ def prepare_xls_content(found_learning_units):
     return res
 
 
-def prepare_xls_parameters_list(user, working_sheets_data):
-    return {xls_build.LIST_DESCRIPTION_KEY: _(XLS_DESCRIPTION),
-            xls_build.FILENAME_KEY: _(XLS_FILENAME),
-            xls_build.USER_KEY: get_name_or_username(user),
-            xls_build.WORKSHEETS_DATA:
-                [{xls_build.CONTENT_KEY: working_sheets_data,
-                  xls_build.HEADER_TITLES_KEY: _prepare_titles(),
-                  xls_build.WORKSHEET_TITLE_KEY: _(WORKSHEET_TITLE),
-                  }
-                 ]}
-
-
 def _prepare_titles():
     titles = LEARNING_UNIT_TITLES.copy()
     for title in ATTRIBUTION_TITLES:
@@ -86,13 +75,18 @@ def _prepare_titles():
     return titles
 
 
-def create_xls_attribution(user, found_learning_units, filters):
+def create_xls_attribution_stream(user, found_learning_units, filters):
+    workbook = StreamingWorkbook()
+    workbook.add_worksheet(_(WORKSHEET_TITLE), _prepare_titles(), _get_rows(found_learning_units))
+    workbook.add_parameters_worksheet(XLS_DESCRIPTION, get_name_or_username(user), filters)
+    return workbook.save()
+
+
+def _get_rows(found_learning_units):
     for learning_unit_yr in found_learning_units:
-        learning_unit_yr.attribution_charge_news = attribution_charge_new\
+        learning_unit_yr.attribution_charge_news = attribution_charge_new \
             .find_attribution_charge_new_by_learning_unit_year_as_dict(learning_unit_year=learning_unit_yr)
-
-    working_sheets_data = prepare_xls_content(found_learning_units)
-    return xls_build.generate_xls(prepare_xls_parameters_list(user, working_sheets_data), filters)
+        yield from prepare_xls_content([learning_unit_yr])
 
 
 def extract_xls_data_from_learning_unit(learning_unit_yr):
@@ -169,9 +169,9 @@ def search_by_learning_unit_this_year(code, specific_title, academic_year=None):
 
 
 def filter_by_entities(queryset, entities):
-    entities_ids = [entity.id for entity in entities]
+    # entities: Entity objects or ids
     l_container_year_ids = entity_container_year.search(link_type=entity_container_year_link_type.ALLOCATION_ENTITY,
-                                                        entity_id=entities_ids) \
+                                                        entity_id=list(entities)) \
         .values_list('learning_container_year_id', flat=True)
     queryset = queryset.filter(learning_unit_year__learning_container_year__id__in=l_container_year_ids)
     return queryset
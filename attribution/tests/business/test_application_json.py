@@ -51,7 +51,7 @@ class AttributionJsonTest(TestCase):
         self.tutor_application_3 = TutorApplicationFactory(tutor=self.tutor_3,
                                                            learning_container_year=self.l_container_1)
 
-    @mock.patch('osis_common.queue.queue_sender.send_message')
+    @mock.patch('base.utils.queue_publisher.publisher.publish')
     @override_settings(QUEUES={'QUEUES_NAME':{'APPLICATION_OSIS_PORTAL': 'dummy'}})
     def test_build_attributions_json(self, mock_send_message):
         application_list = application_json._compute_list()
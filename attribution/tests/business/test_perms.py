@@ -31,8 +31,11 @@ from django.test import TestCase
 
 from attribution.business.perms import _is_tutor_attributed_to_the_learning_unit
 from base.business.learning_units.perms import _is_tutor_summary_responsible_of_learning_unit_year, \
-    _is_learning_unit_year_summary_editable, _is_calendar_opened_to_edit_educational_information
+    _is_learning_unit_year_summary_editable, _is_calendar_opened_to_edit_educational_information, \
+    find_educational_information_perms_by_learning_unit_year
 from attribution.tests.factories.attribution import AttributionFactory
+from base.models.enums.entity_container_year_link_type import REQUIREMENT_ENTITY
+from base.tests.factories.entity_container_year import EntityContainerYearFactory
 from base.tests.factories.learning_unit_year import LearningUnitYearFactory
 from osis_common.utils.datetime import get_tzinfo
 
@@ -101,3 +104,55 @@ class TestPerms(TestCase):
         )
 
         patcher.stop()
+
+
+class TestFindEducationalInformationPermsByLearningUnitYear(TestCase):
+    def setUp(self):
+        self.attribution = AttributionFactory(summary_responsible=True,
+                                              learning_unit_year__summary_locked=False)
+        self.tutor = self.attribution.tutor
+        self.learning_unit_year = self.attribution.learning_unit_year
+        self.requirement_entity_container = EntityContainerYearFactory(
+            learning_container_year=self.learning_unit_year.learning_container_year,
+            type=REQUIREMENT_ENTITY
+        )
+        self.locked_learning_unit_year = AttributionFactory(
+            tutor=self.tutor,
+            summary_responsible=True,
+            learning_unit_year__summary_locked=True
+        ).learning_unit_year
+        self.not_responsible_learning_unit_year = AttributionFactory(
+            tutor=self.tutor,
+            summary_responsible=False,
+            learning_unit_year__summary_locked=False
+        ).learning_unit_year
+
+        today = datetime.date.today()
+        self.entity_calendars = {
+            self.requirement_entity_container.entity_id: {
+                'start_date': today - datetime.timedelta(days=1),
+                'end_date': today + datetime.timedelta(days=1),
+            }
+        }
+
+    def test_perms_evaluated_for_all_learning_unit_years(self):
+        learning_unit_years = [self.learning_unit_year, self.locked_learning_unit_year,
+                               self.not_responsible_learning_unit_year]
+        with self.assertNumQueries(2):
+            perms = find_educational_information_perms_by_learning_unit_year(
+                user=self.tutor.person.user,
+                learning_unit_years=learning_unit_years,
+                entity_calendars=self.entity_calendars
+            )
+
+        self.assertTrue(perms[self.learning_unit_year.id].is_valid())
+        self.assertFalse(perms[self.locked_learning_unit_year.id].is_valid())
+        self.assertFalse(perms[self.not_responsible_learning_unit_year.id].is_valid())
+
+    def test_perms_when_calendar_not_opened(self):
+        perms = find_educational_information_perms_by_learning_unit_year(
+            user=self.tutor.person.user,
+            learning_unit_years=[self.learning_unit_year],
+            entity_calendars={}
+        )
+        self.assertFalse(perms[self.learning_unit_year.id].is_valid())
@@ -24,10 +24,10 @@
 #
 ##############################################################################
 import datetime
-from unittest import mock
 
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
+from openpyxl import load_workbook
 
 from base.models.enums import entity_container_year_link_type
 from base.tests.factories.learning_unit_component import LearningUnitComponentFactory
@@ -74,20 +74,21 @@ class TestXlsBuild(TestCase):
         self.assertCountEqual(xls_build_attribution._prepare_titles(),
                               LEARNING_UNIT_TITLES + xls_build_attribution.ATTRIBUTION_TITLES)
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_no_data(self, mock_generate_xls):
-        xls_build_attribution.create_xls_attribution(self.user, [], None)
-        expected_argument = _generate_xls_build_parameter([], self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+    def test_create_xls_attribution_stream_with_no_data(self):
+        worksheet = _load_first_worksheet(xls_build_attribution.create_xls_attribution_stream(self.user, [], None))
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_a_learning_unit(self, mock_generate_xls):
-        xls_build_attribution.create_xls_attribution(self.user, [self.learning_unit_yr_1], None)
-        an_attribution = self.learning_unit_yr_1.attribution_charge_news.get(self.attribution_1.attribution.id)
-        xls_data = [self.get_xls_data(an_attribution, self.learning_unit_yr_1)]
+        self.assertEqual(worksheet.title, str(_(xls_build_attribution.WORKSHEET_TITLE)))
+        self.assertEqual(_get_rows_values(worksheet), [LEARNING_UNIT_TITLES + xls_build_attribution.ATTRIBUTION_TITLES])
+
+    def test_create_xls_attribution_stream_with_a_learning_unit(self):
+        worksheet = _load_first_worksheet(
+            xls_build_attribution.create_xls_attribution_stream(self.user, [self.learning_unit_yr_1], None)
+        )
 
-        expected_argument = _generate_xls_build_parameter(xls_data, self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+        rows = _get_rows_values(worksheet)
+        self.assertEqual(len(rows), len(self.learning_unit_yr_1.attribution_charge_news) + 1)
+        self.assertEqual(rows[1][:2], [self.learning_unit_yr_1.academic_year.name, self.learning_unit_yr_1.acronym])
+        self.assertEqual(rows[1][5:7], [ACRONYM_REQUIREMENT, ACRONYM_ALLOCATION])
 
     def get_xls_data(self, an_attribution, learning_unit_yr):
         return [learning_unit_yr.academic_year.name,
@@ -109,14 +110,9 @@ class TestXlsBuild(TestCase):
                 ]
 
 
-def _generate_xls_build_parameter(xls_data, user):
-    return {
-        xls_build.LIST_DESCRIPTION_KEY: _(xls_build_attribution.XLS_DESCRIPTION),
-        xls_build.FILENAME_KEY: _(xls_build_attribution.XLS_FILENAME),
-        xls_build.USER_KEY: user.username,
-        xls_build.WORKSHEETS_DATA: [{
-            xls_build.CONTENT_KEY: xls_data,
-            xls_build.HEADER_TITLES_KEY: LEARNING_UNIT_TITLES + xls_build_attribution.ATTRIBUTION_TITLES,
-            xls_build.WORKSHEET_TITLE_KEY: _(xls_build_attribution.WORKSHEET_TITLE),
-        }]
-    }
+def _load_first_worksheet(stream):
+    return load_workbook(stream).worksheets[0]
+
+
+def _get_rows_values(worksheet):
+    return [[cell.value for cell in row] for row in worksheet.rows]
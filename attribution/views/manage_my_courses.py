@@ -30,7 +30,8 @@ from django.views.decorators.http import require_http_methods
 
 from attribution.views.perms import tutor_can_view_educational_information
 from base.business.learning_units.perms import is_eligible_to_update_learning_unit_pedagogy, \
-    find_educational_information_submission_dates_of_learning_unit_year, can_user_edit_educational_information
+    find_educational_information_submission_dates_of_learning_unit_year, \
+    find_educational_information_perms_by_learning_unit_year
 from base.models.learning_unit_year import find_learning_unit_years_by_academic_year_tutor_attributions
 from attribution.models.attribution import find_all_summary_responsibles_by_learning_unit_years
 
@@ -59,8 +60,12 @@ def list_my_attributions_summary_editable(request):
         ac_year=current_ac,
         reference=academic_calendar_type.SUMMARY_COURSE_SUBMISSION
     )
-    errors = (can_user_edit_educational_information(user=tutor.person.user, learning_unit_year_id=luy.id)
-              for luy in learning_unit_years)
+    errors_by_learning_unit_year_id = find_educational_information_perms_by_learning_unit_year(
+        user=tutor.person.user,
+        learning_unit_years=learning_unit_years,
+        entity_calendars=entity_calendars
+    )
+    errors = (errors_by_learning_unit_year_id[luy.id] for luy in learning_unit_years)
     context = {
         'learning_unit_years_with_errors': zip(learning_unit_years, errors),
         'entity_calendars': entity_calendars,
@@ -51,7 +51,7 @@ def search(request):
         course_code = request.GET.get('course_code')
         learning_unit_title = request.GET.get('learning_unit_title')
         attributions = search_attributions(
-            entities_manager=entities_manager,
+            entity_ids=mdl_base.entity_manager.find_managed_entity_ids(request.user),
             tutor=tutor,
             summary_responsible=summary_responsible,
             course_code=course_code,
@@ -29,7 +29,7 @@ import sys
 from django.core.urlresolvers import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
-# Used in base.views.education_groups.detail.EducationGroupGeneralInformation#get_sections_with_translated_labels
+# Used in base.business.education_groups.general_information#get_sections_with_translated_labels
 from .portal_conf import SECTION_LIST
 
 BASE_DIR = os.path.dirname((os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -87,6 +87,8 @@ INSTALLED_APPS = (
 )
 
 MIDDLEWARE = (
+    'base.middlewares.query_budget_middleware.QueryBudgetMiddleware',
+    'base.middlewares.replica_pinning_middleware.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,7 +100,6 @@ MIDDLEWARE = (
     'django.middleware.security.SecurityMiddleware',
     'base.middlewares.extra_http_responses_midleware.ExtraHttpResponsesMiddleware',
     'waffle.middleware.WaffleMiddleware',
-    'base.middlewares.notification_middleware.NotificationMiddleware',
 )
 
 INTERNAL_IPS = ()
@@ -149,6 +150,34 @@ DATABASES = {
     },
 }
 
+# Read replicas of the default database, used by the read-only views (see base.utils.db_router)
+# ex: DATABASE_REPLICA_HOSTS=replica1.osis.local,replica2.osis.local
+DATABASE_REPLICAS = []
+for index, replica_host in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",")), start=1):
+    replica_alias = 'replica_{}'.format(index)
+    DATABASES[replica_alias] = dict(
+        DATABASES['default'], HOST=replica_host.strip(), ATOMIC_REQUESTS=False, TEST={'MIRROR': 'default'}
+    )
+    DATABASE_REPLICAS.append(replica_alias)
+DATABASE_ROUTERS = ['base.utils.db_router.ReplicaRouter']
+# Seconds during which the reads of a user are sent to the default database after a write
+REPLICA_PINNING_SECONDS = int(os.environ.get("REPLICA_PINNING_SECONDS", 5))
+
+# Query budget (see base.middlewares.query_budget_middleware): queries count, database time and duplicated queries
+# by view, logged for each request and exposed in the Prometheus format on /query_budget/metrics/
+QUERY_BUDGET_ENABLED = os.environ.get('QUERY_BUDGET_ENABLED', 'False').lower() == 'true'
+QUERY_BUDGET_METRICS_ENABLED = os.environ.get('QUERY_BUDGET_METRICS_ENABLED', 'False').lower() == 'true'
+# Maximal number of queries by view name, checked by the tests of the hot pages
+QUERY_BUDGETS = {
+    'scores_encoding': 40,
+    'online_encoding': 40,
+    'learning_units': 40,
+    'education_group_read': 60,
+    # About 4 queries by requested section, for the 27 sections requested by the portal
+    'v0.1-ws_catalog_offer': 120,
+    'entity_diagram': 20,
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/1.9/topics/i18n/
 # If you want to change the default settings,
@@ -219,6 +248,14 @@ LOGO_OSIS_URL = os.environ.get('LOGO_OSIS_URL', '')
 # They are used to ensure the migration of Data between Osis and other application (ex : Osis <> Osis-Portal)
 # See in settings.dev.example to configure the queues
 QUEUES = {}
+# The changes of the serializable models are recorded in the transaction which makes them and published afterwards
+# by batches (base.business.outbox), instead of being published by SerializableModel.save and delete
+QUEUES_OUTBOX = os.environ.get('QUEUES_OUTBOX', 'False').lower() == 'true'
+QUEUES_OUTBOX_BATCH_SIZE = int(os.environ.get('QUEUES_OUTBOX_BATCH_SIZE', 500))
+# Responses to the queues are published through a pool of connections kept open (base.utils.queue_publisher)
+QUEUE_PUBLISHER_POOL_SIZE = int(os.environ.get('QUEUE_PUBLISHER_POOL_SIZE', 4))
+QUEUE_PUBLISHER_MAX_RETRIES = int(os.environ.get('QUEUE_PUBLISHER_MAX_RETRIES', 3))
+QUEUE_PUBLISHER_RETRY_BACKOFF = float(os.environ.get('QUEUE_PUBLISHER_RETRY_BACKOFF', 0.5))
 
 
 # Celery settings
@@ -230,6 +267,10 @@ CELERY_BROKER_URL = "amqp://{user}:{password}@{host}:{port}".format(
 )
 CELERY_CELERYBEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'django-db')
+# Number of objects postponed by each celery task of the automatic postponement
+POSTPONEMENT_CHUNK_SIZE = int(os.environ.get('POSTPONEMENT_CHUNK_SIZE', 100))
+# Number of days the files of the background exports are kept before being purged
+EXPORT_JOB_RETENTION_DAYS = int(os.environ.get('EXPORT_JOB_RETENTION_DAYS', 7))
 
 # Additionnal Locale Path
 # Add local path in your environment settings (ex: dev.py)
@@ -9,7 +9,7 @@ from django.utils.translation import ugettext_lazy as _
 # specific
 # common
 # specific,common
-# Used base.views.education_groups.detail.EducationGroupGeneralInformation#get_sections_with_translated_labels
+# Used base.business.education_groups.general_information#get_sections_with_translated_labels
 Section = namedtuple('Section', 'title labels')
 
 SECTION_LIST = [
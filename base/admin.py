@@ -91,6 +91,9 @@ admin.site.register(exam_enrollment.ExamEnrollment,
 admin.site.register(exam_enrollment.ExamEnrollmentHistory,
                     exam_enrollment.ExamEnrollmentHistoryAdmin)
 
+admin.site.register(export_job.ExportJob,
+                    export_job.ExportJobAdmin)
+
 admin.site.register(external_learning_unit_year.ExternalLearningUnitYear,
                     external_learning_unit_year.ExternalLearningUnitYearAdmin)
 
@@ -163,6 +166,9 @@ admin.site.register(organization.Organization,
 admin.site.register(organization_address.OrganizationAddress,
                     organization_address.OrganizationAddressAdmin)
 
+admin.site.register(outbox_record.OutboxRecord,
+                    outbox_record.OutboxRecordAdmin)
+
 admin.site.register(person.Person,
                     person.PersonAdmin)
 
@@ -172,9 +178,15 @@ admin.site.register(person_address.PersonAddress,
 admin.site.register(person_entity.PersonEntity,
                     person_entity.PersonEntityAdmin)
 
+admin.site.register(postponement_job.PostponementJob,
+                    postponement_job.PostponementJobAdmin)
+
 admin.site.register(prerequisite.Prerequisite,
                     prerequisite.PrerequisiteAdmin)
 
+admin.site.register(prerequisite.PrerequisiteItem,
+                    prerequisite.PrerequisiteItemAdmin)
+
 admin.site.register(program_manager.ProgramManager,
                     program_manager.ProgramManagerAdmin)
 
@@ -33,5 +33,11 @@ class BaseConfig(AppConfig):
         from base.models.models_signals import add_to_tutors_group, remove_from_tutor_group, \
             add_to_pgm_managers_group, remove_from_pgm_managers_group
         from assessments.views.score_encoding import get_json_data_scores_sheets
+        from base.business.autocomplete import invalidate_entity_version_index, invalidate_certificate_aim_index
+        from base.business.education_groups.general_information import invalidate_translated_text, \
+            invalidate_translated_text_label
+        from base.business.group_element_years.structure_snapshot import invalidate_group_element_year
+        from base.business.outbox import connect_serializable_models
+        connect_serializable_models()
         # if django.core.exceptions.AppRegistryNotReady: Apps aren't loaded yet.
         # ===> This exception says that there is an error in the implementation of method ready(self) !!
@@ -0,0 +1,101 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from notifications.models import Notification
+
+from base.models.academic_calendar import AcademicCalendar
+from base.models.academic_calendar_notification import AcademicCalendarNotification
+from base.utils.notifications import invalidate_notifications_cache
+
+ALERT_WEEK = 2
+BATCH_SIZE = 1000
+
+
+def send_academic_calendar_notifications():
+    """
+    Notify the users of the academic calendars starting within ALERT_WEEK weeks.
+
+    A user is notified once per academic calendar, and again when the academic calendar has been modified
+    since the last notification of the user. Return the number of notifications created.
+    """
+    academic_calendars = list(
+        AcademicCalendar.objects.starting_within(weeks=ALERT_WEEK).order_by("start_date", "end_date")
+    )
+    if not academic_calendars:
+        return 0
+
+    content_type = ContentType.objects.get_for_model(AcademicCalendar)
+    user_ids = list(User.objects.filter(is_active=True, last_login__isnull=False).values_list('pk', flat=True))
+    notified_user_ids = _find_notified_user_ids_by_academic_calendar(academic_calendars)
+
+    pairs_to_notify = [
+        (ac_obj, user_id)
+        for ac_obj in academic_calendars
+        for user_id in user_ids if user_id not in notified_user_ids[ac_obj.pk]
+    ]
+    notifications = [
+        Notification(
+            recipient_id=user_id,
+            actor_content_type=content_type,
+            actor_object_id=str(ac_obj.pk),
+            verb="{} ({})".format(ac_obj.title, ac_obj.start_date.strftime("%d/%m")),
+        )
+        for ac_obj, user_id in pairs_to_notify
+    ]
+    # A notification is only sent with the row which prevents it from being sent again
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+        AcademicCalendarNotification.objects.bulk_create(
+            [
+                AcademicCalendarNotification(user_id=user_id, academic_calendar=ac_obj,
+                                             academic_calendar_changed=ac_obj.changed)
+                for ac_obj, user_id in pairs_to_notify
+            ],
+            batch_size=BATCH_SIZE
+        )
+    invalidate_notifications_cache({user_id for _, user_id in pairs_to_notify})
+    return len(notifications)
+
+
+def _find_notified_user_ids_by_academic_calendar(academic_calendars):
+    """
+    The sent notifications are read from AcademicCalendarNotification rather than from the notifications,
+    which the users can clear.
+    """
+    academic_calendars_by_id = {ac_obj.pk: ac_obj for ac_obj in academic_calendars}
+    notified_user_ids = {ac_obj.pk: set() for ac_obj in academic_calendars}
+
+    sent_notifications = AcademicCalendarNotification.objects.filter(
+        academic_calendar__in=academic_calendars_by_id.keys(),
+    ).values_list('academic_calendar', 'user', 'academic_calendar_changed')
+
+    for academic_calendar_id, user_id, academic_calendar_changed in sent_notifications:
+        ac_obj = academic_calendars_by_id[academic_calendar_id]
+        if ac_obj.changed is None or (academic_calendar_changed and academic_calendar_changed >= ac_obj.changed):
+            notified_user_ids[ac_obj.pk].add(user_id)
+    return notified_user_ids
@@ -0,0 +1,258 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import bisect
+import logging
+import threading
+import time
+import unicodedata
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from base.models.certificate_aim import CertificateAim
+from base.models.entity import Entity
+from base.models.entity_version import EntityVersion, find_all_current_entities_version, \
+    PEDAGOGICAL_ENTITY_ADDED_EXCEPTIONS
+from base.models.enums.entity_type import PEDAGOGICAL_ENTITY_TYPES
+from base.models.enums.organization_type import MAIN
+from base.models.organization import Organization
+from base.utils.cache import cache
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+INDEX_TTL = 60 * 15
+PREFIX_INDEX_VERSION_KEY = 'autocomplete_index_version_{}'
+
+EXACT_MATCH = 0
+PREFIX_MATCH = 1
+WORD_PREFIX_MATCH = 2
+CONTAINS_MATCH = 3
+
+
+def normalize(value):
+    """ Lower case and accents removed, in order to compare search terms """
+    value = unicodedata.normalize('NFD', str(value or '').strip().lower())
+    return ''.join(char for char in value if not unicodedata.combining(char))
+
+
+class PrefixIndex:
+    """
+    In-memory index of objects searchable by prefix.
+
+    Each entry is a tuple (obj, main_term, other_terms). The main term (ex: acronym, code) is ranked before the words
+    of the other terms (ex: title, description). A substring match is kept as last resort in order to stay
+    compatible with the former 'icontains' lookups.
+    """
+
+    def __init__(self, entries, sort_key=None):
+        entries = list(entries)
+        if sort_key:
+            entries.sort(key=lambda entry: sort_key(entry[0]))
+
+        self.objects = [obj for obj, _, _ in entries]
+        self._main_terms = [normalize(main_term) for _, main_term, _ in entries]
+        self._haystacks = []
+        main_keys = []
+        word_keys = []
+        for position, (_, main_term, other_terms) in enumerate(entries):
+            main_keys.append((self._main_terms[position], position))
+            normalized_terms = [normalize(term) for term in other_terms]
+            for word in set(" ".join(normalized_terms).split()):
+                word_keys.append((word, position))
+            self._haystacks.append(" ".join([self._main_terms[position]] + normalized_terms))
+        self._main_keys = sorted(main_keys)
+        self._word_keys = sorted(word_keys)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def search(self, term, predicate=None):
+        term = normalize(term)
+        if not term:
+            return [obj for obj in self.objects if predicate is None or predicate(obj)]
+
+        ranks = {}
+        for position in self._find_positions_by_prefix(self._main_keys, term):
+            ranks[position] = EXACT_MATCH if self._main_terms[position] == term else PREFIX_MATCH
+        for position in self._find_positions_by_prefix(self._word_keys, term):
+            ranks.setdefault(position, WORD_PREFIX_MATCH)
+        for position, haystack in enumerate(self._haystacks):
+            if position not in ranks and term in haystack:
+                ranks[position] = CONTAINS_MATCH
+
+        return [
+            self.objects[position] for position in sorted(ranks, key=lambda pos: (ranks[pos], pos))
+            if predicate is None or predicate(self.objects[position])
+        ]
+
+    def search_exact(self, term, predicate=None):
+        """ Return the objects whose main term is exactly the term """
+        term = normalize(term)
+        return [
+            self.objects[position] for position in sorted(self._find_positions_by_prefix(self._main_keys, term))
+            if self._main_terms[position] == term and (predicate is None or predicate(self.objects[position]))
+        ]
+
+    @staticmethod
+    def _find_positions_by_prefix(keys, prefix):
+        index = bisect.bisect_left(keys, (prefix,))
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            yield keys[index][1]
+            index += 1
+
+
+class CachedPrefixIndex:
+    """
+    Per-process PrefixIndex built lazily.
+
+    The index is rebuilt when its time to live is exceeded or when it has been invalidated, in this process
+    or in another one (through the version stored in the shared cache).
+    """
+    name = None
+    ttl = INDEX_TTL
+    sort_key = None
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._index = None
+        self._built_at = None
+        self._version = None
+
+    def build_entries(self):
+        raise NotImplementedError
+
+    def get_index(self):
+        version = self._get_shared_version()
+        with self._lock:
+            if self._is_outdated(version):
+                self._index = PrefixIndex(self.build_entries(), sort_key=self.sort_key)
+                self._built_at = time.monotonic()
+                self._version = version
+            return self._index
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+        try:
+            cache.set(self._get_version_key(), uuid.uuid4().hex, timeout=None)
+        except Exception:
+            logger.exception('An error occurred with cache system')
+
+    def _is_outdated(self, version):
+        return self._index is None or \
+            time.monotonic() - self._built_at > self.ttl or \
+            version != self._version
+
+    def _get_shared_version(self):
+        try:
+            return cache.get(self._get_version_key())
+        except Exception:
+            logger.exception('An error occurred with cache system')
+            return self._version
+
+    def _get_version_key(self):
+        return PREFIX_INDEX_VERSION_KEY.format(self.name)
+
+
+class EntityVersionIndex(CachedPrefixIndex):
+    name = 'entity_version'
+
+    def build_entries(self):
+        entity_versions = find_all_current_entities_version().select_related('entity__organization')
+        return [(entity_version, entity_version.acronym, [entity_version.title]) for entity_version in entity_versions]
+
+    @staticmethod
+    def sort_key(entity_version):
+        return entity_version.acronym
+
+    def search(self, term, country=None):
+        if country == "all":
+            predicate = None
+        elif country:
+            predicate = _country_predicate(country)
+        else:
+            predicate = _is_pedagogical_entity_version
+        return self.get_index().search(term, predicate)
+
+
+def _country_predicate(country_id):
+    country_id = str(country_id)
+    return lambda entity_version: str(entity_version.entity.country_id) == country_id
+
+
+def _is_pedagogical_entity_version(entity_version):
+    organization = entity_version.entity.organization
+    return organization is not None and organization.type == MAIN and (
+        entity_version.entity_type in PEDAGOGICAL_ENTITY_TYPES or
+        entity_version.acronym in PEDAGOGICAL_ENTITY_ADDED_EXCEPTIONS
+    )
+
+
+class CertificateAimIndex(CachedPrefixIndex):
+    name = 'certificate_aim'
+
+    def build_entries(self):
+        return [(aim, str(aim.code), [aim.description]) for aim in CertificateAim.objects.all()]
+
+    @staticmethod
+    def sort_key(certificate_aim):
+        return certificate_aim.section, certificate_aim.code
+
+    def search(self, term, section=None):
+        """ A numeric term is a code, searched exactly as the former 'code' lookup """
+        predicate = _section_predicate(section) if section else None
+        if str(term or '').strip().isdigit():
+            return self.get_index().search_exact(term, predicate)
+        return self.get_index().search(term, predicate)
+
+
+def _section_predicate(section):
+    section = str(section)
+    return lambda certificate_aim: str(certificate_aim.section) == section
+
+
+entity_version_index = EntityVersionIndex()
+certificate_aim_index = CertificateAimIndex()
+
+
+@receiver(post_save, sender=EntityVersion)
+@receiver(post_delete, sender=EntityVersion)
+@receiver(post_save, sender=Entity)
+@receiver(post_delete, sender=Entity)
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_entity_version_index(sender, **kwargs):
+    # After the commit, otherwise another process could rebuild its index from the uncommitted data
+    transaction.on_commit(entity_version_index.invalidate)
+
+
+@receiver(post_save, sender=CertificateAim)
+@receiver(post_delete, sender=CertificateAim)
+def invalidate_certificate_aim_index(sender, **kwargs):
+    transaction.on_commit(certificate_aim_index.invalidate)
@@ -23,20 +23,25 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from django.core.exceptions import PermissionDenied, MultipleObjectsReturned
-from django.db.models import Prefetch
+import collections
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.exceptions import PermissionDenied
+from django.db.models import Case, CharField, F, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Concat
 from django.utils.translation import ugettext_lazy as _
 
 from base.business.education_groups.perms import check_permission
 from base.business.xls import get_name_or_username, convert_boolean
+from base.business.xls_stream import StreamingWorkbook
+from base.models.education_group_year import EducationGroupYear
+from base.models.entity_version import EntityVersion
 from base.models.enums import academic_calendar_type
 from base.models.enums import education_group_categories
 from base.models.enums import mandate_type as mandate_types
-from base.models.mandate import Mandate
 from base.models.offer_year_calendar import OfferYearCalendar
 from base.models.person import Person
 from base.models.program_manager import is_program_manager
-from osis_common.document import xls_build
 
 # List of key that a user can modify
 DATE_FORMAT = '%d-%m-%Y'
@@ -106,6 +111,23 @@ SECRETARIES = 'secretaries'
 PRESIDENTS = 'presidents'
 NUMBER_SESSIONS = 3
 
+SESSION_ACADEMIC_CALENDAR_TYPES = [
+    academic_calendar_type.EXAM_ENROLLMENTS,
+    academic_calendar_type.SCORES_EXAM_SUBMISSION,
+    academic_calendar_type.DISSERTATION_SUBMISSION,
+    academic_calendar_type.DELIBERATION,
+    academic_calendar_type.SCORES_EXAM_DIFFUSION
+]
+# Ordering columns of the search page (see education_group/search.html) and their database fields
+ADMINISTRATIVE_ORDER_FIELDS = {
+    'academic_year.year': 'academic_year__year',
+    'acronym': 'acronym',
+    'title': 'title',
+    'education_group_type.name': 'education_group_type__name',
+    'management_entity_version.acronym': 'management_entity_acronym',
+    'partial_acronym': 'partial_acronym',
+}
+
 
 def can_user_edit_administrative_data(a_user, an_education_group_year, raise_exception=False):
     """
@@ -139,20 +161,16 @@ def assert_category_of_education_group_year(education_group_year, authorized_cat
         raise PermissionDenied("Education group category is not correct.")
 
 
-def create_xls(user, found_education_groups_param, filters, order_data):
+def create_xls_stream(user, found_education_groups_param, filters, order_data):
     found_education_groups = ordering_data(found_education_groups_param, order_data)
-    working_sheets_data = prepare_xls_content(found_education_groups)
-    parameters = {xls_build.DESCRIPTION: XLS_DESCRIPTION,
-                  xls_build.USER: get_name_or_username(user),
-                  xls_build.FILENAME: XLS_FILENAME,
-                  xls_build.HEADER_TITLES: EDUCATION_GROUP_TITLES,
-                  xls_build.WS_TITLE: WORKSHEET_TITLE}
-
-    return xls_build.generate_xls(xls_build.prepare_xls_parameters_list(working_sheets_data, parameters), filters)
-
-
-def prepare_xls_content(found_education_groups):
-    return [extract_xls_data_from_education_group(eg) for eg in found_education_groups]
+    workbook = StreamingWorkbook()
+    workbook.add_worksheet(
+        WORKSHEET_TITLE,
+        EDUCATION_GROUP_TITLES,
+        (extract_xls_data_from_education_group(eg) for eg in found_education_groups)
+    )
+    workbook.add_parameters_worksheet(XLS_DESCRIPTION, get_name_or_username(user), filters)
+    return workbook.save()
 
 
 def extract_xls_data_from_education_group(an_education_group):
@@ -185,34 +203,45 @@ def _get_field_value(instance, field):
     return attr
 
 
-def create_xls_administrative_data(user, education_group_years_qs, filters, order_data):
-    # Make select_related/prefetch_related in order to have low DB HIT
-    education_group_years = education_group_years_qs.filter(
+def create_xls_administrative_data_stream(user, education_group_years_qs, filters, order_data):
+    education_group_years = _get_administrative_data_queryset(education_group_years_qs, order_data)
+    workbook = StreamingWorkbook()
+    workbook.add_worksheet(
+        WORKSHEET_TITLE_ADMINISTRATIVE,
+        _get_translated_header_titles(),
+        _get_administrative_rows(education_group_years)
+    )
+    workbook.add_parameters_worksheet(XLS_DESCRIPTION_ADMINISTRATIVE, get_name_or_username(user), filters)
+    return workbook.save()
+
+
+def _get_administrative_data_queryset(education_group_years_qs, order_data=None):
+    """
+    Return the trainings annotated with the acronym of their management entity and ordered in the database.
+    The calendars and the mandataries are loaded afterwards, by set, in _get_administrative_rows.
+    """
+    return education_group_years_qs.filter(
         education_group_type__category=education_group_categories.TRAINING
     ).select_related(
         'education_group_type',
         'academic_year',
-    ).prefetch_related(
-        Prefetch(
-            'education_group__mandate_set',
-            queryset=Mandate.objects.prefetch_related('mandatary_set')
-        ),
-        Prefetch(
-            'offeryearcalendar_set',
-            queryset=OfferYearCalendar.objects.select_related('academic_calendar__sessionexamcalendar')
+    ).annotate(
+        management_entity_acronym=Subquery(
+            EntityVersion.objects.filter(
+                Q(end_date__isnull=True) | Q(end_date__gt=OuterRef('academic_year__end_date')),
+                entity=OuterRef('management_entity'),
+                start_date__lte=OuterRef('academic_year__end_date'),
+            ).order_by('-start_date').values('acronym')[:1],
+            output_field=CharField()
         )
-    )
-    found_education_groups = ordering_data(education_group_years, order_data)
-    working_sheets_data = prepare_xls_content_administrative(found_education_groups)
-    header_titles = _get_translated_header_titles()
-    parameters = {
-        xls_build.DESCRIPTION: XLS_DESCRIPTION_ADMINISTRATIVE,
-        xls_build.USER: get_name_or_username(user),
-        xls_build.FILENAME: XLS_FILENAME_ADMINISTRATIVE,
-        xls_build.HEADER_TITLES: header_titles,
-        xls_build.WS_TITLE: WORKSHEET_TITLE_ADMINISTRATIVE
-    }
-    return xls_build.generate_xls(xls_build.prepare_xls_parameters_list(working_sheets_data, parameters), filters)
+    ).order_by(*_get_administrative_ordering(order_data or {}))
+
+
+def _get_administrative_ordering(order_data):
+    order_field = ADMINISTRATIVE_ORDER_FIELDS.get(order_data.get(ORDER_COL), 'acronym')
+    if order_data.get(ORDER_DIRECTION) == DESC:
+        return ['-' + order_field, '-pk']
+    return [order_field, 'pk']
 
 
 def _get_translated_header_titles():
@@ -238,25 +267,85 @@ def _get_translated_header_session_columns():
     return all_headers_sessions
 
 
-def prepare_xls_content_administrative(education_group_years):
-    xls_data = []
+def _get_administrative_rows(education_group_years):
+    education_group_years = list(education_group_years)
+    education_group_year_ids = [education_group_year.pk for education_group_year in education_group_years]
+    calendars_by_education_group_year = _find_calendars_by_education_group_year(education_group_year_ids)
+    mandataries_by_education_group_year = _find_mandataries_by_education_group_year(education_group_year_ids)
+
     for education_group_year in education_group_years:
+        calendars = calendars_by_education_group_year.get(education_group_year.pk, {})
+        mandataries = mandataries_by_education_group_year.get(education_group_year.pk, {})
         main_data = _extract_main_data(education_group_year)
-        administrative_data = _extract_administrative_data(education_group_year)
-        mandatary_data = _extract_mandatary_data(education_group_year)
+        administrative_data = _extract_administrative_data(calendars)
+        mandatary_data = _extract_mandatary_data(mandataries)
 
         # Put all dict together and ordered it by EDUCATION_GROUP_TITLES_ADMINISTRATIVE
         row = _convert_data_to_xls_row(
             education_group_year_data={**main_data, **administrative_data, **mandatary_data},
             header_list=EDUCATION_GROUP_TITLES_ADMINISTRATIVE
         )
-        xls_data.append(row)
-    return xls_data
+        yield row
+
+
+def _find_calendars_by_education_group_year(education_group_year_ids):
+    """
+    Pivot the offer year calendars of the education group years: one row by education group year, with a column by
+    (academic calendar type, session number, date), named by _get_calendar_column.
+    """
+    columns = {}
+    for reference, session_number in [(academic_calendar_type.COURSE_ENROLLMENT, None)] + [
+        (reference, session_number)
+        for reference in SESSION_ACADEMIC_CALENDAR_TYPES for session_number in range(1, SESSIONS_NUMBER + 1)
+    ]:
+        conditions = {'academic_calendar__reference': reference}
+        if session_number:
+            conditions['academic_calendar__sessionexamcalendar__number_session'] = session_number
+        for date_key in ('start_date', 'end_date'):
+            columns[_get_calendar_column(reference, session_number, date_key)] = Max(
+                Case(When(then=date_key, **conditions))
+            )
+
+    calendars = OfferYearCalendar.objects.filter(
+        education_group_year__in=education_group_year_ids
+    ).values('education_group_year').annotate(**columns).order_by()
+    return {calendar.pop('education_group_year'): calendar for calendar in calendars}
+
+
+def _get_calendar_column(reference, session_number, date_key):
+    return '_'.join([reference.lower(), str(session_number or 0), date_key])
+
+
+def _find_mandataries_by_education_group_year(education_group_year_ids):
+    """
+    Aggregate the names and the qualifications of the mandataries valid during the academic year
+    by education group year and mandate function.
+    """
+    mandatary_prefix = 'education_group__mandate__mandatary__'
+    mandataries = EducationGroupYear.objects.filter(
+        pk__in=education_group_year_ids,
+        **{
+            mandatary_prefix + 'start_date__lte': F('academic_year__start_date'),
+            mandatary_prefix + 'end_date__gte': F('academic_year__end_date'),
+        }
+    ).values('pk', 'education_group__mandate__function').annotate(
+        names=ArrayAgg(
+            Concat(mandatary_prefix + 'person__last_name', Value(' '), mandatary_prefix + 'person__first_name')
+        ),
+        qualifications=ArrayAgg('education_group__mandate__qualification'),
+    ).order_by()
+
+    mandataries_by_education_group_year = collections.defaultdict(dict)
+    for mandatary in mandataries:
+        mandataries_by_education_group_year[mandatary['pk']][mandatary['education_group__mandate__function']] = {
+            'names': mandatary['names'], 'qualifications': mandatary['qualifications']
+        }
+    return mandataries_by_education_group_year
 
 
 def _extract_main_data(an_education_group_year):
     return {
-        MANAGEMENT_ENTITY_COL: an_education_group_year.management_entity_version.acronym,
+        MANAGEMENT_ENTITY_COL: an_education_group_year.management_entity_acronym,
         TRANING_COL: an_education_group_year.acronym,
         TYPE_COL: an_education_group_year.education_group_type,
         ACADEMIC_YEAR_COL: an_education_group_year.academic_year.name,
@@ -265,81 +354,48 @@ def _extract_main_data(an_education_group_year):
     }
 
 
-def _extract_administrative_data(an_education_group_year):
-    course_enrollment_calendar = _get_offer_year_calendar_from_prefetched_data(
-        an_education_group_year,
-        academic_calendar_type.COURSE_ENROLLMENT
-    )
+def _extract_administrative_data(calendars):
+    course_enrollment = academic_calendar_type.COURSE_ENROLLMENT
     administrative_data = {
-        START_COURSE_REGISTRATION_COL: _format_date(course_enrollment_calendar, 'start_date', DATE_FORMAT),
-        END_COURSE_REGISTRATION_COL: _format_date(course_enrollment_calendar, 'end_date', DATE_FORMAT),
+        START_COURSE_REGISTRATION_COL: _format_calendar_date(calendars, course_enrollment, None, 'start_date',
+                                                             DATE_FORMAT),
+        END_COURSE_REGISTRATION_COL: _format_calendar_date(calendars, course_enrollment, None, 'end_date',
+                                                           DATE_FORMAT),
         SESSIONS_COLUMNS: [
-            _extract_session_data(an_education_group_year, session_number) for
+            _extract_session_data(calendars, session_number) for
             session_number in range(1, SESSIONS_NUMBER + 1)
         ]
     }
     return administrative_data
 
 
-def _extract_session_data(education_group_year, session_number):
-    session_academic_cal_type = [
-        academic_calendar_type.EXAM_ENROLLMENTS,
-        academic_calendar_type.SCORES_EXAM_SUBMISSION,
-        academic_calendar_type.DISSERTATION_SUBMISSION,
-        academic_calendar_type.DELIBERATION,
-        academic_calendar_type.SCORES_EXAM_DIFFUSION
-    ]
-    offer_year_cals = {}
-    for academic_cal_type in session_academic_cal_type:
-        offer_year_cals[academic_cal_type] = _get_offer_year_calendar_from_prefetched_data(
-            education_group_year,
-            academic_cal_type,
-            session_number=session_number
-        )
-
+def _extract_session_data(calendars, session_number):
     return {
-        START_EXAM_REGISTRATION_COL: _format_date(offer_year_cals[academic_calendar_type.EXAM_ENROLLMENTS],
-                                                  'start_date', DATE_FORMAT),
-        END_EXAM_REGISTRATION_COL: _format_date(offer_year_cals[academic_calendar_type.EXAM_ENROLLMENTS], 'end_date',
-                                                DATE_FORMAT),
-        MARKS_PRESENTATION_COL: _format_date(offer_year_cals[academic_calendar_type.SCORES_EXAM_SUBMISSION],
-                                             'start_date', DATE_FORMAT),
-        DISSERTATION_PRESENTATION_COL: _format_date(offer_year_cals[academic_calendar_type.DISSERTATION_SUBMISSION],
-                                                    'start_date', DATE_FORMAT),
-        DELIBERATION_COL: _format_date(offer_year_cals[academic_calendar_type.DELIBERATION], 'start_date',
-                                       DATE_TIME_FORMAT),
-        SCORES_DIFFUSION_COL: _format_date(offer_year_cals[academic_calendar_type.SCORES_EXAM_DIFFUSION], 'start_date',
-                                           DATE_TIME_FORMAT),
+        START_EXAM_REGISTRATION_COL: _format_calendar_date(calendars, academic_calendar_type.EXAM_ENROLLMENTS,
+                                                           session_number, 'start_date', DATE_FORMAT),
+        END_EXAM_REGISTRATION_COL: _format_calendar_date(calendars, academic_calendar_type.EXAM_ENROLLMENTS,
+                                                         session_number, 'end_date', DATE_FORMAT),
+        MARKS_PRESENTATION_COL: _format_calendar_date(calendars, academic_calendar_type.SCORES_EXAM_SUBMISSION,
+                                                      session_number, 'start_date', DATE_FORMAT),
+        DISSERTATION_PRESENTATION_COL: _format_calendar_date(calendars, academic_calendar_type.DISSERTATION_SUBMISSION,
+                                                             session_number, 'start_date', DATE_FORMAT),
+        DELIBERATION_COL: _format_calendar_date(calendars, academic_calendar_type.DELIBERATION,
+                                                session_number, 'start_date', DATE_TIME_FORMAT),
+        SCORES_DIFFUSION_COL: _format_calendar_date(calendars, academic_calendar_type.SCORES_EXAM_DIFFUSION,
+                                                    session_number, 'start_date', DATE_TIME_FORMAT),
     }
 
 
-def _extract_mandatary_data(education_group_year):
-    representatives = {mandate_types.PRESIDENT: [], mandate_types.SECRETARY: [], mandate_types.SIGNATORY: []}
-
-    for mandate in education_group_year.education_group.mandate_set.all():
-        representatives = _get_representatives(education_group_year, mandate, representatives)
-
+def _extract_mandatary_data(mandataries):
+    signatories = mandataries.get(mandate_types.SIGNATORY, {})
     return {
-        CHAIR_OF_THE_EXAM_BOARD_COL: names(representatives[mandate_types.PRESIDENT]),
-        EXAM_BOARD_SECRETARY_COL: names(representatives[mandate_types.SECRETARY]),
-        EXAM_BOARD_SIGNATORY_COL: names(representatives[mandate_types.SIGNATORY]),
-        SIGNATORY_QUALIFICATION_COL: qualification(representatives[mandate_types.SIGNATORY]),
+        CHAIR_OF_THE_EXAM_BOARD_COL: names(mandataries.get(mandate_types.PRESIDENT, {}).get('names', [])),
+        EXAM_BOARD_SECRETARY_COL: names(mandataries.get(mandate_types.SECRETARY, {}).get('names', [])),
+        EXAM_BOARD_SIGNATORY_COL: names(signatories.get('names', [])),
+        SIGNATORY_QUALIFICATION_COL: qualification(signatories.get('qualifications', [])),
     }
 
 
-def _get_representatives(education_group_year, mandate, representatives_param):
-    representatives = representatives_param
-    for mandataries in mandate.mandatary_set.all():
-        if _is_valid_mandate(mandataries, education_group_year):
-            if mandataries.mandate.function == mandate_types.PRESIDENT:
-                representatives.get(mandate_types.PRESIDENT).append(mandataries)
-            if mandataries.mandate.function == mandate_types.SECRETARY:
-                representatives.get(mandate_types.SECRETARY).append(mandataries)
-            if mandataries.mandate.function == mandate_types.SIGNATORY:
-                representatives.get(mandate_types.SIGNATORY).append(mandataries)
-    return representatives
-
-
 def _convert_data_to_xls_row(education_group_year_data, header_list):
     xls_row = []
     for header in header_list:
@@ -360,46 +416,16 @@ def _convert_session_data_to_xls_row(session_datas):
     return xls_session_rows
 
 
-def _get_offer_year_calendar_from_prefetched_data(an_education_group_year, academic_calendar_type, session_number=None):
-    offer_year_cals = _get_all_offer_year_calendar_from_prefetched_data(
-        an_education_group_year,
-        academic_calendar_type
-    )
-    if session_number:
-        offer_year_cals = [
-            offer_year_cal for offer_year_cal in offer_year_cals
-            if offer_year_cal.academic_calendar.sessionexamcalendar and
-            offer_year_cal.academic_calendar.sessionexamcalendar.number_session == session_number
-        ]
-
-    if len(offer_year_cals) > 1:
-        raise MultipleObjectsReturned
-    return offer_year_cals[0] if offer_year_cals else None
-
-
-def _get_all_offer_year_calendar_from_prefetched_data(an_education_group_year, academic_calendar_type):
-    return [
-        offer_year_calendar for offer_year_calendar in an_education_group_year.offeryearcalendar_set.all()
-        if offer_year_calendar.academic_calendar.reference == academic_calendar_type
-    ]
-
-
-def _format_date(obj, date_key, date_form):
-    date = getattr(obj, date_key, None) if obj else None
+def _format_calendar_date(calendars, reference, session_number, date_key, date_form):
+    date = calendars.get(_get_calendar_column(reference, session_number, date_key))
     if date:
         return date.strftime(date_form)
     return '-'
 
 
-def _is_valid_mandate(mandate, education_group_yr):
-    return mandate.start_date <= education_group_yr.academic_year.start_date and \
-           mandate.end_date >= education_group_yr.academic_year.end_date
-
-
 def names(representatives):
-    return ', '.join(sorted(str(mandatory.person.full_name) for mandatory in representatives))
+    return ', '.join(sorted(name.strip() for name in representatives))
 
 
-def qualification(signatories):
-    return ', '.join(sorted(signatory.mandate.qualification for signatory in signatories
-                            if signatory.mandate.qualification))
+def qualification(qualifications):
+    return ', '.join(sorted(a_qualification for a_qualification in qualifications if a_qualification))
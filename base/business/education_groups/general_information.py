@@ -0,0 +1,187 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.translation import ugettext_lazy as _
+
+from base.models.education_group_year import EducationGroupYear
+from base.utils.cache import cache
+from base.utils.db_router import pin_primary
+from cms.enums import entity_name
+from cms.models.translated_text import TranslatedText
+from cms.models.translated_text_label import TranslatedTextLabel
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+FRENCH = 'fr-be'
+ENGLISH = 'en'
+SPECIFIC = 'specific'
+COMMON = 'common'
+
+CMS_SECTIONS_CACHE_TIMEOUT = 60 * 60 * 24
+PREFIX_SECTIONS_KEY = 'education_group_general_information'
+PREFIX_VERSION_KEY = 'education_group_general_information_version'
+# Version shared by all the education group years: bumped when a common text or a label is modified
+COMMON_VERSION_KEY = 'education_group_general_information_version_common'
+
+Section = namedtuple('Section', 'title labels')
+
+
+def get_sections_with_translated_labels(education_group_year, user_language):
+    """
+    Return the sections of settings.SECTION_LIST with, for each label, its translation in the user language and the
+    french and english texts of the education group year (specific) or of its common education group year (common).
+
+    The texts are loaded in 3 queries and cached by education group year and language.
+    """
+    records_by_section = _get_from_cache(education_group_year.id, user_language)
+    if records_by_section is None:
+        # The cached sections must not come from a replica lagging behind the last modification
+        with pin_primary():
+            records_by_section = _load_records_by_section(education_group_year, user_language)
+        _set_in_cache(education_group_year.id, user_language, records_by_section)
+    return [Section(section.title, records) for section, records in zip(settings.SECTION_LIST, records_by_section)]
+
+
+def _load_records_by_section(education_group_year, user_language):
+    common_education_group_year = None
+    if not education_group_year.acronym.startswith('common-'):
+        common_education_group_year = EducationGroupYear.objects.look_for_common(
+            education_group_type=education_group_year.education_group_type,
+            academic_year=education_group_year.academic_year,
+        ).first()
+
+    labels = {label for section in settings.SECTION_LIST for label, _selectors in section.labels}
+    translated_labels = _find_translated_labels(labels, user_language)
+    texts = _find_texts(labels, [education_group_year, common_education_group_year])
+
+    records_by_section = []
+    for section in settings.SECTION_LIST:
+        records = []
+        for label, selectors in section.labels:
+            for selector in selectors.split(','):
+                if selector == SPECIFIC:
+                    records.append(_build_record(education_group_year, label, SPECIFIC, translated_labels, texts))
+                if selector == COMMON and common_education_group_year is not None:
+                    records.append(
+                        _build_record(common_education_group_year, label, COMMON, translated_labels, texts)
+                    )
+        records_by_section.append(records)
+    return records_by_section
+
+
+def _find_translated_labels(labels, user_language):
+    return dict(
+        TranslatedTextLabel.objects.filter(
+            text_label__entity=entity_name.OFFER_YEAR,
+            text_label__label__in=labels,
+            language=user_language
+        ).order_by('-id').values_list('text_label__label', 'label')
+    )
+
+
+def _find_texts(labels, education_group_years):
+    references = [egy.id for egy in education_group_years if egy is not None]
+    texts = TranslatedText.objects.filter(
+        entity=entity_name.OFFER_YEAR,
+        text_label__label__in=labels,
+        reference__in=references,
+        language__in=[FRENCH, ENGLISH]
+    ).order_by('-id').values_list('reference', 'text_label__label', 'language', 'text')
+    return {(reference, label, language): text for reference, label, language, text in texts}
+
+
+def _build_record(education_group_year, label, selector, translated_labels, texts):
+    translation = translated_labels.get(label)
+    return {
+        'label': label,
+        'type': selector,
+        'translation': translation if translation else (_('This label %s does not exist') % label),
+        FRENCH: texts.get((education_group_year.id, label, FRENCH)),
+        ENGLISH: texts.get((education_group_year.id, label, ENGLISH)),
+    }
+
+
+def _get_from_cache(education_group_year_id, user_language):
+    try:
+        return cache.get(_get_sections_key(education_group_year_id, user_language))
+    except Exception:
+        logger.exception('An error occurred with cache system')
+        return None
+
+
+def _set_in_cache(education_group_year_id, user_language, records_by_section):
+    try:
+        cache.set(_get_sections_key(education_group_year_id, user_language), records_by_section,
+                  timeout=CMS_SECTIONS_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+def _get_sections_key(education_group_year_id, user_language):
+    version_key = _get_version_key(education_group_year_id)
+    versions = cache.get_many([version_key, COMMON_VERSION_KEY])
+    return "_".join([
+        PREFIX_SECTIONS_KEY, str(education_group_year_id), str(user_language),
+        versions.get(version_key, ''), versions.get(COMMON_VERSION_KEY, '')
+    ])
+
+
+def _get_version_key(education_group_year_id):
+    return "_".join([PREFIX_VERSION_KEY, str(education_group_year_id)])
+
+
+def invalidate_cache(education_group_year_id=None):
+    """ Invalidate the sections of an education group year or, without id, of all education group years """
+    try:
+        cache.set(_get_version_key(education_group_year_id) if education_group_year_id else COMMON_VERSION_KEY,
+                  uuid.uuid4().hex, timeout=None)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+@receiver(post_save, sender=TranslatedText)
+@receiver(post_delete, sender=TranslatedText)
+def invalidate_translated_text(sender, instance, **kwargs):
+    if instance.entity != entity_name.OFFER_YEAR:
+        return
+    education_group_year_id = instance.reference
+    # After the commit, in order not to let a reader cache the sections again from the previous data
+    transaction.on_commit(lambda: invalidate_cache(education_group_year_id))
+    if EducationGroupYear.objects.look_for_common(pk=education_group_year_id).exists():
+        transaction.on_commit(invalidate_cache)
+
+
+@receiver(post_save, sender=TranslatedTextLabel)
+@receiver(post_delete, sender=TranslatedTextLabel)
+def invalidate_translated_text_label(sender, **kwargs):
+    transaction.on_commit(invalidate_cache)
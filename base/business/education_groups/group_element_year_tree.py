@@ -26,36 +26,42 @@
 from django.db.models import OuterRef, Exists
 from django.urls import reverse
 
+from base.business.group_element_years import structure_snapshot
 from base.business.group_element_years.management import EDUCATION_GROUP_YEAR, LEARNING_UNIT_YEAR
-from base.models.prerequisite import Prerequisite
+from base.models.group_element_year import GroupElementYear
+from base.models.prerequisite import PrerequisiteItem
 
 
 class NodeBranchJsTree:
     """ Use to generate json from a list of education group years compatible with jstree """
     element_type = EDUCATION_GROUP_YEAR
 
-    def __init__(self, root, group_element_year=None):
+    def __init__(self, root, group_element_year=None, children_by_parent=None):
         self.root = root
         self.group_element_year = group_element_year
+        if children_by_parent is None:
+            children_by_parent = structure_snapshot.find_group_element_years_by_parent(root, self.get_queryset())
+        self.children_by_parent = children_by_parent
         self.children = self.generate_children()
 
     def generate_children(self):
         result = []
-        for group_element_year in self.get_queryset():
+        for group_element_year in self.children_by_parent.get(self.education_group_year.id, []):
             if group_element_year.child_branch and group_element_year.child_branch != self.root:
-                result.append(NodeBranchJsTree(self.root, group_element_year))
+                result.append(NodeBranchJsTree(self.root, group_element_year, self.children_by_parent))
             elif group_element_year.child_leaf:
-                result.append(NodeLeafJsTree(self.root, group_element_year))
+                result.append(NodeLeafJsTree(self.root, group_element_year, self.children_by_parent))
 
         return result
 
     def get_queryset(self):
-        has_prerequisite = Prerequisite.objects.filter(
-            education_group_year__id=self.root.id,
-            learning_unit_year__id=OuterRef("child_leaf__id"),
-        ).exclude(prerequisite__exact='')
+        """ The group element years of the whole tree are loaded at once with this queryset """
+        has_prerequisite = PrerequisiteItem.objects.filter(
+            prerequisite__education_group_year__id=self.root.id,
+            prerequisite__learning_unit_year__id=OuterRef("child_leaf__id"),
+        )
 
-        return self.education_group_year.groupelementyear_set.all() \
+        return GroupElementYear.objects.all() \
             .annotate(has_prerequisites=Exists(has_prerequisite)) \
             .select_related('child_branch__academic_year',
                             'child_leaf__academic_year',
@@ -24,8 +24,10 @@
 #
 #############################################################################
 import re
+from collections import defaultdict
 
 from base.models import prerequisite as mdl_prerequisite, group_element_year as mdl_group_element_year
+from base.models.learning_unit_year import LearningUnitYear
 
 
 def extract_learning_units_acronym_from_prerequisite(prerequisite_string):
@@ -47,7 +49,22 @@ def get_learning_units_which_are_outside_of_education_group(education_group_year
     return list(set(list_learning_unit_acronyms) - set(list_acronyms_inside_education_group))
 
 
-def get_prerequisite_acronyms_which_are_outside_of_education_group(education_group_year_root, prerequisite_obj):
-    list_prerequisites_acronyms = extract_learning_units_acronym_from_prerequisite(prerequisite_obj.prerequisite)
-    return get_learning_units_which_are_outside_of_education_group(education_group_year_root,
-                                                                   list_prerequisites_acronyms)
+def get_prerequisite_acronyms_outside_of_education_group_by_learning_unit_year(education_group_year_root):
+    """ Check all the prerequisites of an education group year at once, without parsing them """
+    acronyms_inside = get_learning_acronyms_inside_education_groups([education_group_year_root.id])
+    items = mdl_prerequisite.PrerequisiteItem.objects.filter(
+        prerequisite__education_group_year=education_group_year_root
+    ).exclude(acronym__in=acronyms_inside).values_list('prerequisite__learning_unit_year_id', 'acronym')
+
+    acronyms_by_learning_unit_year = defaultdict(list)
+    for learning_unit_year_id, acronym in items:
+        acronyms_by_learning_unit_year[learning_unit_year_id].append(acronym)
+    return dict(acronyms_by_learning_unit_year)
+
+
+def find_learning_unit_years_which_require(education_group_year, learning_unit_year):
+    """ Return the learning unit years having learning_unit_year as prerequisite inside education_group_year """
+    return LearningUnitYear.objects.filter(
+        prerequisite__education_group_year=education_group_year,
+        prerequisite__prerequisiteitem__learning_unit_year=learning_unit_year,
+    ).distinct()
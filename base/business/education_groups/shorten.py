@@ -24,6 +24,7 @@
 #
 ##############################################################################
 from django.core.exceptions import ValidationError, NON_FIELD_ERRORS
+from django.db.models import Count
 from django.utils.safestring import mark_safe
 from django.utils.translation import ngettext_lazy, ugettext_lazy as _
 
@@ -36,17 +37,18 @@ def start(education_group, until_year):
     """
     This function will delete all education group year
     """
-    education_group_years_to_delete = _get_education_group_years_to_delete(education_group, until_year)
-    egy_deleted = []
-    for education_group_year in education_group_years_to_delete:
-        egy_deleted.append(education_group_year)
-        education_group_year.delete()
+    egy_deleted = list(_get_education_group_years_to_delete(education_group, until_year))
+    if egy_deleted:
+        EducationGroupYear.objects.filter(pk__in=[egy.pk for egy in egy_deleted]).delete()
+        # If the education_group has no more children, we can delete it
+        if not education_group.educationgroupyear_set.exists():
+            education_group.delete()
     return egy_deleted
 
 
 def check_education_group_end_date(education_group, end_year):
     education_group_years_to_delete = _get_education_group_years_to_delete(education_group, end_year)
-    protected_messages = _get_protected_messages(education_group_years_to_delete)
+    protected_messages = get_protected_messages(education_group_years_to_delete)
     if protected_messages:
         error_msg = _get_formated_error_msg(end_year, protected_messages)
         raise ValidationError({
@@ -69,10 +71,13 @@ def _get_formated_error_msg(end_year, protected_messages):
 
 
 def get_protected_messages_by_education_group_year(education_group_year):
+    protected_messages = get_protected_messages([education_group_year])
+    return protected_messages[0]['messages'] if protected_messages else []
+
+
+def _build_protected_messages(count_enrollment, have_pgrm_content):
     protected_message = []
 
-    # Count the number of enrollment
-    count_enrollment = OfferEnrollment.objects.filter(education_group_year=education_group_year).count()
     if count_enrollment:
         protected_message.append(
             ngettext_lazy(
@@ -82,8 +87,6 @@ def get_protected_messages_by_education_group_year(education_group_year):
             ) % {"count_enrollment": count_enrollment}
         )
 
-    # Check if content is not empty
-    have_pgrm_content = GroupElementYear.objects.filter(parent=education_group_year).exists()
     if have_pgrm_content:
         protected_message.append(_("The content of the education group is not empty."))
 
@@ -97,10 +100,25 @@ def _get_education_group_years_to_delete(education_group, end_year):
     ).order_by('academic_year__year')
 
 
-def _get_protected_messages(education_group_years):
+def get_protected_messages(education_group_years):
+    """
+    Return the protected messages of the education group years, in their order.
+    The enrollments and the contents of all the education group years are counted in two queries.
+    """
+    education_group_years = list(education_group_years)
+    ids = [education_group_year.pk for education_group_year in education_group_years]
+    enrollment_counts = dict(
+        OfferEnrollment.objects.filter(education_group_year__in=ids).values_list('education_group_year')
+        .annotate(count=Count('id')).order_by()
+    )
+    ids_with_content = set(
+        GroupElementYear.objects.filter(parent__in=ids).values_list('parent', flat=True).distinct()
+    )
+
     protected_messages = []
     for education_group_year in education_group_years:
-        protected_message = get_protected_messages_by_education_group_year(education_group_year)
+        protected_message = _build_protected_messages(enrollment_counts.get(education_group_year.pk, 0),
+                                                      education_group_year.pk in ids_with_content)
         if protected_message:
             protected_messages.append({
                 'education_group_year': education_group_year,
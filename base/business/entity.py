@@ -24,10 +24,9 @@
 #
 ##############################################################################
 from django.db.models import Prefetch
-from django.utils import timezone
 
 from base import models as mdl
-from base.models import entity_calendar, entity_version
+from base.models import entity_calendar
 from base.models import entity_version as mdl_entity_version
 from base.models.entity import Entity
 from base.models.entity_version import EntityVersion
@@ -50,24 +49,15 @@ def get_entities_ids(entity_acronym, with_entity_subordinated):
 
 
 def get_entity_calendar(an_entity_version, academic_yr):
-    entity_cal = entity_calendar.find_by_entity_and_reference_and_academic_year(
-        an_entity_version.entity.id,
+    return entity_calendar.find_effective_entity_calendar(
+        an_entity_version.entity_id,
         academic_calendar_type.SUMMARY_COURSE_SUBMISSION,
         academic_yr
     )
 
-    if entity_cal:
-        return entity_cal
-    else:
-        if an_entity_version.parent:
-            parent_entity_version = entity_version.find_latest_version_by_entity(an_entity_version.parent,
-                                                                                 timezone.now())
-            if parent_entity_version:
-                return get_entity_calendar(parent_entity_version, academic_yr)
-        return None
 
-
-def build_entity_container_prefetch(entity_container_year_link_types):
+def build_entity_container_prefetch(entity_container_year_link_types,
+                                    learning_container_year_path='learning_container_year'):
     parent_version_prefetch = Prefetch('parent__entityversion_set',
                                        queryset=mdl_entity_version.search(),
                                        to_attr='entity_versions')
@@ -75,7 +65,7 @@ def build_entity_container_prefetch(entity_container_year_link_types):
                                        queryset=mdl_entity_version.search()
                                        .prefetch_related(parent_version_prefetch),
                                        to_attr='entity_versions')
-    entity_container_prefetch = Prefetch('learning_container_year__entitycontaineryear_set',
+    entity_container_prefetch = Prefetch(learning_container_year_path + '__entitycontaineryear_set',
                                          queryset=mdl.entity_container_year.search(
                                              link_type=entity_container_year_link_types)
                                          .prefetch_related(entity_version_prefetch),
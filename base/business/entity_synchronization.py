@@ -0,0 +1,249 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+import itertools
+
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from base.business import outbox
+from base.business.autocomplete import entity_version_index
+from base.models import entity_calendar, entity_manager
+from base.models.entity import Entity
+from base.models.entity_version import EntityVersion
+
+ENTITY_FIELDS = ('organization_id', 'website', 'location', 'postal_code', 'city', 'country_id', 'phone', 'fax')
+# Versions having the same key are the same version, possibly with another end date
+VERSION_KEY_FIELDS = ('acronym', 'title', 'entity_type', 'parent_id', 'start_date')
+
+SynchronizationResult = collections.namedtuple(
+    'SynchronizationResult',
+    ['created_entities_count', 'updated_entities_count', 'new_versions_count', 'updated_versions_count', 'errors']
+)
+
+
+def synchronize_entities(entities_data):
+    """
+    Synchronize the whole organisational chart sent by the HR feed.
+
+    :param entities_data: list of entities, in the format of post_entities (external_id, organization, website, ...,
+    entityversion_set: list of {acronym, title, entity_type, parent, start_date, end_date})
+    :return: SynchronizationResult. The versions overlapping an other version of the same entity or with the same
+    acronym are not saved and reported in errors.
+    """
+    errors = []
+    entities_data = [data for data in entities_data if _check_entity_data(data, errors)]
+
+    entities_by_external_id = {
+        entity.external_id: entity
+        for entity in Entity.objects.filter(external_id__in=[data['external_id'] for data in entities_data])
+    }
+    versions_by_entity_id = _get_versions_by_entity_id(entities_by_external_id.values())
+    existing_parent_ids = _get_existing_parent_ids(entities_data)
+
+    new_entities, updated_entities, new_versions, updated_versions = [], [], [], []
+    for data in entities_data:
+        entity = entities_by_external_id.get(data['external_id'])
+        if entity is None:
+            entity = Entity(external_id=data['external_id'])
+            _set_entity_fields(entity, data)
+            entities_by_external_id[entity.external_id] = entity
+            new_entities.append(entity)
+        elif _set_entity_fields(entity, data):
+            updated_entities.append(entity)
+
+        existing_versions = versions_by_entity_id.get(entity.pk, []) if entity.pk else []
+        _diff_versions(entity, data['entityversion_set'], existing_versions, existing_parent_ids,
+                       new_versions, updated_versions, errors)
+
+    _validate_overlaps(versions_by_entity_id, new_versions, updated_versions, errors)
+
+    with transaction.atomic():
+        Entity.objects.bulk_create(new_entities)
+        for entity in updated_entities:
+            Entity.objects.filter(pk=entity.pk).update(**{field: getattr(entity, field) for field in ENTITY_FIELDS})
+        for version in new_versions:
+            version.entity_id = version.entity.pk
+        EntityVersion.objects.bulk_create(new_versions)
+        _update_end_dates(updated_versions)
+        # Neither do they record the changes to publish on the queues
+        outbox.record_changes(Entity, [entity.pk for entity in new_entities + updated_entities])
+        outbox.record_changes(EntityVersion, [version.pk for version in new_versions] +
+                              [version.pk for version, _end_date in updated_versions])
+        # The bulk operations do not send the signals invalidating the calendars inherited through the structure,
+        # the managed entities and the autocomplete of the entity versions
+        transaction.on_commit(entity_calendar.invalidate_cache)
+        transaction.on_commit(entity_manager.invalidate_cache)
+        transaction.on_commit(entity_version_index.invalidate)
+
+    return SynchronizationResult(len(new_entities), len(updated_entities), len(new_versions), len(updated_versions),
+                                 errors)
+
+
+def _check_entity_data(data, errors):
+    if not isinstance(data, dict) or not data.get('external_id'):
+        errors.append({'entity': data, 'error': 'external_id is required'})
+        return False
+    data.setdefault('entityversion_set', [])
+    return True
+
+
+def _get_versions_by_entity_id(entities):
+    versions = EntityVersion.objects.filter(entity__in=[entity.pk for entity in entities]).order_by('entity_id')
+    return {
+        entity_id: list(entity_versions)
+        for entity_id, entity_versions in itertools.groupby(versions, key=lambda version: version.entity_id)
+    }
+
+
+def _get_existing_parent_ids(entities_data):
+    parent_ids = {version.get('parent') for data in entities_data for version in data['entityversion_set']}
+    return set(Entity.objects.filter(pk__in=parent_ids - {None}).values_list('pk', flat=True))
+
+
+def _set_entity_fields(entity, data):
+    """ Return True if a field has been modified """
+    values = {
+        'organization_id': data.get('organization'),
+        'website': data.get('website'),
+        'location': data.get('location'),
+        'postal_code': data.get('postal_code'),
+        'city': data.get('city'),
+        'country_id': data.get('country_id', data.get('country')),
+        'phone': data.get('phone'),
+        'fax': data.get('fax'),
+    }
+    if entity.pk:
+        # An existing entity keeps its organization
+        del values['organization_id']
+    modified = False
+    for field, value in values.items():
+        if getattr(entity, field) != value:
+            setattr(entity, field, value)
+            modified = True
+    return modified
+
+
+def _diff_versions(entity, versions_data, existing_versions, existing_parent_ids, new_versions, updated_versions,
+                   errors):
+    existing_versions_by_key = {_get_version_key(version): version for version in existing_versions}
+    for version_data in versions_data:
+        version = EntityVersion(
+            entity=entity,
+            acronym=version_data.get('acronym'),
+            title=version_data.get('title'),
+            entity_type=version_data.get('entity_type'),
+            parent_id=version_data.get('parent') if version_data.get('parent') in existing_parent_ids else None,
+            start_date=_parse_date(version_data.get('start_date')),
+            end_date=_parse_date(version_data.get('end_date')),
+            external_id=version_data.get('external_id'),
+        )
+        if version.start_date is None or (entity.pk and version.parent_id == entity.pk) or \
+                (version_data.get('end_date') and version.end_date is None):
+            errors.append({'entity': entity.external_id, 'version': version_data, 'error': 'invalid version'})
+            continue
+
+        existing_version = existing_versions_by_key.get(_get_version_key(version))
+        if existing_version is None:
+            new_versions.append(version)
+        elif existing_version.end_date != version.end_date:
+            updated_versions.append((existing_version, version.end_date))
+
+
+def _get_version_key(version):
+    return tuple(getattr(version, field) for field in VERSION_KEY_FIELDS)
+
+
+def _parse_date(value):
+    if value is None or hasattr(value, 'year'):
+        return value
+    try:
+        return parse_date(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _validate_overlaps(versions_by_entity_id, new_versions, updated_versions, errors):
+    """
+    The versions of an entity and the versions with the same acronym can not overlap.
+    The versions of the other entities sharing an acronym are loaded in one query.
+    The invalid new versions are removed and the invalid updated versions get back their end date.
+    """
+    loaded_versions = [version for versions in versions_by_entity_id.values() for version in versions]
+    updated_version_ids = {version.pk for version, _end_date in updated_versions}
+    other_versions = EntityVersion.objects.filter(
+        acronym__in={version.acronym for version in itertools.chain(
+            new_versions, (version for version, _end_date in updated_versions)
+        )}
+    ).exclude(
+        pk__in=[version.pk for version in loaded_versions]
+    ).only('pk', 'entity_id', 'acronym', 'start_date', 'end_date')
+
+    intervals_by_entity = collections.defaultdict(list)
+    intervals_by_acronym = collections.defaultdict(list)
+
+    def accept(entity_key, acronym, start_date, end_date):
+        intervals_by_entity[entity_key].append((start_date, end_date))
+        intervals_by_acronym[acronym].append((start_date, end_date))
+
+    def overlap(entity_key, acronym, start_date, end_date):
+        intervals = itertools.chain(intervals_by_entity[entity_key], intervals_by_acronym[acronym])
+        return any(
+            (other_end is None or start_date <= other_end) and (end_date is None or other_start <= end_date)
+            for other_start, other_end in intervals
+        )
+
+    for version in itertools.chain(loaded_versions, other_versions):
+        if version.pk not in updated_version_ids:
+            accept(version.entity_id, version.acronym, version.start_date, version.end_date)
+
+    for version, end_date in list(updated_versions):
+        if overlap(version.entity_id, version.acronym, version.start_date, end_date):
+            errors.append(_build_overlap_error(version))
+            updated_versions.remove((version, end_date))
+            end_date = version.end_date
+        accept(version.entity_id, version.acronym, version.start_date, end_date)
+
+    for version in list(new_versions):
+        entity_key = version.entity_id or id(version.entity)
+        if overlap(entity_key, version.acronym, version.start_date, version.end_date):
+            errors.append(_build_overlap_error(version))
+            new_versions.remove(version)
+            continue
+        accept(entity_key, version.acronym, version.start_date, version.end_date)
+
+
+def _build_overlap_error(version):
+    return {'entity': version.entity.external_id, 'version': str(version), 'error': 'overlapping dates'}
+
+
+def _update_end_dates(updated_versions):
+    # One query by end date
+    versions_by_end_date = collections.defaultdict(list)
+    for version, end_date in updated_versions:
+        versions_by_end_date[end_date].append(version.pk)
+    for end_date, version_ids in versions_by_end_date.items():
+        EntityVersion.objects.filter(pk__in=version_ids).update(end_date=end_date)
@@ -0,0 +1,223 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+import datetime
+import logging
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files import File
+from django.db import transaction
+from django.http import QueryDict
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+from notifications.models import Notification
+from notifications.signals import notify
+
+from attribution.business import xls_build as attribution_xls
+from backoffice.celery import app as celery_app
+from base.business import learning_unit, learning_unit_xls, proposal_xls, education_group
+from base.business.learning_unit_year_with_context import iter_with_latest_entities
+from base.business.learning_units import xls_comparison
+from base.business.xls_stream import get_xls_filename
+from base.forms.education_groups import EducationGroupFilter
+from base.forms.learning_unit.search_form import LearningUnitYearForm
+from base.forms.proposal.learning_unit_proposal import LearningUnitProposalForm
+from base.models.education_group_year import EducationGroupYear
+from base.models.enums import export_job_status, export_type
+from base.models.export_job import ExportJob
+from base.utils.notifications import invalidate_notifications_cache
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+RUN_EXPORT_JOB_TASK = 'base.tasks.run_export_job'
+
+# Keys of ExportJob.parameters
+SEARCH_DATA = 'search_data'
+FILTERS = 'filters'
+EXTRA = 'extra'
+
+
+def start_export_job(user, an_export_type, search_data, filters, extra=None):
+    """
+    Register an export job and dispatch it to a celery worker once the current transaction is committed.
+
+    :param user: User who will receive the file
+    :param an_export_type: one of export_type.EXPORT_TYPES
+    :param search_data: QueryDict of the search form used to find the objects to export
+    :param filters: OrderedDict of the research criteria displayed in the file
+    :param extra: dict of the export specific configuration
+    :return: ExportJob
+    """
+    job = ExportJob.objects.create(
+        user=user,
+        export_type=an_export_type,
+        parameters={
+            SEARCH_DATA: dict(search_data.lists()),
+            FILTERS: [[str(label), str(value)] for label, value in filters.items()],
+            EXTRA: extra or {},
+        }
+    )
+    transaction.on_commit(lambda: _dispatch(job))
+    return job
+
+
+def _dispatch(job):
+    result = celery_app.send_task(RUN_EXPORT_JOB_TASK, args=[job.pk])
+    ExportJob.objects.filter(pk=job.pk).update(task_id=result.id or '')
+
+
+def run_export_job(export_job_id):
+    job = ExportJob.objects.select_related('user').get(pk=export_job_id)
+    _set_status(job, export_job_status.RUNNING)
+    try:
+        filename, stream = _get_export_function(job.export_type)(job.user, job.parameters)
+        with stream:
+            job.file.save(get_xls_filename(filename), File(stream), save=False)
+        job.finished = timezone.now()
+        _set_status(job, export_job_status.DONE)
+        # The job is the target of the notification, which links to its download view
+        notify.send(job, recipient=job.user, verb=str(_("Your export is ready")), target=job)
+    except Exception as e:
+        logger.exception('Export job {} failed'.format(job.pk))
+        job.error = str(e)
+        job.finished = timezone.now()
+        _set_status(job, export_job_status.FAILED)
+        notify.send(job, recipient=job.user, verb=str(_("Your export has failed")))
+    invalidate_notifications_cache([job.user_id])
+    return job.status
+
+
+def purge_export_jobs():
+    """
+    Delete the export jobs created more than EXPORT_JOB_RETENTION_DAYS days ago with their file and their
+    notifications. Return the number of deleted jobs.
+    """
+    limit = timezone.now() - datetime.timedelta(days=settings.EXPORT_JOB_RETENTION_DAYS)
+    expired_jobs = list(ExportJob.objects.filter(created__lt=limit))
+    if not expired_jobs:
+        return 0
+
+    for job in expired_jobs:
+        if job.file:
+            job.file.delete(save=False)
+    Notification.objects.filter(
+        actor_content_type=ContentType.objects.get_for_model(ExportJob),
+        actor_object_id__in=[str(job.pk) for job in expired_jobs],
+    ).delete()
+    ExportJob.objects.filter(pk__in=[job.pk for job in expired_jobs]).delete()
+    invalidate_notifications_cache({job.user_id for job in expired_jobs})
+    return len(expired_jobs)
+
+
+def _set_status(job, status):
+    job.status = status
+    job.save()
+
+
+def _get_export_function(an_export_type):
+    return {
+        export_type.LEARNING_UNITS: _export_learning_units,
+        export_type.LEARNING_UNITS_WITH_PARAMETERS: _export_learning_units_with_parameters,
+        export_type.LEARNING_UNITS_ATTRIBUTIONS: _export_learning_units_attributions,
+        export_type.LEARNING_UNITS_COMPARISON: _export_learning_units_comparison,
+        export_type.PROPOSALS: _export_proposals,
+        export_type.EDUCATION_GROUPS: _export_education_groups,
+        export_type.EDUCATION_GROUPS_ADMINISTRATIVE: _export_education_groups_administrative_data,
+    }[an_export_type]
+
+
+# Export functions return the name of the file and a stream of the workbook
+def _export_learning_units(user, parameters):
+    return learning_unit.XLS_FILENAME, learning_unit.create_xls_stream(
+        user, iter_with_latest_entities(_find_learning_units(parameters)), _get_filters(parameters)
+    )
+
+
+def _export_learning_units_with_parameters(user, parameters):
+    return learning_unit.XLS_FILENAME, learning_unit_xls.create_xls_with_parameters_stream(
+        user, iter_with_latest_entities(_find_learning_units(parameters)), _get_filters(parameters), parameters[EXTRA]
+    )
+
+
+def _export_learning_units_attributions(user, parameters):
+    return attribution_xls.XLS_FILENAME, attribution_xls.create_xls_attribution_stream(
+        user, iter_with_latest_entities(_find_learning_units(parameters)), _get_filters(parameters)
+    )
+
+
+def _export_learning_units_comparison(user, parameters):
+    return xls_comparison.XLS_FILENAME, xls_comparison.create_xls_comparison_stream(
+        user, _find_learning_units(parameters), _get_filters(parameters), parameters[EXTRA].get('comparison_year')
+    )
+
+
+def _export_proposals(user, parameters):
+    form = LearningUnitProposalForm(_get_search_data(parameters))
+    proposals = form.get_proposal_learning_units() if form.is_valid() else []
+    return proposal_xls.XLS_FILENAME, proposal_xls.create_xls_proposal_stream(
+        user, iter_with_latest_entities(proposals, learning_unit_year_attr='learning_unit_year'),
+        _get_filters(parameters)
+    )
+
+
+def _export_education_groups(user, parameters):
+    return education_group.XLS_FILENAME, education_group.create_xls_stream(
+        user, _find_education_group_years(parameters), _get_filters(parameters), parameters[EXTRA]
+    )
+
+
+def _export_education_groups_administrative_data(user, parameters):
+    return education_group.XLS_FILENAME_ADMINISTRATIVE, education_group.create_xls_administrative_data_stream(
+        user, _find_education_group_years(parameters), _get_filters(parameters), parameters[EXTRA]
+    )
+
+
+def _find_learning_units(parameters):
+    form = LearningUnitYearForm(
+        _get_search_data(parameters),
+        service_course_search=parameters[EXTRA].get('service_course_search', False),
+        borrowed_course_search=parameters[EXTRA].get('borrowed_course_search', False),
+    )
+    return form.get_activity_learning_units() if form.is_valid() else []
+
+
+def _find_education_group_years(parameters):
+    form = EducationGroupFilter(_get_search_data(parameters))
+    if not form.is_valid():
+        return EducationGroupYear.objects.none()
+    return form.get_object_list()
+
+
+def _get_search_data(parameters):
+    search_data = QueryDict(mutable=True)
+    for key, values in parameters[SEARCH_DATA].items():
+        search_data.setlist(key, values)
+    return search_data
+
+
+def _get_filters(parameters):
+    return collections.OrderedDict(parameters[FILTERS])
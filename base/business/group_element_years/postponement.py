@@ -23,13 +23,18 @@
 #    see http://www.gnu.org/licenses/.
 #
 ############################################################################
+import itertools
+
 from django.db import Error, transaction
 from django.utils.translation import ugettext as _
 
 from base.business.education_groups.postponement import duplicate_education_group_year
-from base.business.utils.model import update_related_object
+from base.business.group_element_years import structure_snapshot
+from base.business.utils.model import duplicate_object
 from base.models.academic_year import starting_academic_year
 from base.models.education_group_year import EducationGroupYear
+from base.models.group_element_year import GroupElementYear
+from base.models.learning_unit_year import LearningUnitYear
 
 
 class NotPostponeError(Error):
@@ -57,25 +62,64 @@ class PostponeContent:
 
         self.result = []
         self.instance_n1 = self.get_instance_n1(self.instance)
+        self._next_branches_by_education_group = {}
+        self._next_leaves_by_learning_unit = {}
 
     @transaction.atomic
-    def postpone(self, instance=None):
-        if not instance:
-            instance = self.instance
-            next_instance = self.instance_n1
-        else:
-            next_instance = self.get_instance_n1(instance)
-
-        for gr in instance.groupelementyear_set.all():
-            new_gr = update_related_object(gr, "parent", next_instance)
-            if new_gr.child_leaf:
+    def postpone(self):
+        """
+        The N content is loaded level by level and the N+1 counterparts of its children in two queries.
+        All the new links are then created at once, keeping their order.
+        """
+        children_by_parent = self._find_children_by_parent()
+        group_element_years = list(itertools.chain.from_iterable(children_by_parent.values()))
+
+        self._next_branches_by_education_group = {
+            egy.education_group_id: egy for egy in EducationGroupYear.objects.filter(
+                education_group__in={gr.child_branch.education_group_id for gr in group_element_years
+                                     if gr.child_branch},
+                academic_year=self.next_academic_year,
+            )
+        }
+        leaves = [gr.child_leaf for gr in group_element_years if gr.child_leaf]
+        self._next_leaves_by_learning_unit = {
+            (luy.learning_unit_id, luy.academic_year.year): luy for luy in LearningUnitYear.objects.filter(
+                learning_unit__in={luy.learning_unit_id for luy in leaves},
+                academic_year__year__in={luy.academic_year.year + 1 for luy in leaves},
+            ).select_related('academic_year')
+        }
+
+        new_group_element_years = []
+        self._postpone_children(self.instance, self.instance_n1, children_by_parent, new_group_element_years)
+        self.result.extend(GroupElementYear.objects.bulk_create(new_group_element_years))
+        # The bulk creation does not send the signals invalidating the structure snapshots
+        academic_year_ids = {(gr.child_branch or gr.child_leaf).academic_year_id for gr in new_group_element_years}
+        academic_year_ids.add(self.next_academic_year.id)
+        transaction.on_commit(lambda: structure_snapshot.invalidate_cache(*academic_year_ids))
+        return self.instance_n1
+
+    def _find_children_by_parent(self):
+        children_by_parent = {}
+        parent_ids = {self.instance.pk}
+        while parent_ids:
+            group_element_years = GroupElementYear.objects.filter(parent__in=parent_ids)\
+                .select_related('child_branch', 'child_leaf__academic_year').order_by('order')
+            for gr in group_element_years:
+                children_by_parent.setdefault(gr.parent_id, []).append(gr)
+            parent_ids = {gr.child_branch_id for gr in group_element_years
+                          if gr.child_branch_id and gr.child_branch_id not in children_by_parent}
+        return children_by_parent
+
+    def _postpone_children(self, instance, next_instance, children_by_parent, new_group_element_years):
+        for gr in children_by_parent.get(instance.pk, []):
+            new_gr = duplicate_object(gr)
+            new_gr.parent = next_instance
+            if gr.child_leaf:
                 self._postpone_child_leaf(gr, new_gr)
             else:
-                self._postpone_child_branch(gr, new_gr)
+                self._postpone_child_branch(gr, new_gr, children_by_parent, new_group_element_years)
 
-            self.result.append(new_gr)
-
-        return next_instance
+            new_group_element_years.append(new_gr)
 
     def get_instance_n1(self, instance):
         try:
@@ -90,27 +134,26 @@ class PostponeContent:
 
         return next_instance
 
-    @staticmethod
-    def _postpone_child_leaf(old_gr, new_gr):
+    def _postpone_child_leaf(self, old_gr, new_gr):
         """
         During the postponement of the learning units, we will take the next learning unit year
         but if it does not exist for N+1, we will attach the old instance .
         """
         old_luy = old_gr.child_leaf
-        new_luy = old_luy.get_learning_unit_next_year() or old_luy
-        new_gr.child_leaf = new_luy
-        return new_gr.save()
+        new_gr.child_leaf = self._next_leaves_by_learning_unit.get(
+            (old_luy.learning_unit_id, old_luy.academic_year.year + 1), old_luy
+        )
 
-    def _postpone_child_branch(self, old_gr, new_gr):
+    def _postpone_child_branch(self, old_gr, new_gr, children_by_parent, new_group_element_years):
         """
         Unlike child leaf, the child branch must also be postponed (recursively)
         """
         old_egy = old_gr.child_branch
-        new_egy = old_egy.next_year()
+        new_egy = self._next_branches_by_education_group.get(old_egy.education_group_id)
 
         if not new_egy:
             new_egy = duplicate_education_group_year(old_egy, self.next_academic_year)
-            self.postpone(old_egy)
+            self._next_branches_by_education_group[old_egy.education_group_id] = new_egy
+            self._postpone_children(old_egy, new_egy, children_by_parent, new_group_element_years)
 
         new_gr.child_branch = new_egy
-        return new_gr.save()
@@ -0,0 +1,272 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from base.models.education_group_type import EducationGroupType, GROUP_TYPE_OPTION
+from base.models.education_group_year import EducationGroupYear
+from base.models.enums import education_group_categories
+from base.models.group_element_year import GroupElementYear
+from base.utils.cache import cache
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+PREFIX_SNAPSHOT_KEY = 'structure_snapshot'
+PREFIX_VERSION_KEY = 'structure_snapshot_version'
+# Version shared by all the academic years: bumped when an education group type is modified
+COMMON_VERSION_KEY = 'structure_snapshot_version_common'
+
+# Snapshots already loaded by this process, by academic year id: (version, snapshot)
+_loaded_snapshots = {}
+
+
+class StructureSnapshot:
+    """
+    Structure of the programs of an academic year, in a compact form which can be cached:
+     - links: tuples (group_element_year_id, parent_id, child_branch_id, child_leaf_id, child_branch_academic_year_id)
+       of all the group element years of the academic year, in the order of their parent;
+     - formation_ids: ids of the education group years at which the search of the formations of a child stops
+       (trainings and mini-trainings other than options).
+    The adjacency of the links is indexed when the snapshot is loaded.
+    """
+    def __init__(self, links, formation_ids):
+        self.links = links
+        self.formation_ids = formation_ids
+        self.children_by_parent = {}
+        self.parents_by_child_branch = {}
+        self.parents_by_child_leaf = {}
+        for link in links:
+            _id, parent_id, child_branch_id, child_leaf_id, _academic_year_id = link
+            self.children_by_parent.setdefault(parent_id, []).append(link)
+            if child_branch_id:
+                self.parents_by_child_branch.setdefault(child_branch_id, []).append(parent_id)
+            else:
+                self.parents_by_child_leaf.setdefault(child_leaf_id, []).append(parent_id)
+
+    def __getstate__(self):
+        return self.links, self.formation_ids
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def find_formation_ids(self, child_leaf_id=None, child_branch_id=None):
+        """ Return the ids of the first formations found going up from the child """
+        parent_ids = self.parents_by_child_leaf.get(child_leaf_id, []) if child_leaf_id else \
+            self.parents_by_child_branch.get(child_branch_id, [])
+        formation_ids, visited = set(), set()
+        while parent_ids:
+            next_parent_ids = []
+            for parent_id in parent_ids:
+                if parent_id in visited:
+                    continue
+                visited.add(parent_id)
+                if parent_id in self.formation_ids:
+                    formation_ids.add(parent_id)
+                else:
+                    next_parent_ids.extend(self.parents_by_child_branch.get(parent_id, []))
+            parent_ids = next_parent_ids
+        return list(formation_ids)
+
+
+def get_structure_snapshot(academic_year_id):
+    """
+    Return the snapshot of the structure of the academic year.
+
+    It is kept in the memory of the process while its version is the current one, else loaded from the cache or built
+    in one query.
+    """
+    version = _get_version(academic_year_id)
+    loaded = _loaded_snapshots.get(academic_year_id)
+    if loaded and loaded[0] == version:
+        return loaded[1]
+
+    snapshot = _get_from_cache(academic_year_id, version)
+    if snapshot is None:
+        snapshot = _build_snapshot(academic_year_id)
+        _set_in_cache(academic_year_id, version, snapshot)
+    _loaded_snapshots[academic_year_id] = (version, snapshot)
+    return snapshot
+
+
+def forget_loaded_snapshots():
+    """ Drop the snapshots kept in the memory of the process: they are loaded again from the cache or built """
+    _loaded_snapshots.clear()
+
+
+def find_descendant_links(root):
+    """
+    Return the links under the root by parent id, in their order, walking through the snapshots of the academic years
+    of the branches. A branch which is the root is not walked again.
+    """
+    links_by_parent = {}
+    branches = [(root.id, root.academic_year_id)]
+    while branches:
+        parent_id, academic_year_id = branches.pop()
+        if parent_id in links_by_parent:
+            continue
+        links = get_structure_snapshot(academic_year_id).children_by_parent.get(parent_id, [])
+        links_by_parent[parent_id] = links
+        branches.extend(
+            (child_branch_id, child_academic_year_id)
+            for _id, _parent_id, child_branch_id, _child_leaf_id, child_academic_year_id in links
+            if child_branch_id and child_branch_id != root.id
+        )
+    return links_by_parent
+
+
+def find_group_element_years_by_parent(root, queryset=None):
+    """
+    Return the group element years under the root by parent id, in their order. They are loaded in one query from the
+    queryset (by default all the group element years with their child).
+    """
+    links_by_parent = find_descendant_links(root)
+    if queryset is None:
+        queryset = GroupElementYear.objects.select_related('child_branch', 'child_leaf')
+    group_element_years_by_id = queryset.in_bulk(
+        [link[0] for links in links_by_parent.values() for link in links]
+    )
+    # A link of an outdated snapshot may no longer exist
+    return {
+        parent_id: [group_element_years_by_id[link[0]] for link in links if link[0] in group_element_years_by_id]
+        for parent_id, links in links_by_parent.items()
+    }
+
+
+def _build_snapshot(academic_year_id):
+    # Read on the primary: a snapshot built from a lagging replica would be cached under the current version
+    links = GroupElementYear.objects.using('default').filter(
+        Q(parent__academic_year=academic_year_id) |
+        Q(child_branch__academic_year=academic_year_id) |
+        Q(child_leaf__academic_year=academic_year_id),
+        parent__isnull=False,
+    ).order_by('parent_id', 'order').values_list(
+        'id', 'parent_id', 'child_branch_id', 'child_leaf_id', 'child_branch__academic_year_id',
+        'parent__education_group_type__category', 'parent__education_group_type__name'
+    )
+    formation_ids = set()
+    compact_links = []
+    for link in links:
+        compact_links.append(link[:5])
+        if _is_formation(*link[5:]):
+            formation_ids.add(link[1])
+    return StructureSnapshot(compact_links, frozenset(formation_ids))
+
+
+def _is_formation(category, type_name):
+    return category == education_group_categories.TRAINING or \
+        (category == education_group_categories.MINI_TRAINING and type_name != GROUP_TYPE_OPTION)
+
+
+def _get_version(academic_year_id):
+    version_key = _get_version_key(academic_year_id)
+    try:
+        versions = cache.get_many([version_key, COMMON_VERSION_KEY])
+        if version_key not in versions:
+            # Without a stored version, the snapshots already loaded may be outdated
+            versions[version_key] = _bump_version(version_key)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+        # Without cache, a snapshot cannot be trusted: always rebuilt
+        return uuid.uuid4().hex
+    return "_".join([versions[version_key], versions.get(COMMON_VERSION_KEY, '')])
+
+
+def _get_from_cache(academic_year_id, version):
+    try:
+        return cache.get(_get_snapshot_key(academic_year_id, version))
+    except Exception:
+        logger.exception('An error occurred with cache system')
+        return None
+
+
+def _set_in_cache(academic_year_id, version, snapshot):
+    try:
+        cache.set(_get_snapshot_key(academic_year_id, version), snapshot, timeout=SNAPSHOT_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+def _get_snapshot_key(academic_year_id, version):
+    return "_".join([PREFIX_SNAPSHOT_KEY, str(academic_year_id), version])
+
+
+def _get_version_key(academic_year_id):
+    return "_".join([PREFIX_VERSION_KEY, str(academic_year_id)])
+
+
+def _bump_version(version_key):
+    version = uuid.uuid4().hex
+    cache.set(version_key, version, timeout=None)
+    return version
+
+
+def invalidate_cache(*academic_year_ids):
+    """ Invalidate the snapshots of the academic years or, without id, of all academic years """
+    try:
+        for version_key in [_get_version_key(ac_year_id) for ac_year_id in academic_year_ids] or [COMMON_VERSION_KEY]:
+            _bump_version(version_key)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+def _invalidate_on_commit(*academic_year_ids):
+    # Bumped before the commit, the version would let a concurrent reader cache a snapshot of the old structure
+    transaction.on_commit(lambda: invalidate_cache(*academic_year_ids))
+
+
+@receiver(post_save, sender=GroupElementYear)
+@receiver(post_delete, sender=GroupElementYear)
+def invalidate_group_element_year(sender, instance, **kwargs):
+    # A link belongs to the snapshots of the academic years of its parent and of its child
+    academic_year_ids = set()
+    for field_name in ('parent', 'child_branch', 'child_leaf'):
+        try:
+            obj = getattr(instance, field_name)
+        except ObjectDoesNotExist:
+            continue
+        if obj:
+            academic_year_ids.add(obj.academic_year_id)
+    _invalidate_on_commit(*academic_year_ids)
+
+
+@receiver(post_save, sender=EducationGroupYear)
+@receiver(post_delete, sender=EducationGroupYear)
+def invalidate_education_group_year(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.academic_year_id)
+
+
+@receiver(post_save, sender=EducationGroupType)
+@receiver(post_delete, sender=EducationGroupType)
+def invalidate_education_group_type(sender, **kwargs):
+    _invalidate_on_commit()
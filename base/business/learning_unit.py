@@ -37,6 +37,7 @@ from base.business.entity import get_entity_calendar
 from base.business.learning_unit_year_with_context import volume_learning_component_year
 from base.business.learning_units.comparison import get_entity_by_type
 from base.business.xls import get_name_or_username
+from base.business.xls_stream import StreamingWorkbook
 from base.models import entity_container_year, academic_calendar
 from base.models import learning_achievement
 from base.models.entity_component_year import EntityComponentYear
@@ -204,10 +205,6 @@ def _is_used_by_full_learning_unit_year(a_learning_class_year):
     return False
 
 
-def prepare_xls_content(found_learning_units):
-    return [extract_xls_data_from_learning_unit(lu) for lu in found_learning_units]
-
-
 def extract_xls_data_from_learning_unit(learning_unit_yr):
     return [
         learning_unit_yr.academic_year.name, learning_unit_yr.acronym, learning_unit_yr.complete_title,
@@ -225,16 +222,15 @@ def get_entity_acronym(an_entity):
     return an_entity.acronym if an_entity else None
 
 
-def create_xls(user, found_learning_units, filters):
-    titles = LEARNING_UNIT_TITLES_PART1 + LEARNING_UNIT_TITLES_PART2
-    working_sheets_data = prepare_xls_content(found_learning_units)
-    parameters = {xls_build.DESCRIPTION: XLS_DESCRIPTION,
-                  xls_build.USER: get_name_or_username(user),
-                  xls_build.FILENAME: XLS_FILENAME,
-                  xls_build.HEADER_TITLES: titles,
-                  xls_build.WS_TITLE: WORKSHEET_TITLE}
-
-    return xls_build.generate_xls(xls_build.prepare_xls_parameters_list(working_sheets_data, parameters), filters)
+def create_xls_stream(user, found_learning_units, filters):
+    workbook = StreamingWorkbook()
+    workbook.add_worksheet(
+        WORKSHEET_TITLE,
+        LEARNING_UNIT_TITLES_PART1 + LEARNING_UNIT_TITLES_PART2,
+        (extract_xls_data_from_learning_unit(lu) for lu in found_learning_units)
+    )
+    workbook.add_parameters_worksheet(XLS_DESCRIPTION, get_name_or_username(user), filters)
+    return workbook.save()
 
 
 def is_summary_submission_opened():
@@ -23,14 +23,14 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import functools
-
 from django.contrib.messages import ERROR, SUCCESS
 from django.contrib.messages import INFO
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.forms import model_to_dict
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from backoffice.celery import app as celery_app
 from base import models as mdl_base
 from base.business.learning_units import perms
 from base.business.learning_units.edition import update_or_create_entity_container_year_with_components, \
@@ -42,6 +42,7 @@ from base.models.entity_container_year import find_entities_grouped_by_linktype
 from base.models.enums import proposal_state, proposal_type
 from base.models.enums.entity_container_year_link_type import ENTITY_TYPE_LIST
 from base.models.enums.proposal_type import ProposalType
+from base.models.proposal_learning_unit import ProposalLearningUnit
 from base.utils import send_mail as send_mail_util
 from reference.models import language
 
@@ -64,6 +65,12 @@ INITIAL_DATA_FIELDS = {
         ]
     }
 
+APPLY_ACTION_ON_PROPOSALS_TASK = 'base.tasks.apply_action_on_proposals'
+# Above this number of selected proposals, the cancellation and the consolidation are applied by a celery worker
+BACKGROUND_PROPOSALS_THRESHOLD = 20
+CANCEL = 'cancel'
+CONSOLIDATE = 'consolidate'
+
 
 def compute_proposal_type(proposal_learning_unit_year, learning_unit_year):
     if proposal_learning_unit_year.type in [ProposalType.CREATION.name, ProposalType.SUPPRESSION.name]:
@@ -204,26 +211,61 @@ def _get_rid_of_blank_value(data):
 
 
 def force_state_of_proposals(proposals, author, new_state):
-    change_state = functools.partial(modify_proposal_state, new_state)
-    return _apply_action_on_proposals_and_send_report(
-        proposals,
-        author,
-        change_state,
+    proposals = list(proposals)
+    eligible_proposal_ids = {proposal.pk for proposal in perms.find_proposals_eligible_to_edit(proposals, author)}
+    # The auto_now fields are not set by update()
+    now = timezone.now()
+    ProposalLearningUnit.objects.filter(pk__in=eligible_proposal_ids).update(state=new_state, changed=now, date=now)
+
+    proposals_with_results = [
+        (proposal, {} if proposal.pk in eligible_proposal_ids else _get_no_rights_results(author))
+        for proposal in proposals
+    ]
+    return _build_messages_by_level(
+        proposals_with_results,
         "Proposal %(acronym)s (%(academic_year)s) successfully changed state.",
         "Proposal %(acronym)s (%(academic_year)s) cannot be changed state.",
-        None,
-        None,
-        perms.is_eligible_to_edit_proposal
     )
 
 
-def modify_proposal_state(new_state, proposal):
-    proposal.state = new_state
-    proposal.save()
-    return {}
+def cancel_proposals_and_send_report(proposals, author, research_criteria):
+    return _apply_action_in_background_or_send_report(CANCEL, proposals, author, research_criteria)
 
 
-def cancel_proposals_and_send_report(proposals, author, research_criteria):
+def consolidate_proposals_and_send_report(proposals, author, research_criteria):
+    return _apply_action_in_background_or_send_report(CONSOLIDATE, proposals, author, research_criteria)
+
+
+def apply_action_on_proposals_in_background(action, proposal_ids, author_id, research_criteria):
+    """ Apply the action on the proposals which still exist and send the report to the author """
+    proposals = ProposalLearningUnit.objects.filter(pk__in=proposal_ids).select_related(
+        'learning_unit_year__academic_year', 'learning_unit_year__learning_container_year'
+    )
+    author = mdl_base.person.Person.objects.get(pk=author_id)
+    return _get_action_with_report(action)(proposals, author, research_criteria)
+
+
+def _apply_action_in_background_or_send_report(action, proposals, author, research_criteria):
+    proposals = list(proposals)
+    if len(proposals) <= BACKGROUND_PROPOSALS_THRESHOLD:
+        return _get_action_with_report(action)(proposals, author, research_criteria)
+
+    proposal_ids = [proposal.pk for proposal in proposals]
+    research_criteria = [[str(label), str(value)] for label, value in research_criteria or []]
+    transaction.on_commit(lambda: celery_app.send_task(
+        APPLY_ACTION_ON_PROPOSALS_TASK, args=[action, proposal_ids, author.pk, research_criteria]
+    ))
+    return {INFO: [_("The proposals are being processed. A report will be sent when it is done.")]}
+
+
+def _get_action_with_report(action):
+    return {
+        CANCEL: _cancel_proposals_and_send_report,
+        CONSOLIDATE: _consolidate_proposals_and_send_report,
+    }[action]
+
+
+def _cancel_proposals_and_send_report(proposals, author, research_criteria):
     return _apply_action_on_proposals_and_send_report(
         proposals,
         author,
@@ -232,11 +274,11 @@ def cancel_proposals_and_send_report(proposals, author, research_criteria):
         "Proposal %(acronym)s (%(academic_year)s) cannot be canceled.",
         send_mail_util.send_mail_cancellation_learning_unit_proposals,
         research_criteria,
-        perms.is_eligible_for_cancel_of_proposal
+        perms.find_proposals_eligible_for_cancel
     )
 
 
-def consolidate_proposals_and_send_report(proposals, author, research_criteria):
+def _consolidate_proposals_and_send_report(proposals, author, research_criteria):
     return _apply_action_on_proposals_and_send_report(
         proposals,
         author,
@@ -245,19 +287,23 @@ def consolidate_proposals_and_send_report(proposals, author, research_criteria):
         "Proposal %(acronym)s (%(academic_year)s) cannot be consolidated.",
         send_mail_util.send_mail_consolidation_learning_unit_proposal,
         research_criteria,
-        perms.is_eligible_to_consolidate_proposal
+        perms.find_proposals_eligible_to_consolidate
     )
 
 
 def _apply_action_on_proposals_and_send_report(proposals, author, action_method, success_msg_id, error_msg_id,
-                                               send_mail_method, research_criteria, permission_check):
-    messages_by_level = {SUCCESS: [], ERROR: []}
-    proposals_with_results = _apply_action_on_proposals(proposals, action_method, author, permission_check)
+                                               send_mail_method, research_criteria, find_eligible_proposals):
+    proposals_with_results = _apply_action_on_proposals(proposals, action_method, author, find_eligible_proposals)
+    messages_by_level = _build_messages_by_level(proposals_with_results, success_msg_id, error_msg_id)
 
     if send_mail_method:
         send_mail_method(author, proposals_with_results, research_criteria)
         messages_by_level[INFO] = [_("A report has been sent.")]
+    return messages_by_level
+
 
+def _build_messages_by_level(proposals_with_results, success_msg_id, error_msg_id):
+    messages_by_level = {SUCCESS: [], ERROR: []}
     for proposal, results in proposals_with_results:
         if ERROR in results:
             messages_by_level[ERROR].append(_(error_msg_id) % {
@@ -272,20 +318,26 @@ def _apply_action_on_proposals_and_send_report(proposals, author, action_method,
     return messages_by_level
 
 
-def _apply_action_on_proposals(proposals, action_method, author, permission_check):
+def _apply_action_on_proposals(proposals, action_method, author, find_eligible_proposals):
+    proposals = list(proposals)
+    eligible_proposal_ids = {proposal.pk for proposal in find_eligible_proposals(proposals, author)}
+
     proposals_with_results = []
     for proposal in proposals:
-        proposal_with_result = (proposal, {ERROR: ["User %(person)s do not have rights on this proposal." % {
-            "person": str(author)
-        }]})
-        if permission_check(proposal, author):
-            proposal_with_result = (proposal, action_method(proposal))
+        proposal_with_result = (proposal, _get_no_rights_results(author))
+        if proposal.pk in eligible_proposal_ids:
+            with transaction.atomic():
+                proposal_with_result = (proposal, action_method(proposal))
 
         proposals_with_results.append(proposal_with_result)
 
     return proposals_with_results
 
 
+def _get_no_rights_results(author):
+    return {ERROR: ["User %(person)s do not have rights on this proposal." % {"person": str(author)}]}
+
+
 def cancel_proposal(proposal):
     results = {}
     if proposal.type == ProposalType.CREATION.name:
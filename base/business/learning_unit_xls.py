@@ -27,16 +27,15 @@
 from django.utils.translation import ugettext_lazy as _
 
 from base import models as mdl_base
-from base.business.learning_unit import LEARNING_UNIT_TITLES_PART2,  XLS_DESCRIPTION, XLS_FILENAME, \
+from base.business.learning_unit import LEARNING_UNIT_TITLES_PART2,  XLS_DESCRIPTION, \
     WORKSHEET_TITLE, get_same_container_year_components, get_entity_acronym
 from base.business.xls import get_name_or_username
+from base.business.xls_stream import StreamingWorkbook, styled_row
 from osis_common.document import xls_build
 from attribution.business import attribution_charge_new
 from base.models.enums import learning_component_year_type
 from openpyxl.styles import Alignment, Style, PatternFill, Color, Font
 from base.models.enums.proposal_type import ProposalType
-from openpyxl.utils import get_column_letter
-from collections import defaultdict
 # List of key that a user can modify
 VOLUMES_INITIALIZED = {'VOLUME_TOTAL': 0, 'PLANNED_CLASSES': 0, 'VOLUME_Q1': 0, 'VOLUME_Q2': 0}
 
@@ -63,6 +62,13 @@ PROPOSAL_LINE_STYLES = {
     ProposalType.TRANSFORMATION_AND_MODIFICATION.name: Style(font=Font(color=TRANSFORMATION_AND_MODIFICATION_COLOR),),
 }
 WRAP_TEXT_STYLE = Style(alignment=Alignment(wrapText=True, vertical="top"), )
+WRAP_TEXT = 'wrap_text'
+LEGEND_STYLE_PREFIX = 'legend_'
+STREAM_NAMED_STYLES = dict(
+    PROPOSAL_LINE_STYLES,
+    **{LEGEND_STYLE_PREFIX + cell: style for style, cells in DEFAULT_LEGEND_STYLES.items() for cell in cells}
+)
+STREAM_NAMED_STYLES[WRAP_TEXT] = WRAP_TEXT_STYLE
 WITH_ATTRIBUTIONS = 'with_attributions'
 WITH_GRP = 'with_grp'
 
@@ -81,17 +87,6 @@ LEARNING_UNIT_TITLES_PART1 = [
 ]
 
 
-def prepare_xls_content(learning_units,
-                        with_grp=False,
-                        with_attributions=False):
-    return [
-        extract_xls_data_from_learning_unit(lu,
-                                            with_grp,
-                                            with_attributions)
-        for lu in learning_units
-        ]
-
-
 def extract_xls_data_from_learning_unit(learning_unit_yr, with_grp, with_attributions):
 
     lu_data_part1 = _get_data_part1(learning_unit_yr)
@@ -103,50 +98,50 @@ def extract_xls_data_from_learning_unit(learning_unit_yr, with_grp, with_attribu
     return lu_data_part1
 
 
-def create_xls_with_parameters(user, learning_units, filters, extra_configuration):
+def create_xls_with_parameters_stream(user, learning_units, filters, extra_configuration):
     with_grp = extra_configuration.get(WITH_GRP)
     with_attributions = extra_configuration.get(WITH_ATTRIBUTIONS)
-    titles_part1 = LEARNING_UNIT_TITLES_PART1.copy()
+    titles = LEARNING_UNIT_TITLES_PART1.copy()
     titles_part2 = LEARNING_UNIT_TITLES_PART2.copy()
-
     if with_grp:
         titles_part2.append(str(HEADER_PROGRAMS))
-
     if with_attributions:
-        titles_part1.append(str(HEADER_TEACHERS))
-        for learning_unit_yr in learning_units:
+        titles.append(str(HEADER_TEACHERS))
+    titles.extend(titles_part2)
+
+    workbook = StreamingWorkbook(named_styles=STREAM_NAMED_STYLES)
+    workbook.add_worksheet(
+        WORKSHEET_TITLE,
+        titles,
+        _get_styled_rows(learning_units, with_grp, with_attributions),
+        column_styles={
+            titles.index(title): WRAP_TEXT for title in (str(HEADER_PROGRAMS), str(HEADER_TEACHERS))
+            if title in titles
+        }
+    )
+    workbook.add_worksheet(_('Legend'), [str(_('Legend'))], _get_styled_legend_rows())
+    workbook.add_parameters_worksheet(XLS_DESCRIPTION, get_name_or_username(user), filters)
+    return workbook.save()
+
+
+def _get_styled_rows(learning_units, with_grp, with_attributions):
+    for learning_unit_yr in learning_units:
+        if with_attributions:
             learning_unit_yr.attribution_charge_news = attribution_charge_new \
                 .find_attribution_charge_new_by_learning_unit_year_as_dict(learning_unit_year=learning_unit_yr)
+        proposal = mdl_base.proposal_learning_unit.find_by_learning_unit_year(learning_unit_yr)
+        yield styled_row(
+            extract_xls_data_from_learning_unit(learning_unit_yr, with_grp, with_attributions),
+            style=proposal.type if proposal else None
+        )
 
-    working_sheets_data = prepare_xls_content(learning_units, with_grp, with_attributions)
-
-    titles_part1.extend(titles_part2)
-
-    ws_data = xls_build.prepare_xls_parameters_list(working_sheets_data,
-                                                    _get_parameters_configurable_list(learning_units,
-                                                                                      titles_part1,
-                                                                                      user))
-    ws_data.update({xls_build.WORKSHEETS_DATA: [ws_data.get(xls_build.WORKSHEETS_DATA)[0], _prepare_legend_ws_data()]})
-    return xls_build.generate_xls(ws_data, filters)
-
-
-def _get_parameters_configurable_list(learning_units, titles, user):
-    parameters = {
-        xls_build.DESCRIPTION: XLS_DESCRIPTION,
-        xls_build.USER: get_name_or_username(user),
-        xls_build.FILENAME: XLS_FILENAME,
-        xls_build.HEADER_TITLES: titles,
-        xls_build.WS_TITLE: WORKSHEET_TITLE,
-        xls_build.STYLED_CELLS: {
-            WRAP_TEXT_STYLE: _get_wrapped_cells(
-                learning_units,
-                _get_col_letter(titles, HEADER_PROGRAMS),
-                _get_col_letter(titles, HEADER_TEACHERS)
-            )
-        },
-        xls_build.COLORED_ROWS: _get_colored_rows(learning_units),
+
+def _get_styled_legend_rows():
+    legend_style_by_row = {
+        int(cell[1:]): LEGEND_STYLE_PREFIX + cell for cells in DEFAULT_LEGEND_STYLES.values() for cell in cells
     }
-    return parameters
+    for row_number, legend_row in enumerate(_prepare_legend_ws_data()[xls_build.CONTENT_KEY], start=2):
+        yield styled_row(legend_row, cell_styles={0: legend_style_by_row.get(row_number)})
 
 
 def _get_absolute_credits(learning_unit_yr):
@@ -206,27 +201,6 @@ def _prepare_legend_ws_data():
     }
 
 
-def _get_wrapped_cells(learning_units, teachers_col_letter, programs_col_letter):
-    dict_wrapped_styled_cells = []
-
-    for idx, luy in enumerate(learning_units, start=2):
-        if teachers_col_letter:
-            dict_wrapped_styled_cells.append("{}{}".format(teachers_col_letter, idx))
-        if programs_col_letter:
-            dict_wrapped_styled_cells.append("{}{}".format(programs_col_letter, idx))
-
-    return dict_wrapped_styled_cells
-
-
-def _get_colored_rows(learning_units):
-    colored_cells = defaultdict(list)
-    for idx, luy in enumerate(learning_units, start=1):
-        proposal = mdl_base.proposal_learning_unit.find_by_learning_unit_year(luy)
-        if proposal:
-            colored_cells[PROPOSAL_LINE_STYLES.get(proposal.type)].append(idx)
-    return colored_cells
-
-
 def _get_attribution_line(an_attribution):
     return "{} - {} : {} - {} : {} - {} : {} - {} : {} - {} : {} - {} : {} ".format(
         an_attribution.get('person'),
@@ -245,13 +219,6 @@ def _get_attribution_line(an_attribution):
     )
 
 
-def _get_col_letter(titles, title_search):
-    for idx, title in enumerate(titles, start=1):
-        if title == title_search:
-            return get_column_letter(idx)
-    return None
-
-
 def _get_trainings_by_educ_group_year(learning_unit_yr):
     groups = []
     learning_unit_yr.group_elements_years = mdl_base.group_element_year.search(child_leaf=learning_unit_yr) \
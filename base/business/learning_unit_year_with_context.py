@@ -29,7 +29,9 @@ from django.db import models
 
 from base.business import entity_version as business_entity_version
 from base.models import entity_container_year, learning_unit_component, entity_component_year, learning_unit_year
+from base.models.entity_version import EntityVersion
 from base.models.enums import entity_container_year_link_type as entity_types
+from base.models.utils.utils import iterate_by_chunks
 from osis_common.utils.numbers import to_float_or_zero
 
 ENTITY_TYPES_VOLUME = [
@@ -38,6 +40,11 @@ ENTITY_TYPES_VOLUME = [
     entity_types.ADDITIONAL_REQUIREMENT_ENTITY_2
 ]
 
+LATEST_ENTITY_ACRONYM_ANNOTATIONS = {
+    entity_types.REQUIREMENT_ENTITY: 'requirement_entity_acronym',
+    entity_types.ALLOCATION_ENTITY: 'allocation_entity_acronym',
+}
+
 
 class LearningUnitYearWithContext:
     def __init__(self, **kwargs):
@@ -88,6 +95,34 @@ def append_latest_entities(learning_unit_yr, service_course_search=False):
     return learning_unit_yr
 
 
+def annotate_latest_entity_acronyms(queryset, learning_container_year_path='learning_container_year'):
+    """
+    Annotate the acronym of the latest version of the requirement and allocation entities
+    (requirement_entity_acronym and allocation_entity_acronym) with a subquery by entity type.
+    """
+    return queryset.annotate(**{
+        annotation: models.Subquery(
+            EntityVersion.objects.filter(
+                entity__entitycontaineryear__learning_container_year=models.OuterRef(learning_container_year_path),
+                entity__entitycontaineryear__type=link_type
+            ).order_by('-start_date').values('acronym')[:1],
+            output_field=models.CharField()
+        ) for link_type, annotation in LATEST_ENTITY_ACRONYM_ANNOTATIONS.items()
+    })
+
+
+def iter_with_latest_entities(objects, learning_unit_year_attr=None):
+    """
+    Yield the objects, fetched by chunks, with the latest entities appended to their learning unit year:
+    the object itself or its learning_unit_year_attr attribute.
+    """
+    for obj in iterate_by_chunks(objects):
+        learning_unit_yr = getattr(obj, learning_unit_year_attr) if learning_unit_year_attr else obj
+        if not hasattr(learning_unit_yr, 'entities'):
+            append_latest_entities(learning_unit_yr)
+        yield obj
+
+
 def append_components(learning_unit_year):
     learning_unit_year.components = OrderedDict()
     if learning_unit_year.learning_unit_components:
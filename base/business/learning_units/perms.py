@@ -30,12 +30,13 @@ from django.utils.translation import ugettext_lazy as _
 from waffle.models import Flag
 
 from base.business.institution import find_summary_course_submission_dates_for_entity_version
-from base.models import proposal_learning_unit, tutor
+from base.models import proposal_learning_unit, tutor, entity_calendar
 from base.models.academic_year import MAX_ACADEMIC_YEAR_FACULTY, MAX_ACADEMIC_YEAR_CENTRAL, \
-    starting_academic_year
+    starting_academic_year, current_academic_year
 from base.models.entity import Entity
+from base.models.entity_container_year import EntityContainerYear
 from base.models.entity_version import find_last_entity_version_by_learning_unit_year_id
-from base.models.enums import learning_container_year_types, entity_container_year_link_type
+from base.models.enums import learning_container_year_types, entity_container_year_link_type, academic_calendar_type
 from base.models.enums.entity_container_year_link_type import REQUIREMENT_ENTITY
 from base.models.enums.proposal_state import ProposalState
 from base.models.enums.proposal_type import ProposalType
@@ -321,6 +322,10 @@ def _is_learning_unit_year_summary_editable(*, learning_unit_year_id, **kwargs):
 
 def _is_calendar_opened_to_edit_educational_information(*, learning_unit_year_id, **kwargs):
     submission_dates = find_educational_information_submission_dates_of_learning_unit_year(learning_unit_year_id)
+    _check_submission_dates_contains_now(submission_dates)
+
+
+def _check_submission_dates_contains_now(submission_dates):
     if not submission_dates:
         raise PermissionDenied(_("Not in period to edit educational information."))
 
@@ -350,7 +355,136 @@ class can_user_edit_educational_information(BasePerm):
     )
 
 
+def _is_tutor_summary_responsible_of_preloaded_learning_unit_year(*, learning_unit_year, summary_responsible_ids,
+                                                                 **kwargs):
+    if learning_unit_year.id not in summary_responsible_ids:
+        raise PermissionDenied(_("You are not summary responsible for this learning unit."))
+
+
+def _is_preloaded_learning_unit_year_summary_editable(*, learning_unit_year, **kwargs):
+    if learning_unit_year.summary_locked:
+        raise PermissionDenied(_("The learning unit is not summary editable."))
+
+
+def _is_calendar_opened_in_preloaded_submission_dates(*, submission_dates, **kwargs):
+    _check_submission_dates_contains_now(submission_dates)
+
+
+class can_user_edit_preloaded_educational_information(BasePerm):
+    """ Same rules as can_user_edit_educational_information, evaluated on data loaded beforehand """
+    predicates = (
+        _is_tutor_summary_responsible_of_preloaded_learning_unit_year,
+        _is_preloaded_learning_unit_year_summary_editable,
+        _is_calendar_opened_in_preloaded_submission_dates
+    )
+
+
+def find_educational_information_perms_by_learning_unit_year(user, learning_unit_years, entity_calendars=None):
+    """
+    Batch version of can_user_edit_educational_information.
+
+    All the learning unit years are evaluated with one attribution query, one requirement entity query
+    and one entity calendar map (built unless given).
+
+    :param user: User
+    :param learning_unit_years: iterable of LearningUnitYear
+    :param entity_calendars: result of entity_calendar.build_calendar_by_entities for the summary course submission
+    :return: dict {learning_unit_year_id: can_user_edit_preloaded_educational_information}
+    """
+    learning_unit_years = list(learning_unit_years)
+    learning_unit_year_ids = [luy.id for luy in learning_unit_years]
+
+    summary_responsible_ids = set(LearningUnitYear.objects.filter(
+        pk__in=learning_unit_year_ids,
+        attribution__summary_responsible=True,
+        attribution__tutor__person__user=user
+    ).values_list('pk', flat=True))
+
+    requirement_entity_id_by_luy_id = dict(EntityContainerYear.objects.filter(
+        learning_container_year__learningunityear__in=learning_unit_year_ids,
+        type=REQUIREMENT_ENTITY
+    ).values_list('learning_container_year__learningunityear__id', 'entity_id'))
+
+    if entity_calendars is None:
+        entity_calendars = entity_calendar.build_calendar_by_entities(
+            ac_year=current_academic_year(),
+            reference=academic_calendar_type.SUMMARY_COURSE_SUBMISSION
+        )
+
+    return {
+        luy.id: can_user_edit_preloaded_educational_information(
+            user=user,
+            learning_unit_year=luy,
+            summary_responsible_ids=summary_responsible_ids,
+            submission_dates=entity_calendars.get(requirement_entity_id_by_luy_id.get(luy.id), {})
+        ) for luy in learning_unit_years
+    }
+
+
 class can_learning_unit_year_educational_information_be_udpated(BasePerm):
     predicates = (
         _is_learning_unit_year_summary_editable,
     )
+
+
+def find_proposals_eligible_for_cancel(proposals, person):
+    """ Batch version of is_eligible_for_cancel_of_proposal """
+    if not _has_person_the_right_to_make_proposal(None, person):
+        return []
+    is_central_manager = person.is_central_manager()
+    return [
+        proposal for proposal in _find_proposals_attached_to_person(proposals, person)
+        if is_central_manager or proposal.state == ProposalState.FACULTY.name
+    ]
+
+
+def find_proposals_eligible_to_edit(proposals, person):
+    """ Batch version of is_eligible_to_edit_proposal """
+    if not _has_person_the_right_edit_proposal(None, person):
+        return []
+    attached_proposals = _find_proposals_attached_to_person(proposals, person)
+    if person.is_central_manager():
+        return attached_proposals
+
+    next_academic_year = starting_academic_year().year + 1
+    return [
+        proposal for proposal in attached_proposals
+        if proposal.state == ProposalState.FACULTY.name and not (
+            proposal.type == ProposalType.MODIFICATION.name and
+            proposal.learning_unit_year.academic_year.year != next_academic_year
+        )
+    ]
+
+
+def find_proposals_eligible_to_consolidate(proposals, person):
+    """ Batch version of is_eligible_to_consolidate_proposal """
+    if not _has_person_the_right_to_consolidate(None, person):
+        return []
+    return [
+        proposal for proposal in _find_proposals_attached_to_person(proposals, person)
+        if _is_proposal_in_state_to_be_consolidated(proposal, person)
+    ]
+
+
+def _find_proposals_attached_to_person(proposals, person):
+    """ Batch version of _is_attached_to_initial_or_current_requirement_entity: one requirement entity query """
+    proposals = list(proposals)
+    linked_entity_ids = person.linked_entities
+    attached_container_year_ids = {
+        container_year_id for container_year_id, entity_id in EntityContainerYear.objects.filter(
+            learning_container_year__in=[proposal.learning_unit_year.learning_container_year_id
+                                         for proposal in proposals],
+            type=REQUIREMENT_ENTITY
+        ).values_list('learning_container_year_id', 'entity_id')
+        if entity_id in linked_entity_ids
+    }
+    return [
+        proposal for proposal in proposals
+        if _get_initial_requirement_entity_id(proposal) in linked_entity_ids or
+        proposal.learning_unit_year.learning_container_year_id in attached_container_year_ids
+    ]
+
+
+def _get_initial_requirement_entity_id(proposal):
+    initial_entity_id = (proposal.initial_data.get("entities") or {}).get(REQUIREMENT_ENTITY)
+    return int(initial_entity_id) if initial_entity_id else None
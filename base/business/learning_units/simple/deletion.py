@@ -23,36 +23,206 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+from collections import OrderedDict
+
+from django.db.models import Count, F
 from django.utils.translation import ugettext_lazy as _
 
-from assistant.models import tutoring_learning_unit_year
+from assistant.models.tutoring_learning_unit_year import TutoringLearningUnitYear
 from attribution.models.attribution import Attribution
 from attribution.models.attribution_charge_new import AttributionChargeNew
-from attribution.models.attribution_new import AttributionNew
 from base.business.learning_unit import CMS_LABEL_SPECIFICATIONS, CMS_LABEL_PEDAGOGY, CMS_LABEL_SUMMARY
-from base.models import learning_unit_enrollment, learning_unit_component, learning_class_year, \
-    learning_unit_year as learn_unit_year_model
-from base.models import proposal_learning_unit
+from base.models.enums import learning_unit_year_subtypes
+from base.models.group_element_year import GroupElementYear
+from base.models.learning_class_year import LearningClassYear
+from base.models.learning_component_year import LearningComponentYear
+from base.models.learning_container_year import LearningContainerYear
+from base.models.learning_unit_component import LearningUnitComponent
+from base.models.learning_unit_enrollment import LearningUnitEnrollment
+from base.models.learning_unit_year import LearningUnitYear
+from base.models.proposal_learning_unit import ProposalLearningUnit
 from cms.enums import entity_name
-from cms.models import translated_text
+from cms.models.translated_text import TranslatedText
+
+CMS_LABELS_TO_DELETE = CMS_LABEL_SPECIFICATIONS + CMS_LABEL_PEDAGOGY + CMS_LABEL_SUMMARY
+
+
+class LearningUnitYearDeletionPlan:
+    """
+    Deletion of a learning unit year with the following years of its learning unit and, for a full, the partims of
+    its containers (with their following years).
+
+    The learning unit years and everything preventing their deletion are loaded in a fixed number of queries,
+    whatever the number of years.
+    """
+
+    def __init__(self, learning_unit_year, check_proposal=True):
+        self.learning_unit_year = learning_unit_year
+        self.check_proposal = check_proposal
+        self.learning_unit_years = self._find_learning_unit_years()
+        self._impacts = None
+
+    def _find_learning_unit_years(self):
+        learning_unit_years = list(
+            self._get_queryset().filter(
+                learning_unit=self.learning_unit_year.learning_unit_id,
+                academic_year__year__gte=self.learning_unit_year.academic_year.year,
+            )
+        )
+        container_ids = [luy.learning_container_year_id for luy in learning_unit_years
+                         if luy.is_full() and luy.learning_container_year_id]
+        if not container_ids:
+            return learning_unit_years
+
+        first_year_by_partim = {}
+        for partim in self._get_queryset().filter(learning_container_year__in=container_ids,
+                                                  subtype=learning_unit_year_subtypes.PARTIM):
+            first_year = first_year_by_partim.get(partim.learning_unit_id, partim.academic_year.year)
+            first_year_by_partim[partim.learning_unit_id] = min(first_year, partim.academic_year.year)
+
+        known_ids = {luy.id for luy in learning_unit_years}
+        for partim in self._get_queryset().filter(learning_unit__in=first_year_by_partim.keys()):
+            first_year = first_year_by_partim[partim.learning_unit_id]
+            if partim.id not in known_ids and partim.academic_year.year >= first_year:
+                learning_unit_years.append(partim)
+        return learning_unit_years
+
+    @staticmethod
+    def _get_queryset():
+        return LearningUnitYear.objects.select_related('academic_year', 'learning_unit', 'learning_container_year')
+
+    @property
+    def learning_unit_year_ids(self):
+        return [luy.id for luy in self.learning_unit_years]
+
+    def get_impacts(self):
+        """ Return, by object preventing the deletion, the reason of the protection """
+        if self._impacts is None:
+            self._impacts = self._compute_impacts()
+        return self._impacts
+
+    def _compute_impacts(self):
+        learning_unit_years_by_id = {luy.id: luy for luy in self.learning_unit_years}
+        ids = self.learning_unit_year_ids
+        impacts = OrderedDict()
+
+        proposals = ProposalLearningUnit.objects.filter(learning_unit_year__in=ids)
+        if not self.check_proposal:
+            proposals = proposals.exclude(learning_unit_year=self.learning_unit_year)
+        for proposal in proposals:
+            proposal.learning_unit_year = learning_unit_years_by_id[proposal.learning_unit_year_id]
+            impacts[proposal] = _get_proposal_message(proposal)
+
+        enrollment_counts = LearningUnitEnrollment.objects.filter(learning_unit_year__in=ids)\
+            .values_list('learning_unit_year').annotate(count=Count('id')).order_by()
+        for learning_unit_year_id, count in enrollment_counts:
+            learning_unit_year = learning_unit_years_by_id[learning_unit_year_id]
+            impacts[learning_unit_year] = _get_enrollments_message(learning_unit_year, count)
+
+        for attribution in Attribution.objects.filter(learning_unit_year__in=ids).select_related('tutor__person'):
+            impacts[attribution] = _get_attribution_message(
+                learning_unit_years_by_id[attribution.learning_unit_year_id], attribution.tutor
+            )
+
+        attribution_charges = AttributionChargeNew.objects.filter(
+            learning_component_year__learningunitcomponent__learning_unit_year__in=ids
+        ).annotate(
+            learning_unit_year_id=F('learning_component_year__learningunitcomponent__learning_unit_year')
+        ).select_related('attribution__tutor__person')
+        for attribution_charge in attribution_charges:
+            impacts[attribution_charge.attribution] = _get_attribution_message(
+                learning_unit_years_by_id[attribution_charge.learning_unit_year_id],
+                attribution_charge.attribution.tutor
+            )
+
+        for group_element_year in GroupElementYear.objects.filter(child_leaf__in=ids, parent__isnull=False)\
+                .select_related('parent'):
+            group_element_year.child_leaf = learning_unit_years_by_id[group_element_year.child_leaf_id]
+            impacts.update(_check_group_element_year_deletion(group_element_year))
+
+        for tutoring in TutoringLearningUnitYear.objects.filter(learning_unit_year__in=ids, mandate__isnull=False)\
+                .select_related('mandate__assistant'):
+            tutoring.learning_unit_year = learning_unit_years_by_id[tutoring.learning_unit_year_id]
+            impacts.update(_check_tutoring_learning_unit_year(tutoring))
+
+        return impacts
+
+    def delete(self):
+        """ Delete all the learning unit years of the plan and return the messages of the deletion """
+        ids = self.learning_unit_year_ids
+        class_messages_by_learning_unit_year = self._get_class_messages_by_learning_unit_year()
+
+        msg = []
+        for learning_unit_year in sorted(self.learning_unit_years,
+                                         key=lambda luy: (-luy.academic_year.year, luy.is_full())):
+            msg.extend(class_messages_by_learning_unit_year.get(learning_unit_year.id, []))
+            msg.append(create_learning_unit_year_deletion_message(learning_unit_year))
+
+        container_ids = {luy.learning_container_year_id for luy in self.learning_unit_years
+                         if luy.is_full() and luy.learning_container_year_id}
+        TranslatedText.objects.filter(entity=entity_name.LEARNING_UNIT_YEAR, reference__in=ids,
+                                      text_label__label__in=CMS_LABELS_TO_DELETE).delete()
+        # The serializable objects are loaded in one query by model but deleted one by one:
+        # a queryset deletion would not publish their deletion on the queues
+        objects_to_delete = [
+            list(LearningUnitComponent.objects.filter(learning_unit_year__in=ids)),
+            list(LearningComponentYear.objects.filter(learningunitcomponent__learning_unit_year__in=ids).distinct()),
+            list(LearningUnitYear.objects.filter(id__in=ids)),
+            list(LearningContainerYear.objects.filter(id__in=container_ids)),
+        ]
+        for objects in objects_to_delete:
+            for obj in objects:
+                obj.delete()
+
+        self._decrement_end_year_learning_units()
+        return msg
+
+    def _get_class_messages_by_learning_unit_year(self):
+        class_years = LearningClassYear.objects.filter(
+            learning_component_year__learningunitcomponent__learning_unit_year__in=self.learning_unit_year_ids
+        ).annotate(
+            learning_unit_year_id=F('learning_component_year__learningunitcomponent__learning_unit_year')
+        ).select_related('learning_component_year__learning_container_year__academic_year')
+
+        msg = {}
+        for l_class_year in class_years:
+            msg.setdefault(l_class_year.learning_unit_year_id, []).append(
+                _("The class %(acronym)s has been deleted for the year %(year)s")
+                % {'acronym': l_class_year,
+                   'year': l_class_year.learning_component_year.learning_container_year.academic_year}
+            )
+        return msg
+
+    def _decrement_end_year_learning_units(self):
+        first_deleted_year_by_learning_unit = {}
+        for luy in sorted(self.learning_unit_years, key=lambda luy: luy.academic_year.year, reverse=True):
+            first_deleted_year_by_learning_unit[luy.learning_unit_id] = (luy.learning_unit, luy.academic_year.year)
+        # The given learning unit year may carry a learning unit instance modified by the caller
+        first_deleted_year_by_learning_unit[self.learning_unit_year.learning_unit_id] = (
+            self.learning_unit_year.learning_unit, self.learning_unit_year.academic_year.year
+        )
+
+        for learning_unit_to_edit, first_deleted_year in first_deleted_year_by_learning_unit.values():
+            new_end_year = first_deleted_year - 1
+            if new_end_year >= learning_unit_to_edit.start_year:
+                learning_unit_to_edit.end_year = new_end_year
+                learning_unit_to_edit.save()
 
 
 def check_learning_unit_deletion(learning_unit, check_proposal=True):
-    msg = {}
-
-    for learning_unit_year in learn_unit_year_model.search(learning_unit=learning_unit).order_by('academic_year__year'):
-        msg.update(check_learning_unit_year_deletion(learning_unit_year, check_proposal=check_proposal))
-
-    return msg
+    first_learning_unit_year = LearningUnitYear.objects.filter(learning_unit=learning_unit)\
+        .order_by('academic_year__year').first()
+    if not first_learning_unit_year:
+        return {}
+    return check_learning_unit_year_deletion(first_learning_unit_year, check_proposal=check_proposal)
 
 
 def check_learning_unit_year_deletion(learning_unit_year, check_proposal=True):
-    msg = {}
+    return LearningUnitYearDeletionPlan(learning_unit_year, check_proposal=check_proposal).get_impacts()
 
-    if check_proposal:
-        msg.update(_check_learning_unit_proposal(learning_unit_year))
-    msg.update(check_can_delete_ignoring_proposal_validation(learning_unit_year))
-    return msg
+
+def check_can_delete_ignoring_proposal_validation(learning_unit_year):
+    return check_learning_unit_year_deletion(learning_unit_year, check_proposal=False)
 
 
 def _check_tutoring_learning_unit_year(tutoring):
@@ -82,70 +252,33 @@ def _check_group_element_year_deletion(group_element_year):
             }
 
 
-def _check_attribution_deletion(learning_unit_year):
-    msg = {}
-    error_attribution = "%(subtype)s %(acronym)s is assigned to %(tutor)s for the year %(year)s"
-
-    for attribution in Attribution.objects.filter(learning_unit_year=learning_unit_year):
-        msg[attribution] = _(error_attribution) % {
-            'subtype': _str_partim_or_full(learning_unit_year),
-            'acronym': learning_unit_year.acronym,
-            'tutor': attribution.tutor,
-            'year': learning_unit_year.academic_year}
-
-    for attribution_new in AttributionNew.objects.filter(
-            learning_container_year=learning_unit_year.learning_container_year,
-            attributionchargenew__learning_component_year__learningunitcomponent__learning_unit_year=learning_unit_year
-    ):
-        msg[attribution_new] = _(error_attribution) % {
-            'subtype': _str_partim_or_full(learning_unit_year),
-            'acronym': learning_unit_year.acronym,
-            'tutor': attribution_new.tutor,
-            'year': learning_unit_year.academic_year}
-
-    return msg
-
-
-def _check_learning_unit_component_deletion(l_unit_component):
-    msg = {}
-
-    for attribution_charge in \
-            AttributionChargeNew.objects.filter(learning_component_year=l_unit_component.learning_component_year):
-        attribution = attribution_charge.attribution
-        msg[attribution] = _("%(subtype)s %(acronym)s is assigned to %(tutor)s for the year %(year)s") % {
-            'subtype': _str_partim_or_full(l_unit_component.learning_unit_year),
-            'acronym': l_unit_component.learning_unit_year.acronym,
-            'tutor': attribution.tutor,
-            'year': l_unit_component.learning_unit_year.academic_year}
+def _get_attribution_message(learning_unit_year, tutor):
+    return _("%(subtype)s %(acronym)s is assigned to %(tutor)s for the year %(year)s") % {
+        'subtype': _str_partim_or_full(learning_unit_year),
+        'acronym': learning_unit_year.acronym,
+        'tutor': tutor,
+        'year': learning_unit_year.academic_year}
 
-    return msg
 
+def _get_enrollments_message(learning_unit_year, enrollment_count):
+    return _("There is %(count)d enrollments in %(subtype)s %(acronym)s for the year %(year)s") % {
+        'subtype': _str_partim_or_full(learning_unit_year),
+        'acronym': learning_unit_year.acronym,
+        'year': learning_unit_year.academic_year,
+        'count': enrollment_count}
 
-def _check_learning_unit_proposal(learning_unit_year):
-    msg = {}
-
-    proposal = proposal_learning_unit.find_by_learning_unit_year(learning_unit_year)
-    if proposal:
-        error_proposal = "%(subtype)s %(acronym)s is in proposal for the year %(year)s"
-        msg[proposal] = _(error_proposal) % {'subtype': _str_partim_or_full(proposal.learning_unit_year),
-                                             'acronym': proposal.learning_unit_year.acronym,
-                                             'year': proposal.learning_unit_year.academic_year}
-    return msg
 
-
-def _check_related_partims_deletion(learning_container_year):
-    msg = {}
-
-    for partim in learning_container_year.get_partims_related():
-        msg.update(check_learning_unit_year_deletion(partim))
-
-    return msg
+def _get_proposal_message(proposal):
+    return _("%(subtype)s %(acronym)s is in proposal for the year %(year)s") % {
+        'subtype': _str_partim_or_full(proposal.learning_unit_year),
+        'acronym': proposal.learning_unit_year.acronym,
+        'year': proposal.learning_unit_year.academic_year}
 
 
 def delete_learning_unit(learning_unit):
     msg = []
 
-    first_learning_unit_year_to_delete = learn_unit_year_model.search(learning_unit=learning_unit) \
+    first_learning_unit_year_to_delete = LearningUnitYear.objects.filter(learning_unit=learning_unit) \
         .order_by('academic_year__year').first()
     if first_learning_unit_year_to_delete:
         msg.extend(delete_from_given_learning_unit_year(first_learning_unit_year_to_delete))
@@ -156,112 +289,13 @@ def delete_learning_unit(learning_unit):
 
 
 def delete_from_given_learning_unit_year(learning_unit_year):
-    msg = []
-
-    next_year = learning_unit_year.get_learning_unit_next_year()
-    if next_year:
-        msg.extend(delete_from_given_learning_unit_year(next_year))
-
-    if learning_unit_year.learning_container_year and learning_unit_year.is_full():
-        msg.extend(_delete_learning_container_year(learning_unit_year.learning_container_year))
-
-    for component in learning_unit_component.find_by_learning_unit_year(learning_unit_year):
-        msg.extend(_delete_learning_unit_component(component))
-
-    _delete_cms_data(learning_unit_year)
-
-    _decrement_end_year_learning_unit(learning_unit_year)
-
-    learning_unit_year.delete()
-
-    msg.append(create_learning_unit_year_deletion_message(learning_unit_year))
-    return msg
-
-
-def _decrement_end_year_learning_unit(learning_unit_year):
-    learning_unit_to_edit = learning_unit_year.learning_unit
-
-    start_year = learning_unit_to_edit.start_year
-    new_end_year = learning_unit_year.academic_year.year - 1
-    if new_end_year >= start_year:
-        learning_unit_to_edit.end_year = new_end_year
-        learning_unit_to_edit.save()
-
-
-def _delete_learning_container_year(learning_unit_container):
-    msg = []
-
-    for partim in learning_unit_container.get_partims_related():
-        msg.extend(delete_from_given_learning_unit_year(partim))
-    learning_unit_container.delete()
-
-    return msg
-
-
-def _delete_learning_unit_component(l_unit_component):
-    msg = []
-
-    msg.extend(_delete_learning_component_year(l_unit_component.learning_component_year))
-    l_unit_component.delete()
-
-    return msg
-
-
-def _delete_learning_component_year(learning_component_year):
-    msg = []
-
-    for l_class_year in learning_class_year.find_by_learning_component_year(learning_component_year):
-        l_class_year.delete()
-        msg.append(_("The class %(acronym)s has been deleted for the year %(year)s")
-                   % {'acronym': l_class_year,
-                      'year': learning_component_year.learning_container_year.academic_year})
-    learning_component_year.delete()
-
-    return msg
+    return LearningUnitYearDeletionPlan(learning_unit_year).delete()
 
 
 def _str_partim_or_full(learning_unit_year):
     return _('The partim') if learning_unit_year.is_partim() else _('The learning unit')
 
 
-def _delete_cms_data(learning_unit_year):
-    text_label_names = CMS_LABEL_SPECIFICATIONS + CMS_LABEL_PEDAGOGY + CMS_LABEL_SUMMARY
-    for learning_unit_cms_data in translated_text.search(entity=entity_name.LEARNING_UNIT_YEAR,
-                                                         reference=learning_unit_year.id,
-                                                         text_labels_name=text_label_names):
-        learning_unit_cms_data.delete()
-
-
-def check_can_delete_ignoring_proposal_validation(learning_unit_year):
-    msg = {}
-    enrollment_count = len(learning_unit_enrollment.find_by_learning_unit_year(learning_unit_year))
-    if enrollment_count > 0:
-        msg[learning_unit_year] = _("There is %(count)d enrollments in %(subtype)s %(acronym)s for the year %(year)s") \
-                                  % {'subtype': _str_partim_or_full(learning_unit_year),
-                                     'acronym': learning_unit_year.acronym,
-                                     'year': learning_unit_year.academic_year,
-                                     'count': enrollment_count}
-    if learning_unit_year.is_full() and learning_unit_year.learning_container_year:
-        msg.update(_check_related_partims_deletion(learning_unit_year.learning_container_year))
-    msg.update(_check_attribution_deletion(learning_unit_year))
-    for component in learning_unit_component.find_by_learning_unit_year(learning_unit_year):
-        msg.update(_check_learning_unit_component_deletion(component))
-    for group_element_year in learning_unit_year.find_list_group_element_year():
-        msg.update(_check_group_element_year_deletion(group_element_year))
-    msg.update(check_tutorings_deletion(learning_unit_year))
-    next_year = learning_unit_year.get_learning_unit_next_year()
-    if next_year:
-        msg.update(check_learning_unit_year_deletion(next_year))
-    return msg
-
-
-def check_tutorings_deletion(learning_unit_year):
-    msg = {}
-    for tutoring in tutoring_learning_unit_year.find_learning_unit_year(learning_unit_year=learning_unit_year):
-            msg.update(_check_tutoring_learning_unit_year(tutoring))
-    return msg
-
-
 def create_learning_unit_year_deletion_message(learning_unit_year_deleted):
     return _('learning_unit_successfuly_deleted').format(acronym=learning_unit_year_deleted.acronym,
                                                          academic_year=learning_unit_year_deleted.academic_year)
@@ -23,6 +23,7 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+from django.db.models import QuerySet
 from django.utils.translation import ugettext_lazy as _
 
 from base.models.external_learning_unit_year import ExternalLearningUnitYear
@@ -30,6 +31,7 @@ from base.models.learning_unit_year import LearningUnitYear
 from base.models.proposal_learning_unit import ProposalLearningUnit
 from osis_common.document import xls_build
 from base.business.xls import get_name_or_username
+from base.business.xls_stream import StreamingWorkbook, styled_row
 from base.business.learning_unit_year_with_context import append_latest_entities, append_components, \
     get_learning_component_prefetch
 from base.business.entity import build_entity_container_prefetch
@@ -38,7 +40,6 @@ from base.models.enums import learning_component_year_type
 from base.business.learning_unit import get_organization_from_learning_unit_year
 from base.business.learning_units.comparison import get_partims_as_str
 from base.models.academic_year import current_academic_year
-from openpyxl.utils import get_column_letter
 
 # List of key that a user can modify
 EMPTY_VALUE = ''
@@ -98,100 +99,68 @@ ACRONYM_COL_NUMBER = 0
 ACADEMIC_COL_NUMBER = 1
 CELLS_MODIFIED_NO_BORDER = 'modifications'
 CELLS_TOP_BORDER = 'border_not_modified'
-DATA = 'data'
-
-
-def create_xls_comparison(user, learning_unit_years, filters, academic_yr_comparison):
-    working_sheets_data = []
-    cells_modified_with_green_font = []
-    cells_with_top_border = []
-
-    if learning_unit_years:
-        luys_for_2_years = _get_learning_unit_yrs_on_2_different_years(academic_yr_comparison, learning_unit_years)
-        data = prepare_xls_content(luys_for_2_years)
-        working_sheets_data = data.get('data')
-        cells_modified_with_green_font = data.get(CELLS_MODIFIED_NO_BORDER)
-        cells_with_top_border = data.get(CELLS_TOP_BORDER)
-
-    parameters = {
-        xls_build.DESCRIPTION: XLS_DESCRIPTION,
-        xls_build.USER: get_name_or_username(user),
-        xls_build.FILENAME: XLS_FILENAME,
-        xls_build.HEADER_TITLES: LEARNING_UNIT_TITLES,
-        xls_build.WS_TITLE: WORKSHEET_TITLE,
-    }
-    dict_styled_cells = {}
-    if cells_modified_with_green_font:
-        dict_styled_cells.update({xls_build.STYLE_MODIFIED: cells_modified_with_green_font})
-
-    if cells_with_top_border:
-        dict_styled_cells.update({xls_build.STYLE_BORDER_TOP: cells_with_top_border})
-    if dict_styled_cells:
-        parameters.update({xls_build.STYLED_CELLS: dict_styled_cells})
-    return xls_build.generate_xls(xls_build.prepare_xls_parameters_list(working_sheets_data, parameters), filters)
-
-
-def _get_learning_unit_yrs_on_2_different_years(academic_yr_comparison, learning_unit_years):
-    learning_unit_years = \
-        LearningUnitYear.objects.filter(
-            learning_unit__in=(_get_learning_units(learning_unit_years)),
-            academic_year__year__in=(
-                learning_unit_years[0].academic_year.year,
-                academic_yr_comparison)
-        ).select_related(
-            'academic_year',
-            'learning_container_year',
-            'learning_container_year__academic_year'
-        ).prefetch_related(
-            get_learning_component_prefetch()
-        ).prefetch_related(
-            build_entity_container_prefetch([
-                entity_types.ALLOCATION_ENTITY,
-                entity_types.REQUIREMENT_ENTITY,
-                entity_types.ADDITIONAL_REQUIREMENT_ENTITY_1,
-                entity_types.ADDITIONAL_REQUIREMENT_ENTITY_2
-            ])
-        ).order_by('learning_unit', 'academic_year__year')
-    [append_latest_entities(learning_unit, False) for learning_unit in learning_unit_years]
-    [append_components(learning_unit) for learning_unit in learning_unit_years]
-    return learning_unit_years
 
 
-def _get_learning_units(learning_unit_years):
-    return list(set([l.learning_unit for l in learning_unit_years]))
+def create_xls_comparison_stream(user, learning_unit_years, filters, academic_yr_comparison):
+    rows = []
+    # Only the first row of a queryset is fetched
+    if learning_unit_years[:1]:
+        rows = _get_styled_rows(_search_learning_unit_yrs_on_2_different_years(academic_yr_comparison,
+                                                                              learning_unit_years))
+    workbook = StreamingWorkbook(named_styles={
+        CELLS_MODIFIED_NO_BORDER: xls_build.STYLE_MODIFIED,
+        CELLS_TOP_BORDER: xls_build.STYLE_BORDER_TOP,
+    })
+    workbook.add_worksheet(WORKSHEET_TITLE, LEARNING_UNIT_TITLES, rows)
+    workbook.add_parameters_worksheet(XLS_DESCRIPTION, get_name_or_username(user), filters)
+    return workbook.save()
 
 
-def prepare_xls_content(learning_unit_yrs):
-    data = []
+def _get_styled_rows(learning_unit_yrs):
     learning_unit = None
     first_data = None
-    modified_cells_no_border = []
-    top_border = []
-    for line_index, l_u_yr in enumerate(learning_unit_yrs, start=1):
-
-        if learning_unit is None:
-            learning_unit = l_u_yr.learning_unit
-            new_line = True
-        else:
-            if learning_unit == l_u_yr.learning_unit:
-                new_line = False
-            else:
-                learning_unit = l_u_yr.learning_unit
-                new_line = True
+    for l_u_yr in learning_unit_yrs:
+        append_latest_entities(l_u_yr, False)
+        append_components(l_u_yr)
+        new_line = learning_unit != l_u_yr.learning_unit
+        learning_unit = l_u_yr.learning_unit
         luy_data = extract_xls_data_from_learning_unit(l_u_yr, new_line, first_data)
         if new_line:
             first_data = luy_data
-            top_border.extend(get_border_columns(line_index+1))
+            yield styled_row(luy_data, style=CELLS_TOP_BORDER)
         else:
-            modified_cells_no_border.extend(_check_changes_other_than_code_and_year(first_data, luy_data, line_index+1))
+            modified_columns = _get_modified_column_indexes(first_data, luy_data)
             first_data = None
-        data.append(luy_data)
+            yield styled_row(luy_data, cell_styles={col_index: CELLS_MODIFIED_NO_BORDER
+                                                    for col_index in modified_columns})
+
+
+def _search_learning_unit_yrs_on_2_different_years(academic_yr_comparison, learning_unit_years):
+    return LearningUnitYear.objects.filter(
+        learning_unit__in=(_get_learning_units(learning_unit_years)),
+        academic_year__year__in=(
+            learning_unit_years[0].academic_year.year,
+            academic_yr_comparison)
+    ).select_related(
+        'academic_year',
+        'learning_container_year',
+        'learning_container_year__academic_year'
+    ).prefetch_related(
+        get_learning_component_prefetch()
+    ).prefetch_related(
+        build_entity_container_prefetch([
+            entity_types.ALLOCATION_ENTITY,
+            entity_types.REQUIREMENT_ENTITY,
+            entity_types.ADDITIONAL_REQUIREMENT_ENTITY_1,
+            entity_types.ADDITIONAL_REQUIREMENT_ENTITY_2
+        ])
+    ).order_by('learning_unit', 'academic_year__year')
 
-    return {
-        DATA: data,
-        CELLS_TOP_BORDER: top_border or None,
-        CELLS_MODIFIED_NO_BORDER: modified_cells_no_border or None,
-    }
+
+def _get_learning_units(learning_unit_years):
+    if isinstance(learning_unit_years, QuerySet):
+        return learning_unit_years.order_by().values('learning_unit')
+    return list(set([l.learning_unit for l in learning_unit_years]))
 
 
 def extract_xls_data_from_learning_unit(learning_unit_yr, new_line, first_data):
@@ -295,20 +264,14 @@ def _get_academic_year(obj):
         return obj.learning_unit_year.academic_year
 
 
-def _check_changes_other_than_code_and_year(first_data, second_data, line_index):
+def _get_modified_column_indexes(first_data, second_data):
     modifications = []
     for col_index, obj in enumerate(first_data):
         if col_index == ACRONYM_COL_NUMBER and second_data[ACRONYM_COL_NUMBER] != EMPTY_VALUE:
-            modifications.append('{}{}'.format(get_column_letter(col_index+1), line_index))
+            modifications.append(col_index)
         else:
             if obj != second_data[col_index] and col_index != ACADEMIC_COL_NUMBER:
-                modifications.append('{}{}'.format(get_column_letter(col_index+1), line_index))
+                modifications.append(col_index)
 
     return modifications
 
-
-def get_border_columns(line):
-    style = []
-    for col_index, obj in enumerate(LEARNING_UNIT_TITLES, start=1):
-        style.append('{}{}'.format(get_column_letter(col_index), line))
-    return style
@@ -0,0 +1,176 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models.signals import post_save, post_delete
+
+from base.models.outbox_record import OutboxRecord
+from base.utils import queue_publisher
+from osis_common.models import serializable_model
+from osis_common.models.serializable_model import SerializableModel, serialize
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+# Key of the PostgreSQL advisory lock held by the relay publishing a batch
+RELAY_LOCK_KEY = 4821
+
+# Publication of SerializableModel.save and delete, replaced by skip_inline_publication
+_inline_send_to_queue = None
+
+
+def is_enabled():
+    return bool(settings.QUEUES) and settings.QUEUES_OUTBOX
+
+
+def record_changes(model, object_ids):
+    """ Record the changes of objects saved in bulk (bulk_create, update), which do not send the post_save signal """
+    if is_enabled():
+        OutboxRecord.objects.bulk_create(
+            OutboxRecord(model=model._meta.label_lower, object_id=object_id) for object_id in object_ids
+        )
+
+
+def record_saved_instance(sender, instance, **kwargs):
+    if is_enabled():
+        OutboxRecord.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+def record_deleted_instance(sender, instance, **kwargs):
+    # The deleted object can only be serialized now
+    if is_enabled():
+        OutboxRecord.objects.create(model=sender._meta.label_lower, object_id=instance.pk, to_delete=True,
+                                    payload=_serialize(instance, to_delete=True))
+
+
+def connect_serializable_models():
+    """ Record the changes of all the serializable models of the installed applications """
+    _replace_inline_publication()
+    for model in apps.get_models():
+        if issubclass(model, SerializableModel):
+            post_save.connect(record_saved_instance, sender=model, dispatch_uid='outbox_save_{}'.format(model))
+            post_delete.connect(record_deleted_instance, sender=model, dispatch_uid='outbox_delete_{}'.format(model))
+
+
+def _replace_inline_publication():
+    """
+    SerializableModel.save and delete publish the object themselves with osis_common's send_to_queue.
+    With the outbox, the relay publishes it: the inline publication is skipped, otherwise every change is sent twice.
+    """
+    global _inline_send_to_queue
+    if _inline_send_to_queue is not None:
+        return
+    if not hasattr(serializable_model, 'send_to_queue'):
+        if is_enabled():
+            raise ImproperlyConfigured('QUEUES_OUTBOX cannot skip the publication of SerializableModel.save: '
+                                       'osis_common.models.serializable_model.send_to_queue is not found.')
+        return
+    _inline_send_to_queue = serializable_model.send_to_queue
+    serializable_model.send_to_queue = skip_inline_publication
+
+
+def skip_inline_publication(*args, **kwargs):
+    if is_enabled():
+        # The change is recorded in the outbox by the post_save and post_delete receivers
+        return None
+    return _inline_send_to_queue(*args, **kwargs)
+
+
+def relay_outbox(batch_size=None):
+    """
+    Publish the recorded changes on the migration queue by batches of settings.QUEUES_OUTBOX_BATCH_SIZE records,
+    in the order of the changes. The changes of an object in a batch are published once, with its current state.
+
+    The records of a batch are deleted once published: a batch is published again if its publication fails.
+    A single relay runs at once, otherwise the changes of an object could be published out of order: a relay which
+    finds another one running stops.
+
+    :return: number of records relayed
+    """
+    if not is_enabled():
+        return 0
+    batch_size = batch_size or settings.QUEUES_OUTBOX_BATCH_SIZE
+    queue_name = settings.QUEUES.get('QUEUES_NAME').get('MIGRATIONS_TO_PRODUCE')
+    relayed = 0
+    while True:
+        with transaction.atomic():
+            if not _acquire_relay_lock():
+                logger.info('The outbox is being relayed by another process')
+                return relayed
+            records = list(OutboxRecord.objects.order_by('pk')[:batch_size])
+            if not records:
+                return relayed
+            queue_publisher.publisher.publish_many(queue_name, _build_messages(records))
+            OutboxRecord.objects.filter(pk__in=[record.pk for record in records]).delete()
+        relayed += len(records)
+
+
+def _acquire_relay_lock():
+    """ The lock is released at the end of the transaction """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [RELAY_LOCK_KEY])
+        return cursor.fetchone()[0]
+
+
+def _build_messages(records):
+    last_records = collections.OrderedDict()
+    for record in records:
+        key = (record.model, record.object_id)
+        # The object is published at the position of its last change
+        last_records.pop(key, None)
+        last_records[key] = record
+
+    instances = _find_instances(record for record in last_records.values() if not record.to_delete)
+    messages = []
+    for key, record in last_records.items():
+        if record.to_delete:
+            messages.append(record.payload)
+        elif key in instances:
+            messages.append(_serialize(instances[key]))
+        # Otherwise, the object has been deleted since and its deletion is recorded in a next batch
+    return messages
+
+
+def _find_instances(records):
+    """ Load the objects to publish with one query by model """
+    object_ids_by_model = collections.defaultdict(set)
+    for record in records:
+        object_ids_by_model[record.model].add(record.object_id)
+    return {
+        (model_label, instance.pk): instance
+        for model_label, object_ids in object_ids_by_model.items()
+        for instance in apps.get_model(model_label).objects.filter(pk__in=object_ids)
+    }
+
+
+def _serialize(instance, to_delete=False):
+    message = serialize(instance)
+    message['to_delete'] = to_delete
+    return message
@@ -0,0 +1,148 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from backoffice.celery import app as celery_app
+from base.business.education_groups.automatic_postponement import EducationGroupAutomaticPostponement
+from base.business.learning_units.automatic_postponement import LearningUnitAutomaticPostponement
+from base.models.enums import export_job_status, postponement_type
+from base.models.postponement_job import PostponementJob, PostponementJobItem
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+RUN_POSTPONEMENT_CHUNK_TASK = 'base.tasks.run_postponement_chunk'
+
+
+def start_postponement_job(a_postponement_type, queryset=None, user=None):
+    """
+    Send the statistics of the postponement to the managers, register a job and dispatch the objects to duplicate
+    by chunks of settings.POSTPONEMENT_CHUNK_SIZE to the celery workers once the current transaction is committed.
+
+    The statistics are computed once and stored on the job, to be sent with the combined results when the last
+    chunk is processed, as the postponement itself changes them.
+
+    :param a_postponement_type: one of postponement_type.POSTPONEMENT_TYPES
+    :param queryset: objects to postpone, all the objects of the penultimate academic year if None
+    :param user: User who started the postponement
+    :return: PostponementJob
+    """
+    process = _get_postponement_class(a_postponement_type)(queryset)
+    process.send_before.__func__(process.last_academic_year, process.to_duplicate,
+                                 process.already_duplicated, process.to_not_duplicate)
+
+    object_ids = sorted(obj.pk for obj in process.to_duplicate)
+    job = PostponementJob.objects.create(
+        postponement_type=a_postponement_type,
+        user=user,
+        academic_year=process.last_academic_year,
+        total=len(object_ids),
+        already_duplicated_count=process.already_duplicated.count(),
+        to_not_duplicate_count=process.to_not_duplicate.count(),
+    )
+    if not object_ids:
+        _finish(job)
+        return job
+
+    PostponementJobItem.objects.bulk_create(
+        [PostponementJobItem(job=job, object_id=object_id) for object_id in object_ids],
+        batch_size=settings.POSTPONEMENT_CHUNK_SIZE
+    )
+
+    chunk_size = settings.POSTPONEMENT_CHUNK_SIZE
+    chunks = [object_ids[index:index + chunk_size] for index in range(0, len(object_ids), chunk_size)]
+    transaction.on_commit(lambda: _dispatch(job, chunks))
+    return job
+
+
+def _dispatch(job, chunks):
+    for chunk in chunks:
+        celery_app.send_task(RUN_POSTPONEMENT_CHUNK_TASK, args=[job.pk, chunk])
+
+
+def run_postponement_chunk(postponement_job_id, object_ids):
+    """
+    Extend the objects of a chunk in one transaction and add their results to the job.
+
+    The items of the chunk are locked and marked as processed in the same transaction, so a task delivered again
+    waits for the first one and only extends the objects which have not been processed yet.
+    """
+    job = PostponementJob.objects.select_related('academic_year').get(pk=postponement_job_id)
+    postponement_class = _get_postponement_class(job.postponement_type)
+    PostponementJob.objects.filter(pk=job.pk, status=export_job_status.PENDING).update(
+        status=export_job_status.RUNNING
+    )
+    with transaction.atomic():
+        items = PostponementJobItem.objects.select_for_update().filter(
+            job=job, object_id__in=object_ids, processed=False
+        )
+        pending_ids = [item.object_id for item in items]
+        if pending_ids:
+            objects = postponement_class.model.objects.filter(pk__in=pending_ids).order_by('pk')
+            try:
+                with transaction.atomic():
+                    result, errors = postponement_class.extend_objects(objects, job.academic_year)
+            except Exception:
+                # The objects of the chunk are reported in error to let the job finish
+                logger.exception('Postponement chunk of job {} failed'.format(job.pk))
+                result, errors = [], list(objects)
+            PostponementJobItem.objects.filter(job=job, object_id__in=pending_ids).update(processed=True)
+            _register_chunk_results(job.pk, len(pending_ids), result, errors)
+    return PostponementJob.objects.get(pk=job.pk).progress
+
+
+def _register_chunk_results(postponement_job_id, object_count, result, errors):
+    PostponementJob.objects.filter(pk=postponement_job_id).update(processed=F('processed') + object_count)
+    job = PostponementJob.objects.select_for_update().get(pk=postponement_job_id)
+    job.result += [str(obj) for obj in result]
+    job.errors += [str(obj) for obj in errors]
+    job.save(update_fields=['result', 'errors'])
+    if job.processed >= job.total:
+        _finish(job)
+
+
+def _finish(job):
+    job.status = export_job_status.DONE
+    job.finished = timezone.now()
+    job.save()
+    transaction.on_commit(lambda: _send_results(job))
+
+
+def _send_results(job):
+    postponement_class = _get_postponement_class(job.postponement_type)
+    postponement_class.send_after(job.academic_year, job.result, job.already_duplicated_count,
+                                  job.to_not_duplicate_count, job.errors)
+
+
+def _get_postponement_class(a_postponement_type):
+    return {
+        postponement_type.LEARNING_UNITS: LearningUnitAutomaticPostponement,
+        postponement_type.EDUCATION_GROUPS: EducationGroupAutomaticPostponement,
+    }[a_postponement_type]
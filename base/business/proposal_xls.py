@@ -29,6 +29,7 @@ from django.utils.translation import ugettext_lazy as _
 from osis_common.document import xls_build
 from base.business.learning_unit import get_entity_acronym
 from base.business.xls import get_name_or_username
+from base.business.xls_stream import StreamingWorkbook
 
 WORKSHEET_TITLE = 'Proposals'
 XLS_FILENAME = 'Proposals'
@@ -40,10 +41,6 @@ PROPOSAL_TITLES = [str(_('requirement_entity_small')), str(_('code')), str(_('ti
                    str(_('allocation_entity_small')), str(_('proposal_date'))]
 
 
-def prepare_xls_content(proposals):
-    return [extract_xls_data_from_proposal(proposal) for proposal in proposals]
-
-
 def extract_xls_data_from_proposal(proposal):
     return [get_entity_acronym(proposal.learning_unit_year.entities.get('REQUIREMENT_ENTITY')),
             proposal.learning_unit_year.acronym,
@@ -59,32 +56,10 @@ def extract_xls_data_from_proposal(proposal):
             proposal.date.strftime('%d-%m-%Y')]
 
 
-def prepare_xls_parameters_list(user, working_sheets_data):
-    return {xls_build.LIST_DESCRIPTION_KEY: _(XLS_DESCRIPTION),
-            xls_build.FILENAME_KEY: _(XLS_FILENAME),
-            xls_build.USER_KEY: get_name_or_username(user),
-            xls_build.WORKSHEETS_DATA:
-                [{xls_build.CONTENT_KEY: working_sheets_data,
-                  xls_build.HEADER_TITLES_KEY: PROPOSAL_TITLES,
-                  xls_build.WORKSHEET_TITLE_KEY: _(WORKSHEET_TITLE),
-                  }
-                 ]}
-
-
-def create_xls(user, proposals, filters):
-    working_sheets_data = prepare_xls_content(proposals)
-    return xls_build.generate_xls(
-        xls_build.prepare_xls_parameters_list(working_sheets_data, configure_parameters(user)), filters)
-
-
-def create_xls_proposal(user, proposals, filters):
-    return xls_build.generate_xls(prepare_xls_parameters_list(prepare_xls_content(proposals),
-                                                              configure_parameters(user)), filters)
-
-
-def configure_parameters(user):
-    return {xls_build.DESCRIPTION: XLS_DESCRIPTION,
-            xls_build.USER: get_name_or_username(user),
-            xls_build.FILENAME: XLS_FILENAME,
-            xls_build.HEADER_TITLES: PROPOSAL_TITLES,
-            xls_build.WS_TITLE: WORKSHEET_TITLE}
+def create_xls_proposal_stream(user, proposals, filters):
+    workbook = StreamingWorkbook()
+    workbook.add_worksheet(
+        _(WORKSHEET_TITLE), PROPOSAL_TITLES, (extract_xls_data_from_proposal(proposal) for proposal in proposals)
+    )
+    workbook.add_parameters_worksheet(XLS_DESCRIPTION, get_name_or_username(user), filters)
+    return workbook.save()
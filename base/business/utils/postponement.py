@@ -71,20 +71,29 @@ class AutomaticPostponement(ABC):
         self._extend_objects()
 
         # send statistics with results to the managers
-        self.send_after.__func__(self.last_academic_year, self.result, self.already_duplicated,
-                                 self.to_not_duplicate, self.errors)
+        self.send_after.__func__(self.last_academic_year, self.result, self.already_duplicated.count(),
+                                 self.to_not_duplicate.count(), self.errors)
 
         return self.result, self.errors
 
     def _extend_objects(self):
-        for obj in self.to_duplicate:
+        result, errors = self.extend_objects(self.to_duplicate, self.last_academic_year)
+        self.result.extend(result)
+        self.errors.extend(errors)
+
+    @classmethod
+    def extend_objects(cls, objects, last_academic_year):
+        """ Extend each object in its own savepoint and return the extended objects and the objects in error """
+        result, errors = [], []
+        for obj in objects:
             try:
                 with transaction.atomic():
-                    self.result.append(self.extend_obj(obj, self.last_academic_year))
+                    result.append(cls.extend_obj(obj, last_academic_year))
 
             # General catch to be sure to not stop the rest of the duplication
             except (Error, ObjectDoesNotExist, MultipleObjectsReturned, ConsistencyError):
-                self.errors.append(obj)
+                errors.append(obj)
+        return result, errors
 
     @classmethod
     def extend_obj(cls, obj, last_academic_year):
@@ -0,0 +1,145 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+import datetime
+import decimal
+import tempfile
+
+from django.utils.text import slugify
+from django.utils.translation import ugettext_lazy as _
+from openpyxl import Workbook
+from openpyxl.styles import Font, Style
+from openpyxl.writer.write_only import WriteOnlyCell
+
+XLSX_EXTENSION = 'xlsx'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+MAX_WORKSHEET_TITLE_LENGTH = 31
+DATE_TIME_FORMAT = '%d-%m-%Y %H:%M'
+
+HEADER_STYLE = 'header'
+DEFAULT_NAMED_STYLES = {
+    HEADER_STYLE: Style(font=Font(bold=True)),
+}
+STYLE_ATTRIBUTES = ('font', 'fill', 'border', 'alignment', 'number_format', 'protection')
+_DEFAULT_STYLE = Style()
+_NATIVE_TYPES = (str, int, float, decimal.Decimal, bool, datetime.date, datetime.datetime, datetime.time)
+
+StyledRow = collections.namedtuple('StyledRow', ['values', 'style', 'cell_styles'])
+
+
+def styled_row(values, style=None, cell_styles=None):
+    """
+    :param values: list of the values of the row
+    :param style: name of the style applied to the whole row
+    :param cell_styles: dict {column index: name of the style} applied to some cells of the row
+    """
+    return StyledRow(values, style, cell_styles or {})
+
+
+class StreamingWorkbook:
+    """
+    Workbook written row by row in openpyxl write-only mode.
+
+    Rows are consumed from iterables (typically generators) and are never kept in memory. Styles are registered
+    by name before writing and the combinations used by a cell are computed once.
+    """
+
+    def __init__(self, named_styles=None):
+        self.workbook = Workbook(write_only=True)
+        self.named_styles = dict(DEFAULT_NAMED_STYLES)
+        self.named_styles.update(named_styles or {})
+        self._computed_styles = {}
+
+    def add_worksheet(self, title, header_titles, rows, column_styles=None):
+        """
+        :param title: title of the worksheet
+        :param header_titles: list of the titles of the columns, written in bold on the first line
+        :param rows: iterable of lists of values or of StyledRow
+        :param column_styles: dict {column index: name of the style} applied to every row
+        """
+        worksheet = self.workbook.create_sheet(title=str(title)[:MAX_WORKSHEET_TITLE_LENGTH])
+        if header_titles:
+            worksheet.append([self._build_cell(worksheet, title, (HEADER_STYLE,)) for title in header_titles])
+
+        column_styles = column_styles or {}
+        for row in rows:
+            if not isinstance(row, StyledRow):
+                row = styled_row(row)
+            worksheet.append(self._build_row(worksheet, row, column_styles))
+        return worksheet
+
+    def add_parameters_worksheet(self, description, user, filters=None):
+        rows = [
+            [str(_('Description')), str(_(description))],
+            [str(_('user')), user],
+            [str(_('date')), datetime.datetime.now().strftime(DATE_TIME_FORMAT)],
+        ]
+        rows.extend([str(label), str(value)] for label, value in (filters or {}).items())
+        return self.add_worksheet(_('parameters'), None, rows, column_styles={0: HEADER_STYLE})
+
+    def save(self):
+        """ Return a file-like object, positioned at the beginning of the workbook """
+        stream = tempfile.TemporaryFile()
+        self.workbook.save(stream)
+        stream.seek(0)
+        return stream
+
+    def _build_row(self, worksheet, row, column_styles):
+        cells = []
+        for col_index, value in enumerate(row.values):
+            style_names = tuple(
+                name for name in (row.style, column_styles.get(col_index), row.cell_styles.get(col_index)) if name
+            )
+            cells.append(self._build_cell(worksheet, value, style_names) if style_names else _convert_value(value))
+        return cells
+
+    def _build_cell(self, worksheet, value, style_names):
+        cell = WriteOnlyCell(worksheet, value=_convert_value(value))
+        for attribute, attribute_value in self._get_computed_style(style_names).items():
+            setattr(cell, attribute, attribute_value)
+        return cell
+
+    def _get_computed_style(self, style_names):
+        """ The last style of style_names defining an attribute wins """
+        if style_names not in self._computed_styles:
+            computed_style = {}
+            for style in (self.named_styles[name] for name in style_names):
+                computed_style.update({
+                    attribute: getattr(style, attribute) for attribute in STYLE_ATTRIBUTES
+                    if getattr(style, attribute) != getattr(_DEFAULT_STYLE, attribute)
+                })
+            self._computed_styles[style_names] = computed_style
+        return self._computed_styles[style_names]
+
+
+def _convert_value(value):
+    if value is None or isinstance(value, _NATIVE_TYPES):
+        return value
+    return str(value)
+
+
+def get_xls_filename(filename):
+    return "{}.{}".format(slugify(str(_(filename))), XLSX_EXTENSION)
@@ -34,7 +34,7 @@ from django.utils.translation import ugettext_lazy as _
 from base import models as mdl
 from base.business.entity import get_entities_ids, build_entity_container_prefetch
 from base.business.entity_version import SERVICE_COURSE
-from base.business.learning_unit_year_with_context import append_latest_entities
+from base.business.learning_unit_year_with_context import append_latest_entities, annotate_latest_entity_acronyms
 from base.forms.common import get_clean_data, treat_empty_or_str_none_as_none, TooManyResultsException
 from base.forms.search.search_form import BaseSearchForm
 from base.forms.utils.choice_field import add_blank
@@ -54,11 +54,11 @@ from base.models.organization_address import find_distinct_by_country
 from base.models.proposal_learning_unit import ProposalLearningUnit
 from reference.models.country import Country
 
+# Results filtered or processed row by row in Python are limited, the others are paginated
 MAX_RECORDS = 1000
 
 
 class LearningUnitSearchForm(BaseSearchForm):
-    MAX_RECORDS = 1000
     ALL_LABEL = (None, _('all_label'))
     ALL_CHOICES = (ALL_LABEL,)
 
@@ -117,7 +117,8 @@ class LearningUnitSearchForm(BaseSearchForm):
                     entity_container_year_link_type.ALLOCATION_ENTITY,
                     entity_container_year_link_type.REQUIREMENT_ENTITY
                 ])
-            ).order_by('academic_year__year', 'acronym').annotate(has_proposal=Exists(has_proposal))
+            ).order_by('academic_year__year', 'acronym', 'pk').annotate(has_proposal=Exists(has_proposal))
+        learning_units = annotate_latest_entity_acronyms(learning_units)
 
         learning_units = self.get_filter_learning_container_ids(learning_units)
 
@@ -218,6 +219,11 @@ class LearningUnitYearForm(LearningUnitSearchForm):
         return [lu for lu in learning_units if lu.entities.get(SERVICE_COURSE)]
 
     def get_learning_units(self, service_course_search=None, requirement_entities=None, luy_status=None):
+        """
+        Return a lazy queryset of the learning unit years found, annotated with the acronyms of their latest entities.
+        The borrowed course search and the service course search are filtered in Python and return a list: they
+        raise TooManyResultsException beyond MAX_RECORDS results.
+        """
         service_course_search = service_course_search or self.service_course_search
         self.cleaned_data['status'] = self._set_status(luy_status)
 
@@ -225,16 +231,16 @@ class LearningUnitYearForm(LearningUnitSearchForm):
             self.cleaned_data['requirement_entities'] = requirement_entities
 
         learning_units = self.get_queryset()
-
-        if not service_course_search and self.cleaned_data and learning_units.count() > self.MAX_RECORDS:
-            raise TooManyResultsException
+        if self.borrowed_course_search or service_course_search:
+            check_max_records(learning_units)
 
         if self.borrowed_course_search:
             # TODO must return a queryset
-            learning_units = self._filter_borrowed_learning_units(learning_units)
+            learning_units = list(self._filter_borrowed_learning_units(learning_units))
 
-        # FIXME We must keep a queryset
-        return [append_latest_entities(learning_unit, service_course_search) for learning_unit in learning_units]
+        if service_course_search:
+            return [append_latest_entities(learning_unit, service_course_search) for learning_unit in learning_units]
+        return learning_units
 
     def _set_status(self, luy_status):
         return convert_status_bool(luy_status) if luy_status else self.cleaned_data['status']
@@ -258,6 +264,11 @@ class LearningUnitYearForm(LearningUnitSearchForm):
         )
 
 
+def check_max_records(learning_units):
+    if learning_units.count() > MAX_RECORDS:
+        raise TooManyResultsException
+
+
 def filter_is_borrowed_learning_unit_year(learning_unit_year_qs, date, faculty_borrowing=None):
     entities = build_current_entity_version_structure_in_memory(date)
     entities_borrowing_allowed = []
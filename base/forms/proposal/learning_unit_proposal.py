@@ -28,10 +28,11 @@ from django.utils.functional import lazy
 from django.utils.translation import ugettext_lazy as _
 
 from base import models as mdl
-from base.business.learning_unit_year_with_context import append_latest_entities
-from base.forms.common import get_clean_data, TooManyResultsException
+from base.business.entity import build_entity_container_prefetch
+from base.business.learning_unit_year_with_context import annotate_latest_entity_acronyms
+from base.forms.common import get_clean_data
 from base.forms.learning_unit.search_form import LearningUnitSearchForm
-from base.models.enums import proposal_type, proposal_state
+from base.models.enums import proposal_type, proposal_state, entity_container_year_link_type
 from base.models.proposal_learning_unit import ProposalLearningUnit
 
 
@@ -78,19 +79,24 @@ class LearningUnitProposalForm(LearningUnitSearchForm):
         return get_clean_data(self.cleaned_data)
 
     def get_proposal_learning_units(self):
+        """ Return a lazy queryset of the proposals found, annotated with the acronyms of their latest entities """
         learning_units = self.get_queryset().filter(proposallearningunit__isnull=False)
 
         learning_units = mdl.proposal_learning_unit.filter_proposal_fields(learning_units, **self.cleaned_data)
 
-        if self.cleaned_data and learning_units.count() > LearningUnitSearchForm.MAX_RECORDS:
-            raise TooManyResultsException
-
-        for learning_unit in learning_units:
-            # TODO Use an annotate
-            append_latest_entities(learning_unit, None)
-
-        # TODO It'll be easier to return a queryset of learningunits
-        return [learning_unit.proposallearningunit for learning_unit in learning_units]
+        proposals = ProposalLearningUnit.objects.filter(
+            learning_unit_year__in=learning_units.order_by().values('pk')
+        ).select_related(
+            'learning_unit_year__academic_year', 'learning_unit_year__learning_container_year'
+        ).prefetch_related(
+            build_entity_container_prefetch(
+                [entity_container_year_link_type.ALLOCATION_ENTITY, entity_container_year_link_type.REQUIREMENT_ENTITY],
+                learning_container_year_path='learning_unit_year__learning_container_year'
+            )
+        ).order_by('learning_unit_year__academic_year__year', 'learning_unit_year__acronym', 'pk')
+        return annotate_latest_entity_acronyms(
+            proposals, learning_container_year_path='learning_unit_year__learning_container_year'
+        )
 
 
 class ProposalStateModelForm(forms.ModelForm):
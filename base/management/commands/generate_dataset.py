@@ -0,0 +1,377 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+import datetime
+import random
+import time
+
+import factory.fuzzy
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from faker.generator import random as faker_random
+
+from base.models.enums import academic_calendar_type, education_group_categories, education_group_types, \
+    entity_container_year_link_type, entity_type, learning_container_year_types, learning_unit_year_subtypes, \
+    number_session, organization_type
+from base.models.person import Person
+from base.tests.factories.academic_calendar import AcademicCalendarFactory
+from base.tests.factories.academic_year import AcademicYearFactory, get_current_year
+from base.tests.factories.campus import CampusFactory
+from base.tests.factories.education_group import EducationGroupFactory
+from base.tests.factories.education_group_type import ExistingEducationGroupTypeFactory
+from base.tests.factories.education_group_year import EducationGroupYearFactory
+from base.tests.factories.entity import EntityFactory
+from base.tests.factories.entity_container_year import EntityContainerYearFactory
+from base.tests.factories.entity_version import EntityVersionFactory
+from base.tests.factories.exam_enrollment import ExamEnrollmentFactory
+from base.tests.factories.group_element_year import GroupElementYearFactory
+from base.tests.factories.learning_container import LearningContainerFactory
+from base.tests.factories.learning_container_year import LearningContainerYearFactory
+from base.tests.factories.learning_unit import LearningUnitFactory
+from base.tests.factories.learning_unit_enrollment import LearningUnitEnrollmentFactory
+from base.tests.factories.learning_unit_year import LearningUnitYearFactory
+from base.tests.factories.offer import OfferFactory
+from base.tests.factories.offer_enrollment import OfferEnrollmentFactory
+from base.tests.factories.offer_type import OfferTypeFactory
+from base.tests.factories.offer_year import OfferYearFactory
+from base.tests.factories.organization import OrganizationFactory
+from base.tests.factories.person import PersonFactory, PersonWithoutUserFactory
+from base.tests.factories.program_manager import ProgramManagerFactory
+from base.tests.factories.session_exam_calendar import SessionExamCalendarFactory
+from base.tests.factories.session_examen import SessionExamFactory
+from base.tests.factories.structure import StructureFactory
+from base.tests.factories.student import StudentFactory
+from base.tests.factories.user import UserFactory
+from reference.tests.factories.country import CountryFactory
+from reference.tests.factories.language import LanguageFactory
+
+# Program manager of all the trainings of the current academic year, used by the benchmarks
+BENCHMARK_USERNAME = 'benchmark_program_manager'
+ROOT_ENTITY_EXTERNAL_ID = 'SYNTHETIC'
+
+BATCH_SIZE = 1000
+
+# (entity type, acronym prefix, number of children by parent entity), the sectors are multiplied by the scale
+ENTITY_LEVELS = (
+    (entity_type.SECTOR, 'S', 4),
+    (entity_type.FACULTY, 'F', 5),
+    (entity_type.SCHOOL, 'E', 5),
+    (entity_type.INSTITUTE, 'I', 4),
+)
+LEARNING_UNITS_BY_FACULTY = 100
+TRAININGS_BY_FACULTY = 3
+GROUPS_BY_TRAINING = 3
+SUBGROUPS_BY_GROUP = 2
+LEARNING_UNITS_BY_SUBGROUP = 5
+STUDENTS_BY_TRAINING = 20
+LEARNING_UNIT_ENROLLMENTS_BY_STUDENT = 10
+
+ProgramNode = collections.namedtuple('ProgramNode', 'faculty acronym parent_index learning_unit_indexes')
+
+
+def seed(value):
+    """ Make the random values of the factories repeatable """
+    random.seed(value)
+    factory.fuzzy.reseed_random(value)
+    faker_random.seed(value)
+
+
+class SyntheticDataset:
+    """
+    Generate a university with the factories of the tests:
+        - an entity tree of SECTOR > FACULTY > SCHOOL > INSTITUTE
+        - learning units of the faculties, for each academic year
+        - bachelors made of groups and subgroups containing learning units, for each academic year but the last
+          one, so the content of the current year can be postponed
+        - students enrolled in the bachelors and their learning units for the three sessions of the current year
+
+    The objects are built by the factories and inserted by batches.
+    """
+
+    def __init__(self, scale=1, years=4):
+        self.scale = scale
+        self.current_year = get_current_year()
+        self.years = list(range(self.current_year - years + 2, self.current_year + 2))
+        self.counts = collections.OrderedDict()
+        self.faculties = []
+        self.entities_by_parent = collections.defaultdict(list)
+        self.learning_unit_years = {}
+        self.trainings = []
+
+    def generate(self):
+        self._create_references()
+        self._create_entities()
+        self._create_learning_units()
+        self._create_programs()
+        self._create_enrollments()
+        return self.counts
+
+    def _bulk_create(self, factory_class, attributes_list):
+        model = factory_class._meta.get_model_class()
+        created = []
+        for start in range(0, len(attributes_list), BATCH_SIZE):
+            created.extend(model.objects.bulk_create(
+                [factory_class.build(**attributes) for attributes in attributes_list[start:start + BATCH_SIZE]]
+            ))
+        self.counts[model._meta.label] = self.counts.get(model._meta.label, 0) + len(created)
+        return created
+
+    def _create_references(self):
+        self.academic_years = {year: AcademicYearFactory(year=year) for year in self.years}
+        self.organization = OrganizationFactory(type=organization_type.MAIN)
+        self.country = CountryFactory()
+        self.campus = CampusFactory(organization=self.organization)
+        self.language = LanguageFactory()
+        self.structure = StructureFactory()
+        self.offer_type = OfferTypeFactory()
+        self.training_type = ExistingEducationGroupTypeFactory(
+            category=education_group_categories.TRAINING, name=education_group_types.BACHELOR
+        )
+        self.group_type = ExistingEducationGroupTypeFactory(
+            category=education_group_categories.GROUP, name=education_group_types.COMMON_CORE
+        )
+
+    def _create_entities(self):
+        start_date = datetime.date(self.years[0], 1, 1)
+        root = EntityFactory(organization=self.organization, country=self.country,
+                             external_id=ROOT_ENTITY_EXTERNAL_ID)
+        EntityVersionFactory(entity=root, parent=None, acronym='UNIV', title='University', entity_type='',
+                             start_date=start_date)
+
+        parents = [(root, '')]
+        for level, (a_type, prefix, children_count) in enumerate(ENTITY_LEVELS):
+            if level == 0:
+                children_count *= self.scale
+            children = [
+                (parent, '{}{}{}'.format(parent_acronym, prefix, number))
+                for parent, parent_acronym in parents for number in range(1, children_count + 1)
+            ]
+            entities = self._bulk_create(EntityFactory, [
+                {'organization': self.organization, 'country': self.country,
+                 'external_id': '{}-{}'.format(ROOT_ENTITY_EXTERNAL_ID, acronym)}
+                for _parent, acronym in children
+            ])
+            self._bulk_create(EntityVersionFactory, [
+                {'entity': entity, 'parent': parent, 'acronym': acronym, 'title': 'Entity ' + acronym,
+                 'entity_type': a_type, 'start_date': start_date}
+                for entity, (parent, acronym) in zip(entities, children)
+            ])
+            for entity, (parent, _acronym) in zip(entities, children):
+                self.entities_by_parent[parent.pk].append(entity)
+            parents = [(entity, acronym) for entity, (_parent, acronym) in zip(entities, children)]
+            if a_type == entity_type.FACULTY:
+                self.faculties = parents
+
+    def _create_learning_units(self):
+        units = [
+            (faculty, 'L{}{:03d}'.format(acronym, number))
+            for faculty, acronym in self.faculties for number in range(1, LEARNING_UNITS_BY_FACULTY + 1)
+        ]
+        containers = self._bulk_create(LearningContainerFactory, [{} for _unit in units])
+        learning_units = self._bulk_create(LearningUnitFactory, [
+            {'learning_container': container, 'start_year': self.years[0], 'end_year': None}
+            for container in containers
+        ])
+
+        for year in self.years:
+            academic_year = self.academic_years[year]
+            container_years = self._bulk_create(LearningContainerYearFactory, [
+                {'learning_container': container, 'academic_year': academic_year, 'acronym': acronym,
+                 'container_type': learning_container_year_types.COURSE, 'common_title': 'Course ' + acronym}
+                for container, (_faculty, acronym) in zip(containers, units)
+            ])
+            learning_unit_years = self._bulk_create(LearningUnitYearFactory, [
+                {'learning_unit': learning_unit, 'learning_container_year': container_year,
+                 'academic_year': academic_year, 'acronym': acronym, 'specific_title': 'Course ' + acronym,
+                 'subtype': learning_unit_year_subtypes.FULL, 'language': self.language, 'campus': self.campus}
+                for learning_unit, container_year, (_faculty, acronym) in zip(learning_units, container_years, units)
+            ])
+            self._bulk_create(EntityContainerYearFactory, [
+                {'learning_container_year': container_year, 'entity': entity, 'type': link_type}
+                for index, (container_year, (faculty, _acronym)) in enumerate(zip(container_years, units))
+                for entity, link_type in (
+                    (self._get_school(faculty, index), entity_container_year_link_type.REQUIREMENT_ENTITY),
+                    (faculty, entity_container_year_link_type.ALLOCATION_ENTITY),
+                )
+            ])
+            for faculty, _acronym in self.faculties:
+                self.learning_unit_years[(year, faculty.pk)] = [
+                    luy for luy, (unit_faculty, _acronym) in zip(learning_unit_years, units) if unit_faculty == faculty
+                ]
+
+    def _get_school(self, faculty, index):
+        schools = self.entities_by_parent[faculty.pk]
+        return schools[index % len(schools)]
+
+    def _create_programs(self):
+        nodes = self._get_program_nodes()
+        education_groups = self._bulk_create(EducationGroupFactory, [
+            {'start_year': self.years[0], 'end_year': None} for _node in nodes
+        ])
+
+        for year in self.years:
+            education_group_years = self._bulk_create(EducationGroupYearFactory, [
+                {'education_group': education_group, 'academic_year': self.academic_years[year],
+                 'acronym': node.acronym, 'partial_acronym': 'L' + node.acronym, 'title': 'Program ' + node.acronym,
+                 'title_english': 'Program ' + node.acronym, 'management_entity': node.faculty,
+                 'administration_entity': node.faculty, 'main_teaching_campus': self.campus,
+                 'education_group_type': self.training_type if node.parent_index is None else self.group_type}
+                for education_group, node in zip(education_groups, nodes)
+            ])
+            if year == self.years[-1]:
+                # The content of the last year is left empty to be postponed
+                continue
+            self._create_program_content(year, nodes, education_group_years)
+
+    def _get_program_nodes(self):
+        nodes = []
+        for faculty, faculty_acronym in self.faculties:
+            for training_number in range(1, TRAININGS_BY_FACULTY + 1):
+                training_index = len(nodes)
+                acronym = '{}{}BA'.format(faculty_acronym, training_number)
+                nodes.append(ProgramNode(faculty, acronym, None, []))
+                for group_number in range(1, GROUPS_BY_TRAINING + 1):
+                    group_index = len(nodes)
+                    group_acronym = '{}G{}'.format(acronym, group_number)
+                    nodes.append(ProgramNode(faculty, group_acronym, training_index, []))
+                    for subgroup_number in range(1, SUBGROUPS_BY_GROUP + 1):
+                        # The same learning units are used by the subgroup each year
+                        learning_unit_indexes = random.sample(range(LEARNING_UNITS_BY_FACULTY),
+                                                              LEARNING_UNITS_BY_SUBGROUP)
+                        nodes.append(ProgramNode(faculty, '{}S{}'.format(group_acronym, subgroup_number),
+                                                 group_index, learning_unit_indexes))
+        return nodes
+
+    def _create_program_content(self, year, nodes, education_group_years):
+        links = []
+        leaves_by_training = collections.defaultdict(list)
+        orders = collections.Counter()
+        for index, (education_group_year, node) in enumerate(zip(education_group_years, nodes)):
+            if node.parent_index is None:
+                continue
+            parent = education_group_years[node.parent_index]
+            links.append({'parent': parent, 'child_branch': education_group_year, 'child_leaf': None,
+                          'order': orders[node.parent_index]})
+            orders[node.parent_index] += 1
+
+            learning_unit_years = self.learning_unit_years[(year, node.faculty.pk)]
+            training_index = nodes[node.parent_index].parent_index
+            for order, learning_unit_index in enumerate(node.learning_unit_indexes):
+                learning_unit_year = learning_unit_years[learning_unit_index]
+                links.append({'parent': education_group_year, 'child_branch': None, 'child_leaf': learning_unit_year,
+                              'order': order})
+                leaves_by_training[training_index].append(learning_unit_year)
+        self._bulk_create(GroupElementYearFactory, links)
+
+        if year == self.current_year:
+            self.trainings = [
+                (education_group_years[index], list(collections.OrderedDict.fromkeys(leaves)))
+                for index, leaves in sorted(leaves_by_training.items())
+            ]
+
+    def _create_enrollments(self):
+        academic_year = self.academic_years[self.current_year]
+        SessionExamCalendarFactory(
+            number_session=number_session.ONE,
+            academic_calendar=AcademicCalendarFactory(
+                academic_year=academic_year, reference=academic_calendar_type.SCORES_EXAM_SUBMISSION
+            )
+        )
+
+        offers = self._bulk_create(OfferFactory, [{} for _training in self.trainings])
+        offer_years = self._bulk_create(OfferYearFactory, [
+            {'offer': offer, 'academic_year': academic_year, 'acronym': training.acronym, 'title': training.title,
+             'entity_management': self.structure, 'entity_administration_fac': self.structure,
+             'offer_type': self.offer_type}
+            for offer, (training, _leaves) in zip(offers, self.trainings)
+        ])
+
+        program_manager = PersonFactory(user=UserFactory(username=BENCHMARK_USERNAME))
+        self._bulk_create(ProgramManagerFactory, [
+            {'person': program_manager, 'offer_year': offer_year, 'education_group': training.education_group}
+            for offer_year, (training, _leaves) in zip(offer_years, self.trainings)
+        ])
+
+        persons = self._bulk_create(PersonWithoutUserFactory, [
+            {} for _index in range(len(self.trainings) * STUDENTS_BY_TRAINING)
+        ])
+        students = self._bulk_create(StudentFactory, [
+            {'person': person, 'registration_id': '{:08d}'.format(index)} for index, person in enumerate(persons)
+        ])
+        for index, (offer_year, (training, leaves)) in enumerate(zip(offer_years, self.trainings)):
+            self._create_training_enrollments(
+                offer_year, training, leaves,
+                students[index * STUDENTS_BY_TRAINING:(index + 1) * STUDENTS_BY_TRAINING]
+            )
+
+    def _create_training_enrollments(self, offer_year, training, leaves, students):
+        sessions = [number for number, _label in number_session.NUMBERS_SESSION]
+        offer_enrollments = self._bulk_create(OfferEnrollmentFactory, [
+            {'offer_year': offer_year, 'student': student, 'education_group_year': training} for student in students
+        ])
+        session_exams = self._bulk_create(SessionExamFactory, [
+            {'learning_unit_year': learning_unit_year, 'offer_year': offer_year, 'number_session': session}
+            for learning_unit_year in leaves for session in sessions
+        ])
+        session_exams_by_key = {(session_exam.learning_unit_year.pk, session_exam.number_session): session_exam
+                                for session_exam in session_exams}
+        learning_unit_enrollments = self._bulk_create(LearningUnitEnrollmentFactory, [
+            {'learning_unit_year': learning_unit_year, 'offer_enrollment': offer_enrollment}
+            for offer_enrollment in offer_enrollments
+            for learning_unit_year in random.sample(leaves, min(LEARNING_UNIT_ENROLLMENTS_BY_STUDENT, len(leaves)))
+        ])
+        self._bulk_create(ExamEnrollmentFactory, [
+            {'session_exam': session_exams_by_key[(enrollment.learning_unit_year.pk, session)],
+             'learning_unit_enrollment': enrollment}
+            for enrollment in learning_unit_enrollments for session in sessions
+        ])
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic university in an empty database to benchmark the business functions. " \
+           "With the default scale, it creates about 500 entities, 2000 learning units by academic year, " \
+           "60 bachelors by academic year and 36000 exam enrollments; these numbers grow with the scale."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help='Multiplier of the size of the dataset')
+        parser.add_argument('--years', type=int, default=4,
+                            help='Number of academic years, ending with the year following the current one')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random values')
+
+    def handle(self, *args, **options):
+        if options['scale'] < 1 or options['years'] < 2:
+            raise CommandError('The scale must be at least 1 and the number of academic years at least 2.')
+        if Person.objects.filter(user__username=BENCHMARK_USERNAME).exists():
+            raise CommandError('The synthetic dataset has already been generated in this database.')
+
+        seed(options['seed'])
+        start = time.monotonic()
+        with transaction.atomic():
+            counts = SyntheticDataset(options['scale'], options['years']).generate()
+
+        for label, count in counts.items():
+            self.stdout.write('{}: {}'.format(label, count))
+        self.stdout.write(self.style.SUCCESS('Dataset generated in {:.1f}s'.format(time.monotonic() - start)))
@@ -0,0 +1,216 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+import json
+import logging
+import statistics
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from assessments.business.score_encoding_list import get_scores_encoding_list
+from base.business import education_group, learning_unit
+from base.business.group_element_years import structure_snapshot
+from base.business.group_element_years.postponement import PostponeContent
+from base.business.learning_unit_year_with_context import iter_with_latest_entities
+from base.management.commands.generate_dataset import BENCHMARK_USERNAME, ROOT_ENTITY_EXTERNAL_ID
+from base.models.academic_year import current_academic_year, starting_academic_year
+from base.models.education_group_year import EducationGroupYear
+from base.models.entity import Entity
+from base.models.entity_version import EntityVersion
+from base.models.enums import education_group_categories
+from base.models.exam_enrollment import ExamEnrollment
+from base.models.group_element_year import GroupElementYear, find_learning_unit_formations
+from base.models.learning_unit_year import LearningUnitYear
+from base.utils.cache import cache
+from base.utils.query_budget import QueryRecorder
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+DATASET_MODELS = (Entity, LearningUnitYear, EducationGroupYear, GroupElementYear, ExamEnrollment)
+
+
+class BenchmarkContext:
+    """ Objects of the synthetic dataset given to the benchmarks """
+
+    def __init__(self):
+        try:
+            self.user = User.objects.get(username=BENCHMARK_USERNAME)
+        except User.DoesNotExist:
+            raise CommandError('Generate the synthetic dataset with the generate_dataset command first.')
+        self.academic_year = current_academic_year()
+        self.root_entity = Entity.objects.get(external_id=ROOT_ENTITY_EXTERNAL_ID)
+        # The content is postponed from the starting academic year, whose content is left empty by the dataset
+        # once the starting academic year is the next one
+        self.training_to_postpone = EducationGroupYear.objects.filter(
+            academic_year=starting_academic_year(),
+            education_group_type__category=education_group_categories.TRAINING,
+            groupelementyear__isnull=False,
+        ).order_by('acronym').first()
+
+    def get_learning_unit_years(self):
+        return LearningUnitYear.objects.filter(academic_year=self.academic_year).order_by('acronym')
+
+    def get_trainings(self):
+        return EducationGroupYear.objects.filter(
+            academic_year=self.academic_year, education_group_type__category=education_group_categories.TRAINING
+        )
+
+
+def scores_encoding_list(context):
+    get_scores_encoding_list(context.user)
+
+
+def learning_unit_formations(context):
+    find_learning_unit_formations(list(context.get_learning_unit_years()), parents_as_instances=True)
+
+
+def entity_tree(context):
+    EntityVersion.objects.get_tree(context.root_entity)
+
+
+def learning_units_xls(context):
+    learning_unit.create_xls_stream(
+        context.user, iter_with_latest_entities(context.get_learning_unit_years()), collections.OrderedDict()
+    ).close()
+
+
+def education_groups_administrative_xls(context):
+    education_group.create_xls_administrative_data_stream(
+        context.user, context.get_trainings(), collections.OrderedDict(),
+        {education_group.ORDER_COL: 'acronym', education_group.ORDER_DIRECTION: 'asc'}
+    ).close()
+
+
+def postponement(context):
+    PostponeContent(context.training_to_postpone).postpone()
+
+
+BENCHMARKS = collections.OrderedDict((function.__name__, function) for function in (
+    scores_encoding_list,
+    learning_unit_formations,
+    entity_tree,
+    learning_units_xls,
+    education_groups_administrative_xls,
+    postponement,
+))
+
+
+def clear_caches():
+    """ Empty the shared cache and the structure snapshots kept by the process """
+    try:
+        cache.clear()
+    except Exception:
+        logger.exception('An error occurred with cache system')
+    structure_snapshot.forget_loaded_snapshots()
+
+
+def run_benchmark(function, context, repeat):
+    """
+    Run the function repeat times, each run being rolled back so the runs are comparable.
+    Each run starts with empty caches: the timings are the ones of a cold cache.
+    """
+    durations = []
+    recorder = None
+    for _run in range(repeat):
+        clear_caches()
+        with transaction.atomic():
+            with QueryRecorder() as recorder:
+                function(context)
+            transaction.set_rollback(True)
+        durations.append(recorder.duration)
+    return collections.OrderedDict([
+        ('min', min(durations)),
+        ('median', statistics.median(durations)),
+        ('mean', statistics.mean(durations)),
+        ('max', max(durations)),
+        ('queries', recorder.count),
+        ('db_time', recorder.db_time),
+    ])
+
+
+def compare_reports(previous, current):
+    """ Return a line by benchmark of both reports with the evolution of its median duration """
+    lines = []
+    for name, result in current['benchmarks'].items():
+        previous_result = previous['benchmarks'].get(name)
+        if not previous_result:
+            continue
+        ratio = result['median'] / previous_result['median'] if previous_result['median'] else 0
+        lines.append('{}: {:.3f}s -> {:.3f}s (x{:.2f}), {} -> {} queries'.format(
+            name, previous_result['median'], result['median'], ratio, previous_result['queries'], result['queries']
+        ))
+    return lines
+
+
+class Command(BaseCommand):
+    help = "Time the main business functions on the synthetic dataset and write a JSON report. " \
+           "The cache is emptied before each run."
+
+    def add_arguments(self, parser):
+        parser.add_argument('benchmarks', nargs='*', help='Names of the benchmarks to run (default: all)')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of runs of each benchmark')
+        parser.add_argument('--output', help='Path of the JSON report (default: standard output)')
+        parser.add_argument('--compare', help='Path of a previous JSON report to compare with')
+
+    def handle(self, *args, **options):
+        names = options['benchmarks'] or list(BENCHMARKS)
+        unknown_names = set(names) - set(BENCHMARKS)
+        if unknown_names:
+            raise CommandError('Unknown benchmarks: {}'.format(', '.join(sorted(unknown_names))))
+        if options['repeat'] < 1:
+            raise CommandError('The number of runs must be at least 1.')
+
+        context = BenchmarkContext()
+        if postponement.__name__ in names and context.training_to_postpone is None:
+            raise CommandError('No training with content in the starting academic year {}: the postponement cannot '
+                               'be measured. Exclude it from the benchmarks to run.'.format(starting_academic_year()))
+        report = collections.OrderedDict([
+            ('date', timezone.now().isoformat()),
+            ('database', connection.vendor),
+            ('repeat', options['repeat']),
+            ('dataset', collections.OrderedDict(
+                (model._meta.label, model.objects.count()) for model in DATASET_MODELS
+            )),
+            ('benchmarks', collections.OrderedDict(
+                (name, run_benchmark(BENCHMARKS[name], context, options['repeat'])) for name in names
+            )),
+        ])
+
+        content = json.dumps(report, indent=4)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(content)
+        else:
+            self.stdout.write(content)
+
+        if options['compare']:
+            with open(options['compare']) as previous_report:
+                for line in compare_reports(json.load(previous_report), report):
+                    self.stdout.write(line)
@@ -23,41 +23,29 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import datetime
+from django.conf import settings
 
-from django.db.models import Q
-from notifications.signals import notify
+from base.utils.db_router import pin_primary, get_replica_aliases
 
-from base.models.academic_calendar import AcademicCalendar
-from base.utils.notifications import get_notifications_last_time_read_for_user, \
-    set_notifications_last_read_as_now_for_user, apply_function_if_data_not_in_cache
+PINNING_COOKIE = 'primary_db_pinned'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
 
-ALERT_WEEK = 2
 
-
-class NotificationMiddleware(object):
+class ReplicaPinningMiddleware(object):
+    """
+    Read your own writes: after a request which may have written data, the reads of the user are sent to the
+    primary database during settings.REPLICA_PINNING_SECONDS, the time for the replicas to catch up.
+    """
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        if request.user.is_authenticated:
-            send_academic_calendar_notifications(request.user)
-
-        response = self.get_response(request)
-        return response
-
+        if not get_replica_aliases():
+            return self.get_response(request)
 
-@apply_function_if_data_not_in_cache
-def send_academic_calendar_notifications(user):
-    time_last_read = get_notifications_last_time_read_for_user(user)
-    ac_qs = AcademicCalendar.objects.starting_within(weeks=ALERT_WEEK).order_by("start_date", "end_date")
+        with pin_primary(PINNING_COOKIE in request.COOKIES):
+            response = self.get_response(request)
 
-    if time_last_read:
-        ac_qs = ac_qs.filter(Q(start_date__gt=time_last_read+datetime.timedelta(weeks=ALERT_WEEK))
-                             | Q(changed__gt=time_last_read))
-
-    for ac_obj in ac_qs:
-        verb = "{} ({})".format(ac_obj.title, ac_obj.start_date.strftime("%d/%m"))
-        notify.send(ac_obj, recipient=user, verb=verb)
-
-    set_notifications_last_read_as_now_for_user(user)
+        if request.method not in SAFE_METHODS and not getattr(request, 'read_only', False):
+            response.set_cookie(PINNING_COOKIE, '1', max_age=settings.REPLICA_PINNING_SECONDS, httponly=True)
+        return response
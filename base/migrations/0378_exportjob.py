@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.2 on 2018-10-29 10:12
+from __future__ import unicode_literals
+
+from django.conf import settings
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('base', '0377_auto_20181024_1436'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('export_type', models.CharField(choices=[('LEARNING_UNITS', 'Learning units'), ('LEARNING_UNITS_WITH_PARAMETERS', 'Learning units with parameters'), ('LEARNING_UNITS_ATTRIBUTIONS', 'Learning units and attributions'), ('LEARNING_UNITS_COMPARISON', 'Learning units comparison'), ('PROPOSALS', 'Proposals'), ('EDUCATION_GROUPS', 'Education groups'), ('EDUCATION_GROUPS_ADMINISTRATIVE', 'Education groups administrative data')], max_length=50, verbose_name='type')),
+                ('parameters', django.contrib.postgres.fields.jsonb.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], db_index=True, default='PENDING', max_length=20, verbose_name='status')),
+                ('file', models.FileField(blank=True, null=True, upload_to='exports')),
+                ('error', models.TextField(blank=True, default='')),
+                ('task_id', models.CharField(blank=True, default='', max_length=255)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created',),
+            },
+        ),
+    ]
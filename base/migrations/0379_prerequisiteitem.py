@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.2 on 2018-10-31 09:24
+from __future__ import unicode_literals
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+AND_OPERATOR = 'ET'
+OR_OPERATOR = 'OU'
+PREREQUISITE_TOKEN_REGEX = r'\(|\)|[^\s()]+'
+
+
+def parse_prerequisite(prerequisite_string):
+    """ Copy of base.models.prerequisite.parse_prerequisite at the time of the migration """
+    main_operator = AND_OPERATOR
+    groups = []
+    current_group = None
+    for token in re.findall(PREREQUISITE_TOKEN_REGEX, prerequisite_string or ''):
+        if token == '(':
+            current_group = []
+        elif token == ')':
+            groups.append(current_group)
+            current_group = None
+        elif token in (AND_OPERATOR, OR_OPERATOR):
+            if current_group is None:
+                main_operator = token
+        elif current_group is None:
+            groups.append([token])
+        else:
+            current_group.append(token)
+    return main_operator, groups
+
+
+def compile_prerequisites(apps, schema_editor):
+    Prerequisite = apps.get_model("base", "Prerequisite")
+    PrerequisiteItem = apps.get_model("base", "PrerequisiteItem")
+    LearningUnitYear = apps.get_model("base", "LearningUnitYear")
+    db_alias = schema_editor.connection.alias
+
+    prerequisites = Prerequisite.objects.using(db_alias).exclude(prerequisite='')\
+        .values_list('id', 'prerequisite', 'learning_unit_year__academic_year_id')
+    for prerequisite_id, prerequisite_string, academic_year_id in prerequisites:
+        main_operator, groups = parse_prerequisite(prerequisite_string)
+        Prerequisite.objects.using(db_alias).filter(pk=prerequisite_id).update(main_operator=main_operator)
+        learning_unit_year_ids = dict(
+            LearningUnitYear.objects.using(db_alias).filter(
+                acronym__in={acronym for group in groups for acronym in group},
+                academic_year_id=academic_year_id,
+            ).values_list('acronym', 'id')
+        )
+        PrerequisiteItem.objects.using(db_alias).bulk_create(
+            PrerequisiteItem(
+                prerequisite_id=prerequisite_id,
+                acronym=acronym,
+                learning_unit_year_id=learning_unit_year_ids.get(acronym),
+                group_number=group_number,
+                position=position,
+            )
+            for group_number, group in enumerate(groups, start=1)
+            for position, acronym in enumerate(group, start=1)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0378_exportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prerequisite',
+            name='main_operator',
+            field=models.CharField(choices=[('ET', 'And'), ('OU', 'Or')], default='ET', max_length=5),
+        ),
+        migrations.CreateModel(
+            name='PrerequisiteItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('acronym', models.CharField(db_index=True, max_length=15)),
+                ('group_number', models.PositiveIntegerField()),
+                ('position', models.PositiveIntegerField()),
+                ('learning_unit_year', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='base.LearningUnitYear')),
+                ('prerequisite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='base.Prerequisite')),
+            ],
+            options={
+                'ordering': ('group_number', 'position'),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='prerequisiteitem',
+            unique_together=set([('prerequisite', 'group_number', 'position')]),
+        ),
+        migrations.RunPython(compile_prerequisites, migrations.RunPython.noop),
+    ]
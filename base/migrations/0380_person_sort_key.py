@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.2 on 2018-11-05 10:12
+from __future__ import unicode_literals
+
+import unicodedata
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def _normalize_string(string):
+    # Copy of base.models.person._normalize_string at the time of this migration
+    if not string:
+        return ''
+    string = string.replace(" ", "")
+    return ''.join((c for c in unicodedata.normalize('NFD', string) if unicodedata.category(c) != 'Mn')).upper()
+
+
+def _get_sort_key(first_name, last_name):
+    return "{} {}".format(_normalize_string(last_name), _normalize_string(first_name))
+
+
+def compute_sort_keys(apps, schema_editor):
+    Person = apps.get_model("base", "Person")
+    db_alias = schema_editor.connection.alias
+
+    sort_keys = []
+    persons = Person.objects.using(db_alias).values_list('id', 'first_name', 'last_name').order_by('id')
+    for person_id, first_name, last_name in persons.iterator():
+        sort_keys.append((person_id, _get_sort_key(first_name, last_name)))
+        if len(sort_keys) == BATCH_SIZE:
+            _update_sort_keys(schema_editor.connection, sort_keys)
+            sort_keys = []
+    if sort_keys:
+        _update_sort_keys(schema_editor.connection, sort_keys)
+
+
+def _update_sort_keys(connection, sort_keys):
+    """ Update the sort keys of a batch of persons in one query """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE base_person SET sort_key = new_sort_key.sort_key "
+            "FROM (VALUES {}) AS new_sort_key (id, sort_key) "
+            "WHERE base_person.id = new_sort_key.id".format(", ".join(["(%s, %s)"] * len(sort_keys))),
+            [value for person_sort_key in sort_keys for value in person_sort_key]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0379_prerequisiteitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='sort_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(compute_sort_keys, migrations.RunPython.noop),
+    ]
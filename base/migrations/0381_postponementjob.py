@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.2 on 2018-11-05 09:41
+from __future__ import unicode_literals
+
+from django.conf import settings
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('base', '0380_person_sort_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostponementJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('postponement_type', models.CharField(choices=[('LEARNING_UNITS', 'Learning units'), ('EDUCATION_GROUPS', 'Education groups')], max_length=50, verbose_name='type')),
+                ('object_ids', django.contrib.postgres.fields.jsonb.JSONField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], db_index=True, default='PENDING', max_length=20, verbose_name='status')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('already_duplicated_count', models.PositiveIntegerField(default=0)),
+                ('to_not_duplicate_count', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('result', django.contrib.postgres.fields.jsonb.JSONField(default=list)),
+                ('errors', django.contrib.postgres.fields.jsonb.JSONField(default=list)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+                ('academic_year', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='base.AcademicYear')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created',),
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.2 on 2018-11-12 10:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('base', '0383_academiccalendarnotification'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='postponementjob',
+            name='object_ids',
+        ),
+        migrations.CreateModel(
+            name='PostponementJobItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.IntegerField()),
+                ('processed', models.BooleanField(default=False)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items',
+                                          to='base.PostponementJob')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='postponementjobitem',
+            unique_together=set([('job', 'object_id')]),
+        ),
+    ]
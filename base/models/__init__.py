@@ -25,6 +25,7 @@
 ##############################################################################
 
 from base.models import academic_calendar
+from base.models import academic_calendar_notification
 from base.models import academic_year
 from base.models import admission_condition
 from base.models import authorized_relationship
@@ -44,6 +45,7 @@ from base.models import entity_container_year
 from base.models import entity_manager
 from base.models import entity_version
 from base.models import exam_enrollment
+from base.models import export_job
 from base.models import external_learning_unit_year
 from base.models import external_learning_unit_year
 from base.models import external_offer
@@ -69,9 +71,11 @@ from base.models import offer_year_domain
 from base.models import offer_year_entity
 from base.models import organization
 from base.models import organization_address
+from base.models import outbox_record
 from base.models import person
 from base.models import person_address
 from base.models import person_entity
+from base.models import postponement_job
 from base.models import prerequisite
 from base.models import program_manager
 from base.models import proposal_learning_unit
@@ -38,11 +38,11 @@ from base.models.entity import Entity
 from base.models.enums import academic_type, internship_presence, schedule_type, activity_presence, \
     diploma_printing_orientation, active_status, duration_unit, decree_category, rate_code
 from base.models.enums import education_group_association
-from base.models.enums import education_group_categories
+from base.models.enums import education_group_categories, postponement_type
 from base.models.enums.constraint_type import CONSTRAINT_TYPE, CREDITS
 from base.models.enums.education_group_types import MINOR
 from base.models.exceptions import MaximumOneParentAllowedException
-from base.models.prerequisite import Prerequisite
+from base.models.prerequisite import PrerequisiteItem
 from osis_common.models.osis_model_admin import OsisModelAdmin
 
 
@@ -63,22 +63,16 @@ class EducationGroupYearAdmin(OsisModelAdmin):
 
     def apply_education_group_year_postponement(self, request, queryset):
         # Potential circular imports
-        from base.business.education_groups.automatic_postponement import EducationGroupAutomaticPostponement
-        from base.views.common import display_success_messages, display_error_messages
+        from base.business.postponement_job import start_postponement_job
+        from base.views.common import display_success_messages
 
-        result, errors = EducationGroupAutomaticPostponement(queryset).postpone()
-        count = len(result)
+        job = start_postponement_job(postponement_type.EDUCATION_GROUPS, queryset, request.user)
         display_success_messages(
             request, ngettext(
-                '%(count)d education group has been postponed with success',
-                '%(count)d education groups have been postponed with success', count
-            ) % {'count': count}
+                '%(count)d education group will be postponed in background',
+                '%(count)d education groups will be postponed in background', job.total
+            ) % {'count': job.total}
         )
-        if errors:
-            display_error_messages(request, "{} : {}".format(
-                _("The following education groups ended with error"),
-                ", ".join([str(error) for error in errors])
-            ))
 
     apply_education_group_year_postponement.short_description = _("Apply postponement on education group year")
 
@@ -553,10 +547,10 @@ class EducationGroupYear(models.Model):
             select_related("child_leaf", "child_leaf__learning_container_year")
 
     def group_element_year_leaves_with_annotate_on_prerequisites(self, root_id):
-        has_prerequisite = Prerequisite.objects.filter(
-            education_group_year__id=root_id,
-            learning_unit_year__id=OuterRef("child_leaf__id"),
-        ).exclude(prerequisite__exact='')
+        has_prerequisite = PrerequisiteItem.objects.filter(
+            prerequisite__education_group_year__id=root_id,
+            prerequisite__learning_unit_year__id=OuterRef("child_leaf__id"),
+        )
         return self.group_element_year_leaves.annotate(has_prerequisites=Exists(has_prerequisite))
 
     @cached_property
@@ -23,15 +23,29 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import logging
+import uuid
+
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 
 from base.models import academic_calendar
 from base.models import entity_version
 from base.models.abstracts.abstract_calendar import AbstractCalendar
 from base.models.academic_year import current_academic_year, starting_academic_year
+from base.utils.cache import cache
 from osis_common.models.osis_model_admin import OsisModelAdmin
 
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+EFFECTIVE_CALENDARS_CACHE_TIMEOUT = 60 * 60 * 24
+PREFIX_EFFECTIVE_CALENDARS_KEY = 'effective_entity_calendars'
+# Bumped when an entity calendar, an academic calendar or the entity structure is modified
+VERSION_KEY = 'effective_entity_calendars_version'
+
 
 class EntityCalendarAdmin(OsisModelAdmin):
     list_display = ('academic_calendar', 'entity', 'start_date', 'end_date', 'changed')
@@ -64,49 +78,130 @@ def find_by_entity_and_reference_and_academic_year(entity_id, reference, academi
 
 
 def find_interval_dates_for_entity(ac_year, reference, entity):
-    return next((
-        date_computed for entity_id, date_computed in build_calendar_by_entities(ac_year, reference).items()
-        if entity.id == entity_id
-    ), None)
+    return build_calendar_by_entities(ac_year, reference).get(entity.id)
+
+
+def find_effective_entity_calendar(entity_id, reference, ac_year):
+    """
+    Return the entity calendar which applies to the entity: its own calendar or, without it, the calendar of its
+    closest parent. Return None when no entity calendar applies (the academic calendar applies).
+    """
+    sources = _get_effective_calendars(ac_year, reference)['sources']
+    if entity_id not in sources:
+        # Entity out of the structure of the academic year: no inheritance
+        return find_by_entity_and_reference_and_academic_year(entity_id, reference, ac_year)
+    entity_calendar = _find_entity_calendar(sources[entity_id])
+    if entity_calendar is None and sources[entity_id] is not None:
+        # The cached entity calendar has been deleted meanwhile: the effective calendars are computed again
+        effective_calendars = _compute_effective_calendars(ac_year, reference)
+        _set_in_cache(ac_year.id, reference, effective_calendars)
+        entity_calendar = _find_entity_calendar(effective_calendars['sources'].get(entity_id))
+    return entity_calendar
+
+
+def _find_entity_calendar(entity_calendar_id):
+    if entity_calendar_id is None:
+        return None
+    return EntityCalendar.objects.select_related('entity', 'academic_calendar__academic_year')\
+        .filter(pk=entity_calendar_id).first()
 
 
 def build_calendar_by_entities(ac_year, reference):
     """
     This function will compute date for each entity. If entity calendar not exist,
     get default date to academic calendar"""
-    entity_structure = entity_version.build_current_entity_version_structure_in_memory(date=ac_year.end_date)
-    entities_id = list(entity_structure.keys())
+    return _get_effective_calendars(ac_year, reference)['dates']
+
+
+def _get_effective_calendars(ac_year, reference):
+    """
+    The dates and the entity calendar which apply to each entity of the structure are computed in one pass and kept
+    in cache until an entity calendar, an academic calendar or an entity version is modified.
+    """
+    effective_calendars = _get_from_cache(ac_year.id, reference)
+    if effective_calendars is None:
+        effective_calendars = _compute_effective_calendars(ac_year, reference)
+        _set_in_cache(ac_year.id, reference, effective_calendars)
+    return effective_calendars
+
+
+def _compute_effective_calendars(ac_year, reference):
+    parent_by_entity_id = _get_parent_by_entity_id(ac_year.end_date)
     ac_calendar = academic_calendar.get_by_reference_and_academic_year(reference, ac_year)
-    all_entities_calendars = EntityCalendar.objects.filter(entity__in=entities_id, academic_calendar=ac_calendar)\
-                                                   .select_related('entity')
+    all_entities_calendars = EntityCalendar.objects.filter(entity__in=list(parent_by_entity_id),
+                                                           academic_calendar=ac_calendar)
 
     # Specific date for an entity [record found on entity calendar]
-    entity_calendar_computed = {}
+    dates, sources = {}, {}
     for entity_calendar in all_entities_calendars:
         # FIXME: We should use date OR datetime in all database model
-        entity_calendar_computed[entity_calendar.entity_id] = {
+        dates[entity_calendar.entity_id] = {
             'start_date': entity_calendar.start_date.date(),
             'end_date': entity_calendar.end_date.date(),
         }
-        entities_id.remove(entity_calendar.entity_id)
+        sources[entity_calendar.entity_id] = entity_calendar.id
 
-    default_dates = {'start_date': ac_calendar.start_date, 'end_date': ac_calendar.end_date}
-    entity_calendar_computed.update({
-        entity_id: _get_start_end_date_of_parent(entity_id, entity_structure, entity_calendar_computed, default_dates)
-        for entity_id in entities_id
-    })
-    return entity_calendar_computed
+    default_dates = {'start_date': ac_calendar.start_date, 'end_date': ac_calendar.end_date} if ac_calendar else None
+    for entity_id in parent_by_entity_id:
+        _inherit_dates_of_parent(entity_id, parent_by_entity_id, dates, sources, default_dates)
+    return {'dates': dates, 'sources': sources}
 
 
-def _get_start_end_date_of_parent(entity_id, entity_structure, entity_calendar_computed, default_date):
-    # Case found start/end date for entity
-    if entity_id in entity_calendar_computed:
-        return entity_calendar_computed[entity_id]
+def _get_parent_by_entity_id(date):
+    # Same version by entity as entity_version.build_current_entity_version_structure_in_memory
+    parent_by_entity_id = dict(entity_version.find_latest_version(date).values_list('entity_id', 'parent_id'))
+    return {entity_id: parent_id if parent_id in parent_by_entity_id else None
+            for entity_id, parent_id in parent_by_entity_id.items()}
 
-    # Case have parent, lookup start/end date in parent
-    if entity_structure[entity_id]['entity_version_parent']:
-        parent_entity_id = entity_structure[entity_id]['entity_version_parent'].entity_id
-        return _get_start_end_date_of_parent(parent_entity_id, entity_structure, entity_calendar_computed, default_date)
 
-    # Case no entity calendar at all
-    return default_date
+def _inherit_dates_of_parent(entity_id, parent_by_entity_id, dates, sources, default_dates):
+    # Walk up to the first entity already computed, then give its dates to all the entities of the path
+    path = []
+    while entity_id is not None and entity_id not in dates:
+        path.append(entity_id)
+        entity_id = parent_by_entity_id[entity_id]
+
+    inherited_dates = dates[entity_id] if entity_id is not None else default_dates
+    inherited_source = sources.get(entity_id)
+    for entity_id in path:
+        dates[entity_id] = inherited_dates
+        sources[entity_id] = inherited_source
+
+
+def _get_from_cache(academic_year_id, reference):
+    try:
+        return cache.get(_get_effective_calendars_key(academic_year_id, reference))
+    except Exception:
+        logger.exception('An error occurred with cache system')
+        return None
+
+
+def _set_in_cache(academic_year_id, reference, effective_calendars):
+    try:
+        cache.set(_get_effective_calendars_key(academic_year_id, reference), effective_calendars,
+                  timeout=EFFECTIVE_CALENDARS_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+def _get_effective_calendars_key(academic_year_id, reference):
+    return "_".join([PREFIX_EFFECTIVE_CALENDARS_KEY, str(academic_year_id), str(reference),
+                     cache.get(VERSION_KEY, '')])
+
+
+def invalidate_cache():
+    try:
+        cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+@receiver(post_save, sender=EntityCalendar)
+@receiver(post_delete, sender=EntityCalendar)
+@receiver(post_save, sender=academic_calendar.AcademicCalendar)
+@receiver(post_delete, sender=academic_calendar.AcademicCalendar)
+@receiver(post_save, sender=entity_version.EntityVersion)
+@receiver(post_delete, sender=entity_version.EntityVersion)
+def invalidate_effective_calendars(sender, **kwargs):
+    # After the commit, otherwise a concurrent request could cache the effective calendars of before the change
+    transaction.on_commit(invalidate_cache)
@@ -23,12 +23,28 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from django.db import models
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import models, transaction
 from django.db.models import Prefetch
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 
 from base.models import entity_version
+from base.utils.cache import cache
 from osis_common.models.serializable_model import SerializableModel, SerializableModelAdmin
 
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+SCOPE_CACHE_TIMEOUT = 60 * 60 * 24
+PREFIX_SCOPE_KEY = 'entity_manager_scope'
+PREFIX_VERSION_KEY = 'entity_manager_scope_version'
+# Version shared by all the users: bumped when the entity structure is modified
+STRUCTURE_VERSION_KEY = 'entity_manager_scope_version_structure'
+
 
 class EntityManagerAdmin(SerializableModelAdmin):
     list_display = ('person', 'structure', 'entity')
@@ -63,12 +79,78 @@ def is_entity_manager(user):
     return EntityManager.objects.filter(person__user=user).count() > 0
 
 
-def find_entities_with_descendants_from_entity_managers(entities_manager):
-    entities_with_descendants = []
-    entities_by_id = entity_version.build_current_entity_version_structure_in_memory()
-    for entity_manager in entities_manager:
-        entities_with_descendants.append(entity_manager.entity)
-        entities_with_descendants += [
-            ent_version.entity for ent_version in entities_by_id[entity_manager.entity_id].get('all_children')
-        ]
-    return entities_with_descendants
+def find_managed_entity_ids(user):
+    """
+    Return the ids of the entities managed by the user and of all their descendants, as a frozenset which can be
+    used directly in an __in filter.
+
+    The ids are loaded in 2 queries and cached by user and by day (the structure depends on the date) until one of
+    its entity managers or the structure changes. A set rather than a subquery: the recursive structure query is
+    run once for all the requests of the user, and the permission checks test the membership of an entity without
+    any query. The set is bounded by the size of the faculties managed by the user.
+    """
+    entity_ids = _get_from_cache(user.id)
+    if entity_ids is None:
+        entity_ids = _load_managed_entity_ids(user)
+        _set_in_cache(user.id, entity_ids)
+    return entity_ids
+
+
+def _load_managed_entity_ids(user):
+    managed_entity_ids = list(
+        EntityManager.objects.filter(person__user=user, entity__isnull=False).values_list('entity_id', flat=True)
+    )
+    if not managed_entity_ids:
+        return frozenset()
+    return frozenset(row['entity_id'] for row in entity_version.EntityVersion.objects.get_tree(managed_entity_ids))
+
+
+def _get_from_cache(user_id):
+    try:
+        return cache.get(_get_scope_key(user_id))
+    except Exception:
+        logger.exception('An error occurred with cache system')
+        return None
+
+
+def _set_in_cache(user_id, entity_ids):
+    try:
+        cache.set(_get_scope_key(user_id), entity_ids, timeout=SCOPE_CACHE_TIMEOUT)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+def _get_scope_key(user_id):
+    version_key = _get_version_key(user_id)
+    versions = cache.get_many([version_key, STRUCTURE_VERSION_KEY])
+    return "_".join([
+        PREFIX_SCOPE_KEY, str(user_id), timezone.now().date().isoformat(), versions.get(version_key, ''),
+        versions.get(STRUCTURE_VERSION_KEY, '')
+    ])
+
+
+def _get_version_key(user_id):
+    return "_".join([PREFIX_VERSION_KEY, str(user_id)])
+
+
+def invalidate_cache(user_id=None):
+    """ Invalidate the managed entities of a user or, without id, of all users """
+    try:
+        cache.set(_get_version_key(user_id) if user_id else STRUCTURE_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    except Exception:
+        logger.exception('An error occurred with cache system')
+
+
+@receiver(post_save, sender=EntityManager)
+@receiver(post_delete, sender=EntityManager)
+def invalidate_entity_manager_scope(sender, instance, **kwargs):
+    user_id = instance.person.user_id
+    if user_id:
+        transaction.on_commit(lambda: invalidate_cache(user_id))
+
+
+@receiver(post_save, sender=entity_version.EntityVersion)
+@receiver(post_delete, sender=entity_version.EntityVersion)
+def invalidate_entity_managers_scopes(sender, **kwargs):
+    # After the commit, otherwise a concurrent request could cache the managed entities of before the change
+    transaction.on_commit(invalidate_cache)
@@ -0,0 +1,44 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.utils.translation import ugettext_lazy as _
+
+LEARNING_UNITS = "LEARNING_UNITS"
+LEARNING_UNITS_WITH_PARAMETERS = "LEARNING_UNITS_WITH_PARAMETERS"
+LEARNING_UNITS_ATTRIBUTIONS = "LEARNING_UNITS_ATTRIBUTIONS"
+LEARNING_UNITS_COMPARISON = "LEARNING_UNITS_COMPARISON"
+PROPOSALS = "PROPOSALS"
+EDUCATION_GROUPS = "EDUCATION_GROUPS"
+EDUCATION_GROUPS_ADMINISTRATIVE = "EDUCATION_GROUPS_ADMINISTRATIVE"
+
+EXPORT_TYPES = (
+    (LEARNING_UNITS, _("Learning units")),
+    (LEARNING_UNITS_WITH_PARAMETERS, _("Learning units with parameters")),
+    (LEARNING_UNITS_ATTRIBUTIONS, _("Learning units and attributions")),
+    (LEARNING_UNITS_COMPARISON, _("Learning units comparison")),
+    (PROPOSALS, _("Proposals")),
+    (EDUCATION_GROUPS, _("Education groups")),
+    (EDUCATION_GROUPS_ADMINISTRATIVE, _("Education groups administrative data")),
+)
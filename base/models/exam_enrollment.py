@@ -37,6 +37,7 @@ from base.models.enums import exam_enrollment_state as enrollment_states, \
     exam_enrollment_justification_type as justification_types
 from base.models.exceptions import JustificationValueException
 from base.models.utils.admin_extentions import remove_delete_action
+from base.models.utils.utils import CollateC
 from osis_common.models.osis_model_admin import OsisModelAdmin
 
 JUSTIFICATION_ABSENT_FOR_TUTOR = _('absent')
@@ -168,10 +169,10 @@ def find_by_ids(ids):
 
 
 def get_session_exam_deadline(enrollment):
-    if hasattr(enrollment.learning_unit_enrollment.offer_enrollment, 'session_exam_deadlines') and \
-            enrollment.learning_unit_enrollment.offer_enrollment.session_exam_deadlines:
-        # Prefetch related
-        return enrollment.learning_unit_enrollment.offer_enrollment.session_exam_deadlines[0]
+    if hasattr(enrollment.learning_unit_enrollment.offer_enrollment, 'session_exam_deadlines'):
+        # Prefetch related: an empty list means that the offer enrollment has no deadline for the session
+        session_exam_deadlines = enrollment.learning_unit_enrollment.offer_enrollment.session_exam_deadlines
+        return session_exam_deadlines[0] if session_exam_deadlines else None
     else:
         # No prefetch
         offer_enrollment = enrollment.learning_unit_enrollment.offer_enrollment
@@ -301,7 +302,8 @@ def get_progress_by_learning_unit_years_and_offer_years(user,
                                         academic_year=academic_year,
                                         with_session_exam_deadline=False)
 
-    return queryset.values('session_exam', 'learning_unit_enrollment__learning_unit_year',
+    # The ordering of the exam enrollments would split the groups
+    return queryset.order_by().values('session_exam', 'learning_unit_enrollment__learning_unit_year',
                            'learning_unit_enrollment__offer_enrollment__offer_year') \
         .annotate(
         total_exam_enrollments=Count('id'),
@@ -354,7 +356,7 @@ def find_for_score_encodings(session_exam_number,
                                               are returned.
     :param with_justification_or_score_draft: If True, only examEnrollments with a score_draft or a justification_draft
                                               are returned.
-    :return: All filtered examEnrollments.
+    :return: All filtered examEnrollments, sorted by learning unit year, offer year and student name.
     """
     if not academic_year:
         academic_year = academic_yr.current_academic_year()
@@ -414,7 +416,10 @@ def find_for_score_encodings(session_exam_number,
     return queryset.select_related('learning_unit_enrollment__offer_enrollment__offer_year') \
         .select_related('session_exam') \
         .select_related('learning_unit_enrollment__offer_enrollment__student__person') \
-        .select_related('learning_unit_enrollment__learning_unit_year')
+        .select_related('learning_unit_enrollment__learning_unit_year') \
+        .order_by(CollateC('learning_unit_enrollment__learning_unit_year__acronym'),
+                  CollateC('learning_unit_enrollment__offer_enrollment__offer_year__acronym'),
+                  CollateC('learning_unit_enrollment__offer_enrollment__student__person__sort_key'))
 
 
 def find_by_student(a_student):
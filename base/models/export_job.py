@@ -0,0 +1,71 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+from django.urls import reverse
+from django.utils.translation import ugettext_lazy as _
+
+from base.models.enums import export_job_status, export_type
+from osis_common.models.osis_model_admin import OsisModelAdmin
+
+
+class ExportJobAdmin(OsisModelAdmin):
+    list_display = ('user', 'export_type', 'status', 'created', 'finished')
+    list_filter = ('status', 'export_type')
+    search_fields = ['user__username']
+    raw_id_fields = ('user',)
+    readonly_fields = ('task_id', 'created', 'finished')
+
+
+class ExportJob(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    export_type = models.CharField(max_length=50, choices=export_type.EXPORT_TYPES, verbose_name=_('type'))
+    parameters = JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=export_job_status.EXPORT_JOB_STATUS,
+                              default=export_job_status.PENDING, db_index=True, verbose_name=_('status'))
+    file = models.FileField(upload_to='exports', blank=True, null=True)
+    error = models.TextField(blank=True, default='')
+    task_id = models.CharField(max_length=255, blank=True, default='')
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ('-created',)
+
+    def __str__(self):
+        return "{} - {} ({})".format(self.user, self.export_type, self.status)
+
+    def get_absolute_url(self):
+        return reverse('export_job_download', args=[self.pk])
+
+    @property
+    def is_done(self):
+        return self.status == export_job_status.DONE
+
+
+def find_by_user(user):
+    return ExportJob.objects.filter(user=user)
@@ -33,10 +33,9 @@ from django.utils.translation import ugettext_lazy as _
 from ordered_model.models import OrderedModel
 
 from backoffice.settings.base import LANGUAGE_CODE_EN
-from base.models import education_group_type, education_group_year
-from base.models.education_group_type import GROUP_TYPE_OPTION
+from base.models import education_group_year
 from base.models.education_group_year import EducationGroupYear
-from base.models.enums import education_group_categories, link_type, quadrimesters
+from base.models.enums import link_type, quadrimesters
 from base.models.learning_component_year import LearningComponentYear, volume_total_verbose
 from base.models.learning_unit_year import LearningUnitYear
 from osis_common.decorators.deprecated import deprecated
@@ -238,23 +237,12 @@ def find_by_child_leaf(learning_unit_year):
 def find_learning_unit_formations(objects, parents_as_instances=False):
     root_ids_by_object_id = {}
     if objects:
-        filters = _get_root_filters()
-        root_ids_by_object_id = _find_related_formations(objects, filters)
+        root_ids_by_object_id = _find_related_formations(objects)
         if parents_as_instances:
             root_ids_by_object_id = _convert_parent_ids_to_instances(root_ids_by_object_id)
     return root_ids_by_object_id
 
 
-def _get_root_filters():
-    root_type_names = education_group_type.search(category=education_group_categories.MINI_TRAINING) \
-        .exclude(name=GROUP_TYPE_OPTION).values_list('name', flat=True)
-    root_categories = [education_group_categories.TRAINING]
-    return {
-        'parent__education_group_type__name': root_type_names,
-        'parent__education_group_type__category': root_categories
-    }
-
-
 def _convert_parent_ids_to_instances(root_ids_by_object_id):
     flat_root_ids = list(set(itertools.chain.from_iterable(root_ids_by_object_id.values())))
     map_instance_by_id = {obj.id: obj for obj in education_group_year.search(id=flat_root_ids)}
@@ -273,69 +261,22 @@ def _raise_if_incorrect_instance(objects):
         raise AttributeError("All objects must be the same class instance ({})".format(obj_class))
 
 
-def _find_related_formations(objects, filters):
+def _find_related_formations(objects):
+    from base.business.group_element_years.structure_snapshot import get_structure_snapshot
+
     _raise_if_incorrect_instance(objects)
-    academic_year = _extract_common_academic_year(objects)
-    parents_by_id = _build_parent_list_by_education_group_year_id(academic_year, filters=filters)
+    snapshot = get_structure_snapshot(_extract_common_academic_year_id(objects))
     if isinstance(objects[0], LearningUnitYear):
-        return {obj.id: _find_elements(parents_by_id, filters, child_leaf_id=obj.id) for obj in objects}
+        return {obj.id: snapshot.find_formation_ids(child_leaf_id=obj.id) for obj in objects}
     else:
-        return {obj.id: _find_elements(parents_by_id, filters, child_branch_id=obj.id) for obj in objects}
+        return {obj.id: snapshot.find_formation_ids(child_branch_id=obj.id) for obj in objects}
 
 
-def _extract_common_academic_year(objects):
+def _extract_common_academic_year_id(objects):
     if len(set(getattr(obj, 'academic_year_id') for obj in objects)) > 1:
         raise AttributeError("The algorithm should load only graph/structure for 1 academic_year "
                              "to avoid too large 'in-memory' data and performance issues.")
-    return objects[0].academic_year
-
-
-def _build_parent_list_by_education_group_year_id(academic_year, filters=None):
-    columns_needed_for_filters = filters.keys() if filters else []
-    group_elements = list(search(academic_year=academic_year)
-                          .filter(parent__isnull=False)
-                          .filter(Q(child_leaf__isnull=False) | Q(child_branch__isnull=False))
-                          .select_related('education_group_year__education_group_type')
-                          .values('parent', 'child_branch', 'child_leaf', *columns_needed_for_filters))
-    result = {}
-    # TODO :: uses .annotate() on queryset to make the below expected result
-    for group_element_year in group_elements:
-        key = _build_child_key(child_branch=group_element_year['child_branch'],
-                               child_leaf=group_element_year['child_leaf'])
-        result.setdefault(key, []).append(group_element_year)
-    return result
-
-
-def _build_child_key(child_branch=None, child_leaf=None):
-    args = [child_leaf, child_branch]
-    if not any(args) or all(args):
-        raise AttributeError('Only one of the 2 param must bet set (not both of them).')
-    if child_leaf:
-        branch_part = 'child_leaf'
-        id_part = child_leaf
-    else:
-        branch_part = 'child_branch'
-        id_part = child_branch
-    return '{branch_part}_{id_part}'.format(**locals())
-
-
-def _find_elements(group_elements_by_child_id, filters, child_leaf_id=None, child_branch_id=None):
-    roots = []
-    unique_child_key = _build_child_key(child_leaf=child_leaf_id, child_branch=child_branch_id)
-    group_elem_year_parents = group_elements_by_child_id.get(unique_child_key) or []
-    for group_elem_year in group_elem_year_parents:
-        parent_id = group_elem_year['parent']
-        if filters and _match_any_filters(group_elem_year, filters):
-            # If record matches any filter, we must stop mounting across the hierarchy.
-            roots.append(parent_id)
-        else:
-            # Recursive call ; the parent_id becomes the child_branch.
-            roots.extend(_find_elements(group_elements_by_child_id, filters, child_branch_id=parent_id))
-    return list(set(roots))
-
-
-def _match_any_filters(element_year, filters):
-    return any(element_year[col_name] in values_list for col_name, values_list in filters.items())
+    return objects[0].academic_year_id
 
 
 def get_or_create_group_element_year(parent, child_branch=None, child_leaf=None):
@@ -35,7 +35,7 @@ from django.utils.translation import ugettext_lazy as _, ngettext
 from base.models import entity_container_year as mdl_entity_container_year
 from base.models.academic_year import compute_max_academic_year_adjournment, AcademicYear, \
     MAX_ACADEMIC_YEAR_FACULTY, starting_academic_year
-from base.models.enums import active_status, learning_container_year_types
+from base.models.enums import active_status, learning_container_year_types, postponement_type
 from base.models.enums import learning_unit_year_subtypes, internship_subtypes, \
     learning_unit_year_session, entity_container_year_link_type, quadrimesters, attribution_procedure
 from base.models.enums.learning_container_year_types import COURSE, INTERNSHIP
@@ -68,22 +68,18 @@ class LearningUnitYearAdmin(SerializableModelAdmin):
 
     def apply_learning_unit_year_postponement(self, request, queryset):
         # Potential circular imports
-        from base.business.learning_units.automatic_postponement import LearningUnitAutomaticPostponement
-        from base.views.common import display_success_messages, display_error_messages
+        from base.business.postponement_job import start_postponement_job
+        from base.views.common import display_success_messages
 
-        result, errors = LearningUnitAutomaticPostponement(queryset.filter(learning_container_year__isnull=False))
-        count = len(result)
+        job = start_postponement_job(
+            postponement_type.LEARNING_UNITS, queryset.filter(learning_container_year__isnull=False), request.user
+        )
         display_success_messages(
             request, ngettext(
-                '%(count)d learning unit has been postponed with success',
-                '%(count)d learning units have been postponed with success', count
-            ) % {'count': count}
+                '%(count)d learning unit will be postponed in background',
+                '%(count)d learning units will be postponed in background', job.total
+            ) % {'count': job.total}
         )
-        if errors:
-            display_error_messages(request, "{} : {}".format(
-                _("The following learning units ended with error"),
-                ", ".join([str(error) for error in errors])
-            ))
 
     apply_learning_unit_year_postponement.short_description = _("Apply postponement on learning unit year")
 
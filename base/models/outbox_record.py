@@ -0,0 +1,55 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+
+from osis_common.models.osis_model_admin import OsisModelAdmin
+
+
+class OutboxRecordAdmin(OsisModelAdmin):
+    list_display = ('model', 'object_id', 'to_delete', 'created')
+    list_filter = ('model', 'to_delete')
+    readonly_fields = ('model', 'object_id', 'to_delete', 'payload', 'created')
+
+
+class OutboxRecord(models.Model):
+    """
+    Change of a serializable object, written in the transaction of the change and published afterwards
+    on the queues by base.business.outbox.relay_outbox
+    """
+    # Label of the model, as 'base.entity'
+    model = models.CharField(max_length=100)
+    object_id = models.IntegerField()
+    to_delete = models.BooleanField(default=False)
+    # Serialization of a deleted object, the other objects are serialized when they are published
+    payload = JSONField(blank=True, null=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('pk',)
+
+    def __str__(self):
+        return "{} {}{}".format(self.model, self.object_id, " (deleted)" if self.to_delete else "")
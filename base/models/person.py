@@ -23,6 +23,7 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import unicodedata
 from datetime import date
 
 from django.conf import settings
@@ -74,6 +75,8 @@ class Person(SerializableModel):
     source = models.CharField(max_length=25, blank=True, null=True, choices=person_source_type.CHOICES,
                               default=person_source_type.BASE)
     employee = models.BooleanField(default=False)
+    # Accent and case insensitive key used to sort persons by last name and first name in the database
+    sort_key = models.CharField(max_length=255, blank=True, default='', db_index=True, editable=False)
 
     def save(self, **kwargs):
         # When person is created by another application this rule can be applied.
@@ -84,6 +87,7 @@ class Person(SerializableModel):
                                and settings.INTERNAL_EMAIL_SUFFIX in str(self.email).lower():
                     raise AttributeError('Invalid email for external person.')
 
+        self.sort_key = self.get_sort_key(self.first_name, self.last_name)
         super(Person, self).save()
 
     def username(self):
@@ -120,6 +124,14 @@ class Person(SerializableModel):
             middle_name or ""
         ]).strip()
 
+    @staticmethod
+    def get_sort_key(first_name, last_name):
+        """
+        Return the last name and the first name without spaces nor accents, in upper case.
+        For example : ('Zoé', 'De Là') ==> 'DELA ZOE'
+        """
+        return "{} {}".format(_normalize_string(last_name), _normalize_string(first_name))
+
     @cached_property
     def linked_entities(self):
         entities_id = set()
@@ -248,3 +260,10 @@ def find_by_firstname_or_lastname(name):
 
 def is_person_linked_to_entity_in_charge_of_learning_unit(learning_unit_year, person):
     return person.is_linked_to_entity_in_charge_of_learning_unit_year(learning_unit_year)
+
+
+def _normalize_string(string):
+    if not string:
+        return ''
+    string = string.replace(" ", "")
+    return ''.join((c for c in unicodedata.normalize('NFD', string) if unicodedata.category(c) != 'Mn')).upper()
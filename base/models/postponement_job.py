@@ -0,0 +1,88 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+from base.models.enums import export_job_status, postponement_type
+from osis_common.models.osis_model_admin import OsisModelAdmin
+
+
+class PostponementJobAdmin(OsisModelAdmin):
+    list_display = ('postponement_type', 'academic_year', 'status', 'processed', 'total', 'created', 'finished')
+    list_filter = ('status', 'postponement_type')
+    raw_id_fields = ('user', 'academic_year')
+    readonly_fields = ('processed', 'already_duplicated_count', 'to_not_duplicate_count', 'result', 'errors',
+                       'created', 'finished')
+
+
+class PostponementJob(models.Model):
+    """ Progress and results of an automatic postponement run by chunks on the celery workers """
+    postponement_type = models.CharField(max_length=50, choices=postponement_type.POSTPONEMENT_TYPES,
+                                         verbose_name=_('type'))
+    # Person who started the postponement from the admin, empty for the annual procedure
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, blank=True, null=True, on_delete=models.SET_NULL)
+    # Academic year of the postponed objects (N+6)
+    academic_year = models.ForeignKey('AcademicYear', on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=export_job_status.EXPORT_JOB_STATUS,
+                              default=export_job_status.PENDING, db_index=True, verbose_name=_('status'))
+    total = models.PositiveIntegerField(default=0)
+    # Statistics computed when the job is started, sent with the results
+    already_duplicated_count = models.PositiveIntegerField(default=0)
+    to_not_duplicate_count = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    result = JSONField(default=list)
+    errors = JSONField(default=list)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ('-created',)
+
+    def __str__(self):
+        return "{} - {} ({})".format(self.postponement_type, self.academic_year, self.status)
+
+    @property
+    def progress(self):
+        """ Percentage of the objects already processed """
+        if not self.total:
+            return 100
+        return int(self.processed * 100 / self.total)
+
+    @property
+    def is_done(self):
+        return self.status == export_job_status.DONE
+
+
+class PostponementJobItem(models.Model):
+    """ Object to postpone by a job, processed once even when the celery task of its chunk is delivered again """
+    job = models.ForeignKey(PostponementJob, related_name='items', on_delete=models.CASCADE)
+    object_id = models.IntegerField()
+    processed = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('job', 'object_id')
@@ -23,13 +23,16 @@
 #    see http://www.gnu.org/licenses/.
 #
 #############################################################################
+import re
+
 from django.core import validators
-from django.db import models
+from django.db import models, transaction
 from django.utils.functional import lazy
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 
 from base.models import learning_unit
+from base.models.learning_unit_year import LearningUnitYear
 from osis_common.models.osis_model_admin import OsisModelAdmin
 
 AND_OPERATOR = "ET"
@@ -56,6 +59,11 @@ PREREQUISITE_SYNTAX_REGEX = r'^({no_element_regex}|' \
                                 multiple_elements_regex_and=MULTIPLE_PREREQUISITES_REGEX_AND,
                                 multiple_elements_regex_or=MULTIPLE_PREREQUISITES_REGEX_OR
                             )
+PREREQUISITE_TOKEN_REGEX = r'\(|\)|[^\s()]+'
+OPERATOR_CHOICES = (
+    (AND_OPERATOR, _('And')),
+    (OR_OPERATOR, _('Or')),
+)
 mark_safe_lazy = lazy(mark_safe, str)
 prerequisite_syntax_validator = validators.RegexValidator(regex=PREREQUISITE_SYNTAX_REGEX,
                                                           message=mark_safe_lazy(_("Prerequisites are invalid")))
@@ -75,9 +83,92 @@ class Prerequisite(models.Model):
     learning_unit_year = models.ForeignKey("LearningUnitYear")
     education_group_year = models.ForeignKey("EducationGroupYear")
     prerequisite = models.CharField(blank=True, max_length=240, default="", validators=[prerequisite_syntax_validator])
+    main_operator = models.CharField(max_length=5, choices=OPERATOR_CHOICES, default=AND_OPERATOR)
 
     class Meta:
         unique_together = ('learning_unit_year', 'education_group_year')
 
     def __str__(self):
         return "{}{} : {}".format(self.education_group_year, self.learning_unit_year, self.prerequisite)
+
+    @property
+    def secondary_operator(self):
+        return OR_OPERATOR if self.main_operator == AND_OPERATOR else AND_OPERATOR
+
+    def save(self, *args, **kwargs):
+        self.main_operator, groups = parse_prerequisite(self.prerequisite)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._compile_items(groups)
+
+    def _compile_items(self, groups):
+        """ Replace the items of the prerequisite by the acronyms of the parsed groups """
+        self.prerequisiteitem_set.all().delete()
+        acronyms = {acronym for group in groups for acronym in group}
+        learning_unit_year_ids = dict(
+            LearningUnitYear.objects.filter(
+                acronym__in=acronyms,
+                academic_year__learningunityear=self.learning_unit_year_id,
+            ).values_list('acronym', 'id')
+        ) if acronyms else {}
+        PrerequisiteItem.objects.bulk_create(
+            PrerequisiteItem(
+                prerequisite=self,
+                acronym=acronym,
+                learning_unit_year_id=learning_unit_year_ids.get(acronym),
+                group_number=group_number,
+                position=position,
+            )
+            for group_number, group in enumerate(groups, start=1)
+            for position, acronym in enumerate(group, start=1)
+        )
+
+
+class PrerequisiteItemAdmin(OsisModelAdmin):
+    list_display = ('prerequisite', 'acronym', 'learning_unit_year', 'group_number', 'position')
+    raw_id_fields = ('prerequisite', 'learning_unit_year')
+    search_fields = ['acronym', 'prerequisite__learning_unit_year__acronym',
+                     'prerequisite__education_group_year__acronym']
+
+
+class PrerequisiteItem(models.Model):
+    """
+    An acronym of a prerequisite, stored in the group of acronyms joined by the secondary operator it belongs to.
+    The groups are joined by the main operator of the prerequisite.
+    """
+    prerequisite = models.ForeignKey(Prerequisite, on_delete=models.CASCADE)
+    acronym = models.CharField(max_length=15, db_index=True)
+    learning_unit_year = models.ForeignKey("LearningUnitYear", null=True, blank=True, on_delete=models.SET_NULL)
+    group_number = models.PositiveIntegerField()
+    position = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ('prerequisite', 'group_number', 'position')
+        ordering = ('group_number', 'position')
+
+    def __str__(self):
+        return "{} : {} ({}.{})".format(self.prerequisite, self.acronym, self.group_number, self.position)
+
+
+def parse_prerequisite(prerequisite_string):
+    """
+    Parse a prerequisite matching PREREQUISITE_SYNTAX_REGEX.
+    Return the main operator and the list of groups of acronyms, a single acronym being a group of one element.
+    """
+    main_operator = AND_OPERATOR
+    groups = []
+    current_group = None
+    for token in re.findall(PREREQUISITE_TOKEN_REGEX, prerequisite_string or ''):
+        if token == '(':
+            current_group = []
+        elif token == ')':
+            groups.append(current_group)
+            current_group = None
+        elif token in (AND_OPERATOR, OR_OPERATOR):
+            if current_group is None:
+                main_operator = token
+        elif current_group is None:
+            groups.append([token])
+        else:
+            current_group.append(token)
+    return main_operator, groups
@@ -25,6 +25,7 @@
 ##############################################################################
 from enum import Enum
 
+from django.db.models import Func
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils.translation import ugettext_lazy as _
@@ -40,6 +41,14 @@ class ChoiceEnum(Enum):
         return tuple((x.name, _(x.value)) for x in cls)
 
 
+class CollateC(Func):
+    """
+    Compare the values of a text expression on their code points (COLLATE "C"), as Python compares the strings,
+    rather than with the linguistic collation of the database.
+    """
+    template = '%(expressions)s COLLATE "C"'
+
+
 def get_object_or_none(klass, *args, **kwargs):
     try:
         return get_object_or_404(klass, *args, **kwargs)
@@ -51,3 +60,19 @@ def get_object_or_none(klass, *args, **kwargs):
             "First argument to get_object_or_none() must be a Model, Manager, "
             "or QuerySet, not '%s'." % klass__name
         )
+
+
+def iterate_by_chunks(objects, chunk_size=500):
+    """
+    Iterate over a queryset by evaluating it by slices of chunk_size objects.
+
+    Unlike QuerySet.iterator(), each slice keeps the select_related and the prefetch_related of the queryset.
+    The queryset must have a deterministic ordering.
+    """
+    offset = 0
+    while True:
+        chunk = list(objects[offset:offset + chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        offset += chunk_size
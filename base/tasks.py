@@ -1,8 +1,8 @@
 from celery.schedules import crontab
 
 from backoffice.celery import app as celery_app
-from base.business.education_groups.automatic_postponement import EducationGroupAutomaticPostponement
-from base.business.learning_units.automatic_postponement import LearningUnitAutomaticPostponement
+from base.business import export_job, academic_calendar, learning_unit_proposal, postponement_job, outbox
+from base.models.enums import postponement_type
 
 celery_app.conf.beat_schedule.update({
     'Extend learning units': {
@@ -14,9 +14,7 @@ celery_app.conf.beat_schedule.update({
 
 @celery_app.task
 def extend_learning_units():
-    process = LearningUnitAutomaticPostponement()
-    process.postpone()
-    return process.serialize_postponement_results()
+    return postponement_job.start_postponement_job(postponement_type.LEARNING_UNITS).pk
 
 
 celery_app.conf.beat_schedule.update({
@@ -29,6 +27,59 @@ celery_app.conf.beat_schedule.update({
 
 @celery_app.task
 def extend_education_groups():
-    process = EducationGroupAutomaticPostponement()
-    process.postpone()
-    return process.serialize_postponement_results()
+    return postponement_job.start_postponement_job(postponement_type.EDUCATION_GROUPS).pk
+
+
+@celery_app.task
+def run_postponement_chunk(postponement_job_id, object_ids):
+    return postponement_job.run_postponement_chunk(postponement_job_id, object_ids)
+
+
+@celery_app.task
+def run_export_job(export_job_id):
+    return export_job.run_export_job(export_job_id)
+
+
+celery_app.conf.beat_schedule.update({
+    'Purge the expired export jobs': {
+        'task': 'base.tasks.purge_export_jobs',
+        'schedule': crontab(minute=0, hour=3)
+    },
+})
+
+
+@celery_app.task
+def purge_export_jobs():
+    return export_job.purge_export_jobs()
+
+
+celery_app.conf.beat_schedule.update({
+    'Send academic calendar notifications': {
+        'task': 'base.tasks.send_academic_calendar_notifications',
+        'schedule': crontab(minute=0)
+    },
+})
+
+
+@celery_app.task
+def send_academic_calendar_notifications():
+    return academic_calendar.send_academic_calendar_notifications()
+
+
+@celery_app.task
+def apply_action_on_proposals(action, proposal_ids, author_id, research_criteria):
+    return learning_unit_proposal.apply_action_on_proposals_in_background(action, proposal_ids, author_id,
+                                                                          research_criteria)
+
+
+celery_app.conf.beat_schedule.update({
+    'Relay the queue outbox': {
+        'task': 'base.tasks.relay_outbox',
+        'schedule': crontab()
+    },
+})
+
+
+@celery_app.task
+def relay_outbox():
+    return outbox.relay_outbox()
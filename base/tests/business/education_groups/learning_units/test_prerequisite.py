@@ -28,11 +28,13 @@ import itertools
 from django.test import TestCase
 
 from base.business.education_groups.learning_units.prerequisite import extract_learning_units_acronym_from_prerequisite, \
-    get_learning_units_which_are_outside_of_education_group
+    get_learning_units_which_are_outside_of_education_group, find_learning_unit_years_which_require, \
+    get_prerequisite_acronyms_outside_of_education_group_by_learning_unit_year
 from base.tests.factories.academic_year import AcademicYearFactory
 from base.tests.factories.education_group_year import TrainingFactory, MiniTrainingFactory
 from base.tests.factories.group_element_year import GroupElementYearFactory
-from base.tests.factories.learning_unit_year import LearningUnitYearFakerFactory
+from base.tests.factories.learning_unit_year import LearningUnitYearFakerFactory, LearningUnitYearFactory
+from base.tests.factories.prerequisite import PrerequisiteFactory
 
 
 class TestLearningUnitsAcronymsFromPrerequisite(TestCase):
@@ -119,3 +121,44 @@ class TestGetLearningUnitsWhichAreNotInsideTraining(TestCase):
         self.assertCountEqual(get_learning_units_which_are_outside_of_education_group(self.education_group_year_root,
                                                                                       learning_units_acronym),
                          [luy_outside.acronym, luy_outside_2.acronym])
+
+
+class TestPrerequisitesOfEducationGroup(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.academic_year = AcademicYearFactory()
+        cls.education_group_year_root = TrainingFactory(academic_year=cls.academic_year)
+        cls.learning_unit_years = [LearningUnitYearFactory(academic_year=cls.academic_year) for _ in range(0, 3)]
+        for learning_unit_year in cls.learning_unit_years:
+            GroupElementYearFactory(parent=cls.education_group_year_root, child_leaf=learning_unit_year,
+                                    child_branch=None)
+        cls.luy_outside = LearningUnitYearFactory(academic_year=cls.academic_year)
+
+        cls.prerequisite = PrerequisiteFactory(
+            education_group_year=cls.education_group_year_root,
+            learning_unit_year=cls.learning_unit_years[0],
+            prerequisite="{} ET {}".format(cls.learning_unit_years[1].acronym, cls.luy_outside.acronym)
+        )
+        PrerequisiteFactory(
+            education_group_year=cls.education_group_year_root,
+            learning_unit_year=cls.learning_unit_years[2],
+            prerequisite=cls.learning_unit_years[1].acronym
+        )
+        PrerequisiteFactory(learning_unit_year=cls.learning_unit_years[0],
+                            prerequisite=cls.learning_unit_years[2].acronym)
+
+    def test_find_learning_unit_years_which_require(self):
+        self.assertCountEqual(
+            find_learning_unit_years_which_require(self.education_group_year_root, self.learning_unit_years[1]),
+            [self.learning_unit_years[0], self.learning_unit_years[2]]
+        )
+        self.assertFalse(
+            find_learning_unit_years_which_require(self.education_group_year_root, self.learning_unit_years[2])
+        )
+
+    def test_get_prerequisite_acronyms_outside_of_education_group_by_learning_unit_year(self):
+        with self.assertNumQueries(2):
+            result = get_prerequisite_acronyms_outside_of_education_group_by_learning_unit_year(
+                self.education_group_year_root
+            )
+        self.assertEqual(result, {self.learning_unit_years[0].id: [self.luy_outside.acronym]})
@@ -0,0 +1,125 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from backoffice.settings.portal_conf import Section
+from base.business.education_groups.general_information import get_sections_with_translated_labels, FRENCH, \
+    ENGLISH, SPECIFIC, COMMON
+from base.tests.factories.education_group_year import EducationGroupYearFactory
+from base.utils.cache import cache
+from cms.enums import entity_name
+from cms.tests.factories.text_label import TextLabelFactory
+from cms.tests.factories.translated_text import TranslatedTextFactory
+from cms.tests.factories.translated_text_label import TranslatedTextLabelFactory
+
+SECTION_LIST = [
+    Section(title='Welcome', labels=[('welcome_introduction', 'specific')]),
+    Section(title='Detailed programme', labels=[('caap', 'specific,common')]),
+]
+
+
+@override_settings(SECTION_LIST=SECTION_LIST)
+class TestGetSectionsWithTranslatedLabels(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.education_group_year = EducationGroupYearFactory(acronym='DROI1BA')
+        cls.common_education_group_year = EducationGroupYearFactory(
+            acronym='common-1ba',
+            education_group_type=cls.education_group_year.education_group_type,
+            academic_year=cls.education_group_year.academic_year,
+        )
+        cls.welcome_label = TextLabelFactory(label='welcome_introduction', entity=entity_name.OFFER_YEAR)
+        cls.caap_label = TextLabelFactory(label='caap', entity=entity_name.OFFER_YEAR)
+        TranslatedTextLabelFactory(text_label=cls.welcome_label, label='Introduction', language=FRENCH)
+
+    def setUp(self):
+        cache.clear()
+        self.welcome_text = self._create_text(self.education_group_year, self.welcome_label, FRENCH, 'Bienvenue')
+        self._create_text(self.education_group_year, self.welcome_label, ENGLISH, 'Welcome')
+        self.common_caap_text = self._create_text(self.common_education_group_year, self.caap_label, FRENCH,
+                                                  'Commun')
+
+    @staticmethod
+    def _create_text(education_group_year, text_label, language, text):
+        return TranslatedTextFactory(entity=entity_name.OFFER_YEAR, reference=education_group_year.id,
+                                     text_label=text_label, language=language, text=text)
+
+    def test_sections_content(self):
+        sections = get_sections_with_translated_labels(self.education_group_year, FRENCH)
+
+        self.assertEqual([section.title for section in sections], ['Welcome', 'Detailed programme'])
+        self.assertEqual(sections[0].labels, [{
+            'label': 'welcome_introduction', 'type': SPECIFIC, 'translation': 'Introduction',
+            FRENCH: 'Bienvenue', ENGLISH: 'Welcome',
+        }])
+        caap_specific, caap_common = sections[1].labels
+        self.assertEqual((caap_specific['type'], caap_specific[FRENCH]), (SPECIFIC, None))
+        self.assertEqual((caap_common['type'], caap_common[FRENCH]), (COMMON, 'Commun'))
+        self.assertIn('caap', caap_common['translation'])
+
+    def test_common_education_group_year_has_no_common_records(self):
+        sections = get_sections_with_translated_labels(self.common_education_group_year, FRENCH)
+        self.assertEqual([record['type'] for record in sections[1].labels], [SPECIFIC])
+        self.assertEqual(sections[1].labels[0][FRENCH], 'Commun')
+
+    def test_fixed_number_of_queries_and_cached(self):
+        with self.assertNumQueries(3):
+            get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        with self.assertNumQueries(0):
+            get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        with self.assertNumQueries(3):
+            get_sections_with_translated_labels(self.education_group_year, ENGLISH)
+
+    def test_cache_invalidated_once_committed(self):
+        get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        self.welcome_text.text = 'Bonjour'
+        self.welcome_text.save()
+
+        # The transaction of the test case is never committed
+        sections = get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        self.assertEqual(sections[0].labels[0][FRENCH], 'Bienvenue')
+
+    @mock.patch('base.business.education_groups.general_information.transaction.on_commit',
+                side_effect=lambda func: func())
+    def test_cache_invalidated_when_specific_text_saved(self, mock_on_commit):
+        get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        self.welcome_text.text = 'Bonjour'
+        self.welcome_text.save()
+
+        sections = get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        self.assertEqual(sections[0].labels[0][FRENCH], 'Bonjour')
+
+    @mock.patch('base.business.education_groups.general_information.transaction.on_commit',
+                side_effect=lambda func: func())
+    def test_cache_invalidated_when_common_text_saved(self, mock_on_commit):
+        get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        self.common_caap_text.text = 'Modifié'
+        self.common_caap_text.save()
+
+        sections = get_sections_with_translated_labels(self.education_group_year, FRENCH)
+        self.assertEqual(sections[1].labels[1][FRENCH], 'Modifié')
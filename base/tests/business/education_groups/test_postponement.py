@@ -261,3 +261,22 @@ class TestPostpone(TestCase):
         new_child_leaf = new_root.groupelementyear_set.last().child_leaf
         self.assertEqual(new_child_leaf, new_luy)
         self.assertEqual(new_child_leaf.academic_year, self.next_academic_year)
+
+    def test_postpone_keep_order_of_children(self):
+        leaves = [
+            GroupElementYearFactory(parent=self.current_education_group_year, child_branch=None,
+                                    child_leaf=LearningUnitYearFactory(academic_year=self.current_academic_year))
+            for _ in range(3)
+        ]
+        new_luy = LearningUnitYearFactory(academic_year=self.next_academic_year,
+                                          learning_unit=leaves[1].child_leaf.learning_unit)
+
+        self.postponer = PostponeContent(self.current_education_group_year)
+        new_root = self.postponer.postpone()
+
+        self.assertEqual(len(self.postponer.result), 4)
+        new_group_element_years = list(new_root.groupelementyear_set.order_by('order'))
+        self.assertEqual([gr.order for gr in new_group_element_years],
+                         [self.current_group_element_year.order] + [gr.order for gr in leaves])
+        self.assertEqual([gr.child_leaf for gr in new_group_element_years[1:]],
+                         [leaves[0].child_leaf, new_luy, leaves[2].child_leaf])
@@ -107,7 +107,7 @@ class TestGetProtectedMessageEducationGroupYear(EducationGroupShortenContext):
             administration_entity=self.entity,
             academic_year=self.generated_ac_years.academic_years[0],
         )
-        protected_messages = shorten._get_protected_messages([edy])
+        protected_messages = shorten.get_protected_messages([edy])
         self.assertFalse(protected_messages)
 
     def test_get_protected_messages_with_protected_datas(self):
@@ -124,7 +124,7 @@ class TestGetProtectedMessageEducationGroupYear(EducationGroupShortenContext):
             OfferEnrollmentFactory(education_group_year=edy)
             all_edy.append(edy)
 
-        protected_messages = shorten._get_protected_messages(all_edy)
+        protected_messages = shorten.get_protected_messages(all_edy)
         self.assertIsInstance(protected_messages, list)
         self.assertEqual(len(protected_messages), 10)
 
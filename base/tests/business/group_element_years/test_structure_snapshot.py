@@ -0,0 +1,100 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import pickle
+from unittest import mock
+
+from django.test import TestCase
+
+from base.business.group_element_years import structure_snapshot
+from base.models.enums import education_group_categories
+from base.tests.factories.academic_year import AcademicYearFactory
+from base.tests.factories.education_group_type import EducationGroupTypeFactory
+from base.tests.factories.education_group_year import EducationGroupYearFactory
+from base.tests.factories.group_element_year import GroupElementYearFactory
+from base.tests.factories.learning_unit_year import LearningUnitYearFactory
+from base.utils.cache import cache
+
+
+class TestStructureSnapshot(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.academic_year = AcademicYearFactory()
+        training_type = EducationGroupTypeFactory(category=education_group_categories.TRAINING)
+        group_type = EducationGroupTypeFactory(category=education_group_categories.GROUP)
+        cls.root = EducationGroupYearFactory(academic_year=cls.academic_year, education_group_type=training_type)
+        cls.group = EducationGroupYearFactory(academic_year=cls.academic_year, education_group_type=group_type)
+        cls.learning_unit_year = LearningUnitYearFactory(academic_year=cls.academic_year)
+        cls.group_link = GroupElementYearFactory(parent=cls.root, child_branch=cls.group)
+        cls.leaf_link = GroupElementYearFactory(parent=cls.group, child_branch=None,
+                                                child_leaf=cls.learning_unit_year)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_find_formation_ids(self):
+        snapshot = structure_snapshot.get_structure_snapshot(self.academic_year.id)
+        self.assertEqual(snapshot.find_formation_ids(child_leaf_id=self.learning_unit_year.id), [self.root.id])
+        self.assertEqual(snapshot.find_formation_ids(child_branch_id=self.group.id), [self.root.id])
+        self.assertEqual(snapshot.find_formation_ids(child_branch_id=self.root.id), [])
+
+    def test_snapshot_kept_in_memory(self):
+        snapshot = structure_snapshot.get_structure_snapshot(self.academic_year.id)
+        with self.assertNumQueries(0):
+            self.assertIs(structure_snapshot.get_structure_snapshot(self.academic_year.id), snapshot)
+
+    def test_snapshot_pickled_in_compact_form(self):
+        snapshot = pickle.loads(pickle.dumps(structure_snapshot.get_structure_snapshot(self.academic_year.id)))
+        self.assertEqual(snapshot.children_by_parent[self.root.id][0][0], self.group_link.id)
+
+    @mock.patch('base.business.group_element_years.structure_snapshot.transaction.on_commit',
+                side_effect=lambda func: func())
+    def test_snapshot_invalidated_when_group_element_year_saved(self, mock_on_commit):
+        structure_snapshot.get_structure_snapshot(self.academic_year.id)
+        other_root = EducationGroupYearFactory(academic_year=self.academic_year,
+                                               education_group_type=self.root.education_group_type)
+        GroupElementYearFactory(parent=other_root, child_branch=self.group)
+
+        snapshot = structure_snapshot.get_structure_snapshot(self.academic_year.id)
+        self.assertCountEqual(snapshot.find_formation_ids(child_leaf_id=self.learning_unit_year.id),
+                              [self.root.id, other_root.id])
+
+    @mock.patch('base.business.group_element_years.structure_snapshot.transaction.on_commit')
+    def test_snapshot_invalidated_only_after_commit(self, mock_on_commit):
+        snapshot = structure_snapshot.get_structure_snapshot(self.academic_year.id)
+        GroupElementYearFactory(parent=self.root, child_branch=EducationGroupYearFactory(
+            academic_year=self.academic_year
+        ))
+
+        self.assertTrue(mock_on_commit.called)
+        self.assertIs(structure_snapshot.get_structure_snapshot(self.academic_year.id), snapshot)
+
+    def test_find_group_element_years_by_parent(self):
+        with self.assertNumQueries(2):
+            group_element_years_by_parent = structure_snapshot.find_group_element_years_by_parent(self.root)
+        self.assertEqual(group_element_years_by_parent, {
+            self.root.id: [self.group_link],
+            self.group.id: [self.leaf_link],
+        })
@@ -24,16 +24,17 @@
 #
 ##############################################################################
 import datetime
-from unittest import mock
+
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
+from openpyxl import load_workbook
+
+from base.business.learning_units.xls_comparison import _search_learning_unit_yrs_on_2_different_years, \
+    _translate_status, create_xls_comparison_stream, LEARNING_UNIT_TITLES, WORKSHEET_TITLE, \
+    CELLS_MODIFIED_NO_BORDER, CELLS_TOP_BORDER, _get_styled_rows, _get_modified_column_indexes
+from base.tests.factories.business.learning_units import GenerateContainer
 from base.tests.factories.user import UserFactory
-from base.business.learning_units.xls_comparison import prepare_xls_content, \
-    _get_learning_unit_yrs_on_2_different_years, _translate_status, create_xls_comparison, \
-    XLS_FILENAME, XLS_DESCRIPTION, LEARNING_UNIT_TITLES, WORKSHEET_TITLE, CELLS_MODIFIED_NO_BORDER, DATA, \
-    _check_changes_other_than_code_and_year, CELLS_TOP_BORDER
 from osis_common.document import xls_build
-from base.tests.factories.business.learning_units import GenerateContainer
 
 
 class TestComparisonXls(TestCase):
@@ -46,17 +47,20 @@ class TestComparisonXls(TestCase):
         self.academic_year = self.learning_unit_year_1.academic_year
         self.previous_academic_year = self.previous_learning_unit_year.academic_year
 
-    def test_prepare_xls_content_no_data(self):
-        self.assertEqual(prepare_xls_content([]), {'data': [], CELLS_MODIFIED_NO_BORDER: None, CELLS_TOP_BORDER: None})
+    def test_get_styled_rows_no_data(self):
+        self.assertEqual(list(_get_styled_rows([])), [])
 
-    def test_prepare_xls_content_with_data(self):
-        learning_unit_years = _get_learning_unit_yrs_on_2_different_years(
+    def test_get_styled_rows_with_data(self):
+        learning_unit_years = _search_learning_unit_yrs_on_2_different_years(
             self.previous_academic_year.year,
             [self.learning_unit_year_1]
         )
-        data_dict = prepare_xls_content(learning_unit_years)
-        data = data_dict.get(DATA)
-        self.assertEqual(len(data), 2)
+        rows = list(_get_styled_rows(learning_unit_years))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0].style, CELLS_TOP_BORDER)
+        self.assertIsNone(rows[1].style)
+        self.assertTrue(all(style == CELLS_MODIFIED_NO_BORDER for style in rows[1].cell_styles.values()))
+        data = [row.values for row in rows]
         learning_unit_yr = self.previous_learning_unit_year
         self.assertEqual(data[0][0], learning_unit_yr.acronym)
         self.assertEqual(data[0][1], learning_unit_yr.academic_year.name)
@@ -75,36 +79,30 @@ class TestComparisonXls(TestCase):
         self.assertEqual(data[0][13], learning_unit_yr.learning_container_year.common_title_english)
         self.assertEqual(data[0][14], learning_unit_yr.specific_title_english)
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_no_data(self, mock_generate_xls):
-        create_xls_comparison(self.user, [], None, self.previous_academic_year.year)
-        expected_argument = _generate_xls_build_parameter([], self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+    def test_create_xls_comparison_stream_with_no_data(self):
+        workbook = load_workbook(create_xls_comparison_stream(self.user, [], None, self.previous_academic_year.year))
+
+        worksheet = workbook.worksheets[0]
+        self.assertEqual(worksheet.title, WORKSHEET_TITLE)
+        self.assertEqual([[cell.value for cell in row] for row in worksheet.rows], [LEARNING_UNIT_TITLES])
+
+    def test_create_xls_comparison_stream_with_data(self):
+        workbook = load_workbook(create_xls_comparison_stream(
+            self.user, [self.learning_unit_year_1], None, self.previous_academic_year.year
+        ))
+
+        rows = [[cell.value for cell in row] for row in workbook.worksheets[0].rows]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1][0], self.previous_learning_unit_year.acronym)
+        self.assertEqual(rows[2][1], self.learning_unit_year_1.academic_year.name)
 
     def test_check_for_changes(self):
         learning_unit_yr_data = [
             ['acronym', '2016-17', 'credits', 'idem'],
             ['acronym 2', '2017-18', 'other credits', 'idem'],
         ]
-        # C2 ('C' = third column, '2' = 2nd line)
         self.assertEqual(
-            _check_changes_other_than_code_and_year(
+            _get_modified_column_indexes(
                 learning_unit_yr_data[0],
-                learning_unit_yr_data[1],
-                2),
-            ['A2', 'C2'])
-
-
-def _generate_xls_build_parameter(xls_data, user):
-    return {
-        xls_build.LIST_DESCRIPTION_KEY: _(XLS_DESCRIPTION),
-        xls_build.FILENAME_KEY: _(XLS_FILENAME),
-        xls_build.USER_KEY: user.username,
-        xls_build.WORKSHEETS_DATA: [{
-            xls_build.CONTENT_KEY: xls_data,
-            xls_build.HEADER_TITLES_KEY: LEARNING_UNIT_TITLES,
-            xls_build.WORKSHEET_TITLE_KEY: _(WORKSHEET_TITLE),
-            xls_build.STYLED_CELLS: None,
-            xls_build.COLORED_ROWS: None,
-        }]
-    }
+                learning_unit_yr_data[1]),
+            [0, 2])
@@ -0,0 +1,121 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+from notifications.models import Notification
+
+from base.business.academic_calendar import send_academic_calendar_notifications
+from base.models.academic_calendar import AcademicCalendar
+from base.models.academic_calendar_notification import AcademicCalendarNotification
+from base.tests.factories.academic_calendar import AcademicCalendarFactory
+from base.tests.factories.user import UserFactory
+from base.utils.cache import cache
+from base.utils.notifications import get_user_notifications, clear_user_notifications
+
+
+class TestSendAcademicCalendarNotifications(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(last_login=timezone.now())
+        cls.other_user = UserFactory(last_login=timezone.now())
+        cls.never_logged_user = UserFactory(last_login=None)
+        cls.inactive_user = UserFactory(last_login=timezone.now(), is_active=False)
+
+        cls.today = datetime.date.today()
+        cls.academic_calendar_today = AcademicCalendarFactory(start_date=cls.today, end_date=cls.today)
+        cls.academic_calendar_in_1_week = AcademicCalendarFactory(start_date=cls.today + datetime.timedelta(weeks=1),
+                                                                  end_date=cls.today + datetime.timedelta(weeks=1))
+        cls.academic_calendar_in_3_weeks = AcademicCalendarFactory(start_date=cls.today + datetime.timedelta(weeks=3),
+                                                                   end_date=cls.today + datetime.timedelta(weeks=3))
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_notify_academic_calendars_starting_within_2_weeks(self):
+        self.assertEqual(send_academic_calendar_notifications(), 4)
+
+        self.assertCountEqual(
+            [notification.verb for notification in self.user.notifications.unread()],
+            ["{} ({})".format(ac.title, ac.start_date.strftime("%d/%m"))
+             for ac in [self.academic_calendar_today, self.academic_calendar_in_1_week]]
+        )
+        self.assertEqual(self.other_user.notifications.count(), 2)
+        self.assertFalse(self.never_logged_user.notifications.exists())
+        self.assertFalse(self.inactive_user.notifications.exists())
+
+    def test_users_notified_only_once(self):
+        send_academic_calendar_notifications()
+
+        self.assertEqual(send_academic_calendar_notifications(), 0)
+        self.assertEqual(self.user.notifications.count(), 2)
+
+    def test_users_notified_again_when_academic_calendar_modified(self):
+        send_academic_calendar_notifications()
+        AcademicCalendar.objects.filter(pk=self.academic_calendar_today.pk).update(
+            changed=timezone.now() + datetime.timedelta(minutes=1)
+        )
+
+        self.assertEqual(send_academic_calendar_notifications(), 2)
+
+    def test_only_missing_notifications_created(self):
+        AcademicCalendarNotification.objects.create(
+            user=self.user,
+            academic_calendar=self.academic_calendar_today,
+            academic_calendar_changed=self.academic_calendar_today.changed
+        )
+
+        self.assertEqual(send_academic_calendar_notifications(), 3)
+
+    def test_users_not_notified_again_after_clearing_their_notifications(self):
+        send_academic_calendar_notifications()
+        clear_user_notifications(self.user)
+
+        self.assertEqual(send_academic_calendar_notifications(), 0)
+        self.assertFalse(self.user.notifications.exists())
+
+    def test_cached_notifications_invalidated(self):
+        get_user_notifications(self.user)
+        send_academic_calendar_notifications()
+
+        self.assertEqual(len(get_user_notifications(self.user)), 2)
+
+    def test_fixed_number_of_queries(self):
+        ContentType.objects.get_for_model(AcademicCalendar)
+        # The savepoint of the inserts is created and released
+        with self.assertNumQueries(7):
+            send_academic_calendar_notifications()
+
+    @mock.patch.object(AcademicCalendarNotification.objects, 'bulk_create', side_effect=DatabaseError)
+    def test_notifications_not_sent_when_they_cannot_be_recorded(self, mock_bulk_create):
+        with self.assertRaises(DatabaseError):
+            send_academic_calendar_notifications()
+
+        self.assertFalse(Notification.objects.exists())
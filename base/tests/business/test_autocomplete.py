@@ -0,0 +1,123 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.test import TestCase, SimpleTestCase
+
+from base.business.autocomplete import PrefixIndex, entity_version_index, certificate_aim_index
+from base.models.enums import entity_type
+from base.tests.factories.certificate_aim import CertificateAimFactory
+from base.tests.factories.entity_version import EntityVersionFactory, MainEntityVersionFactory
+
+
+class TestPrefixIndex(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixIndex([
+            ('LDRT', 'LDRT', ['Licence en droit']),
+            ('DRT', 'DRT', ['Faculté de droit']),
+            ('DRTI', 'DRTI', ['Droit international']),
+            ('AGRO', 'AGRO', ['Faculté des bioingénieurs']),
+        ], sort_key=lambda obj: obj)
+
+    def test_empty_term_returns_all_objects_sorted(self):
+        self.assertEqual(self.index.search(''), ['AGRO', 'DRT', 'DRTI', 'LDRT'])
+
+    def test_exact_match_ranked_before_prefix_and_contains(self):
+        self.assertEqual(self.index.search('drt'), ['DRT', 'DRTI', 'LDRT'])
+
+    def test_search_on_words_of_other_terms_without_accents(self):
+        self.assertEqual(self.index.search('faculte'), ['AGRO', 'DRT'])
+
+    def test_search_with_predicate(self):
+        self.assertEqual(self.index.search('drt', lambda obj: obj != 'DRT'), ['DRTI', 'LDRT'])
+
+    def test_no_result(self):
+        self.assertEqual(self.index.search('xyz'), [])
+
+
+class TestEntityVersionIndex(TestCase):
+    def setUp(self):
+        self.entity_version = MainEntityVersionFactory(acronym="DRT", entity_type=entity_type.SCHOOL)
+        self.other_entity_version = EntityVersionFactory(acronym="DRTI", entity_type=entity_type.INSTITUTE)
+        # The index is invalidated on commit, which never happens in a TestCase
+        entity_version_index.invalidate()
+
+    def test_search_pedagogical_entities_by_default(self):
+        self.assertEqual(entity_version_index.search("DRT"), [self.entity_version])
+
+    def test_search_all_entities(self):
+        self.assertEqual(entity_version_index.search("DRT", country="all"),
+                         [self.entity_version, self.other_entity_version])
+
+    def test_search_by_country(self):
+        result = entity_version_index.search("", country=self.other_entity_version.entity.country_id)
+        self.assertEqual(result, [self.other_entity_version])
+
+    def test_no_query_when_index_is_built(self):
+        entity_version_index.get_index()
+        with self.assertNumQueries(0):
+            entity_version_index.search("DRT", country="all")
+
+    @mock.patch('base.business.autocomplete.transaction.on_commit', side_effect=lambda func: func())
+    def test_index_invalidated_on_save(self, mock_on_commit):
+        entity_version_index.get_index()
+        self.entity_version.acronym = "AGRO"
+        self.entity_version.save()
+        self.assertEqual(entity_version_index.search("AGRO"), [self.entity_version])
+
+    @mock.patch('base.business.autocomplete.transaction.on_commit')
+    def test_index_invalidated_only_after_commit(self, mock_on_commit):
+        index = entity_version_index.get_index()
+        self.entity_version.save()
+
+        self.assertIs(entity_version_index.get_index(), index)
+        mock_on_commit.assert_called_with(entity_version_index.invalidate)
+
+    @mock.patch('base.business.autocomplete.time.monotonic')
+    def test_index_rebuilt_when_ttl_exceeded(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        first_index = entity_version_index.get_index()
+        mock_monotonic.return_value = entity_version_index.ttl + 1
+        self.assertIsNot(entity_version_index.get_index(), first_index)
+
+
+class TestCertificateAimIndex(TestCase):
+    def setUp(self):
+        self.certificate_aim = CertificateAimFactory(code=1234, section=5, description="description")
+        self.other_certificate_aim = CertificateAimFactory(code=12, section=2, description="other")
+        certificate_aim_index.invalidate()
+
+    def test_search_on_code(self):
+        self.assertEqual(certificate_aim_index.search("12"), [self.other_certificate_aim])
+        self.assertEqual(certificate_aim_index.search("1234"), [self.certificate_aim])
+        self.assertEqual(certificate_aim_index.search("123"), [])
+
+    def test_search_on_description(self):
+        self.assertEqual(certificate_aim_index.search("descr"), [self.certificate_aim])
+
+    def test_search_with_section(self):
+        self.assertEqual(certificate_aim_index.search("1234", section="5"), [self.certificate_aim])
+        self.assertEqual(certificate_aim_index.search("12", section="5"), [])
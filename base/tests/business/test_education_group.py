@@ -24,22 +24,22 @@
 #
 ##############################################################################
 import datetime
-from unittest import mock
 
 from django.contrib.auth.models import Permission, Group
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
+from openpyxl import load_workbook
 
-from base.business.education_group import can_user_edit_administrative_data, prepare_xls_content, create_xls, \
-    XLS_DESCRIPTION, XLS_FILENAME, WORKSHEET_TITLE, EDUCATION_GROUP_TITLES, ORDER_COL, ORDER_DIRECTION, \
-    XLS_DESCRIPTION_ADMINISTRATIVE, XLS_FILENAME_ADMINISTRATIVE, WORKSHEET_TITLE_ADMINISTRATIVE, \
-    EDUCATION_GROUP_TITLES_ADMINISTRATIVE, prepare_xls_content_administrative, create_xls_administrative_data, \
+from base.business.education_group import can_user_edit_administrative_data, create_xls_stream, \
+    WORKSHEET_TITLE, EDUCATION_GROUP_TITLES, ORDER_COL, ORDER_DIRECTION, WORKSHEET_TITLE_ADMINISTRATIVE, \
+    EDUCATION_GROUP_TITLES_ADMINISTRATIVE, _get_administrative_rows, create_xls_administrative_data_stream, \
     DATE_FORMAT, MANAGEMENT_ENTITY_COL, TRANING_COL, TYPE_COL, ACADEMIC_YEAR_COL, START_COURSE_REGISTRATION_COL, \
     END_COURSE_REGISTRATION_COL, SESSIONS_COLUMNS, WEIGHTING_COL, DEFAULT_LEARNING_UNIT_ENROLLMENT_COL, \
     CHAIR_OF_THE_EXAM_BOARD_COL, EXAM_BOARD_SECRETARY_COL, EXAM_BOARD_SIGNATORY_COL, SIGNATORY_QUALIFICATION_COL, \
     START_EXAM_REGISTRATION_COL, END_EXAM_REGISTRATION_COL, MARKS_PRESENTATION_COL, DISSERTATION_PRESENTATION_COL, \
-    DELIBERATION_COL, SCORES_DIFFUSION_COL, SESSION_HEADERS, _get_translated_header_titles
+    DELIBERATION_COL, SCORES_DIFFUSION_COL, SESSION_HEADERS, _get_translated_header_titles, \
+    _get_administrative_data_queryset, extract_xls_data_from_education_group
 from base.business.education_groups.perms import get_education_group_year_eligible_management_entities
 from base.models.education_group_year import EducationGroupYear
 from base.models.enums import academic_calendar_type
@@ -61,7 +61,6 @@ from base.tests.factories.person_entity import PersonEntityFactory
 from base.tests.factories.program_manager import ProgramManagerFactory
 from base.tests.factories.session_exam_calendar import SessionExamCalendarFactory
 from base.tests.factories.user import UserFactory
-from osis_common.document import xls_build
 
 NO_SESSION_DATA = {'session1': None, 'session2': None, 'session3': None}
 
@@ -160,44 +159,37 @@ class EducationGroupXlsTestCase(TestCase):
         self.education_group_year_2.management_entity_version = EntityVersionFactory()
         self.user = UserFactory()
 
-    def test_prepare_xls_content_no_data(self):
-        self.assertEqual(prepare_xls_content([]), [])
+    def test_extract_xls_data_from_education_group(self):
+        self.assertEqual(extract_xls_data_from_education_group(self.education_group_year_1),
+                         get_xls_data(self.education_group_year_1))
 
-    def test_prepare_xls_content_with_data(self):
-        data = prepare_xls_content([self.education_group_year_1])
-        self.assertEqual(len(data), 1)
-        self.assertEqual(data[0], get_xls_data(self.education_group_year_1))
-
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_no_data(self, mock_generate_xls):
-        create_xls(self.user, [], None, {ORDER_COL: None, ORDER_DIRECTION: None})
-
-        expected_argument = _generate_xls_build_parameter([], self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
-
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_asc_ordering(self, mock_generate_xls):
-        create_xls(self.user,
-                   [self.education_group_year_1, self.education_group_year_2],
-                   None,
-                   {ORDER_COL: 'acronym', ORDER_DIRECTION: None})
+    def test_create_xls_stream_with_no_data(self):
+        worksheet = _load_first_worksheet(
+            create_xls_stream(self.user, [], None, {ORDER_COL: None, ORDER_DIRECTION: None})
+        )
 
-        xls_data = [get_xls_data(self.education_group_year_2), get_xls_data(self.education_group_year_1)]
+        self.assertEqual(worksheet.title, WORKSHEET_TITLE)
+        self.assertEqual(_get_rows_values(worksheet), [EDUCATION_GROUP_TITLES])
 
-        expected_argument = _generate_xls_build_parameter(xls_data, self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+    def test_create_xls_stream_with_asc_ordering(self):
+        worksheet = _load_first_worksheet(create_xls_stream(
+            self.user,
+            [self.education_group_year_1, self.education_group_year_2],
+            None,
+            {ORDER_COL: 'acronym', ORDER_DIRECTION: None}
+        ))
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_desc_ordering(self, mock_generate_xls):
-        create_xls(self.user,
-                   [self.education_group_year_1, self.education_group_year_2],
-                   None,
-                   {ORDER_COL: 'acronym', ORDER_DIRECTION: 'desc'})
+        self.assertEqual([row[1] for row in _get_rows_values(worksheet)[1:]], ['DEUXIEME', 'PREMIER'])
 
-        xls_data = [get_xls_data(self.education_group_year_1), get_xls_data(self.education_group_year_2)]
+    def test_create_xls_stream_with_desc_ordering(self):
+        worksheet = _load_first_worksheet(create_xls_stream(
+            self.user,
+            [self.education_group_year_1, self.education_group_year_2],
+            None,
+            {ORDER_COL: 'acronym', ORDER_DIRECTION: 'desc'}
+        ))
 
-        expected_argument = _generate_xls_build_parameter(xls_data, self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+        self.assertEqual([row[1] for row in _get_rows_values(worksheet)[1:]], ['PREMIER', 'DEUXIEME'])
 
 
 class EducationGroupXlsAdministrativeDataTestCase(TestCase):
@@ -209,7 +201,11 @@ class EducationGroupXlsAdministrativeDataTestCase(TestCase):
         self.education_group_year_1 = EducationGroupYearFactory(academic_year=self.academic_year, acronym="PREMIER",
                                                                 education_group=self.education_group,
                                                                 weighting=True)
-        self.education_group_year_1.management_entity_version = EntityVersionFactory()
+        self.education_group_year_1.management_entity_version = EntityVersionFactory(
+            entity=self.education_group_year_1.management_entity,
+            start_date=self.academic_year.start_date,
+            end_date=None
+        )
 
         self._create_administrative_data()
         self._create_mandatary_data()
@@ -280,21 +276,68 @@ class EducationGroupXlsAdministrativeDataTestCase(TestCase):
             end_date=self.academic_year.end_date
         )
 
-    def test_prepare_xls_content_no_data(self):
-        self.assertEqual(prepare_xls_content_administrative([]), [])
+    def test_get_administrative_rows_no_data(self):
+        self.assertEqual(list(_get_administrative_rows([])), [])
 
-    def test_prepare_xls_content_administrative_with_data(self):
-        data = prepare_xls_content_administrative([self.education_group_year_1])
+    def test_get_administrative_rows_with_data(self):
+        data = list(_get_administrative_rows(self._get_administrative_data_queryset()))
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0], self.get_xls_administrative_data(self.education_group_year_1))
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_no_data(self, mock_generate_xls):
-        qs_empty = EducationGroupYear.objects.none()
-        create_xls_administrative_data(self.user, qs_empty, None, {ORDER_COL: None, ORDER_DIRECTION: None})
+    def test_get_administrative_rows_fixed_number_of_queries(self):
+        for acronym in ['SECOND', 'TROISIEME']:
+            EducationGroupYearFactory(academic_year=self.academic_year, acronym=acronym)
+        education_group_years = self._get_administrative_data_queryset(
+            EducationGroupYear.objects.filter(academic_year=self.academic_year)
+        )
+
+        with self.assertNumQueries(3):
+            data = list(_get_administrative_rows(education_group_years))
+        self.assertEqual([row[1] for row in data], ['PREMIER', 'SECOND', 'TROISIEME'])
 
-        expected_argument = _generate_xls_administrative_data_build_parameter([], self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+    def test_get_administrative_rows_ordered_in_database(self):
+        EducationGroupYearFactory(academic_year=self.academic_year, acronym='SECOND')
+        education_group_years = self._get_administrative_data_queryset(
+            EducationGroupYear.objects.filter(academic_year=self.academic_year),
+            {ORDER_COL: 'acronym', ORDER_DIRECTION: 'desc'}
+        )
+        self.assertEqual([row[1] for row in _get_administrative_rows(education_group_years)],
+                         ['SECOND', 'PREMIER'])
+
+    def test_get_administrative_rows_mandatary_out_of_academic_year(self):
+        MandataryFactory(
+            mandate__education_group=self.education_group,
+            mandate__function=mandate_types.PRESIDENT,
+            start_date=self.academic_year.start_date - datetime.timedelta(days=10),
+            end_date=self.academic_year.start_date - datetime.timedelta(days=1)
+        )
+        data = list(_get_administrative_rows(self._get_administrative_data_queryset()))
+        self.assertEqual(data[0], self.get_xls_administrative_data(self.education_group_year_1))
+
+    def _get_administrative_data_queryset(self, education_group_years=None, order_data=None):
+        if education_group_years is None:
+            education_group_years = EducationGroupYear.objects.filter(pk=self.education_group_year_1.pk)
+        return _get_administrative_data_queryset(education_group_years, order_data)
+
+    def test_create_xls_administrative_data_stream_with_no_data(self):
+        worksheet = _load_first_worksheet(create_xls_administrative_data_stream(
+            self.user, EducationGroupYear.objects.none(), None, {ORDER_COL: None, ORDER_DIRECTION: None}
+        ))
+
+        self.assertEqual(worksheet.title, WORKSHEET_TITLE_ADMINISTRATIVE)
+        self.assertEqual(_get_rows_values(worksheet), [_get_translated_header_titles()])
+
+    def test_create_xls_administrative_data_stream_with_data(self):
+        worksheet = _load_first_worksheet(create_xls_administrative_data_stream(
+            self.user,
+            EducationGroupYear.objects.filter(pk=self.education_group_year_1.pk),
+            None,
+            {ORDER_COL: None, ORDER_DIRECTION: None}
+        ))
+
+        rows = _get_rows_values(worksheet)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:2], [self.education_group_year_1.management_entity_version.acronym, 'PREMIER'])
 
     def test_headers_title_property(self):
         expected_headers = [
@@ -367,34 +410,12 @@ def get_xls_data(an_education_group_year):
             an_education_group_year.partial_acronym]
 
 
-def _generate_xls_build_parameter(xls_data, user):
-    return {
-        xls_build.LIST_DESCRIPTION_KEY: _(XLS_DESCRIPTION),
-        xls_build.FILENAME_KEY: _(XLS_FILENAME),
-        xls_build.USER_KEY: user.username,
-        xls_build.WORKSHEETS_DATA: [{
-            xls_build.CONTENT_KEY: xls_data,
-            xls_build.HEADER_TITLES_KEY: EDUCATION_GROUP_TITLES,
-            xls_build.WORKSHEET_TITLE_KEY: _(WORKSHEET_TITLE),
-            xls_build.STYLED_CELLS: None,
-            xls_build.COLORED_ROWS: None,
-        }]
-    }
-
-
-def _generate_xls_administrative_data_build_parameter(xls_data, user):
-    return {
-        xls_build.LIST_DESCRIPTION_KEY: _(XLS_DESCRIPTION_ADMINISTRATIVE),
-        xls_build.FILENAME_KEY: _(XLS_FILENAME_ADMINISTRATIVE),
-        xls_build.USER_KEY: user.username,
-        xls_build.WORKSHEETS_DATA: [{
-            xls_build.CONTENT_KEY: xls_data,
-            xls_build.HEADER_TITLES_KEY: _get_translated_header_titles(),
-            xls_build.WORKSHEET_TITLE_KEY: _(WORKSHEET_TITLE_ADMINISTRATIVE),
-            xls_build.STYLED_CELLS: None,
-            xls_build.COLORED_ROWS: None,
-        }]
-    }
+def _load_first_worksheet(stream):
+    return load_workbook(stream).worksheets[0]
+
+
+def _get_rows_values(worksheet):
+    return [[cell.value for cell in row] for row in worksheet.rows]
 
 
 class EducationGroupGetEligibleEntities(TestCase):
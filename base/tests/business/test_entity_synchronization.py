@@ -0,0 +1,155 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from base.business.entity_synchronization import synchronize_entities
+from base.models.entity import Entity
+from base.models.entity_version import EntityVersion
+from base.models.enums import entity_type
+from base.tests.factories.entity import EntityFactory
+from base.tests.factories.entity_version import EntityVersionFactory
+from base.tests.factories.organization import OrganizationFactory
+
+
+class TestSynchronizeEntities(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = OrganizationFactory()
+        cls.parent = EntityFactory(organization=cls.organization)
+        cls.entity = EntityFactory(organization=cls.organization, external_id='ENTITY_1', city='Louvain-la-Neuve')
+        cls.version = EntityVersionFactory(entity=cls.entity, parent=cls.parent, acronym='DRT', title='Droit',
+                                           entity_type=entity_type.FACULTY, start_date=datetime.date(2015, 9, 1),
+                                           end_date=None)
+
+    def _build_entity_data(self, external_id, versions, city='Louvain-la-Neuve'):
+        return {
+            'external_id': external_id,
+            'organization': self.organization.pk,
+            'city': city,
+            'entityversion_set': versions,
+        }
+
+    def _build_version_data(self, acronym='DRT', title='Droit', start_date='2015-09-01', end_date=None,
+                            parent=None):
+        return {
+            'acronym': acronym,
+            'title': title,
+            'entity_type': entity_type.FACULTY,
+            'parent': (parent or self.parent).pk,
+            'start_date': start_date,
+            'end_date': end_date,
+        }
+
+    def test_create_new_entities(self):
+        result = synchronize_entities([
+            self._build_entity_data('ENTITY_2', [self._build_version_data(acronym='ESPO', title='Sciences po')])
+        ])
+
+        self.assertEqual((result.created_entities_count, result.new_versions_count), (1, 1))
+        version = EntityVersion.objects.get(entity__external_id='ENTITY_2')
+        self.assertEqual((version.acronym, version.parent, version.start_date),
+                         ('ESPO', self.parent, datetime.date(2015, 9, 1)))
+
+    def test_identical_version_not_created_again(self):
+        result = synchronize_entities([self._build_entity_data('ENTITY_1', [self._build_version_data()])])
+
+        self.assertEqual(result, (0, 0, 0, 0, []))
+        self.assertEqual(EntityVersion.objects.filter(entity=self.entity).count(), 1)
+
+    def test_update_entity_and_end_date_of_version(self):
+        result = synchronize_entities([
+            self._build_entity_data('ENTITY_1', [self._build_version_data(end_date='2018-08-31')], city='Bruxelles')
+        ])
+
+        self.assertEqual((result.updated_entities_count, result.updated_versions_count), (1, 1))
+        self.version.refresh_from_db()
+        self.assertEqual(self.version.end_date, datetime.date(2018, 8, 31))
+        self.assertEqual(Entity.objects.get(pk=self.entity.pk).city, 'Bruxelles')
+
+    def test_version_with_another_parent_not_identical(self):
+        other_parent = EntityFactory(organization=self.organization)
+
+        result = synchronize_entities([
+            self._build_entity_data('ENTITY_1', [self._build_version_data(end_date='2018-08-31', parent=other_parent)])
+        ])
+
+        # The version of the other parent overlaps the existing version instead of updating its end date
+        self.assertEqual((result.new_versions_count, result.updated_versions_count), (0, 0))
+        self.assertEqual(len(result.errors), 1)
+        self.version.refresh_from_db()
+        self.assertIsNone(self.version.end_date)
+
+    def test_overlapping_version_of_same_entity_not_created(self):
+        result = synchronize_entities([
+            self._build_entity_data('ENTITY_1', [self._build_version_data(title='Faculté de droit',
+                                                                          start_date='2017-09-01')])
+        ])
+
+        self.assertEqual(result.new_versions_count, 0)
+        self.assertEqual(len(result.errors), 1)
+
+    def test_overlapping_version_with_same_acronym_not_created(self):
+        result = synchronize_entities([
+            self._build_entity_data('ENTITY_2', [self._build_version_data(start_date='2017-09-01')])
+        ])
+
+        self.assertEqual((result.created_entities_count, result.new_versions_count), (1, 0))
+        self.assertEqual(len(result.errors), 1)
+
+    def test_acronym_moved_to_another_entity(self):
+        result = synchronize_entities([
+            self._build_entity_data('ENTITY_2', [self._build_version_data(start_date='2018-09-01')]),
+            self._build_entity_data('ENTITY_1', [self._build_version_data(end_date='2018-08-31')]),
+        ])
+
+        self.assertEqual((result.new_versions_count, result.updated_versions_count, result.errors), (1, 1, []))
+
+    @mock.patch('base.business.autocomplete.entity_version_index.invalidate')
+    @mock.patch('base.business.entity_synchronization.transaction.on_commit', side_effect=lambda func: func())
+    def test_caches_of_the_structure_invalidated(self, mock_on_commit, mock_invalidate_entity_version_index):
+        synchronize_entities([self._build_entity_data('ENTITY_1', [self._build_version_data(end_date='2018-08-31')])])
+
+        self.assertTrue(mock_invalidate_entity_version_index.called)
+
+    def test_invalid_entity_reported(self):
+        result = synchronize_entities([{'organization': self.organization.pk}])
+        self.assertEqual(len(result.errors), 1)
+
+    def test_number_of_queries_independent_of_number_of_entities(self):
+        def count_queries(external_ids):
+            with CaptureQueriesContext(connection) as context:
+                synchronize_entities([
+                    self._build_entity_data(external_id, [self._build_version_data(acronym=external_id)])
+                    for external_id in external_ids
+                ])
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(['A1', 'A2']), count_queries(['B1', 'B2', 'B3', 'B4']))
@@ -0,0 +1,157 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+import datetime
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from base.business import export_job
+from base.models.enums import export_job_status, export_type
+from base.models.export_job import ExportJob
+from base.tests.factories.export_job import ExportJobFactory
+from base.tests.factories.user import UserFactory
+
+
+class TestStartExportJob(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+
+    @mock.patch('base.business.export_job.transaction.on_commit')
+    def test_job_registered_with_search_parameters(self, mock_on_commit):
+        search_data = QueryDict('acronym=LDROI&academic_year_id=1')
+        filters = collections.OrderedDict([('acronym', 'LDROI')])
+
+        job = export_job.start_export_job(self.user, export_type.LEARNING_UNITS, search_data, filters,
+                                          {'with_grp': True})
+
+        self.assertEqual(job.status, export_job_status.PENDING)
+        self.assertEqual(job.parameters[export_job.SEARCH_DATA],
+                         {'acronym': ['LDROI'], 'academic_year_id': ['1']})
+        self.assertEqual(job.parameters[export_job.FILTERS], [['acronym', 'LDROI']])
+        self.assertEqual(job.parameters[export_job.EXTRA], {'with_grp': True})
+        self.assertTrue(mock_on_commit.called)
+
+
+class TestRunExportJob(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.job = ExportJobFactory()
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    @mock.patch('base.business.export_job._export_learning_units')
+    def test_file_saved_and_user_notified(self, mock_export):
+        stream = tempfile.TemporaryFile()
+        stream.write(b'content')
+        stream.seek(0)
+        mock_export.return_value = ('learning_units_filename', stream)
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            export_job.run_export_job(self.job.pk)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, export_job_status.DONE)
+        self.assertIsNotNone(self.job.finished)
+        self.assertTrue(self.job.file.name.endswith('.xlsx'))
+        self.assertTrue(stream.closed)
+        notification = self.job.user.notifications.get()
+        self.assertEqual(notification.target, self.job)
+        self.assertEqual(notification.description, None)
+
+    @mock.patch('base.business.export_job._export_learning_units', side_effect=Exception('error'))
+    def test_job_failed(self, mock_export):
+        export_job.run_export_job(self.job.pk)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, export_job_status.FAILED)
+        self.assertEqual(self.job.error, 'error')
+        self.assertEqual(self.job.user.notifications.count(), 1)
+
+    def test_get_search_data(self):
+        search_data = export_job._get_search_data({export_job.SEARCH_DATA: {'entities': ['1', '2']}})
+        self.assertEqual(search_data.getlist('entities'), ['1', '2'])
+
+    def test_all_export_types_have_an_export_function(self):
+        for an_export_type, _ in export_type.EXPORT_TYPES:
+            self.assertTrue(callable(export_job._get_export_function(an_export_type)))
+
+
+@override_settings(EXPORT_JOB_RETENTION_DAYS=7)
+class TestPurgeExportJobs(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _create_job(self, days_ago):
+        job = ExportJobFactory(status=export_job_status.DONE)
+        with override_settings(MEDIA_ROOT=self.media_root):
+            job.file.save('export.xlsx', ContentFile(b'content'))
+        ExportJob.objects.filter(pk=job.pk).update(created=timezone.now() - datetime.timedelta(days=days_ago))
+        return job
+
+    def test_expired_jobs_deleted_with_their_file_and_notifications(self):
+        expired_job = self._create_job(days_ago=8)
+        recent_job = self._create_job(days_ago=1)
+        for job in (expired_job, recent_job):
+            export_job.notify.send(job, recipient=job.user, verb="Your export is ready", target=job)
+
+        with override_settings(MEDIA_ROOT=self.media_root):
+            expired_file_path = expired_job.file.path
+            recent_file_path = recent_job.file.path
+            self.assertEqual(export_job.purge_export_jobs(), 1)
+
+        self.assertFalse(ExportJob.objects.filter(pk=expired_job.pk).exists())
+        self.assertTrue(ExportJob.objects.filter(pk=recent_job.pk).exists())
+        self.assertFalse(os.path.exists(expired_file_path))
+        self.assertTrue(os.path.exists(recent_file_path))
+        self.assertEqual(expired_job.user.notifications.count(), 0)
+        self.assertEqual(recent_job.user.notifications.count(), 1)
+
+    def test_nothing_to_purge(self):
+        self._create_job(days_ago=1)
+        self.assertEqual(export_job.purge_export_jobs(), 0)
+
+
+class TestExportJobModel(TestCase):
+    def test_find_by_user(self):
+        job = ExportJobFactory()
+        ExportJobFactory()
+        self.assertEqual(list(ExportJob.objects.filter(user=job.user)), [job])
+
+    def test_get_absolute_url(self):
+        job = ExportJobFactory()
+        self.assertEqual(job.get_absolute_url(), reverse('export_job_download', args=[job.pk]))
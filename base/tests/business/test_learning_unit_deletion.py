@@ -24,8 +24,10 @@
 #
 ##############################################################################
 import datetime
+from unittest import mock
 
 from django.contrib.auth.models import Group
+from django.db import models
 from django.core.exceptions import ObjectDoesNotExist
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
@@ -64,6 +66,7 @@ from cms.enums import entity_name
 from cms.models.translated_text import TranslatedText
 from cms.tests.factories.text_label import TextLabelFactory
 from cms.tests.factories.translated_text import TranslatedTextFactory
+from osis_common.models.serializable_model import SerializableModel
 
 
 class LearningUnitYearDeletion(TestCase):
@@ -73,12 +76,12 @@ class LearningUnitYearDeletion(TestCase):
 
     def test_check_related_partims_deletion(self):
         l_container_year = LearningContainerYearFactory()
-        LearningUnitYearFactory(
+        l_unit_1 = LearningUnitYearFactory(
             acronym="LBIR1212",
             learning_container_year=l_container_year,
             academic_year=self.academic_year, subtype=learning_unit_year_subtypes.FULL,
             learning_unit=self.learning_unit)
-        msg = deletion._check_related_partims_deletion(l_container_year)
+        msg = deletion.check_learning_unit_year_deletion(l_unit_1)
         self.assertEqual(len(msg.values()), 0)
 
         l_unit_2 = LearningUnitYearFactory(acronym="LBIR1212", learning_container_year=l_container_year,
@@ -103,7 +106,7 @@ class LearningUnitYearDeletion(TestCase):
         AttributionChargeNewFactory(learning_component_year=component.learning_component_year,
                                     attribution=attribution_2)
 
-        msg = deletion._check_related_partims_deletion(l_container_year)
+        msg = deletion.check_learning_unit_year_deletion(l_unit_1)
         msg = list(msg.values())
 
         self.assertEqual(len(msg), 5)
@@ -168,7 +171,7 @@ class LearningUnitYearDeletion(TestCase):
         l_unit_1 = LearningUnitYearFactory(acronym="LBIR1212", learning_container_year=l_container_year,
                                            academic_year=self.academic_year, subtype=learning_unit_year_subtypes.FULL)
         ProposalLearningUnitFactory(learning_unit_year=l_unit_1)
-        msg = deletion._check_learning_unit_proposal(l_unit_1)
+        msg = deletion.check_learning_unit_year_deletion(l_unit_1)
 
         msg = list(msg.values())
         self.assertEqual(msg, [
@@ -318,7 +321,7 @@ class LearningUnitYearDeletion(TestCase):
         # Before delete, we should have 3 data in CMS
         self.assertEqual(3, TranslatedText.objects.all().count())
 
-        deletion._delete_cms_data(learning_unit_year_to_delete)
+        deletion.LearningUnitYearDeletionPlan(learning_unit_year_to_delete).delete()
 
         # After deletion, we should have no data in CMS
         self.assertFalse(TranslatedText.objects.all().count())
@@ -370,6 +373,75 @@ class LearningUnitYearDeletion(TestCase):
             base.business.learning_units.perms.is_eligible_to_delete_learning_unit_year(learning_unit_year, person))
 
 
+class TestLearningUnitYearDeletionPlan(TestCase):
+    def setUp(self):
+        self.learning_unit = LearningUnitFactory(start_year=1900)
+        self.partim_learning_unit = LearningUnitFactory(start_year=1900)
+        self.full_years = []
+        self.partim_years = []
+        for year in range(2010, 2015):
+            academic_year = AcademicYearFactory(year=year)
+            container_year = LearningContainerYearFactory(academic_year=academic_year)
+            self.full_years.append(LearningUnitYearFactory(
+                academic_year=academic_year, learning_unit=self.learning_unit, learning_container_year=container_year,
+                subtype=learning_unit_year_subtypes.FULL
+            ))
+            self.partim_years.append(LearningUnitYearFactory(
+                academic_year=academic_year, learning_unit=self.partim_learning_unit,
+                learning_container_year=container_year, subtype=learning_unit_year_subtypes.PARTIM
+            ))
+
+    def test_learning_unit_years_of_the_plan(self):
+        plan = deletion.LearningUnitYearDeletionPlan(self.full_years[2])
+        self.assertCountEqual(plan.learning_unit_years, self.full_years[2:] + self.partim_years[2:])
+
+        plan = deletion.LearningUnitYearDeletionPlan(self.partim_years[3])
+        self.assertCountEqual(plan.learning_unit_years, self.partim_years[3:])
+
+    def test_impacts_loaded_in_fixed_number_of_queries(self):
+        for learning_unit_year in self.full_years + self.partim_years:
+            LearningUnitEnrollmentFactory(learning_unit_year=learning_unit_year)
+            GroupElementYearFactory(child_branch=None, child_leaf=learning_unit_year)
+        ProposalLearningUnitFactory(learning_unit_year=self.full_years[0])
+        ProposalLearningUnitFactory(learning_unit_year=self.partim_years[-1])
+
+        plan = deletion.LearningUnitYearDeletionPlan(self.full_years[0], check_proposal=False)
+        with self.assertNumQueries(6):
+            impacts = plan.get_impacts()
+
+        self.assertEqual(len(impacts), 2 * len(self.full_years) * 2 + 1)
+        self.assertIn(_("%(subtype)s %(acronym)s is in proposal for the year %(year)s") % {
+            'subtype': _('The partim'),
+            'acronym': self.partim_years[-1].acronym,
+            'year': self.partim_years[-1].academic_year
+        }, impacts.values())
+
+    def test_delete(self):
+        msg = deletion.LearningUnitYearDeletionPlan(self.full_years[2]).delete()
+
+        self.assertEqual(len(msg), 6)
+        self.assertEqual(msg[-1], deletion.create_learning_unit_year_deletion_message(self.full_years[2]))
+        self.assertCountEqual(LearningUnitYear.objects.all(), self.full_years[:2] + self.partim_years[:2])
+        self.assertEqual(LearningContainerYear.objects.count(), 2)
+
+        self.learning_unit.refresh_from_db()
+        self.partim_learning_unit.refresh_from_db()
+        self.assertEqual(self.learning_unit.end_year, 2011)
+        self.assertEqual(self.partim_learning_unit.end_year, 2011)
+
+    def test_serializable_objects_deleted_one_by_one(self):
+        LearningUnitComponentFactory(learning_unit_year=self.full_years[3])
+
+        with mock.patch.object(SerializableModel, 'delete', autospec=True, side_effect=models.Model.delete) \
+                as mock_delete:
+            deletion.LearningUnitYearDeletionPlan(self.full_years[3]).delete()
+
+        deleted_objects = [call[0][0] for call in mock_delete.call_args_list]
+        self.assertEqual(len([obj for obj in deleted_objects if isinstance(obj, LearningUnitYear)]), 4)
+        self.assertEqual(len([obj for obj in deleted_objects if isinstance(obj, LearningContainerYear)]), 2)
+        self.assertEqual(len([obj for obj in deleted_objects if isinstance(obj, LearningUnitComponent)]), 1)
+
+
 def add_to_group(user, group_name):
     group, created = Group.objects.get_or_create(name=group_name)
     group.user_set.add(user)
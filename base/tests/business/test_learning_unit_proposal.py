@@ -35,7 +35,7 @@ from factory import fuzzy
 
 from base import models as mdl_base
 from base.business import learning_unit_proposal as lu_proposal_business
-from base.business.learning_unit_proposal import compute_proposal_type, consolidate_proposal, modify_proposal_state
+from base.business.learning_unit_proposal import compute_proposal_type, consolidate_proposal
 from base.business.learning_unit_proposal import consolidate_proposals_and_send_report
 from base.business.learning_units.perms import PROPOSAL_CONSOLIDATION_ELIGIBLE_STATES
 from base.models.academic_year import AcademicYear, LEARNING_UNIT_CREATION_SPAN_YEARS
@@ -102,8 +102,8 @@ class TestLearningUnitProposalCancel(TestCase):
         self.assertCountEqual(list(mdl_base.learning_unit.LearningUnit.objects.filter(id=lu.id)),
                               [])
 
-    @patch("base.business.learning_units.perms.is_eligible_for_cancel_of_proposal",
-           side_effect=lambda proposal, person: True)
+    @patch("base.business.learning_units.perms.find_proposals_eligible_for_cancel",
+           side_effect=lambda proposals, person: proposals)
     @patch('base.utils.send_mail.send_mail_cancellation_learning_unit_proposals')
     def test_cancel_proposals_of_type_suppression(self, mock_send_mail, mock_perm):
         proposal = self._create_proposal(prop_type=proposal_type.ProposalType.SUPPRESSION.name,
@@ -217,8 +217,8 @@ class TestConsolidateProposals(TestCase):
                                        entity=person_entity.entity,
                                        type=entity_container_year_link_type.REQUIREMENT_ENTITY)
 
-    @mock.patch("base.business.learning_units.perms.is_eligible_to_consolidate_proposal",
-                side_effect=lambda proposal, person: True)
+    @mock.patch("base.business.learning_units.perms.find_proposals_eligible_to_consolidate",
+                side_effect=lambda proposals, person: proposals)
     @mock.patch("base.business.learning_unit_proposal.consolidate_proposal",
                 side_effect=lambda prop: {SUCCESS: ["msg_success"]})
     @mock.patch("base.utils.send_mail.send_mail_consolidation_learning_unit_proposal",
@@ -324,11 +324,68 @@ class TestConsolidateProposal(TestCase):
         self.assertTrue(mock_update_learning_unit_with_report.called)
 
 
-class TestModifyProposalState(TestCase):
-    def test_change_new_state(self):
-        proposal = ProposalLearningUnitFactory(state=proposal_state.ProposalState.FACULTY.name)
+class TestForceStateOfProposals(TestCase):
+    def setUp(self):
+        self.author = PersonFactory()
+        self.proposals = [ProposalLearningUnitFactory(state=proposal_state.ProposalState.FACULTY.name)
+                          for _ in range(2)]
+
+    @mock.patch("base.business.learning_units.perms.find_proposals_eligible_to_edit",
+                side_effect=lambda proposals, person: proposals[:1])
+    def test_change_state_of_eligible_proposals(self, mock_perm):
         new_state = proposal_state.ProposalState.SUSPENDED.name
-        modify_proposal_state(new_state, proposal)
+        result = lu_proposal_business.force_state_of_proposals(self.proposals, self.author, new_state)
+
+        self.assertEqual([proposal.state for proposal in ProposalLearningUnit.objects.order_by('pk')],
+                         [new_state, proposal_state.ProposalState.FACULTY.name])
+        self.assertEqual(len(result[SUCCESS]), 1)
+        self.assertEqual(len(result[ERROR]), 1)
+
+    @mock.patch("base.business.learning_units.perms.find_proposals_eligible_to_edit",
+                side_effect=lambda proposals, person: proposals[:1])
+    def test_modification_dates_of_eligible_proposals_updated(self, mock_perm):
+        previous_dates = [(proposal.changed, proposal.date) for proposal in self.proposals]
+
+        lu_proposal_business.force_state_of_proposals(self.proposals, self.author,
+                                                      proposal_state.ProposalState.SUSPENDED.name)
+
+        changed_proposal, unchanged_proposal = ProposalLearningUnit.objects.order_by('pk')
+        self.assertGreater(changed_proposal.changed, previous_dates[0][0])
+        self.assertGreater(changed_proposal.date, previous_dates[0][1])
+        self.assertEqual((unchanged_proposal.changed, unchanged_proposal.date), previous_dates[1])
+
 
-        proposal.refresh_from_db()
-        self.assertEqual(proposal.state, new_state)
+@mock.patch("base.business.learning_units.perms.find_proposals_eligible_to_consolidate",
+            side_effect=lambda proposals, person: proposals)
+@mock.patch("base.business.learning_unit_proposal.consolidate_proposal",
+            side_effect=lambda prop: {SUCCESS: ["msg_success"]})
+@mock.patch("base.utils.send_mail.send_mail_consolidation_learning_unit_proposal")
+class TestApplyActionOnProposalsInBackground(TestCase):
+    def setUp(self):
+        self.author = PersonFactory()
+        self.proposals = [ProposalLearningUnitFactory()
+                          for _ in range(lu_proposal_business.BACKGROUND_PROPOSALS_THRESHOLD + 1)]
+
+    @mock.patch("base.business.learning_unit_proposal.celery_app.send_task")
+    @mock.patch("django.db.transaction.on_commit", side_effect=lambda func: func())
+    def test_large_selection_dispatched_to_celery(self, mock_on_commit, mock_send_task, mock_mail, mock_consolidate,
+                                                  mock_perm):
+        result = consolidate_proposals_and_send_report(self.proposals, self.author, [("Acronym", "LDROI")])
+
+        mock_send_task.assert_called_once_with(
+            lu_proposal_business.APPLY_ACTION_ON_PROPOSALS_TASK,
+            args=[lu_proposal_business.CONSOLIDATE, [proposal.pk for proposal in self.proposals], self.author.pk,
+                  [["Acronym", "LDROI"]]]
+        )
+        self.assertEqual(list(result.keys()), [INFO])
+        self.assertFalse(mock_consolidate.called)
+        self.assertFalse(mock_mail.called)
+
+    def test_apply_action_in_background_sends_report(self, mock_mail, mock_consolidate, mock_perm):
+        result = lu_proposal_business.apply_action_on_proposals_in_background(
+            lu_proposal_business.CONSOLIDATE, [proposal.pk for proposal in self.proposals], self.author.pk, []
+        )
+
+        self.assertEqual(mock_consolidate.call_count, len(self.proposals))
+        self.assertEqual(len(result[SUCCESS]), len(self.proposals))
+        self.assertTrue(mock_mail.called)
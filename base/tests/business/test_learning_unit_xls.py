@@ -26,15 +26,16 @@
 import datetime
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
+from openpyxl import load_workbook
 
 from base.tests.factories.learning_unit_year import LearningUnitYearFactory
 from base.tests.factories.proposal_learning_unit import ProposalLearningUnitFactory
 from base.tests.factories.person import PersonFactory
-from base.business.learning_unit_xls import DEFAULT_LEGEND_STYLES, SPACES, PROPOSAL_LINE_STYLES, _update_volumes_data, \
-    _get_significant_volume, VOLUMES_INITIALIZED, _prepare_legend_ws_data, _get_wrapped_cells, \
-    _get_colored_rows, _get_attribution_line, _get_col_letter, _get_trainings_by_educ_group_year, _add_training_data, \
-    _get_data_part1, _get_parameters_configurable_list, WRAP_TEXT_STYLE, HEADER_PROGRAMS, XLS_DESCRIPTION, \
-    _get_absolute_credits, _get_volumes, _get_data_part2
+from base.business.learning_unit_xls import DEFAULT_LEGEND_STYLES, SPACES, _update_volumes_data, \
+    _get_significant_volume, VOLUMES_INITIALIZED, _prepare_legend_ws_data, _get_styled_rows, \
+    _get_attribution_line, _get_trainings_by_educ_group_year, _add_training_data, \
+    _get_data_part1, create_xls_with_parameters_stream, HEADER_PROGRAMS, HEADER_TEACHERS, WITH_GRP, \
+    WITH_ATTRIBUTIONS, LEARNING_UNIT_TITLES_PART1, _get_absolute_credits, _get_volumes, _get_data_part2
 from base.models.enums import proposal_type, proposal_state
 from base.tests.factories.academic_year import AcademicYearFactory
 from base.tests.factories.learning_container_year import LearningContainerYearFactory
@@ -118,37 +119,30 @@ class TestLearningUnitXls(TestCase):
             type=proposal_type.ProposalType.CREATION.name,
         )
 
-    def test_get_wrapped_cells_with_teachers_and_programs(self):
-        styles = _get_wrapped_cells([self.learning_unit_yr_1, self.learning_unit_yr_2],
-                                    COL_TEACHERS_LETTER,
-                                    COL_PROGRAMS_LETTER)
-        self.assertCountEqual(styles, ['{}2'.format(COL_TEACHERS_LETTER),
-                                       '{}2'.format(COL_PROGRAMS_LETTER),
-                                       '{}3'.format(COL_TEACHERS_LETTER),
-                                       '{}3'.format(COL_PROGRAMS_LETTER)])
-
-    def test_get_wrapped_cells_with_teachers(self):
-        styles = _get_wrapped_cells([self.learning_unit_yr_1, self.learning_unit_yr_2], COL_TEACHERS_LETTER, None)
-        self.assertCountEqual(styles, ['{}2'.format(COL_TEACHERS_LETTER),
-                                       '{}3'.format(COL_TEACHERS_LETTER)])
-
-    def test_get_wrapped_cells_with_programs(self):
-        styles = _get_wrapped_cells([self.learning_unit_yr_1, self.learning_unit_yr_2], None, COL_PROGRAMS_LETTER)
-        self.assertCountEqual(styles, ['{}2'.format(COL_PROGRAMS_LETTER),
-                                       '{}3'.format(COL_PROGRAMS_LETTER)])
-
-    def test_get_col_letter(self):
-        title_searched = 'title 2'
-        titles = ['title 1', title_searched, 'title 3']
-        self.assertEqual(_get_col_letter(titles, title_searched), 'B')
-        self.assertIsNone(_get_col_letter(titles, 'whatever'))
-
-    def test_get_colored_rows(self):
-        self.assertEqual(_get_colored_rows([self.learning_unit_yr_1,
-                                            self.learning_unit_yr_2,
-                                            self.proposal_creation_1.learning_unit_year,
-                                            self.proposal_creation_2.learning_unit_year]),
-                         {PROPOSAL_LINE_STYLES.get(self.proposal_creation_1.type): [3, 4]})
+    def test_get_styled_rows(self):
+        rows = list(_get_styled_rows([self.learning_unit_yr_2, self.learning_unit_year_with_entities], False, False))
+
+        self.assertEqual([row.values[0] for row in rows],
+                         [self.learning_unit_yr_2.acronym, self.learning_unit_year_with_entities.acronym])
+        self.assertEqual([row.style for row in rows], [None, self.proposal_creation_3.type])
+
+    def test_create_xls_with_parameters_stream(self):
+        workbook = load_workbook(create_xls_with_parameters_stream(
+            UserFactory(),
+            [self.learning_unit_year_with_entities],
+            None,
+            {WITH_GRP: True, WITH_ATTRIBUTIONS: False}
+        ))
+
+        self.assertEqual(len(workbook.worksheets), 3)
+        worksheet = workbook.worksheets[0]
+        header = [cell.value for cell in next(worksheet.rows)]
+        self.assertEqual(header[:len(LEARNING_UNIT_TITLES_PART1)], LEARNING_UNIT_TITLES_PART1)
+        self.assertEqual(header[-1], str(HEADER_PROGRAMS))
+        self.assertNotIn(str(HEADER_TEACHERS), header)
+        self.assertEqual(worksheet['A2'].value, self.learning_unit_year_with_entities.acronym)
+        self.assertEqual(worksheet['A2'].font.color.rgb, '00008000')
+        self.assertTrue(worksheet.cell(row=2, column=len(header)).alignment.wrap_text)
 
     def test_get_attributions_line(self):
         a_person = PersonFactory(last_name="Smith", first_name='Aaron')
@@ -244,23 +238,6 @@ class TestLearningUnitXls(TestCase):
         self.assertEqual(data[6], _(self.proposal_creation_1.type))
         self.assertEqual(data[7], _(self.proposal_creation_1.state))
 
-    def test_get_parameters_configurable_list(self):
-        user_name = 'Ducon'
-        an_user = UserFactory(username=user_name)
-        titles = ['title1', 'title2']
-        learning_units = [self.learning_unit_yr_1, self.learning_unit_yr_2]
-        param = _get_parameters_configurable_list(learning_units, titles, an_user)
-        self.assertEqual(param.get(xls_build.DESCRIPTION), XLS_DESCRIPTION)
-        self.assertEqual(param.get(xls_build.USER), user_name)
-        self.assertEqual(param.get(xls_build.HEADER_TITLES), titles)
-        self.assertEqual(param.get(xls_build.STYLED_CELLS), {WRAP_TEXT_STYLE: []})
-        self.assertEqual(param.get(xls_build.COLORED_ROWS), {})
-
-        titles.append(HEADER_PROGRAMS)
-
-        param = _get_parameters_configurable_list(learning_units, titles, an_user)
-        self.assertEqual(param.get(xls_build.STYLED_CELLS), {WRAP_TEXT_STYLE: ['C2', 'C3']})
-
     def test_get_absolute_credits(self):
         credits_luy = 15
         luy = LearningUnitYearFactory(credits=credits_luy)
@@ -24,18 +24,24 @@
 #
 ##############################################################################
 import datetime
+from unittest import mock
 
 from django.test import TestCase
 
 from base.business import learning_unit_year_with_context
+from base.business.entity import build_entity_container_prefetch
 from base.models.enums import entity_container_year_link_type as entity_types, organization_type, \
     entity_container_year_link_type
+from base.models.learning_unit_year import LearningUnitYear
+from base.models.utils.utils import iterate_by_chunks
 from base.tests.factories.academic_year import AcademicYearFactory
 from base.tests.factories.entity import EntityFactory
 from base.tests.factories.entity_component_year import EntityComponentYearFactory
 from base.tests.factories.entity_container_year import EntityContainerYearFactory
+from base.tests.factories.entity_version import EntityVersionFactory
 from base.tests.factories.learning_component_year import LearningComponentYearFactory
 from base.tests.factories.learning_container_year import LearningContainerYearFactory
+from base.tests.factories.learning_unit_year import LearningUnitYearFactory
 from base.tests.factories.organization import OrganizationFactory
 from reference.tests.factories.country import CountryFactory
 
@@ -111,3 +117,36 @@ class LearningUnitYearWithContextTestCase(TestCase):
         self.assertEqual(data.get('VOLUME_Q1'), 10)
         self.assertEqual(data.get('VOLUME_Q2'), 5)
         self.assertEqual(data.get('VOLUME_REQUIREMENT_ENTITY'), 15)
+
+
+class TestIterWithLatestEntities(TestCase):
+    def setUp(self):
+        self.learning_unit_years = [LearningUnitYearFactory() for _ in range(3)]
+        for learning_unit_year in self.learning_unit_years:
+            entity_version = EntityVersionFactory(end_date=datetime.date(2099, 12, 31))
+            EntityContainerYearFactory(learning_container_year=learning_unit_year.learning_container_year,
+                                       type=entity_container_year_link_type.REQUIREMENT_ENTITY,
+                                       entity=entity_version.entity)
+
+    @mock.patch('base.business.learning_unit_year_with_context.iterate_by_chunks',
+                side_effect=lambda objects: iterate_by_chunks(objects, chunk_size=2))
+    def test_objects_fetched_by_chunks_with_latest_entities(self, mock_iterate):
+        queryset = LearningUnitYear.objects.filter(pk__in=[luy.pk for luy in self.learning_unit_years]).order_by('pk')
+        queryset = queryset.prefetch_related(build_entity_container_prefetch([entity_types.REQUIREMENT_ENTITY]))
+
+        learning_unit_years = list(learning_unit_year_with_context.iter_with_latest_entities(queryset))
+
+        self.assertEqual(learning_unit_years, sorted(self.learning_unit_years, key=lambda luy: luy.pk))
+        self.assertTrue(all(luy.entities.get(entity_types.REQUIREMENT_ENTITY) for luy in learning_unit_years))
+
+    def test_annotate_latest_entity_acronyms(self):
+        learning_unit_year = self.learning_unit_years[0]
+        entity = learning_unit_year.learning_container_year.entitycontaineryear_set.get().entity
+        EntityVersionFactory(entity=entity, acronym='LATEST', start_date=datetime.date(2100, 1, 1), end_date=None)
+
+        annotated_learning_unit_year = learning_unit_year_with_context.annotate_latest_entity_acronyms(
+            LearningUnitYear.objects.filter(pk=learning_unit_year.pk)
+        ).get()
+
+        self.assertEqual(annotated_learning_unit_year.requirement_entity_acronym, 'LATEST')
+        self.assertIsNone(annotated_learning_unit_year.allocation_entity_acronym)
@@ -0,0 +1,143 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+import pika.exceptions
+from django.test import TestCase, override_settings
+
+from base.business import outbox
+from base.models.entity import Entity
+from base.models.outbox_record import OutboxRecord
+from base.tests.factories.entity import EntityFactory
+from osis_common.models import serializable_model
+
+QUEUES = {'QUEUES_NAME': {'MIGRATIONS_TO_PRODUCE': 'migrations'}}
+
+
+def _serialize(instance):
+    return {'model': instance._meta.label_lower, 'id': instance.pk}
+
+
+@mock.patch('base.business.outbox.serialize', side_effect=_serialize)
+@mock.patch('base.utils.queue_publisher.publisher.publish_many')
+class TestOutbox(TestCase):
+    def setUp(self):
+        self.entities = [EntityFactory() for _ in range(3)]
+        # Enabled once the entities are created, their saves would be recorded in the outbox
+        queues_settings = override_settings(QUEUES=QUEUES, QUEUES_OUTBOX=True)
+        queues_settings.enable()
+        self.addCleanup(queues_settings.disable)
+
+    def _message(self, entity, to_delete=False):
+        return {'model': 'base.entity', 'id': entity.pk, 'to_delete': to_delete}
+
+    def test_changes_not_recorded_when_disabled(self, mock_publish_many, mock_serialize):
+        with override_settings(QUEUES_OUTBOX=False):
+            outbox.record_changes(Entity, [self.entities[0].pk])
+        self.assertFalse(OutboxRecord.objects.exists())
+
+    def test_changes_of_an_object_coalesced(self, mock_publish_many, mock_serialize):
+        outbox.record_saved_instance(sender=Entity, instance=self.entities[0])
+        outbox.record_changes(Entity, [self.entities[1].pk, self.entities[0].pk])
+        outbox.record_deleted_instance(sender=Entity, instance=self.entities[2])
+
+        self.assertEqual(outbox.relay_outbox(), 4)
+
+        mock_publish_many.assert_called_once_with('migrations', [
+            self._message(self.entities[1]), self._message(self.entities[0]),
+            self._message(self.entities[2], to_delete=True),
+        ])
+        self.assertFalse(OutboxRecord.objects.exists())
+
+    def test_relayed_by_batches(self, mock_publish_many, mock_serialize):
+        outbox.record_changes(Entity, [entity.pk for entity in self.entities])
+
+        self.assertEqual(outbox.relay_outbox(batch_size=2), 3)
+
+        self.assertEqual([call[0][1] for call in mock_publish_many.call_args_list],
+                         [[self._message(entity) for entity in self.entities[:2]], [self._message(self.entities[2])]])
+
+    def test_records_kept_when_publication_fails(self, mock_publish_many, mock_serialize):
+        mock_publish_many.side_effect = pika.exceptions.AMQPError
+        outbox.record_changes(Entity, [self.entities[0].pk])
+
+        with self.assertRaises(pika.exceptions.AMQPError):
+            outbox.relay_outbox()
+
+        self.assertEqual(OutboxRecord.objects.count(), 1)
+
+    def test_object_deleted_since_its_change_not_published(self, mock_publish_many, mock_serialize):
+        outbox.record_changes(Entity, [self.entities[0].pk, 0])
+
+        outbox.relay_outbox()
+
+        mock_publish_many.assert_called_once_with('migrations', [self._message(self.entities[0])])
+
+    @mock.patch('base.business.outbox._acquire_relay_lock', return_value=False)
+    def test_not_relayed_while_another_relay_runs(self, mock_acquire_relay_lock, mock_publish_many, mock_serialize):
+        outbox.record_changes(Entity, [self.entities[0].pk])
+
+        self.assertEqual(outbox.relay_outbox(), 0)
+
+        self.assertFalse(mock_publish_many.called)
+        self.assertEqual(OutboxRecord.objects.count(), 1)
+
+
+@mock.patch('base.business.outbox.serialize', side_effect=_serialize)
+# Enabled without the queues settings, the saves of the serializable models are not published on the queues
+@mock.patch('base.business.outbox.is_enabled', return_value=True)
+class TestSerializableModelsConnected(TestCase):
+    def test_saved_instance_recorded(self, mock_is_enabled, mock_serialize):
+        entity = EntityFactory()
+
+        self.assertTrue(OutboxRecord.objects.filter(model='base.entity', object_id=entity.pk, to_delete=False).exists())
+
+    def test_deleted_instance_recorded(self, mock_is_enabled, mock_serialize):
+        entity = EntityFactory()
+        entity_id = entity.pk
+
+        entity.delete()
+
+        record = OutboxRecord.objects.get(model='base.entity', object_id=entity_id, to_delete=True)
+        self.assertEqual(record.payload, {'model': 'base.entity', 'id': entity_id, 'to_delete': True})
+
+
+@mock.patch('base.business.outbox._inline_send_to_queue')
+class TestInlinePublication(TestCase):
+    def test_replaced_when_the_application_is_ready(self, mock_inline_send_to_queue):
+        self.assertIs(serializable_model.send_to_queue, outbox.skip_inline_publication)
+
+    def test_skipped_when_enabled(self, mock_inline_send_to_queue):
+        with override_settings(QUEUES=QUEUES, QUEUES_OUTBOX=True):
+            serializable_model.send_to_queue({'id': 1})
+
+        self.assertFalse(mock_inline_send_to_queue.called)
+
+    def test_published_when_disabled(self, mock_inline_send_to_queue):
+        with override_settings(QUEUES=QUEUES, QUEUES_OUTBOX=False):
+            serializable_model.send_to_queue({'id': 1}, to_delete=True)
+
+        mock_inline_send_to_queue.assert_called_once_with({'id': 1}, to_delete=True)
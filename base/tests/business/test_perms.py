@@ -27,7 +27,9 @@ import datetime
 
 from django.contrib.auth.models import Permission, Group
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from base.business.learning_units import perms
 from base.business.learning_units.perms import is_eligible_to_create_modification_proposal, \
@@ -456,6 +458,112 @@ class TestIsEligibleToConsolidateLearningUnitProposal(TestCase):
                 self.assertTrue(is_eligible_to_consolidate_proposal(proposal, self.person_with_right_to_consolidate))
 
 
+
+class TestFindProposalsEligible(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.current_academic_year = create_current_academic_year()
+        cls.next_academic_year = AcademicYearFactory(
+            year=cls.current_academic_year.year + 1,
+            start_date=datetime.date(cls.current_academic_year.year + 1, 9, 15),
+            end_date=datetime.date(cls.current_academic_year.year + 2, 9, 30)
+        )
+        cls.faculty_manager = FacultyManagerFactory(
+            'can_propose_learningunit', 'can_edit_learning_unit_proposal', 'can_consolidate_learningunit_proposal'
+        )
+        cls.person_entity = PersonEntityFactory(person=cls.faculty_manager)
+
+    def _create_proposal(self, state, attached=True, academic_year=None, **kwargs):
+        academic_year = academic_year or self.next_academic_year
+        kwargs.setdefault('type', ProposalType.SUPPRESSION.name)
+        proposal = ProposalLearningUnitFactory(
+            state=state,
+            learning_unit_year__academic_year=academic_year,
+            learning_unit_year__learning_container_year__academic_year=academic_year,
+            **kwargs
+        )
+        EntityContainerYearFactory(
+            learning_container_year=proposal.learning_unit_year.learning_container_year,
+            entity=self.person_entity.entity if attached else EntityContainerYearFactory().entity,
+            type=entity_container_year_link_type.REQUIREMENT_ENTITY
+        )
+        return proposal
+
+    def _get_person(self):
+        # Refresh permissions and linked entities caches
+        return Person.objects.get(pk=self.faculty_manager.pk)
+
+    def test_find_proposals_eligible_for_cancel(self):
+        faculty_proposal = self._create_proposal(proposal_state.ProposalState.FACULTY.name)
+        central_proposal = self._create_proposal(proposal_state.ProposalState.CENTRAL.name)
+        not_attached_proposal = self._create_proposal(proposal_state.ProposalState.FACULTY.name, attached=False)
+
+        self.assertEqual(
+            perms.find_proposals_eligible_for_cancel(
+                [faculty_proposal, central_proposal, not_attached_proposal], self._get_person()
+            ),
+            [faculty_proposal]
+        )
+
+    def test_find_proposals_attached_to_initial_requirement_entity(self):
+        proposal = self._create_proposal(proposal_state.ProposalState.FACULTY.name, attached=False, initial_data={
+            "entities": {entity_container_year_link_type.REQUIREMENT_ENTITY: self.person_entity.entity.id}
+        })
+        self.assertEqual(perms.find_proposals_eligible_for_cancel([proposal], self._get_person()), [proposal])
+
+    def test_find_proposals_eligible_to_edit(self):
+        faculty_proposal = self._create_proposal(proposal_state.ProposalState.FACULTY.name)
+        modification_proposal = self._create_proposal(proposal_state.ProposalState.FACULTY.name,
+                                                      type=ProposalType.MODIFICATION.name)
+        modification_proposal_in_past = self._create_proposal(
+            proposal_state.ProposalState.FACULTY.name, type=ProposalType.MODIFICATION.name,
+            academic_year=self.current_academic_year
+        )
+
+        self.assertEqual(
+            perms.find_proposals_eligible_to_edit(
+                [faculty_proposal, modification_proposal, modification_proposal_in_past], self._get_person()
+            ),
+            [faculty_proposal, modification_proposal]
+        )
+
+    def test_find_proposals_eligible_to_consolidate(self):
+        accepted_proposal = self._create_proposal(proposal_state.ProposalState.ACCEPTED.name)
+        faculty_proposal = self._create_proposal(proposal_state.ProposalState.FACULTY.name)
+
+        self.assertEqual(
+            perms.find_proposals_eligible_to_consolidate([accepted_proposal, faculty_proposal], self._get_person()),
+            [accepted_proposal]
+        )
+        self.assertEqual(perms.find_proposals_eligible_to_consolidate([accepted_proposal], PersonFactory()), [])
+
+    def test_same_results_as_single_proposal_checks(self):
+        proposals = [self._create_proposal(state, attached=attached)
+                     for state in (proposal_state.ProposalState.FACULTY.name,
+                                   proposal_state.ProposalState.ACCEPTED.name)
+                     for attached in (True, False)]
+        person = self._get_person()
+
+        for find_eligible, is_eligible in [
+            (perms.find_proposals_eligible_for_cancel, perms.is_eligible_for_cancel_of_proposal),
+            (perms.find_proposals_eligible_to_edit, perms.is_eligible_to_edit_proposal),
+            (perms.find_proposals_eligible_to_consolidate, perms.is_eligible_to_consolidate_proposal),
+        ]:
+            with self.subTest(find_eligible=find_eligible.__name__):
+                self.assertEqual(find_eligible(proposals, person),
+                                 [proposal for proposal in proposals if is_eligible(proposal, person)])
+
+    def test_number_of_queries_does_not_depend_on_number_of_proposals(self):
+        proposals = [self._create_proposal(proposal_state.ProposalState.FACULTY.name) for _ in range(3)]
+
+        with CaptureQueriesContext(connection) as one_proposal_queries:
+            perms.find_proposals_eligible_to_edit(proposals[:1], self._get_person())
+        with CaptureQueriesContext(connection) as three_proposals_queries:
+            perms.find_proposals_eligible_to_edit(proposals, self._get_person())
+
+        self.assertEqual(len(one_proposal_queries), len(three_proposals_queries))
+
+
 class TestIsAcademicYearInRangeToCreatePartim(TestCase):
     @classmethod
     def setUpTestData(cls):
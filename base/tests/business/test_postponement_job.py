@@ -0,0 +1,138 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.db import Error
+from django.test import TestCase, override_settings
+
+from base.business import postponement_job
+from base.business.learning_units.automatic_postponement import LearningUnitAutomaticPostponement
+from base.business.utils.postponement import AutomaticPostponement
+from base.models.enums import export_job_status, postponement_type
+from base.models.learning_unit_year import LearningUnitYear
+from base.tests.factories.academic_year import AcademicYearFactory, get_current_year
+from base.tests.factories.learning_unit_year import LearningUnitYearFactory
+
+
+@override_settings(POSTPONEMENT_CHUNK_SIZE=2)
+@mock.patch('base.business.postponement_job.transaction.on_commit')
+class TestPostponementJob(TestCase):
+    def setUp(self):
+        current_year = get_current_year()
+        self.academic_years = [AcademicYearFactory(year=i) for i in range(current_year, current_year + 7)]
+        self.learning_unit_years = [
+            LearningUnitYearFactory(academic_year=self.academic_years[-2], learning_unit__end_year=None)
+            for _ in range(3)
+        ]
+        self.ids = sorted(luy.pk for luy in self.learning_unit_years)
+
+    def _start(self):
+        return postponement_job.start_postponement_job(postponement_type.LEARNING_UNITS)
+
+    @mock.patch('base.business.postponement_job.celery_app.send_task')
+    def test_objects_dispatched_by_chunks(self, mock_send_task, mock_on_commit):
+        job = self._start()
+
+        self.assertEqual((job.total, job.status), (3, export_job_status.PENDING))
+        self.assertEqual(job.academic_year, self.academic_years[-1])
+        mock_on_commit.call_args[0][0]()
+        self.assertEqual([call[1]['args'] for call in mock_send_task.call_args_list],
+                         [[job.pk, self.ids[:2]], [job.pk, self.ids[2:]]])
+
+    def test_results_of_chunks_combined(self, mock_on_commit):
+        job = self._start()
+
+        self.assertEqual(postponement_job.run_postponement_chunk(job.pk, self.ids[:2]), 66)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, len(job.result)), (export_job_status.RUNNING, 2, 2))
+
+        self.assertEqual(postponement_job.run_postponement_chunk(job.pk, self.ids[2:]), 100)
+        job.refresh_from_db()
+        self.assertEqual((job.status, len(job.result), job.errors), (export_job_status.DONE, 3, []))
+        self.assertIsNotNone(job.finished)
+        self.assertEqual(LearningUnitYear.objects.filter(academic_year=self.academic_years[-1]).count(), 3)
+
+    def test_items_registered_for_the_objects_to_postpone(self, mock_on_commit):
+        job = self._start()
+
+        self.assertEqual(sorted(job.items.values_list('object_id', flat=True)), self.ids)
+        self.assertFalse(job.items.filter(processed=True).exists())
+
+    @mock.patch.object(LearningUnitAutomaticPostponement, 'send_after')
+    def test_chunk_delivered_again_not_processed_twice(self, mock_send_after, mock_on_commit):
+        job = self._start()
+
+        postponement_job.run_postponement_chunk(job.pk, self.ids[:2])
+        self.assertEqual(postponement_job.run_postponement_chunk(job.pk, self.ids[:2]), 66)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, len(job.result)), (export_job_status.RUNNING, 2, 2))
+
+        postponement_job.run_postponement_chunk(job.pk, self.ids[2:])
+        postponement_job.run_postponement_chunk(job.pk, self.ids[2:])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, len(job.result)), (export_job_status.DONE, 3, 3))
+        self.assertEqual(LearningUnitYear.objects.filter(academic_year=self.academic_years[-1]).count(), 3)
+        # Dispatch of the chunks and results sent once
+        self.assertEqual(mock_on_commit.call_count, 2)
+
+    @mock.patch('base.business.learning_units.automatic_postponement.LearningUnitAutomaticPostponement.extend_obj',
+                side_effect=Error('test error'))
+    def test_objects_in_error(self, mock_extend_obj, mock_on_commit):
+        job = self._start()
+
+        postponement_job.run_postponement_chunk(job.pk, self.ids)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, export_job_status.DONE)
+        self.assertEqual(sorted(job.errors), sorted(str(luy) for luy in self.learning_unit_years))
+
+    def test_nothing_to_postpone(self, mock_on_commit):
+        LearningUnitYear.objects.all().delete()
+
+        job = self._start()
+
+        self.assertEqual((job.total, job.status, job.progress), (0, export_job_status.DONE, 100))
+        self.assertTrue(mock_on_commit.called)
+
+    @mock.patch.object(LearningUnitAutomaticPostponement, 'send_after')
+    def test_statistics_of_the_start_sent_with_the_results(self, mock_send_after, mock_on_commit):
+        already_duplicated = self.learning_unit_years[0]
+        LearningUnitYearFactory(academic_year=self.academic_years[-1], learning_unit=already_duplicated.learning_unit)
+        LearningUnitYearFactory(academic_year=self.academic_years[-2],
+                                learning_unit__end_year=self.academic_years[-2].year)
+        job = self._start()
+
+        postponement_job.run_postponement_chunk(job.pk, [pk for pk in self.ids if pk != already_duplicated.pk])
+        mock_on_commit.call_args[0][0]()
+
+        job.refresh_from_db()
+        self.assertEqual((job.total, job.already_duplicated_count, job.to_not_duplicate_count), (2, 1, 1))
+        mock_send_after.assert_called_once_with(self.academic_years[-1], job.result, 1, 1, [])
+
+    def test_all_postponement_types_have_a_postponement_class(self, mock_on_commit):
+        for a_postponement_type, _ in postponement_type.POSTPONEMENT_TYPES:
+            self.assertTrue(issubclass(postponement_job._get_postponement_class(a_postponement_type),
+                                       AutomaticPostponement))
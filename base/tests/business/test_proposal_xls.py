@@ -23,12 +23,11 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from unittest import mock
-
 from django.test import TestCase
 from django.utils.translation import ugettext_lazy as _
+from openpyxl import load_workbook
 
-from base.business.proposal_xls import XLS_DESCRIPTION, XLS_FILENAME, WORKSHEET_TITLE
+from base.business.proposal_xls import WORKSHEET_TITLE
 from base.models.enums import entity_container_year_link_type
 from base.tests.factories.entity_version import EntityVersionFactory
 from base.tests.factories.entity import EntityFactory
@@ -67,13 +66,8 @@ class TestProposalXls(TestCase):
         self.proposal_1 = ProposalLearningUnitFactory(learning_unit_year=self.l_unit_yr_1, entity=entity_vr.entity)
         self.user = UserFactory()
 
-    def test_prepare_xls_content_no_data(self):
-        self.assertEqual(proposal_xls.prepare_xls_content([]), [])
-
-    def test_prepare_xls_content_with_data(self):
-        proposals_data = proposal_xls.prepare_xls_content([self.proposal_1])
-        self.assertEqual(len(proposals_data), 1)
-        self.assertEqual(proposals_data[0], self._get_xls_data())
+    def test_extract_xls_data_from_proposal(self):
+        self.assertEqual(proposal_xls.extract_xls_data_from_proposal(self.proposal_1), self._get_xls_data())
 
     def _get_xls_data(self):
         return [self.l_unit_yr_1.entities.get('REQUIREMENT_ENTITY').acronym,
@@ -89,32 +83,18 @@ class TestProposalXls(TestCase):
                 self.l_unit_yr_1.entities.get('ALLOCATION_ENTITY').acronym,
                 self.proposal_1.date.strftime('%d-%m-%Y')]
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_no_data(self, mock_generate_xls):
-        proposal_xls.create_xls(self.user, [], None)
-        expected_argument = _generate_xls_build_parameter([], self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
-
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_a_learning_unit(self, mock_generate_xls):
-        proposal_xls.create_xls(self.user, [self.proposal_1], None)
-
-        xls_data = [self._get_xls_data()]
+    def test_create_xls_proposal_stream_with_no_data(self):
+        worksheet = load_workbook(proposal_xls.create_xls_proposal_stream(self.user, [], None)).worksheets[0]
 
-        expected_argument = _generate_xls_build_parameter(xls_data, self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+        self.assertEqual(worksheet.title, str(_(WORKSHEET_TITLE)))
+        self.assertEqual([[cell.value for cell in row] for row in worksheet.rows], [proposal_xls.PROPOSAL_TITLES])
 
+    def test_create_xls_proposal_stream_with_a_learning_unit(self):
+        worksheet = load_workbook(
+            proposal_xls.create_xls_proposal_stream(self.user, [self.proposal_1], None)
+        ).worksheets[0]
 
-def _generate_xls_build_parameter(xls_data, user):
-    return {
-        xls_build.LIST_DESCRIPTION_KEY: _(XLS_DESCRIPTION),
-        xls_build.FILENAME_KEY: _(XLS_FILENAME),
-        xls_build.USER_KEY: user.username,
-        xls_build.WORKSHEETS_DATA: [{
-            xls_build.CONTENT_KEY: xls_data,
-            xls_build.HEADER_TITLES_KEY: proposal_xls.PROPOSAL_TITLES,
-            xls_build.WORKSHEET_TITLE_KEY: _(WORKSHEET_TITLE),
-            xls_build.STYLED_CELLS: None,
-            xls_build.COLORED_ROWS: None,
-        }]
-    }
+        rows = [[cell.value for cell in row] for row in worksheet.rows]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:3], [ACRONYM_REQUIREMENT, self.l_unit_yr_1.acronym, self.l_unit_yr_1.complete_title])
+        self.assertEqual(rows[1][10:], [ACRONYM_ALLOCATION, self.proposal_1.date.strftime('%d-%m-%Y')])
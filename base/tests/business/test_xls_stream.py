@@ -0,0 +1,125 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import collections
+
+from django.test import SimpleTestCase, TestCase
+from openpyxl import load_workbook
+from openpyxl.styles import Font, PatternFill, Style
+
+from base.business import education_group
+from base.business.xls_stream import StreamingWorkbook, styled_row, get_xls_filename
+from base.tests.factories.education_group_year import EducationGroupYearFactory
+from base.tests.factories.entity_version import EntityVersionFactory
+from base.tests.factories.user import UserFactory
+
+RED_STYLE = 'red'
+ITALIC_STYLE = 'italic'
+
+
+class TestStreamingWorkbook(SimpleTestCase):
+    def setUp(self):
+        self.workbook = StreamingWorkbook(named_styles={
+            RED_STYLE: Style(fill=PatternFill(patternType='solid', fgColor='FF0000')),
+            ITALIC_STYLE: Style(font=Font(italic=True)),
+        })
+
+    def _load(self):
+        return load_workbook(self.workbook.save())
+
+    def test_rows_written_after_header(self):
+        self.workbook.add_worksheet('sheet', ['Code', 'Title'], (row for row in [['LDROI1001', 'Droit'], [1, None]]))
+
+        worksheet = self._load().worksheets[0]
+
+        self.assertEqual(worksheet.title, 'sheet')
+        self.assertEqual([[cell.value for cell in row] for row in worksheet.rows],
+                         [['Code', 'Title'], ['LDROI1001', 'Droit'], [1, None]])
+        self.assertTrue(worksheet['A1'].font.bold)
+        self.assertFalse(worksheet['A2'].font.bold)
+
+    def test_styled_rows(self):
+        rows = [
+            styled_row(['a', 'b'], style=RED_STYLE),
+            styled_row(['c', 'd'], cell_styles={1: ITALIC_STYLE}),
+            styled_row(['e', 'f'], style=RED_STYLE, cell_styles={1: ITALIC_STYLE}),
+        ]
+        self.workbook.add_worksheet('sheet', None, rows)
+
+        worksheet = self._load().worksheets[0]
+
+        self.assertEqual(worksheet['A1'].fill.fgColor.rgb, '00FF0000')
+        self.assertFalse(worksheet['B2'].fill.fgColor.rgb == '00FF0000')
+        self.assertTrue(worksheet['B2'].font.italic)
+        self.assertFalse(worksheet['A2'].font.italic)
+        self.assertEqual(worksheet['B3'].fill.fgColor.rgb, '00FF0000')
+        self.assertTrue(worksheet['B3'].font.italic)
+
+    def test_computed_style_memoized(self):
+        self.workbook.add_worksheet('sheet', None, [styled_row([i], style=RED_STYLE) for i in range(3)])
+        self.assertEqual(list(self.workbook._computed_styles.keys()), [(RED_STYLE,)])
+
+    def test_non_native_values_converted_to_string(self):
+        self.workbook.add_worksheet('sheet', None, [[_StrObject()]])
+        self.assertEqual(self._load().worksheets[0]['A1'].value, 'object')
+
+    def test_parameters_worksheet(self):
+        self.workbook.add_worksheet('sheet', ['Code'], [])
+        self.workbook.add_parameters_worksheet('description', 'user', collections.OrderedDict([('acronym', 'LDROI')]))
+
+        worksheet = self._load().worksheets[1]
+
+        rows = [[cell.value for cell in row] for row in worksheet.rows]
+        self.assertEqual(rows[1][1], 'user')
+        self.assertEqual(rows[3], ['acronym', 'LDROI'])
+        self.assertTrue(worksheet['A1'].font.bold)
+
+    def test_long_worksheet_title_truncated(self):
+        self.workbook.add_worksheet('a' * 40, None, [])
+        self.assertEqual(self._load().worksheets[0].title, 'a' * 31)
+
+    def test_get_xls_filename(self):
+        self.assertEqual(get_xls_filename('learning units'), 'learning-units.xlsx')
+
+
+class TestEducationGroupXlsStream(TestCase):
+    def test_create_xls_stream(self):
+        education_group_year = EducationGroupYearFactory()
+        education_group_year.management_entity_version = EntityVersionFactory()
+
+        stream = education_group.create_xls_stream(
+            UserFactory(), [education_group_year], collections.OrderedDict(),
+            {education_group.ORDER_COL: 'acronym', education_group.ORDER_DIRECTION: 'asc'}
+        )
+
+        worksheet = load_workbook(stream).worksheets[0]
+        rows = [[cell.value for cell in row] for row in worksheet.rows]
+        self.assertEqual(rows[0], education_group.EDUCATION_GROUP_TITLES)
+        self.assertEqual(rows[1][1], education_group_year.acronym)
+
+
+class _StrObject:
+    def __str__(self):
+        return 'object'
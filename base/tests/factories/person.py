@@ -65,6 +65,8 @@ class PersonWithoutUserFactory(PersonFactory):
     first_name = factory.Faker('first_name')
     last_name = factory.Faker('last_name')
     email = factory.LazyAttribute(generate_person_email)
+    # Set for the persons built then bulk created, without a call to save()
+    sort_key = factory.LazyAttribute(lambda person: mdl.person.Person.get_sort_key(person.first_name, person.last_name))
 
 
 class PersonWithPermissionsFactory:
@@ -23,6 +23,9 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import datetime
+
+from django.db.models import QuerySet
 from django.test import TestCase
 from django.utils import timezone
 from unittest.mock import patch
@@ -30,7 +33,6 @@ from unittest.mock import patch
 from attribution.tests.factories.attribution import AttributionNewFactory
 from attribution.tests.factories.attribution_charge_new import AttributionChargeNewFactory
 from base.business.learning_unit_year_with_context import is_service_course
-from base.forms.common import TooManyResultsException
 from base.tests.factories.academic_year import AcademicYearFactory
 from base.tests.factories.learning_unit_component import LearningUnitComponentFactory
 from base.tests.factories.learning_unit_year import LearningUnitYearFactory
@@ -41,6 +43,7 @@ from base.models.enums import entity_container_year_link_type, entity_type
 from reference.tests.factories.country import CountryFactory
 from base.tests.factories.tutor import TutorFactory
 from base.forms.learning_unit import search_form
+from base.forms.common import TooManyResultsException
 from base.forms.learning_unit.search_form import LearningUnitSearchForm
 
 
@@ -187,15 +190,19 @@ class TestLearningUnitForm(TestCase):
             "acronym": "LDROI1001"
         }
 
-    def test_case_maximum_results_reached(self):
-        LearningUnitYearFactory(acronym="LDROI1001", academic_year=self.academic_yr)
+    def test_learning_units_annotated_with_latest_entity_acronyms(self):
+        self._create_entity_version(entity=self.list_entity_version[0].entity, acronym="NEWMECA",
+                                    start_date=self.end_date + datetime.timedelta(days=1), end_date=None)
+        form = search_form.LearningUnitYearForm(data={"acronym": "LUY0"})
+        self.assertTrue(form.is_valid())
 
-        form = search_form.LearningUnitYearForm(data=self.get_valid_data())
-        form.MAX_RECORDS = 0
-        form.is_valid()
+        learning_units = form.get_activity_learning_units()
 
-        with self.assertRaises(TooManyResultsException):
-            form.get_activity_learning_units()
+        self.assertIsInstance(learning_units, QuerySet)
+        self.assertEqual(
+            [(luy.requirement_entity_acronym, luy.allocation_entity_acronym) for luy in learning_units],
+            [("NEWMECA", "ELME")]
+        )
 
     def test_get_service_courses_by_empty_requirement_and_allocation_entity(self):
         form_data = {}
@@ -253,6 +260,19 @@ class TestLearningUnitForm(TestCase):
         self.assertTrue(form.is_valid())
         self.assertEqual(form.get_activity_learning_units(), [])
 
+    @patch('base.forms.learning_unit.search_form.MAX_RECORDS', 1)
+    def test_service_courses_limited_to_max_records(self):
+        form = search_form.LearningUnitYearForm({}, service_course_search=True)
+        self.assertTrue(form.is_valid())
+        with self.assertRaises(TooManyResultsException):
+            form.get_activity_learning_units()
+
+    @patch('base.forms.learning_unit.search_form.MAX_RECORDS', 1)
+    def test_other_learning_units_not_limited(self):
+        form = search_form.LearningUnitYearForm({})
+        self.assertTrue(form.is_valid())
+        self.assertGreater(form.get_activity_learning_units().count(), 1)
+
     def test_search_learning_units_by_tutor(self):
         form_data = {
             "tutor": self.tutor.person.first_name,
@@ -260,4 +280,4 @@ class TestLearningUnitForm(TestCase):
 
         form = search_form.LearningUnitYearForm(form_data)
         self.assertTrue(form.is_valid())
-        self.assertEqual(form.get_activity_learning_units(), [self.list_learning_unit_year[0]])
+        self.assertEqual(list(form.get_activity_learning_units()), [self.list_learning_unit_year[0]])
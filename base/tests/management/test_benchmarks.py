@@ -0,0 +1,124 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase
+
+from base.business.group_element_years import structure_snapshot
+from base.management.commands import generate_dataset, run_benchmarks
+from base.models.entity import Entity
+from base.models.enums import entity_type
+from base.models.exam_enrollment import ExamEnrollment
+from base.models.group_element_year import GroupElementYear
+from base.models.learning_unit_year import LearningUnitYear
+from base.utils.cache import cache
+
+SMALL_DATASET = {
+    'ENTITY_LEVELS': (
+        (entity_type.SECTOR, 'S', 1),
+        (entity_type.FACULTY, 'F', 2),
+        (entity_type.SCHOOL, 'E', 2),
+    ),
+    'LEARNING_UNITS_BY_FACULTY': 10,
+    'TRAININGS_BY_FACULTY': 1,
+    'STUDENTS_BY_TRAINING': 2,
+    'LEARNING_UNIT_ENROLLMENTS_BY_STUDENT': 3,
+}
+
+
+@mock.patch.multiple(generate_dataset, **SMALL_DATASET)
+class TestGenerateDataset(TestCase):
+    def test_dataset(self):
+        call_command('generate_dataset', years=3, stdout=StringIO())
+
+        self.assertEqual(Entity.objects.count(), 1 + 1 + 2 + 4)
+        self.assertEqual(LearningUnitYear.objects.count(), 2 * 10 * 3)
+        # 9 groups and 30 learning units by training, the content of the last year is not generated
+        self.assertEqual(GroupElementYear.objects.count(), 2 * 2 * (9 + 30))
+        self.assertEqual(ExamEnrollment.objects.count(), 2 * 2 * 3 * 3)
+
+    def test_dataset_generated_once(self):
+        call_command('generate_dataset', years=2, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('generate_dataset', years=2, stdout=StringIO())
+
+
+@mock.patch.multiple(generate_dataset, **SMALL_DATASET)
+class TestRunBenchmarks(TestCase):
+    def setUp(self):
+        call_command('generate_dataset', years=3, stdout=StringIO())
+        self.output = os.path.join(tempfile.mkdtemp(), 'report.json')
+
+    def test_report(self):
+        group_element_years_count = GroupElementYear.objects.count()
+
+        call_command('run_benchmarks', repeat=2, output=self.output, stdout=StringIO())
+
+        with open(self.output) as output:
+            report = json.load(output)
+        self.assertEqual(list(report['benchmarks']), list(run_benchmarks.BENCHMARKS))
+        self.assertEqual(report['repeat'], 2)
+        for result in report['benchmarks'].values():
+            self.assertLessEqual(result['min'], result['max'])
+            self.assertGreater(result['queries'], 0)
+        # The postponement is rolled back
+        self.assertEqual(GroupElementYear.objects.count(), group_element_years_count)
+
+    def test_unknown_benchmark(self):
+        with self.assertRaises(CommandError):
+            call_command('run_benchmarks', 'unknown', stdout=StringIO())
+
+    def test_postponement_without_training_to_postpone(self):
+        GroupElementYear.objects.all().delete()
+
+        with self.assertRaises(CommandError):
+            call_command('run_benchmarks', 'postponement', repeat=1, stdout=StringIO())
+        call_command('run_benchmarks', 'entity_tree', repeat=1, output=self.output, stdout=StringIO())
+
+    def test_caches_cleared_before_each_run(self):
+        states = []
+
+        def benchmark(context):
+            states.append((cache.get('benchmark'), dict(structure_snapshot._loaded_snapshots)))
+            cache.set('benchmark', 'warm')
+            structure_snapshot._loaded_snapshots[0] = ('version', 'snapshot')
+
+        cache.set('benchmark', 'warm')
+        run_benchmarks.run_benchmark(benchmark, None, 2)
+
+        self.assertEqual(states, [(None, {}), (None, {})])
+
+    def test_compare_reports(self):
+        previous = {'benchmarks': {'entity_tree': {'median': 2.0, 'queries': 10}}}
+        current = {'benchmarks': {'entity_tree': {'median': 1.0, 'queries': 4}, 'postponement': {}}}
+
+        self.assertEqual(run_benchmarks.compare_reports(previous, current),
+                         ['entity_tree: 2.000s -> 1.000s (x0.50), 10 -> 4 queries'])
@@ -0,0 +1,71 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from base.utils.query_budget import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """
+        This mixin checks that a block of code (usually a request on a view) does not execute more queries than
+        the budget of the view declared in settings.QUERY_BUDGETS
+    """
+    @contextmanager
+    def assertQueryBudget(self, view_name):
+        budget = settings.QUERY_BUDGETS[view_name]
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        if recorder.count > budget:
+            duplicates = "\n".join("{} x {}".format(count, sql) for sql, count in recorder.duplicates.items())
+            self.fail("{} executed {} queries for a budget of {}. Duplicated queries:\n{}".format(
+                view_name, recorder.count, budget, duplicates or '-'
+            ))
+
+    def assertQueryCountDoesNotGrow(self, view_name, make_request, add_rows):
+        """
+            Check the budget of the view, then that it executes the same number of queries once add_rows has doubled
+            the rows it displays: a query repeated by row would go unnoticed on the small datasets of the tests.
+            Each measure is preceded by a request warming the caches.
+        """
+        make_request()
+        with self.assertQueryBudget(view_name) as recorder:
+            make_request()
+
+        add_rows()
+        make_request()
+        with self.assertQueryBudget(view_name) as recorder_with_more_rows:
+            make_request()
+
+        if recorder_with_more_rows.count != recorder.count:
+            duplicates = "\n".join(
+                "{} x {}".format(count, sql) for sql, count in recorder_with_more_rows.duplicates.items()
+            )
+            self.fail("{} executed {} queries instead of {} once the rows were doubled. Duplicated queries:\n{}".format(
+                view_name, recorder_with_more_rows.count, recorder.count, duplicates or '-'
+            ))
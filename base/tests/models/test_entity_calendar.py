@@ -23,6 +23,8 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+from unittest import mock
+
 from django.test import TestCase
 from django.utils import timezone
 
@@ -33,6 +35,7 @@ from base.tests.factories.academic_calendar import AcademicCalendarFactory
 from base.tests.factories.academic_year import create_current_academic_year, AcademicYearFactory
 from base.tests.factories.entity_calendar import EntityCalendarFactory
 from base.tests.factories.entity_version import EntityVersionFactory
+from base.utils.cache import cache
 
 
 class TestFindByReferenceForCurrentAcademicYear(TestCase):
@@ -74,6 +77,9 @@ class TestBuildCalendarByEntity(TestCase):
         cls.entity_drt = EntityVersionFactory(acronym='DRT', parent=cls.entity_sst.entity)
         cls.entity_agro = EntityVersionFactory(acronym='AGRO', parent=cls.entity_sst.entity)
 
+    def setUp(self):
+        cache.clear()
+
     def test_build_calendar_by_entity_no_entity_calendars(self):
         entity_calendar_computed = entity_calendar.build_calendar_by_entities(self.academic_year,
                                                                               SUMMARY_COURSE_SUBMISSION)
@@ -130,6 +136,45 @@ class TestBuildCalendarByEntity(TestCase):
         self.assertDictEqual(entity_calendar_computed[self.entity_drt.entity.id], _convert_datetime_to_date(sst_date))
         self.assertDictEqual(entity_calendar_computed[self.entity_agro.entity.id], _convert_datetime_to_date(sst_date))
 
+    def test_build_calendar_by_entity_cached(self):
+        entity_calendar.build_calendar_by_entities(self.academic_year, SUMMARY_COURSE_SUBMISSION)
+        with self.assertNumQueries(0):
+            entity_calendar.build_calendar_by_entities(self.academic_year, SUMMARY_COURSE_SUBMISSION)
+
+    @mock.patch('base.models.entity_calendar.transaction.on_commit', side_effect=lambda func: func())
+    def test_build_calendar_by_entity_invalidated_when_entity_calendar_saved(self, mock_on_commit):
+        entity_calendar.build_calendar_by_entities(self.academic_year, SUMMARY_COURSE_SUBMISSION)
+        sst_date = {
+            'start_date': timezone.now() - timezone.timedelta(days=5),
+            'end_date': timezone.now() + timezone.timedelta(days=20)
+        }
+        EntityCalendarFactory(academic_calendar=self.ac_calendar, entity=self.entity_sst.entity, **sst_date)
+
+        entity_calendar_computed = entity_calendar.build_calendar_by_entities(self.academic_year,
+                                                                              SUMMARY_COURSE_SUBMISSION)
+        self.assertDictEqual(entity_calendar_computed[self.entity_agro.entity.id], _convert_datetime_to_date(sst_date))
+
+    def test_find_effective_entity_calendar(self):
+        sst_calendar = EntityCalendarFactory(academic_calendar=self.ac_calendar, entity=self.entity_sst.entity)
+
+        self.assertEqual(entity_calendar.find_effective_entity_calendar(
+            self.entity_drt.entity.id, SUMMARY_COURSE_SUBMISSION, self.academic_year
+        ), sst_calendar)
+        self.assertIsNone(entity_calendar.find_effective_entity_calendar(
+            self.entity_lsm.entity.id, SUMMARY_COURSE_SUBMISSION, self.academic_year
+        ))
+
+    def test_find_effective_entity_calendar_deleted_since_cached(self):
+        sst_calendar = EntityCalendarFactory(academic_calendar=self.ac_calendar, entity=self.entity_sst.entity)
+        entity_calendar.find_effective_entity_calendar(self.entity_drt.entity.id, SUMMARY_COURSE_SUBMISSION,
+                                                       self.academic_year)
+        # Deleted in another transaction, the cache is not invalidated yet
+        entity_calendar.EntityCalendar.objects.filter(pk=sst_calendar.pk).delete()
+
+        self.assertIsNone(entity_calendar.find_effective_entity_calendar(
+            self.entity_drt.entity.id, SUMMARY_COURSE_SUBMISSION, self.academic_year
+        ))
+
     def test_find_interval_dates_for_entity(self):
         expected_date = {'start_date': self.ac_calendar.start_date, 'end_date': self.ac_calendar.end_date}
         result = entity_calendar.find_interval_dates_for_entity(self.academic_year, SUMMARY_COURSE_SUBMISSION,
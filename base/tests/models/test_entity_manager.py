@@ -23,12 +23,18 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import datetime
+from unittest import mock
 
 from django.test import TestCase
+from django.utils import timezone
+
 from base.models import entity_manager
 from base.tests.factories.entity_manager import EntityManagerFactory
+from base.tests.factories.entity_version import EntityVersionFactory
 from base.tests.factories.structure import StructureFactory
 from base.tests.factories.person import PersonFactory
+from base.utils.cache import cache
 from django.contrib.auth.models import User, Permission
 
 
@@ -50,6 +56,46 @@ class EntityManagerTest(TestCase):
         self.assertTrue(entity_manager.is_entity_manager(self.user))
 
 
+class FindManagedEntityIdsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.parent_version = EntityVersionFactory(parent=None)
+        self.child_version = EntityVersionFactory(parent=self.parent_version.entity)
+        self.entity_manager = EntityManagerFactory(entity=self.parent_version.entity)
+        self.user = self.entity_manager.person.user
+
+    def test_managed_entities_with_descendants(self):
+        self.assertEqual(entity_manager.find_managed_entity_ids(self.user),
+                         {self.parent_version.entity_id, self.child_version.entity_id})
+
+    def test_no_managed_entities(self):
+        self.assertEqual(entity_manager.find_managed_entity_ids(PersonFactory().user), frozenset())
+
+    def test_cached(self):
+        entity_manager.find_managed_entity_ids(self.user)
+        with self.assertNumQueries(0):
+            entity_manager.find_managed_entity_ids(self.user)
+
+    def test_not_cached_from_one_day_to_the_next(self):
+        entity_manager.find_managed_entity_ids(self.user)
+        tomorrow = timezone.now() + datetime.timedelta(days=1)
+        with mock.patch('base.models.entity_manager.timezone.now', return_value=tomorrow):
+            with self.assertNumQueries(2):
+                entity_manager.find_managed_entity_ids(self.user)
+
+    @mock.patch('base.models.entity_manager.transaction.on_commit', side_effect=lambda func: func())
+    def test_invalidated_when_entity_manager_deleted(self, mock_on_commit):
+        entity_manager.find_managed_entity_ids(self.user)
+        self.entity_manager.delete()
+        self.assertEqual(entity_manager.find_managed_entity_ids(self.user), frozenset())
+
+    @mock.patch('base.models.entity_manager.transaction.on_commit', side_effect=lambda func: func())
+    def test_invalidated_when_structure_modified(self, mock_on_commit):
+        entity_manager.find_managed_entity_ids(self.user)
+        new_child_version = EntityVersionFactory(parent=self.child_version.entity)
+        self.assertIn(new_child_version.entity_id, entity_manager.find_managed_entity_ids(self.user))
+
+
 def add_permission(user, codename):
     perm = get_permission(codename)
     user.user_permissions.add(perm)
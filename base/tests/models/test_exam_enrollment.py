@@ -137,3 +137,38 @@ class ExamEnrollmentTest(TestCase):
         self.assertCountEqual(exam_enrollment.find_by_student(None), [])
         self.exam_enrollment.save()
         self.assertCountEqual(exam_enrollment.find_by_student(self.student), [self.exam_enrollment])
+
+    def test_find_for_score_encodings_sorted_by_student_name_without_accents(self):
+        self.exam_enrollment.save()
+        students = [('Zoé', 'Émile', '22345678'), ('Axel', 'Lacazette', '32345678')]
+        for first_name, last_name, registration_id in students:
+            offer_enrollment = test_offer_enrollment.create_offer_enrollment(
+                test_student.create_student(first_name, last_name, registration_id), self.offer_year
+            )
+            create_exam_enrollment(self.session_exam, test_learning_unit_enrollment.create_learning_unit_enrollment(
+                self.learn_unit_year, offer_enrollment
+            ))
+
+        enrollments = exam_enrollment.find_for_score_encodings(1, academic_year=self.academic_year)
+
+        registration_ids = [enrollment.learning_unit_enrollment.offer_enrollment.student.registration_id
+                            for enrollment in enrollments]
+        self.assertEqual(registration_ids, ['22345678', '32345678', '12345678'])
+
+    def test_find_for_score_encodings_sorted_as_the_python_sort_keys(self):
+        # A linguistic collation ignores the spaces and would put 'DEA ANNE' before 'DE ZOE'
+        students = [('Anne', 'Dea', '22345678'), ('Zoé', 'De', '32345678')]
+        for first_name, last_name, registration_id in students:
+            offer_enrollment = test_offer_enrollment.create_offer_enrollment(
+                test_student.create_student(first_name, last_name, registration_id), self.offer_year
+            )
+            create_exam_enrollment(self.session_exam, test_learning_unit_enrollment.create_learning_unit_enrollment(
+                self.learn_unit_year, offer_enrollment
+            ))
+
+        enrollments = exam_enrollment.find_for_score_encodings(1, academic_year=self.academic_year)
+
+        sort_keys = [enrollment.learning_unit_enrollment.offer_enrollment.student.person.sort_key
+                     for enrollment in enrollments]
+        self.assertEqual(sort_keys, sorted(sort_keys))
+        self.assertEqual(sort_keys, ['DE ZOE', 'DEA ANNE'])
@@ -194,6 +194,14 @@ class PersonTest(PersonTestCase):
         self.person_with_user.save()
         self.assertEqual(self.person_with_user.__str__(),"DOE, John Junior")
 
+    def test_sort_key_without_accents_nor_spaces(self):
+        a_person = create_person('Zoé', 'De Là')
+        self.assertEqual(a_person.sort_key, 'DELA ZOE')
+
+        a_person.last_name = None
+        a_person.save()
+        self.assertEqual(a_person.sort_key, ' ZOE')
+
     def test_change_language_with_user_with_person(self):
         change_language(self.user_for_person, "en")
         self.person_with_user.refresh_from_db()
@@ -27,7 +27,10 @@ from unittest import skip
 
 from django.core.exceptions import ValidationError
 from django.test import TestCase
-from base.models.prerequisite import prerequisite_syntax_validator
+from base.models.prerequisite import prerequisite_syntax_validator, parse_prerequisite, AND_OPERATOR, OR_OPERATOR
+from base.tests.factories.academic_year import AcademicYearFactory
+from base.tests.factories.learning_unit_year import LearningUnitYearFactory
+from base.tests.factories.prerequisite import PrerequisiteFactory
 
 
 class TestPrerequisiteSyntaxValidator(TestCase):
@@ -96,3 +99,53 @@ class TestPrerequisiteSyntaxValidator(TestCase):
         for test_value in test_values:
             with self.subTest(good_prerequisite=test_value):
                 self.assertIsNone(prerequisite_syntax_validator(test_value))
+
+
+class TestParsePrerequisite(TestCase):
+    def test_empty_prerequisite(self):
+        self.assertEqual(parse_prerequisite(""), (AND_OPERATOR, []))
+
+    def test_unique_acronym(self):
+        self.assertEqual(parse_prerequisite("LINGI2145A"), (AND_OPERATOR, [["LINGI2145A"]]))
+
+    def test_groups_joined_by_main_operator(self):
+        self.assertEqual(
+            parse_prerequisite("LSINF1111 OU (LINGI1526 ET LINGI2356) OU (LINGI1552 ET LINGI2347)"),
+            (OR_OPERATOR, [["LSINF1111"], ["LINGI1526", "LINGI2356"], ["LINGI1552", "LINGI2347"]])
+        )
+
+    def test_group_in_first_position(self):
+        self.assertEqual(parse_prerequisite("(LINGI1526 OU LINGI2356) ET LINGI1552"),
+                         (AND_OPERATOR, [["LINGI1526", "LINGI2356"], ["LINGI1552"]]))
+
+
+class TestPrerequisiteItems(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.academic_year = AcademicYearFactory()
+        cls.learning_unit_year = LearningUnitYearFactory(academic_year=cls.academic_year)
+        cls.required_learning_unit_year = LearningUnitYearFactory(academic_year=cls.academic_year,
+                                                                  acronym="LDROI1001")
+        LearningUnitYearFactory(academic_year=AcademicYearFactory(year=cls.academic_year.year + 1),
+                                acronym="LDROI1002")
+
+    def test_items_compiled_on_save(self):
+        prerequisite = PrerequisiteFactory(learning_unit_year=self.learning_unit_year,
+                                           prerequisite="LDROI1002 OU (LDROI1001 ET LSINF1111)")
+
+        self.assertEqual(prerequisite.main_operator, OR_OPERATOR)
+        self.assertEqual(prerequisite.secondary_operator, AND_OPERATOR)
+        self.assertEqual(
+            list(prerequisite.prerequisiteitem_set.values_list('acronym', 'learning_unit_year', 'group_number',
+                                                               'position')),
+            [("LDROI1002", None, 1, 1), ("LDROI1001", self.required_learning_unit_year.id, 2, 1),
+             ("LSINF1111", None, 2, 2)]
+        )
+
+    def test_items_replaced_on_update(self):
+        prerequisite = PrerequisiteFactory(learning_unit_year=self.learning_unit_year,
+                                           prerequisite="LDROI1001 ET LSINF1111")
+        prerequisite.prerequisite = ""
+        prerequisite.save()
+
+        self.assertFalse(prerequisite.prerequisiteitem_set.exists())
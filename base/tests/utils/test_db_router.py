@@ -0,0 +1,116 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.template import engines
+from django.template.response import TemplateResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+
+from base.middlewares.replica_pinning_middleware import ReplicaPinningMiddleware, PINNING_COOKIE
+from base.models.learning_unit_year import LearningUnitYear
+from base.utils.db_router import ReplicaRouter, use_replica, pin_primary, read_only_view, is_replica_used
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class TestReplicaRouter(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_read_on_primary_outside_of_read_only_context(self):
+        self.assertEqual(self.router.db_for_read(LearningUnitYear), 'default')
+
+    def test_read_on_replica_in_read_only_context(self):
+        with use_replica():
+            self.assertIn(self.router.db_for_read(LearningUnitYear), REPLICAS)
+            self.assertEqual(self.router.db_for_write(LearningUnitYear), 'default')
+
+    def test_read_on_primary_when_pinned(self):
+        with use_replica(), pin_primary():
+            self.assertEqual(self.router.db_for_read(LearningUnitYear), 'default')
+
+    def test_sessions_read_on_primary(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_read_on_primary_without_replicas(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(LearningUnitYear), 'default')
+
+    def test_migrations_only_on_primary(self):
+        self.assertTrue(self.router.allow_migrate('default', 'base'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'base'))
+
+
+class TestReadOnlyView(SimpleTestCase):
+    def test_view_not_atomic_and_run_in_replica_context(self):
+        @read_only_view
+        def view(request):
+            template = engines['django'].from_string("{{ replica_used }}")
+            return TemplateResponse(request, template, {'replica_used': is_replica_used})
+
+        request = RequestFactory().get('/')
+        response = view(request)
+
+        self.assertEqual(view._non_atomic_requests, {'default'})
+        self.assertTrue(request.read_only)
+        self.assertEqual(response.content, b'True')
+        self.assertFalse(is_replica_used())
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS, REPLICA_PINNING_SECONDS=5)
+class TestReplicaPinningMiddleware(SimpleTestCase):
+    def setUp(self):
+        self.replica_used = None
+
+        def get_response(request):
+            with use_replica():
+                self.replica_used = is_replica_used()
+            return HttpResponse()
+        self.middleware = ReplicaPinningMiddleware(get_response)
+
+    def test_pinning_cookie_set_after_post(self):
+        response = self.middleware(RequestFactory().post('/'))
+        self.assertEqual(response.cookies[PINNING_COOKIE]['max-age'], 5)
+
+    def test_no_pinning_cookie_after_get(self):
+        response = self.middleware(RequestFactory().get('/'))
+        self.assertNotIn(PINNING_COOKIE, response.cookies)
+        self.assertTrue(self.replica_used)
+
+    def test_no_pinning_cookie_after_read_only_post(self):
+        request = RequestFactory().post('/')
+        request.read_only = True
+        response = self.middleware(request)
+        self.assertNotIn(PINNING_COOKIE, response.cookies)
+
+    def test_primary_pinned_with_cookie(self):
+        request = RequestFactory().get('/')
+        request.COOKIES[PINNING_COOKIE] = '1'
+        self.middleware(request)
+        self.assertFalse(self.replica_used)
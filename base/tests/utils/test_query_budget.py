@@ -0,0 +1,122 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from base.tests.factories.academic_year import AcademicYearFactory
+from base.tests.factories.person import PersonFactory
+from base.utils import query_budget
+from base.utils.query_budget import fingerprint, QueryRecorder, ViewQueryStatistics
+
+
+class TestFingerprint(TestCase):
+    def test_parameters_removed(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM base_person WHERE id = 12 AND last_name = 'O''Neil'"),
+            "SELECT * FROM base_person WHERE id = ? AND last_name = ?"
+        )
+
+    def test_in_lists_of_any_size_share_the_fingerprint(self):
+        self.assertEqual(fingerprint("SELECT * FROM base_person WHERE id IN (1, 2, 3)"),
+                         fingerprint("SELECT * FROM base_person WHERE id IN (4)"))
+
+
+class TestQueryRecorder(TestCase):
+    def test_record_queries_and_duplicates(self):
+        academic_years = [AcademicYearFactory(year=year) for year in (2017, 2018)]
+
+        with QueryRecorder() as recorder:
+            with connection.cursor() as cursor:
+                for academic_year in academic_years:
+                    cursor.execute("SELECT id FROM base_academicyear WHERE id = %s", [academic_year.id])
+
+        self.assertEqual(recorder.count, 2)
+        self.assertEqual(recorder.duplicates, {"SELECT id FROM base_academicyear WHERE id = ?": 2})
+        self.assertFalse(connection.force_debug_cursor)
+
+
+class TestViewQueryStatistics(TestCase):
+    def test_to_prometheus(self):
+        statistics = ViewQueryStatistics()
+        recorder = mock.Mock(count=3, db_time=0.5, duplicates={'SELECT ?': 2})
+        statistics.add('home', recorder)
+        statistics.add('home', mock.Mock(count=1, db_time=0.25, duplicates={}), budget_exceeded=True)
+
+        self.assertEqual(statistics.get('home'), {
+            'requests': 2, 'queries': 4, 'db_seconds': 0.75, 'duplicate_queries': 1, 'budget_exceeded': 1,
+            'max_queries': 3
+        })
+        metrics = statistics.to_prometheus()
+        self.assertIn('# TYPE osis_view_queries_total counter', metrics)
+        self.assertIn('osis_view_queries_total{view="home"} 4', metrics)
+        self.assertIn('osis_view_max_queries{view="home"} 3', metrics)
+
+
+@override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGETS={'academic_year': 0})
+class TestQueryBudgetMiddleware(TestCase):
+    def setUp(self):
+        query_budget.statistics.clear()
+        self.addCleanup(query_budget.statistics.clear)
+        self.user = PersonFactory().user
+        self.client.force_login(self.user)
+
+    def test_queries_recorded_by_view_name(self):
+        with self.assertLogs(query_budget.logger, level=logging.WARNING) as logs:
+            self.client.get(reverse('academic_year'))
+
+        self.assertEqual(query_budget.statistics.get('academic_year')['requests'], 1)
+        self.assertGreater(query_budget.statistics.get('academic_year')['queries'], 0)
+        self.assertIn("query_budget view=academic_year", logs.output[0])
+
+    @override_settings(QUERY_BUDGET_ENABLED=False)
+    def test_disabled(self):
+        self.client.get(reverse('academic_year'))
+        self.assertEqual(query_budget.statistics.get('academic_year'), {})
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('academic_year'))
+        self.user.is_staff = True
+        self.user.save()
+
+        with override_settings(QUERY_BUDGET_METRICS_ENABLED=True):
+            response = self.client.get(reverse('query_budget_metrics'))
+        self.assertContains(response, 'osis_view_requests_total{view="academic_year"} 1')
+
+        response = self.client.get(reverse('query_budget_metrics'))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(QUERY_BUDGET_METRICS_ENABLED=True)
+    def test_metrics_endpoint_restricted_to_staff(self):
+        response = self.client.get(reverse('query_budget_metrics'))
+        self.assertEqual(response.status_code, 302)
+
+        self.client.logout()
+        response = self.client.get(reverse('query_budget_metrics'))
+        self.assertEqual(response.status_code, 302)
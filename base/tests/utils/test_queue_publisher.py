@@ -0,0 +1,125 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import json
+from unittest import mock
+
+import pika.exceptions
+from django.test import SimpleTestCase
+
+from base.utils.queue_publisher import QueuePublisher
+
+
+@mock.patch('base.utils.queue_publisher.time.sleep')
+@mock.patch('base.utils.queue_publisher.pika.BlockingConnection')
+class TestQueuePublisher(SimpleTestCase):
+    def setUp(self):
+        self.publisher = QueuePublisher(pool_size=2, max_retries=2, backoff=0.1)
+
+    @staticmethod
+    def _get_published_bodies(mock_connection_class):
+        channel = mock_connection_class.return_value.channel.return_value
+        return [json.loads(call[1]['body']) for call in channel.basic_publish.call_args_list]
+
+    def test_connection_reused(self, mock_connection_class, mock_sleep):
+        self.publisher.publish('queue', {'global_id': '001'})
+        self.publisher.publish('queue', {'global_id': '002'})
+
+        self.assertEqual(mock_connection_class.call_count, 1)
+        channel = mock_connection_class.return_value.channel.return_value
+        channel.tx_select.assert_called_once_with()
+        channel.queue_declare.assert_called_once_with(queue='queue', durable=True)
+        self.assertEqual(self._get_published_bodies(mock_connection_class),
+                         [{'global_id': '001'}, {'global_id': '002'}])
+        self.assertEqual(channel.tx_commit.call_count, 2)
+
+    def test_closed_connection_replaced(self, mock_connection_class, mock_sleep):
+        self.publisher.publish('queue', {})
+        mock_connection_class.return_value.is_open = False
+
+        self.publisher.publish('queue', {})
+
+        self.assertEqual(mock_connection_class.call_count, 2)
+
+    def test_retry_with_backoff(self, mock_connection_class, mock_sleep):
+        channel = mock_connection_class.return_value.channel.return_value
+        channel.basic_publish.side_effect = [pika.exceptions.ConnectionClosed(), True]
+
+        self.publisher.publish('queue', {})
+
+        self.assertEqual(mock_connection_class.call_count, 2)
+        mock_sleep.assert_called_once_with(0.1)
+
+    def test_retries_bounded(self, mock_connection_class, mock_sleep):
+        channel = mock_connection_class.return_value.channel.return_value
+        channel.tx_commit.side_effect = pika.exceptions.ChannelClosed()
+
+        with self.assertRaises(pika.exceptions.ChannelClosed):
+            self.publisher.publish('queue', {})
+
+        self.assertEqual(channel.tx_commit.call_count, 3)
+        self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [0.1, 0.2])
+
+    def test_publish_many_committed_once(self, mock_connection_class, mock_sleep):
+        self.publisher.publish_many('queue', [1, 2, 3])
+
+        channel = mock_connection_class.return_value.channel.return_value
+        self.assertEqual(self._get_published_bodies(mock_connection_class), [1, 2, 3])
+        channel.tx_commit.assert_called_once_with()
+
+    def test_publish_many_published_again_when_commit_fails(self, mock_connection_class, mock_sleep):
+        channel = mock_connection_class.return_value.channel.return_value
+        channel.tx_commit.side_effect = [pika.exceptions.ChannelClosed(), None]
+
+        self.publisher.publish_many('queue', [1, 2, 3])
+
+        self.assertEqual(self._get_published_bodies(mock_connection_class), [1, 2, 3, 1, 2, 3])
+        self.assertEqual(channel.tx_commit.call_count, 2)
+
+    def test_connection_closed_by_broker_replaced(self, mock_connection_class, mock_sleep):
+        first_connection, second_connection = mock.Mock(), mock.Mock()
+        mock_connection_class.side_effect = [first_connection, second_connection]
+        self.publisher.publish('queue', {})
+        first_connection.process_data_events.side_effect = pika.exceptions.ConnectionClosed()
+
+        self.publisher.publish('queue', {})
+
+        first_connection.close.assert_called_once_with()
+        self.assertEqual(second_connection.channel.return_value.basic_publish.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_pool_dropped_and_new_connection_used_after_error(self, mock_connection_class, mock_sleep):
+        connections = [mock.Mock(), mock.Mock(), mock.Mock()]
+        mock_connection_class.side_effect = connections
+        with self.publisher._borrow(), self.publisher._borrow():
+            pass
+        connections[0].channel.return_value.basic_publish.side_effect = pika.exceptions.ConnectionClosed()
+
+        self.publisher.publish('queue', {})
+
+        connections[0].close.assert_called_once_with()
+        connections[1].close.assert_called_once_with()
+        connections[1].channel.return_value.basic_publish.assert_not_called()
+        self.assertEqual(connections[2].channel.return_value.basic_publish.call_count, 1)
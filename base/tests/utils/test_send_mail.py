@@ -121,8 +121,8 @@ class TestSendMessage(TestCase):
         self.assertIsInstance(mock_class, EmailMultiAlternatives)
         send_mail.send_mail_after_annual_procedure_of_automatic_postponement_of_luy(self.academic_year,
                                                                              self.luys_to_postpone,
-                                                                             self.luys_already_existing,
-                                                                             self.luys_ending_this_year,
+                                                                             self.luys_already_existing.count(),
+                                                                             self.luys_ending_this_year.count(),
                                                                              self.msg_list)
         call_args = mock_class.call_args
         recipients = call_args[0][3]
@@ -150,8 +150,8 @@ class TestSendMessage(TestCase):
         self.assertIsInstance(mock_class, EmailMultiAlternatives)
         send_mail.send_mail_after_annual_procedure_of_automatic_postponement_of_egy(self.academic_year,
                                                                                     self.egys_to_postpone,
-                                                                                    self.egys_already_existing,
-                                                                                    self.egys_ending_this_year,
+                                                                                    self.egys_already_existing.count(),
+                                                                                    self.egys_ending_this_year.count(),
                                                                                     self.msg_list)
         call_args = mock_class.call_args
         recipients = call_args[0][3]
@@ -24,9 +24,11 @@
 #
 ##############################################################################
 from django.contrib.auth.models import Permission
+from django.contrib.messages import get_messages, WARNING
 from django.http import HttpResponseForbidden
 from django.test import TestCase
 from django.urls import reverse
+from django.utils.translation import ugettext_lazy as _
 
 from base.tests.factories.academic_year import AcademicYearFactory
 from base.tests.factories.education_group_year import EducationGroupYearFactory, TrainingFactory, GroupFactory
@@ -173,4 +175,55 @@ class TestLearningUnitPrerequisite(TestCase):
 
         actual_prerequisites = next(filter(lambda egy: egy.id == self.education_group_year_parents[1].id,
                                            response.context_data["formations"])).prerequisites
-        self.assertEqual(actual_prerequisites, [])
\ No newline at end of file
+        self.assertEqual(actual_prerequisites, [])
+
+
+class TestLearningUnitPrerequisiteTraining(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.academic_year = AcademicYearFactory()
+        cls.root = TrainingFactory(academic_year=cls.academic_year)
+        cls.learning_unit_years = [LearningUnitYearFactory(academic_year=cls.academic_year) for _ in range(0, 3)]
+        for learning_unit_year in cls.learning_unit_years:
+            GroupElementYearFactory(parent=cls.root, child_leaf=learning_unit_year, child_branch=None)
+        cls.luy_outside = LearningUnitYearFactory(academic_year=cls.academic_year)
+
+        PrerequisiteFactory(
+            education_group_year=cls.root,
+            learning_unit_year=cls.learning_unit_years[0],
+            prerequisite="{} ET {}".format(cls.learning_unit_years[1].acronym, cls.luy_outside.acronym)
+        )
+        PrerequisiteFactory(
+            education_group_year=cls.root,
+            learning_unit_year=cls.learning_unit_years[2],
+            prerequisite=cls.learning_unit_years[1].acronym
+        )
+        cls.person = PersonWithPermissionsFactory("can_access_education_group")
+
+    def setUp(self):
+        self.client.force_login(self.person.user)
+
+    def _get(self, learning_unit_year):
+        return self.client.get(reverse("learning_unit_prerequisite", args=[self.root.id, learning_unit_year.id]))
+
+    def test_learning_unit_years_which_require(self):
+        response = self._get(self.learning_unit_years[1])
+
+        self.assertCountEqual(response.context_data["learning_unit_years_which_require"],
+                              [self.learning_unit_years[0], self.learning_unit_years[2]])
+
+    def test_warning_when_prerequisites_outside_of_formation(self):
+        response = self._get(self.learning_unit_years[0])
+
+        warnings = [str(message) for message in get_messages(response.wsgi_request) if message.level == WARNING]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn(self.luy_outside.acronym, warnings[0])
+
+    def test_warning_when_other_learning_units_have_prerequisites_outside_of_formation(self):
+        response = self._get(self.learning_unit_years[1])
+
+        warnings = [str(message) for message in get_messages(response.wsgi_request) if message.level == WARNING]
+        self.assertEqual(warnings, [
+            _("%s other learning units of the formation %s have prerequisites which are not inside it") %
+            (1, self.root)
+        ])
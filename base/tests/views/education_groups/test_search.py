@@ -34,6 +34,7 @@ from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
 from base import utils
+from base.business.xls_stream import XLSX_CONTENT_TYPE
 from base.forms.education_groups import EducationGroupFilter
 from base.models.enums import education_group_categories
 from base.tests.factories.academic_year import AcademicYearFactory
@@ -91,6 +92,16 @@ class TestEducationGroupSearchView(TestCase):
         mock_save_filter_to_cache.assert_called_once_with(response.wsgi_request,
                                                           exclude_params=['xls_status', 'xls_order_col'])
 
+    def test_xls_streamed(self):
+        for xls_status in ("xls", "xls_administrative"):
+            with self.subTest(xls_status=xls_status):
+                response = self.client.get(self.url, data={'xls_status': xls_status, 'acronym': 'UNKNOWN'})
+
+                self.assertEqual(response['Content-Type'], XLSX_CONTENT_TYPE)
+                self.assertTrue(response.streaming)
+                self.assertTrue(b''.join(response.streaming_content))
+                response.close()
+
 
 class TestEducationGroupDataSearchFilter(TestCase):
     """
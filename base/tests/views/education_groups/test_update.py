@@ -36,6 +36,7 @@ from django.urls import reverse
 from django.utils.translation import ugettext as _
 from waffle.testutils import override_flag
 
+from base.business.autocomplete import certificate_aim_index
 from base.business.group_element_years import management
 from base.forms.education_group.group import GroupYearModelForm
 from base.models.enums import education_group_categories, internship_presence
@@ -589,6 +590,8 @@ class TestCertificateAimAutocomplete(TestCase):
             section=5,
             description="description",
         )
+        # The index is invalidated on commit, which never happens in a TestCase
+        certificate_aim_index.invalidate()
 
     def test_user_not_logged(self):
         self.client.logout()
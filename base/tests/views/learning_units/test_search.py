@@ -28,6 +28,7 @@ from django.test import TestCase
 from django.urls import reverse
 from django.http.response import HttpResponseForbidden
 
+from base.business.xls_stream import XLSX_CONTENT_TYPE
 from base.tests.factories.learning_unit_year import LearningUnitYearFactory
 from base.tests.factories.external_learning_unit_year import ExternalLearningUnitYearFactory
 from base.tests.factories.person import PersonFactory
@@ -102,3 +103,27 @@ class TestSearchExternalLearningUnits(TestCase):
         context = response.context
         self.assertEqual(context["search_type"], EXTERNAL_SEARCH)
         self.assertTemplateUsed(response, "learning_unit/by_external.html")
+
+
+class TestSearchLearningUnitsXls(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.learning_unit_year = LearningUnitYearFactory()
+        cls.person = PersonFactory()
+        cls.person.user.user_permissions.add(Permission.objects.get(codename="can_access_learningunit"))
+        cls.url = "{}?academic_year_id={}&acronym={}".format(
+            reverse("learning_units"), cls.learning_unit_year.academic_year.pk, cls.learning_unit_year.acronym
+        )
+
+    def setUp(self):
+        self.client.force_login(self.person.user)
+
+    def test_xls_streamed(self):
+        for xls_status in ("xls", "xls_attribution", "xls_comparison", "xls_with_parameters"):
+            with self.subTest(xls_status=xls_status):
+                response = self.client.post(self.url, data={'xls_status': xls_status})
+
+                self.assertEqual(response['Content-Type'], XLSX_CONTENT_TYPE)
+                self.assertTrue(response.streaming)
+                self.assertTrue(b''.join(response.streaming_content))
+                response.close()
@@ -48,12 +48,13 @@ from base.tests.factories.group_element_year import GroupElementYearFactory
 from base.tests.factories.person import PersonFactory
 from base.tests.factories.program_manager import ProgramManagerFactory
 from base.tests.factories.user import UserFactory
+from base.tests.mixin.query_budget import QueryBudgetMixin
 from cms.enums import entity_name
 from cms.tests.factories.text_label import TextLabelFactory
 from cms.tests.factories.translated_text import TranslatedTextFactory, TranslatedTextRandomFactory
 
 
-class EducationGroupRead(TestCase):
+class EducationGroupRead(QueryBudgetMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
         today = datetime.date.today()
@@ -85,6 +86,20 @@ class EducationGroupRead(TestCase):
 
         self.assertRedirects(response, "/login/?next={}".format(self.url))
 
+    def test_query_budget(self):
+        def add_children_and_languages():
+            for acronym in ("Child_3", "Child_4"):
+                GroupElementYearFactory(
+                    parent=self.education_group_parent,
+                    child_branch=EducationGroupYearFactory(acronym=acronym,
+                                                           academic_year=self.education_group_parent.academic_year)
+                )
+            EducationGroupLanguageFactory(education_group_year=self.education_group_child_1)
+
+        self.assertQueryCountDoesNotGrow('education_group_read', lambda: self.client.get(self.url),
+                                         add_children_and_languages)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
     def test_user_without_permission(self):
         an_other_user = UserFactory()
         self.client.force_login(an_other_user)
@@ -33,7 +33,7 @@ from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 from rest_framework.test import APITestCase
 
-from base.views.entity import post_entities
+from base.views.entity import post_entities, post_entities_bulk
 
 
 class EntityViewTestCase(APITestCase):
@@ -75,6 +75,24 @@ class EntityViewTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_bulk_synchronization(self):
+        response = self.client.post(
+            reverse(post_entities_bulk),
+            data=json.dumps([_create_valid_entity(), _create_valid_entity()], default=str),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created_entities_count'], 2)
+
+    def test_bulk_synchronization_without_list(self):
+        response = self.client.post(
+            reverse(post_entities_bulk),
+            data=json.dumps({'external_id': 'external_id'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 def _create_valid_entity(external_id=None):
     entity_version = EntityVersionFactory.build()
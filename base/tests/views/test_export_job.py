@@ -0,0 +1,83 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.http import HttpResponseNotFound
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from base.models.enums import export_job_status
+from base.tests.factories.export_job import ExportJobFactory
+from base.tests.factories.user import UserFactory
+
+
+class TestExportJobDownload(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.job = ExportJobFactory(status=export_job_status.DONE)
+        self.job.file.save('export.xlsx', ContentFile(b'content'))
+        self.url = reverse('export_job_download', args=[self.job.pk])
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_user_must_be_logged(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(response, "/login/?next={}".format(self.url))
+
+    def test_download_own_export(self):
+        self.client.force_login(self.job.user)
+        response = self.client.get(self.url)
+        self.assertEqual(b''.join(response.streaming_content), b'content')
+
+    def test_cannot_download_export_of_other_user(self):
+        self.client.force_login(UserFactory())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HttpResponseNotFound.status_code)
+
+    def test_cannot_download_pending_export(self):
+        self.job.status = export_job_status.PENDING
+        self.job.save()
+        self.client.force_login(self.job.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HttpResponseNotFound.status_code)
+
+
+class TestMyExportJobs(TestCase):
+    def test_list_export_jobs_of_user(self):
+        job = ExportJobFactory()
+        ExportJobFactory()
+        self.client.force_login(job.user)
+
+        response = self.client.get(reverse('my_export_jobs'))
+
+        self.assertEqual([row['id'] for row in response.json()['export_jobs']], [job.pk])
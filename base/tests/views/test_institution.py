@@ -38,12 +38,13 @@ from base.tests.factories.academic_year import AcademicYearFactory
 from base.tests.factories.entity import EntityFactory
 from base.tests.factories.entity_version import EntityVersionFactory
 from base.tests.factories.person import PersonFactory
+from base.tests.mixin.query_budget import QueryBudgetMixin
 from base.views import institution
 from base.views.institution import entities_search
 from reference.tests.factories.country import CountryFactory
 
 
-class EntityViewTestCase(APITestCase):
+class EntityViewTestCase(QueryBudgetMixin, APITestCase):
     def setUp(self):
         self.user = PersonFactory().user
         today = datetime.date.today()
@@ -111,6 +112,19 @@ class EntityViewTestCase(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_entity_diagram_query_budget(self):
+        def add_children():
+            for index in range(10):
+                child = EntityVersionFactory(parent=self.entity, start_date=self.start_date, end_date=self.end_date)
+                EntityVersionFactory(parent=child.entity, start_date=self.start_date, end_date=self.end_date)
+
+        add_children()
+        self.client.force_login(self.user)
+        url = reverse('entity_diagram', args=[self.entity_version.id])
+
+        self.assertQueryCountDoesNotGrow('entity_diagram', lambda: self.client.get(url), add_children)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
     @mock.patch('base.models.entity_version.find_by_id')
     @mock.patch('django.contrib.auth.decorators')
     def test_get_entity_address(self,  mock_decorators, mock_find_by_id):
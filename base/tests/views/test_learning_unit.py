@@ -37,6 +37,7 @@ from django.http import HttpResponseRedirect
 from django.test import TestCase, RequestFactory, Client
 from django.test.utils import override_settings
 from django.utils.translation import ugettext_lazy as _
+from openpyxl import load_workbook
 from waffle.testutils import override_flag
 
 import base.business.learning_unit
@@ -44,13 +45,15 @@ import base.business.xls
 from attribution.tests.factories.attribution_charge_new import AttributionChargeNewFactory
 from attribution.tests.factories.attribution_new import AttributionNewFactory
 from base.business import learning_unit as learning_unit_business
+from base.business.learning_unit_year_with_context import iter_with_latest_entities
 from base.forms.learning_unit.learning_unit_create import LearningUnitModelForm
-from base.forms.learning_unit.search_form import LearningUnitYearForm, LearningUnitSearchForm
+from base.forms.learning_unit.search_form import LearningUnitYearForm
 from base.forms.learning_unit_pedagogy import LearningUnitPedagogyForm
 from base.forms.learning_unit_specifications import LearningUnitSpecificationsForm, LearningUnitSpecificationsEditForm
 from base.models import learning_unit_component
 from base.models import learning_unit_component_class
 from base.models.academic_year import AcademicYear
+from base.models.entity_container_year import EntityContainerYear
 from base.models.enums import entity_container_year_link_type, active_status, education_group_categories
 from base.models.enums import entity_type
 from base.models.enums import internship_subtypes
@@ -85,9 +88,11 @@ from base.tests.factories.organization import OrganizationFactory
 from base.tests.factories.person import PersonFactory
 from base.tests.factories.person_entity import PersonEntityFactory
 from base.tests.factories.user import SuperUserFactory, UserFactory
+from base.tests.mixin.query_budget import QueryBudgetMixin
 from base.views.learning_unit import learning_unit_components, learning_class_year_edit, learning_unit_specifications, \
     learning_unit_formations, get_charge_repartition_warning_messages, CHARGE_REPARTITION_WARNING_MESSAGE
 from base.views.learning_unit import learning_unit_identification, learning_unit_comparison
+from base.views.common import ITEMS_PER_PAGE
 from base.views.learning_units.create import create_partim_form
 from base.views.learning_units.pedagogy.read import learning_unit_pedagogy
 from base.views.learning_units.search import learning_units
@@ -318,7 +323,7 @@ class LearningUnitViewCreatePartimTestCase(TestCase):
         self.assertRedirects(response, url_to_redirect)
 
 
-class LearningUnitViewTestCase(TestCase):
+class LearningUnitViewTestCase(QueryBudgetMixin, TestCase):
     def setUp(self):
         today = datetime.date.today()
         self.academic_year_1 = AcademicYearFactory.build(start_date=today.replace(year=today.year + 1),
@@ -399,7 +404,7 @@ class LearningUnitViewTestCase(TestCase):
         self.assertEqual(len(context['container_types']),
                          len(learning_container_year_types.LEARNING_CONTAINER_YEAR_TYPES))
         self.assertTrue(context['experimental_phase'])
-        self.assertEqual(context['learning_units'], [])
+        self.assertEqual(list(context['learning_units']), [])
 
     @mock.patch('base.views.layout.render')
     def test_learning_units_search_with_acronym_filtering(self, mock_render):
@@ -422,6 +427,38 @@ class LearningUnitViewTestCase(TestCase):
         self.assertEqual(template, 'learning_units.html')
         self.assertEqual(len(context['learning_units']), 3)
 
+    def test_learning_units_search_query_budget(self):
+        self._prepare_context_learning_units_search()
+        filter_data = {
+            'academic_year_id': self.current_academic_year.id,
+            'acronym': 'LBIR',
+            'status': active_status.ACTIVE
+        }
+
+        def add_learning_units():
+            l_container_yr = LearningContainerYearFactory(acronym="LBIR1200",
+                                                          academic_year=self.current_academic_year,
+                                                          container_type=learning_container_year_types.COURSE)
+            requirement_entity = EntityContainerYear.objects.get(
+                learning_container_year__acronym="LBIR1100",
+                type=entity_container_year_link_type.REQUIREMENT_ENTITY
+            ).entity
+            EntityContainerYearFactory(learning_container_year=l_container_yr, entity=requirement_entity,
+                                       type=entity_container_year_link_type.REQUIREMENT_ENTITY)
+            for acronym, subtype in (("LBIR1200", learning_unit_year_subtypes.FULL),
+                                     ("LBIR1200A", learning_unit_year_subtypes.PARTIM),
+                                     ("LBIR1200B", learning_unit_year_subtypes.PARTIM)):
+                LearningUnitYearFactory(acronym=acronym, learning_container_year=l_container_yr,
+                                        academic_year=self.current_academic_year, subtype=subtype)
+
+        self.assertQueryCountDoesNotGrow(
+            'learning_units',
+            lambda: self.client.get(reverse('learning_units'), data=filter_data),
+            add_learning_units
+        )
+        response = self.client.get(reverse('learning_units'), data=filter_data)
+        self.assertEqual(len(response.context['learning_units']), 6)
+
     @mock.patch('base.views.layout.render')
     def test_learning_units_search_by_acronym_with_valid_regex(self, mock_render):
         self._prepare_context_learning_units_search()
@@ -1242,17 +1279,15 @@ class LearningUnitViewTestCase(TestCase):
             'PLANNED_CLASSES_{}_{}'.format(learning_unit_year.id, learning_component_year.id): [2]
         }
 
-    def test_error_message_case_too_many_results_to_show(self):
-        LearningUnitYearFactory(academic_year=self.academic_year_1)
-        tmpmaxrecors = LearningUnitSearchForm.MAX_RECORDS
-        LearningUnitSearchForm.MAX_RECORDS = 0
+    def test_search_results_paginated_without_maximum(self):
+        for _ in range(ITEMS_PER_PAGE + 1):
+            LearningUnitYearFactory(academic_year=self.academic_year_1)
 
         response = self.client.get(reverse('learning_units'), {'academic_year_id': self.academic_year_1.id})
-        messages = list(response.context['messages'])
-        self.assertEqual(messages[0].message, _('too_many_results'))
 
-        # Restore max_record
-        LearningUnitSearchForm.MAX_RECORDS = tmpmaxrecors
+        self.assertEqual(response.context['learning_units'].paginator.count, ITEMS_PER_PAGE + 1)
+        self.assertEqual(len(response.context['learning_units']), ITEMS_PER_PAGE)
+        self.assertFalse(list(response.context['messages']))
 
     def test_get_username_with_no_person(self):
         a_username = 'dupontm'
@@ -1267,9 +1302,6 @@ class LearningUnitViewTestCase(TestCase):
         self.assertEqual(base.business.xls.get_name_or_username(a_user),
                          '{}, {}'.format(last_name, first_name))
 
-    def test_prepare_xls_content_no_data(self):
-        self.assertEqual(base.business.learning_unit.prepare_xls_content([]), [])
-
     @override_settings(LANGUAGES=[('fr-be', 'French'), ('en', 'English'), ])
     def test_find_inexisting_language_in_settings(self):
         wrong_language_code = 'pt'
@@ -1423,42 +1455,30 @@ class TestCreateXls(TestCase):
 
         self.user = UserFactory()
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_no_data(self, mock_generate_xls):
-        learning_unit_business.create_xls(self.user, [], None)
-        expected_argument = _generate_xls_build_parameter([], self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
+    def test_create_xls_stream_with_no_data(self):
+        worksheet = load_workbook(learning_unit_business.create_xls_stream(self.user, [], None)).worksheets[0]
+
+        self.assertEqual(worksheet.title, learning_unit_business.WORKSHEET_TITLE)
+        self.assertEqual([[cell.value for cell in row] for row in worksheet.rows],
+                         [LEARNING_UNIT_TITLES_PART1 + LEARNING_UNIT_TITLES_PART2])
 
-    @mock.patch("osis_common.document.xls_build.generate_xls")
-    def test_generate_xls_data_with_a_learning_unit(self, mock_generate_xls):
+    def test_create_xls_stream_with_a_learning_unit(self):
         a_form = LearningUnitYearForm({"acronym": self.learning_unit_year.acronym}, service_course_search=False)
         self.assertTrue(a_form.is_valid())
-        found_learning_units = a_form.get_activity_learning_units()
-        learning_unit_business.create_xls(self.user, found_learning_units, None)
-        xls_data = [[self.learning_unit_year.academic_year.name, self.learning_unit_year.acronym,
-                     self.learning_unit_year.complete_title,
-                     xls_build.translate(self.learning_unit_year.learning_container_year.container_type),
-                     xls_build.translate(self.learning_unit_year.subtype), None, None, self.learning_unit_year.credits,
-                     xls_build.translate(self.learning_unit_year.status)]]
-        expected_argument = _generate_xls_build_parameter(xls_data, self.user)
-        mock_generate_xls.assert_called_with(expected_argument, None)
-
-
-def _generate_xls_build_parameter(xls_data, user):
-    titles = LEARNING_UNIT_TITLES_PART1.copy()
-    titles.extend(LEARNING_UNIT_TITLES_PART2.copy())
-    return {
-        xls_build.LIST_DESCRIPTION_KEY: _(learning_unit_business.XLS_DESCRIPTION),
-        xls_build.FILENAME_KEY: _(learning_unit_business.XLS_FILENAME),
-        xls_build.USER_KEY: user.username,
-        xls_build.WORKSHEETS_DATA: [{
-            xls_build.CONTENT_KEY: xls_data,
-            xls_build.HEADER_TITLES_KEY: titles,
-            xls_build.WORKSHEET_TITLE_KEY: _(learning_unit_business.WORKSHEET_TITLE),
-            xls_build.STYLED_CELLS: None,
-            xls_build.COLORED_ROWS: None,
-        }]
-    }
+        found_learning_units = iter_with_latest_entities(a_form.get_activity_learning_units())
+
+        worksheet = load_workbook(
+            learning_unit_business.create_xls_stream(self.user, found_learning_units, None)
+        ).worksheets[0]
+
+        rows = [[cell.value for cell in row] for row in worksheet.rows]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:4], [
+            self.learning_unit_year.academic_year.name, self.learning_unit_year.acronym,
+            self.learning_unit_year.complete_title,
+            str(xls_build.translate(self.learning_unit_year.learning_container_year.container_type))
+        ])
+        self.assertEqual(rows[1][5:7], [None, None])
 
 
 class TestLearningUnitComponents(TestCase):
@@ -36,6 +36,7 @@ from django.test import TestCase, RequestFactory
 from django.urls import reverse
 from waffle.testutils import override_flag
 
+from base.business.autocomplete import entity_version_index
 from base.forms.learning_unit.entity_form import EntityContainerBaseForm
 from base.forms.learning_unit.learning_unit_create import LearningUnitModelForm, LearningUnitYearModelForm, \
     LearningContainerYearModelForm
@@ -636,6 +637,8 @@ class TestEntityAutocomplete(TestCase):
             end_date=None,
             acronym="DRT"
         )
+        # The index is invalidated on commit, which never happens in a TestCase
+        entity_version_index.invalidate()
 
     def test_when_param_is_digit_assert_searching_on_code(self):
         # When searching on "code"
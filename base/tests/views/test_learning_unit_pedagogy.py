@@ -29,7 +29,7 @@ from unittest import mock
 from unittest.mock import patch
 
 from django.contrib.auth.models import Group
-from django.contrib.messages import get_messages
+from django.contrib.messages import get_messages, ERROR
 from django.core.exceptions import PermissionDenied
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseNotAllowed
@@ -41,6 +41,7 @@ from waffle.testutils import override_flag
 
 from attribution.tests.factories.attribution import AttributionFactory
 from base.business.learning_unit import CMS_LABEL_PEDAGOGY_FR_ONLY
+from base.forms.common import TooManyResultsException
 from base.models.academic_year import current_academic_year, starting_academic_year
 from base.models.enums import academic_calendar_type
 from base.models.enums import entity_container_year_link_type
@@ -153,6 +154,16 @@ class LearningUnitPedagogyTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "learning_units.html")
 
+    @mock.patch('base.views.learning_units.educational_information.check_max_records',
+                side_effect=TooManyResultsException)
+    def test_learning_units_summary_list_too_many_results(self, mock_check_max_records):
+        self.client.force_login(self.faculty_user)
+        response = self.client.get(self.url, data={'academic_year_id': current_academic_year().id})
+
+        self.assertTrue(mock_check_max_records.called)
+        self.assertEqual(response.context['learning_units_with_errors'], [])
+        self.assertIn(ERROR, [message.level for message in get_messages(response.wsgi_request)])
+
     def test_learning_units_summary_list_by_client_xls(self):
         # Generate data
         now = datetime.datetime.now()
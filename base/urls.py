@@ -40,7 +40,7 @@ import base.views.learning_units.update
 from attribution.views import attribution, tutor_application
 from base.views import learning_achievement, search, education_groups
 from base.views import learning_unit, offer, common, institution, organization, academic_calendar, \
-    my_osis, entity, student, notifications
+    my_osis, entity, student, notifications, export_job
 from base.views import teaching_material
 from base.views.learning_units.charge_repartition import AddChargeRepartition, \
     RemoveChargeRepartition, EditChargeRepartition, SelectAttributionView
@@ -68,6 +68,7 @@ urlpatterns = [
     ])),
 
     url(r'^academic_year/$', common.academic_year, name='academic_year'),
+    url(r'^query_budget/metrics/$', common.query_budget_metrics, name='query_budget_metrics'),
 
     url(r'^admin/', include([
         url(r'^data/$', common.data, name='data'),
@@ -77,6 +78,7 @@ urlpatterns = [
 
     url(r'^api/v1/', include([
         url(r'^entities/$', entity.post_entities, name='post_entities'),
+        url(r'^entities/bulk/$', entity.post_entities_bulk, name='post_entities_bulk'),
         url(r'^tutor_application/recompute_portal$', tutor_application.recompute_portal,
             name='recompute_tutor_application_portal'),
         url(r'^attribution/recompute_portal$', attribution.recompute_portal, name='recompute_attribution_portal'),
@@ -277,6 +279,10 @@ urlpatterns = [
         url(r'^clear/$', base.views.notifications.clear_user_notifications, name="clear_notifications"),
         url(r'^mark_as_read/$', base.views.notifications.mark_notifications_as_read, name="mark_notifications_as_read"),
     ])),
+    url(r'^export_jobs/', include([
+        url(r'^$', export_job.my_export_jobs, name="my_export_jobs"),
+        url(r'^(?P<export_job_id>[0-9]+)/download/$', export_job.export_job_download, name="export_job_download"),
+    ])),
 
 ]
 
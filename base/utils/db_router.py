@@ -0,0 +1,111 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import random
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction, DEFAULT_DB_ALIAS
+
+# Models of these apps are always read on the primary database
+PRIMARY_ONLY_APP_LABELS = ('sessions',)
+
+_state = threading.local()
+
+
+def get_replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def is_replica_used():
+    return getattr(_state, 'replica_depth', 0) > 0 and not getattr(_state, 'pinned', False)
+
+
+@contextmanager
+def use_replica():
+    """ Reads made in this context are sent to a replica, unless the primary is pinned for the current request """
+    _state.replica_depth = getattr(_state, 'replica_depth', 0) + 1
+    try:
+        yield
+    finally:
+        _state.replica_depth -= 1
+
+
+@contextmanager
+def pin_primary(pinned=True):
+    """ Reads made in this context are sent to the primary, even in a read-only view """
+    previous = getattr(_state, 'pinned', False)
+    _state.pinned = pinned
+    try:
+        yield
+    finally:
+        _state.pinned = previous
+
+
+class ReplicaRouter:
+    """
+    Send the reads of the read-only views to a replica (settings.DATABASE_REPLICAS) and everything else to the
+    primary database. Replicas are copies of the primary: relations are allowed and migrations only run on the
+    primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replica_aliases()
+        if replicas and is_replica_used() and model._meta.app_label not in PRIMARY_ONLY_APP_LABELS:
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replica_aliases()
+
+
+def read_only_view(view_func):
+    """
+    Run the view outside of the request transaction with its reads sent to a replica.
+    Template responses are rendered in the view in order to also read the data of the template on the replica.
+    """
+    @wraps(view_func)
+    def wrapped_view(request, *args, **kwargs):
+        request.read_only = True
+        with use_replica():
+            response = view_func(request, *args, **kwargs)
+            if callable(getattr(response, 'render', None)) and not response.is_rendered:
+                response.render()
+        return response
+    return transaction.non_atomic_requests(wrapped_view)
+
+
+class ReadOnlyViewMixin:
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return read_only_view(super().as_view(**initkwargs))
@@ -23,16 +23,13 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-import datetime
 import pickle
-import time
 
 from base.utils.cache import cache
 
 
 CACHE_NOTIFICATIONS_TIMEOUT = 300  # seconds -> 5 min
 NOTIFICATIONS_KEY = "notifications_unread_user_{}"
-NOTIFICATIONS_TIMESTAMP = "notifications_last_read_user_{}"
 
 
 def cache_queryset_function(function):
@@ -57,15 +54,6 @@ def invalidate_cache(function):
     return wrapper
 
 
-def apply_function_if_data_not_in_cache(function):
-    def wrapper(user, *args, **kwargs):
-        cache_key = make_notifications_cache_key(user)
-        if cache.get(cache_key) is not None:
-            return None
-        return function(user, *args, **kwargs)
-    return wrapper
-
-
 @cache_queryset_function
 def get_user_notifications(user):
     return user.notifications.all().order_by("-unread")
@@ -89,19 +77,8 @@ def clear_user_notifications(user):
     user.notifications.all().delete()
 
 
-def get_notifications_last_time_read_for_user(user):
-    cache_key = make_notifications_timestamp_cache_key(user)
-    timestamp_last_read = cache.get(cache_key)
-    return datetime.datetime.fromtimestamp(float(timestamp_last_read)) if timestamp_last_read else None
-
-
-def set_notifications_last_read_as_now_for_user(user):
-    cache_key = make_notifications_timestamp_cache_key(user)
-    cache.set(cache_key, str(time.time()), timeout=None)
-
-
-def make_notifications_timestamp_cache_key(user):
-    return NOTIFICATIONS_TIMESTAMP.format(user.pk)
+def invalidate_notifications_cache(user_ids):
+    cache.delete_many([NOTIFICATIONS_KEY.format(user_id) for user_id in user_ids])
 
 
 def make_notifications_cache_key(user):
@@ -0,0 +1,163 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+STRING_REGEX = re.compile(r"'(?:[^']|'')*'")
+NUMBER_REGEX = re.compile(r"\b\d+(?:\.\d+)?\b")
+VALUES_LIST_REGEX = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def fingerprint(sql):
+    """ Return the sql without its parameters: the queries of a N+1 share the same fingerprint """
+    sql = STRING_REGEX.sub('?', sql)
+    sql = NUMBER_REGEX.sub('?', sql)
+    sql = VALUES_LIST_REGEX.sub('(?)', sql)
+    return ' '.join(sql.split())
+
+
+class QueryRecorder:
+    """
+    Record the queries executed on all the databases inside the context.
+    The queries are read from the queries log of the connections, which is forced even when DEBUG is False.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.duration = 0
+        self._states = []
+        self._start = None
+
+    def __enter__(self):
+        for alias in connections:
+            connection = connections[alias]
+            self._states.append((connection, connection.force_debug_cursor, len(connection.queries_log)))
+            connection.force_debug_cursor = True
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.duration = time.monotonic() - self._start
+        for connection, force_debug_cursor, initial_length in self._states:
+            connection.force_debug_cursor = force_debug_cursor
+            self.queries.extend(list(connection.queries_log)[initial_length:])
+            if not force_debug_cursor and not settings.DEBUG:
+                # Nobody else reads the log: do not let it grow between the requests
+                connection.queries_log.clear()
+        self._states = []
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def db_time(self):
+        return sum(float(query['time']) for query in self.queries)
+
+    @property
+    def duplicates(self):
+        """ Return the number of executions by fingerprint of the queries executed more than once """
+        counter = Counter(fingerprint(query['sql']) for query in self.queries)
+        return {sql: count for sql, count in counter.items() if count > 1}
+
+
+class ViewQueryStatistics:
+    """ Cumulated query statistics by view name for the current process """
+    METRICS = (
+        ('requests', 'counter', 'Number of requests'),
+        ('queries', 'counter', 'Number of queries'),
+        ('db_seconds', 'counter', 'Time spent in the database'),
+        ('duplicate_queries', 'counter', 'Number of queries sharing the fingerprint of a previous query'),
+        ('budget_exceeded', 'counter', 'Number of requests exceeding the query budget of the view'),
+        ('max_queries', 'gauge', 'Maximal number of queries of a request'),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_view = {}
+
+    def add(self, view_name, recorder, budget_exceeded=False):
+        duplicate_queries = sum(count - 1 for count in recorder.duplicates.values())
+        with self._lock:
+            stats = self._by_view.setdefault(view_name, dict.fromkeys((name for name, _, _ in self.METRICS), 0))
+            stats['requests'] += 1
+            stats['queries'] += recorder.count
+            stats['db_seconds'] += recorder.db_time
+            stats['duplicate_queries'] += duplicate_queries
+            stats['budget_exceeded'] += int(budget_exceeded)
+            stats['max_queries'] = max(stats['max_queries'], recorder.count)
+
+    def get(self, view_name):
+        with self._lock:
+            return dict(self._by_view.get(view_name, {}))
+
+    def clear(self):
+        with self._lock:
+            self._by_view = {}
+
+    def to_prometheus(self):
+        """ Render the statistics in the Prometheus text exposition format """
+        with self._lock:
+            by_view = {view_name: dict(stats) for view_name, stats in self._by_view.items()}
+        lines = []
+        for name, metric_type, description in self.METRICS:
+            metric_name = 'osis_view_{}{}'.format(name, '_total' if metric_type == 'counter' else '')
+            lines.append('# HELP {} {}'.format(metric_name, description))
+            lines.append('# TYPE {} {}'.format(metric_name, metric_type))
+            for view_name in sorted(by_view):
+                lines.append('{}{{view="{}"}} {}'.format(metric_name, view_name, by_view[view_name][name]))
+        return '\n'.join(lines) + '\n'
+
+
+statistics = ViewQueryStatistics()
+
+
+def get_query_budget(view_name):
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+
+
+def record_view_queries(view_name, recorder):
+    budget = get_query_budget(view_name)
+    budget_exceeded = budget is not None and recorder.count > budget
+    statistics.add(view_name, recorder, budget_exceeded=budget_exceeded)
+
+    duplicates = recorder.duplicates
+    logger.log(
+        logging.WARNING if budget_exceeded else logging.INFO,
+        "query_budget view=%s queries=%d budget=%s db_time=%.3f duration=%.3f duplicated_fingerprints=%d",
+        view_name, recorder.count, budget, recorder.db_time, recorder.duration, len(duplicates)
+    )
+    if budget_exceeded:
+        for sql, count in sorted(duplicates.items(), key=lambda item: -item[1]):
+            logger.warning("query_budget view=%s duplicated=%d sql=%s", view_name, count, sql)
@@ -0,0 +1,185 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import contextlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import pika
+import pika.exceptions
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(settings.DEFAULT_LOGGER)
+
+PUBLISH_ERRORS = (pika.exceptions.AMQPError, RuntimeError, OSError)
+
+MESSAGE_PROPERTIES = pika.BasicProperties(content_type='application/json', delivery_mode=2)
+
+
+class _PooledChannel:
+    """
+    A connection and its channel in transaction mode.
+
+    pika 0.12's BlockingChannel waits for the confirmation of each basic_publish once confirm_delivery() is called:
+    a batch would cost a round trip to the broker by message. The channel is in transaction mode instead: the
+    messages of a batch are published without waiting, then committed at once. The broker answers the commit once
+    all of them are routed, and written to disk for the durable queues.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.channel = connection.channel()
+        self.channel.tx_select()
+        self.declared_queues = set()
+
+    @property
+    def is_open(self):
+        return self.connection.is_open and self.channel.is_open
+
+    def is_alive(self):
+        """ Process the pending events of the connection to find out whether the broker has closed it meanwhile """
+        if not self.is_open:
+            return False
+        try:
+            self.connection.process_data_events(time_limit=0)
+        except PUBLISH_ERRORS:
+            return False
+        return self.is_open
+
+    def publish(self, queue_name, bodies):
+        """ Publish the bodies then commit them: none of them is delivered if the commit fails """
+        if queue_name not in self.declared_queues:
+            self.channel.queue_declare(queue=queue_name, durable=True)
+            self.declared_queues.add(queue_name)
+        for body in bodies:
+            self.channel.basic_publish(exchange='', routing_key=queue_name, body=body, properties=MESSAGE_PROPERTIES)
+        self.channel.tx_commit()
+
+    def close(self):
+        try:
+            if self.connection.is_open:
+                self.connection.close()
+        except PUBLISH_ERRORS:
+            logger.warning('Could not close a queue connection', exc_info=True)
+
+
+class QueuePublisher:
+    """
+    Publish json messages on the queues of settings.QUEUES.
+
+    The connections are kept open in a pool shared by the threads of the process, at most pool_size of them being
+    used at the same time. Their channels are in transaction mode (see _PooledChannel): the messages are published
+    once the broker has committed them. A failed publication is retried on a new connection after an exponential
+    backoff, the other connections of the pool being dropped as the broker has probably closed them too.
+    """
+
+    def __init__(self, pool_size=None, max_retries=None, backoff=None):
+        self.pool_size = pool_size or settings.QUEUE_PUBLISHER_POOL_SIZE
+        self.max_retries = settings.QUEUE_PUBLISHER_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.QUEUE_PUBLISHER_RETRY_BACKOFF if backoff is None else backoff
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._pool = queue.LifoQueue(maxsize=self.pool_size)
+        self._semaphore = threading.BoundedSemaphore(self.pool_size)
+
+    def publish(self, queue_name, message):
+        self.publish_many(queue_name, [message])
+
+    def publish_many(self, queue_name, messages):
+        """
+        Publish the messages in order through a single channel, with one commit for the whole batch.
+        A failed commit delivers none of them: the retry publishes the whole batch again.
+        """
+        bodies = [json.dumps(message, cls=DjangoJSONEncoder) for message in messages]
+        attempt = 0
+        while True:
+            try:
+                with self._borrow(new_connection=attempt > 0) as pooled_channel:
+                    pooled_channel.publish(queue_name, bodies)
+                return
+            except PUBLISH_ERRORS:
+                self.close()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.warning('Publication to queue {} failed, retried in {}s'.format(queue_name, delay),
+                               exc_info=True)
+                time.sleep(delay)
+                attempt += 1
+
+    @contextlib.contextmanager
+    def _borrow(self, new_connection=False):
+        if self._pid != os.getpid():
+            # The connections of the parent process must not be shared with a forked process
+            self._reset()
+        self._semaphore.acquire()
+        pooled_channel = None
+        try:
+            pooled_channel = _PooledChannel(self._connect()) if new_connection else self._get_channel()
+            yield pooled_channel
+        except BaseException:
+            if pooled_channel:
+                pooled_channel.close()
+                pooled_channel = None
+            raise
+        finally:
+            if pooled_channel:
+                self._pool.put_nowait(pooled_channel)
+            self._semaphore.release()
+
+    def _get_channel(self):
+        while True:
+            try:
+                pooled_channel = self._pool.get_nowait()
+            except queue.Empty:
+                return _PooledChannel(self._connect())
+            if pooled_channel.is_alive():
+                return pooled_channel
+            pooled_channel.close()
+
+    @staticmethod
+    def _connect():
+        credentials = pika.PlainCredentials(settings.QUEUES.get('QUEUE_USER'), settings.QUEUES.get('QUEUE_PASSWORD'))
+        return pika.BlockingConnection(pika.ConnectionParameters(settings.QUEUES.get('QUEUE_URL'),
+                                                                 settings.QUEUES.get('QUEUE_PORT'),
+                                                                 settings.QUEUES.get('QUEUE_CONTEXT_ROOT'),
+                                                                 credentials))
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+publisher = QueuePublisher()
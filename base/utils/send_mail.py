@@ -122,7 +122,7 @@ def send_mail_before_annual_procedure_of_automatic_postponement_of_luy(
 
 
 def send_mail_after_annual_procedure_of_automatic_postponement_of_luy(
-        end_academic_year, luys_postponed, luys_already_existing, luys_ending_this_year, luys_with_errors):
+        end_academic_year, luys_postponed, luys_already_existing_count, luys_ending_this_year_count, luys_with_errors):
     html_template_ref = 'luy_after_auto_postponement_html'
     txt_template_ref = 'luy_after_auto_postponement_txt'
 
@@ -134,8 +134,8 @@ def send_mail_after_annual_procedure_of_automatic_postponement_of_luy(
     template_base_data = {'academic_year': current_academic_year().year,
                           'end_academic_year': end_academic_year.year,
                           'luys_postponed': len(luys_postponed),
-                          'luys_already_existing': luys_already_existing.count(),
-                          'luys_ending_this_year': luys_ending_this_year.count(),
+                          'luys_already_existing': luys_already_existing_count,
+                          'luys_ending_this_year': luys_ending_this_year_count,
                           'luys_with_errors': luys_with_errors
                           }
     message_content = message_config.create_message_content(html_template_ref, txt_template_ref, None, receivers,
@@ -165,7 +165,7 @@ def send_mail_before_annual_procedure_of_automatic_postponement_of_egy(
 
 
 def send_mail_after_annual_procedure_of_automatic_postponement_of_egy(
-        end_academic_year, egys_postponed, egys_already_existing, egys_ending_this_year, egys_with_errors):
+        end_academic_year, egys_postponed, egys_already_existing_count, egys_ending_this_year_count, egys_with_errors):
     html_template_ref = 'egy_after_auto_postponement_html'
     txt_template_ref = 'egy_after_auto_postponement_txt'
 
@@ -177,8 +177,8 @@ def send_mail_after_annual_procedure_of_automatic_postponement_of_egy(
     template_base_data = {'academic_year': current_academic_year().year,
                           'end_academic_year': end_academic_year.year,
                           'egys_postponed': len(egys_postponed),
-                          'egys_already_existing': egys_already_existing.count(),
-                          'egys_ending_this_year': egys_ending_this_year.count(),
+                          'egys_already_existing': egys_already_existing_count,
+                          'egys_ending_this_year': egys_ending_this_year_count,
                           'egys_with_errors': egys_with_errors
                           }
     message_content = message_config.create_message_content(html_template_ref, txt_template_ref, None, receivers,
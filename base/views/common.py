@@ -32,12 +32,14 @@ from django.contrib.auth import authenticate, logout
 from django.contrib.auth.decorators import login_required, permission_required, user_passes_test
 from django.contrib.auth.views import login as django_login
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
 from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
 from base import models as mdl
 from base.models.utils import native
+from base.utils import query_budget
 from . import layout
 
 ITEMS_PER_PAGE = 25
@@ -194,6 +196,15 @@ def storage(request):
     return layout.render(request, "admin/storage.html", {'table': table})
 
 
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def query_budget_metrics(request):
+    """ Query statistics by view of the current process, scraped by Prometheus (see QueryBudgetMiddleware) """
+    if not settings.QUERY_BUDGET_METRICS_ENABLED:
+        raise Http404
+    return HttpResponse(query_budget.statistics.to_prometheus(), content_type='text/plain; version=0.0.4')
+
+
 def display_error_messages(request, messages_to_display):
     display_messages(request, messages_to_display, messages.ERROR)
 
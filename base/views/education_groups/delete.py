@@ -54,12 +54,4 @@ class DeleteGroupEducationView(DeleteViewWithDependencies):
     def get_protected_messages(self):
         """This function will return all protected message ordered by year"""
         self.education_group_years = self.get_object().educationgroupyear_set.all().order_by('academic_year__year')
-        protected_messages = []
-        for education_group_year in self.education_group_years:
-            protected_message = shorten.get_protected_messages_by_education_group_year(education_group_year)
-            if protected_message:
-                protected_messages.append({
-                    'education_group_year': education_group_year,
-                    'messages': protected_message
-                })
-        return protected_messages
+        return shorten.get_protected_messages(self.education_group_years)
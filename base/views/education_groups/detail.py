@@ -24,32 +24,29 @@
 #
 ##############################################################################
 import json
-from collections import OrderedDict, namedtuple
+from collections import OrderedDict
 
 from ckeditor.widgets import CKEditorWidget
 from django import forms
-from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.db.models import F, Case, When
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
-from django.utils.translation import ugettext_lazy as _
 from django.views.generic import DetailView
 
 from base import models as mdl
 from base.business.education_group import assert_category_of_education_group_year, can_user_edit_administrative_data
-from base.business.education_groups import perms
+from base.business.education_groups import perms, general_information
 from base.business.education_groups.group_element_year_tree import NodeBranchJsTree
 from base.business.education_groups.perms import is_eligible_to_edit_general_information
 from base.models.admission_condition import AdmissionCondition, AdmissionConditionLine
 from base.models.education_group_year import EducationGroupYear
 from base.models.enums import education_group_categories, academic_calendar_type, education_group_types
 from base.models.person import Person
+from base.utils.db_router import ReadOnlyViewMixin
 from cms import models as mdl_cms
 from cms.enums import entity_name
-from cms.models.translated_text import TranslatedText
-from cms.models.translated_text_label import TranslatedTextLabel
 
 SECTIONS_WITH_TEXT = (
     'ucl_bachelors',
@@ -121,7 +118,7 @@ class EducationGroupGenericDetailView(PermissionRequiredMixin, DetailView):
         return super().get(request, *args, **kwargs)
 
 
-class EducationGroupRead(EducationGroupGenericDetailView):
+class EducationGroupRead(ReadOnlyViewMixin, EducationGroupGenericDetailView):
     templates = {
         education_group_categories.TRAINING: "education_group/identification_training_details.html",
         education_group_categories.MINI_TRAINING: "education_group/identification_mini_training_details.html",
@@ -143,7 +140,7 @@ class EducationGroupRead(EducationGroupGenericDetailView):
         return self.templates.get(self.object.education_group_type.category)
 
 
-class EducationGroupDiplomas(EducationGroupGenericDetailView):
+class EducationGroupDiplomas(ReadOnlyViewMixin, EducationGroupGenericDetailView):
     template_name = "education_group/tab_diplomas.html"
     limited_by_category = (education_group_categories.TRAINING,)
 
@@ -151,7 +148,7 @@ class EducationGroupDiplomas(EducationGroupGenericDetailView):
         return super().get_queryset().prefetch_related('certificate_aims')
 
 
-class EducationGroupGeneralInformation(EducationGroupGenericDetailView):
+class EducationGroupGeneralInformation(ReadOnlyViewMixin, EducationGroupGenericDetailView):
     template_name = "education_group/tab_general_informations.html"
     limited_by_category = (education_group_categories.TRAINING, education_group_categories.MINI_TRAINING)
 
@@ -162,78 +159,15 @@ class EducationGroupGeneralInformation(EducationGroupGenericDetailView):
 
         context.update({
             'is_common_education_group_year': is_common_education_group_year,
-            'sections_with_translated_labels': self.get_sections_with_translated_labels(is_common_education_group_year),
+            'sections_with_translated_labels': self.get_sections_with_translated_labels(),
             'can_edit_information': is_eligible_to_edit_general_information(context['person'], context['object']),
         })
 
         return context
 
-    def get_sections_with_translated_labels(self, is_common_education_group_year=None):
-        # Load the info from the common education group year
-        common_education_group_year = None
-        if not is_common_education_group_year:
-            common_education_group_year = EducationGroupYear.objects.look_for_common(
-                education_group_type=self.object.education_group_type,
-                academic_year=self.object.academic_year,
-            ).first()
-
-        # Load the labels
-        Section = namedtuple('Section', 'title labels')
+    def get_sections_with_translated_labels(self):
         user_language = mdl.person.get_user_interface_language(self.request.user)
-        sections_with_translated_labels = []
-        for section in settings.SECTION_LIST:
-            translated_labels = self.get_translated_labels_and_content(section,
-                                                                       user_language,
-                                                                       common_education_group_year)
-
-            sections_with_translated_labels.append(Section(section.title, translated_labels))
-        return sections_with_translated_labels
-
-    def get_translated_labels_and_content(self, section, user_language, common_education_group_year):
-        records = []
-        for label, selectors in section.labels:
-            records.extend(
-                self.get_selectors(common_education_group_year, label, selectors, user_language)
-            )
-        return records
-
-    def get_selectors(self, common_education_group_year, label, selectors, user_language):
-        records = []
-        for selector in selectors.split(','):
-            if selector == 'specific':
-                translations = self.get_content_translations_for_label(
-                    self.object, label, user_language, 'specific')
-                records.append(translations)
-
-            if selector == 'common' and common_education_group_year is not None:
-                translations = self.get_content_translations_for_label(
-                    common_education_group_year, label, user_language, 'common')
-                records.append(translations)
-        return records
-
-    def get_content_translations_for_label(self, education_group_year, label, user_language, type):
-        # fetch the translation for the current user
-        translated_label = TranslatedTextLabel.objects.filter(text_label__entity=entity_name.OFFER_YEAR,
-                                                              text_label__label=label,
-                                                              language=user_language).first()
-        # fetch the translations for the both languages
-        french, english = 'fr-be', 'en'
-        fr_translated_text = TranslatedText.objects.filter(entity=entity_name.OFFER_YEAR,
-                                                           text_label__label=label,
-                                                           reference=str(education_group_year.id),
-                                                           language=french).first()
-        en_translated_text = TranslatedText.objects.filter(entity=entity_name.OFFER_YEAR,
-                                                           text_label__label=label,
-                                                           reference=str(education_group_year.id),
-                                                           language=english).first()
-        return {
-            'label': label,
-            'type': type,
-            'translation': translated_label.label if translated_label else
-            (_('This label %s does not exist') % label),
-            french: fr_translated_text.text if fr_translated_text else None,
-            english: en_translated_text.text if en_translated_text else None,
-        }
+        return general_information.get_sections_with_translated_labels(self.object, user_language)
 
 
 def _get_cms_label_data(cms_label, user_language):
@@ -251,7 +185,7 @@ def _get_cms_label_data(cms_label, user_language):
     return cms_label_data
 
 
-class EducationGroupAdministrativeData(EducationGroupGenericDetailView):
+class EducationGroupAdministrativeData(ReadOnlyViewMixin, EducationGroupGenericDetailView):
     template_name = "education_group/tab_administrative_data.html"
     limited_by_category = (education_group_categories.TRAINING,)
 
@@ -298,7 +232,7 @@ def get_dates(an_academic_calendar_type, an_education_group_year):
         return {}
 
 
-class EducationGroupContent(EducationGroupGenericDetailView):
+class EducationGroupContent(ReadOnlyViewMixin, EducationGroupGenericDetailView):
     template_name = "education_group/tab_content.html"
 
     def get_context_data(self, **kwargs):
@@ -322,7 +256,7 @@ class EducationGroupContent(EducationGroupGenericDetailView):
         return context
 
 
-class EducationGroupUsing(EducationGroupGenericDetailView):
+class EducationGroupUsing(ReadOnlyViewMixin, EducationGroupGenericDetailView):
     template_name = "education_group/tab_utilization.html"
 
     def get_context_data(self, **kwargs):
@@ -332,7 +266,7 @@ class EducationGroupUsing(EducationGroupGenericDetailView):
         return context
 
 
-class EducationGroupYearAdmissionCondition(EducationGroupGenericDetailView):
+class EducationGroupYearAdmissionCondition(ReadOnlyViewMixin, EducationGroupGenericDetailView):
     template_name = "education_group/tab_admission_conditions.html"
     permission_required = 'base.can_edit_educationgroup_pedagogy'
 
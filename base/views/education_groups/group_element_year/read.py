@@ -31,6 +31,7 @@ from django.urls import reverse
 from django.utils import translation
 from django.views.generic import FormView
 
+from base.business.group_element_years import structure_snapshot
 from base.forms.education_group.common import SelectLanguage
 from base.models.education_group_year import EducationGroupYear
 from base.views.mixins import FlagMixin, AjaxTemplateMixin
@@ -57,13 +58,15 @@ def pdf_content(request, root_id, education_group_year_id, language):
         )
 
 
-def get_verbose_children(education_group_year):
+def get_verbose_children(education_group_year, children_by_parent=None):
+    if children_by_parent is None:
+        children_by_parent = structure_snapshot.find_group_element_years_by_parent(education_group_year)
     result = []
 
-    for group_element_year in education_group_year.children:
+    for group_element_year in children_by_parent.get(education_group_year.id, []):
         result.append(group_element_year)
         if group_element_year.child_branch:
-            result.append(get_verbose_children(group_element_year.child_branch))
+            result.append(get_verbose_children(group_element_year.child_branch, children_by_parent))
 
     return result
 
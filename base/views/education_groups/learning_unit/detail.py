@@ -34,8 +34,8 @@ from django.utils.translation import ugettext_lazy as _
 from django.views.generic import DetailView
 
 from base.business.education_groups import perms
-from base.business.education_groups.learning_units.prerequisite import \
-    get_prerequisite_acronyms_which_are_outside_of_education_group
+from base.business.education_groups.learning_units.prerequisite import find_learning_unit_years_which_require, \
+    get_prerequisite_acronyms_outside_of_education_group_by_learning_unit_year
 from base.models import group_element_year
 from base.models.education_group_year import EducationGroupYear
 from base.models.enums import education_group_categories
@@ -108,6 +108,9 @@ class LearningUnitPrerequisiteTraining(LearningUnitGenericDetailView):
                                                      education_group_year=context["root"])
         context["can_modify_prerequisite"] = perms.is_eligible_to_change_education_group(context['person'],
                                                                                          context["root"])
+        context["learning_unit_years_which_require"] = find_learning_unit_years_which_require(
+            context["root"], context["learning_unit_year"]
+        ).order_by('acronym')
         return context
 
     def render_to_response(self, context, **response_kwargs):
@@ -116,15 +119,21 @@ class LearningUnitPrerequisiteTraining(LearningUnitGenericDetailView):
 
     def add_warning_messages(self, context):
         root = context["root"]
-        prerequisite = context["prerequisite"]
         learning_unit_year = context["learning_unit_year"]
-        learning_unit_inconsistent = get_prerequisite_acronyms_which_are_outside_of_education_group(root, prerequisite)\
-            if prerequisite else []
+        # The prerequisites of the whole formation are checked at once
+        acronyms_outside_by_learning_unit_year = \
+            get_prerequisite_acronyms_outside_of_education_group_by_learning_unit_year(root)
+        learning_unit_inconsistent = acronyms_outside_by_learning_unit_year.pop(learning_unit_year.id, [])
         if learning_unit_inconsistent:
             display_warning_messages(
                 self.request,
                 _("The prerequisites %s for the learning unit %s are not inside the selected formation %s") %
-                (", ".join(learning_unit_inconsistent), learning_unit_year, root))
+                (", ".join(sorted(learning_unit_inconsistent)), learning_unit_year, root))
+        if acronyms_outside_by_learning_unit_year:
+            display_warning_messages(
+                self.request,
+                _("%s other learning units of the formation %s have prerequisites which are not inside it") %
+                (len(acronyms_outside_by_learning_unit_year), root))
 
 
 class LearningUnitPrerequisiteGroup(LearningUnitGenericDetailView):
@@ -32,18 +32,28 @@ from django.shortcuts import get_object_or_404, render
 from django.utils.translation import ugettext_lazy as _
 
 from base import models as mdl
-from base.business.education_group import create_xls, ORDER_COL, ORDER_DIRECTION, create_xls_administrative_data
+from base.business import education_group
+from base.business.education_group import ORDER_COL, ORDER_DIRECTION
 from base.forms.education_groups import EducationGroupFilter
 from base.forms.search.search_form import get_research_criteria
-from base.models.enums import education_group_categories
+from base.models.education_group_year import EducationGroupYear
+from base.models.enums import education_group_categories, export_type
 from base.models.person import Person
 from base.utils.cache import cache_filter
+from base.utils.db_router import read_only_view
 from base.views.common import paginate_queryset
+from base.views.export_job import is_background_export_active, start_export_job, stream_xls_response
+
+EDUCATION_GROUP_EXPORT_TYPES = {
+    "xls": export_type.EDUCATION_GROUPS,
+    "xls_administrative": export_type.EDUCATION_GROUPS_ADMINISTRATIVE,
+}
 
 
 @login_required
 @permission_required('base.can_access_education_group', raise_exception=True)
 @cache_filter(exclude_params=['xls_status', 'xls_order_col'])
+@read_only_view
 def education_groups(request):
     person = get_object_or_404(Person, user=request.user)
     current_academic_year = mdl.academic_year.current_academic_year()
@@ -51,18 +61,36 @@ def education_groups(request):
     form = EducationGroupFilter(request.GET or None, initial={'academic_year': current_academic_year,
                                                               'category': education_group_categories.TRAINING})
 
+    xls_status = request.GET.get('xls_status')
+    if xls_status in EDUCATION_GROUP_EXPORT_TYPES and is_background_export_active(request) and form.is_valid():
+        return start_export_job(
+            request,
+            EDUCATION_GROUP_EXPORT_TYPES[xls_status],
+            request.GET,
+            _get_filter_keys(form),
+            {ORDER_COL: request.GET.get('xls_order_col'), ORDER_DIRECTION: request.GET.get('xls_order')}
+        )
+
     object_list = _get_object_list(form, request) if form.is_valid() else []
 
     if request.GET.get('xls_status') == "xls":
-        return create_xls(request.user, object_list, _get_filter_keys(form),
-                          {ORDER_COL: request.GET.get('xls_order_col'), ORDER_DIRECTION: request.GET.get('xls_order')})
-
-    if request.GET.get('xls_status') == "xls_administrative":
-        return create_xls_administrative_data(
+        return stream_xls_response(education_group.XLS_FILENAME, education_group.create_xls_stream(
             request.user,
             object_list,
             _get_filter_keys(form),
             {ORDER_COL: request.GET.get('xls_order_col'), ORDER_DIRECTION: request.GET.get('xls_order')}
+        ))
+
+    if request.GET.get('xls_status') == "xls_administrative":
+        return stream_xls_response(
+            education_group.XLS_FILENAME_ADMINISTRATIVE,
+            education_group.create_xls_administrative_data_stream(
+                request.user,
+                # The administrative data are loaded from a queryset, even when nothing is found
+                object_list or EducationGroupYear.objects.none(),
+                _get_filter_keys(form),
+                {ORDER_COL: request.GET.get('xls_order_col'), ORDER_DIRECTION: request.GET.get('xls_order')}
+            )
         )
 
     context = {
@@ -36,6 +36,7 @@ from django.utils.translation import ugettext_lazy as _
 from waffle.decorators import waffle_flag
 
 from base import models as mdl_base
+from base.business.autocomplete import certificate_aim_index
 from base.business.group_element_years.postponement import PostponeContent, NotPostponeError
 from base.forms.education_group.common import EducationGroupModelForm
 from base.forms.education_group.group import GroupForm
@@ -167,19 +168,8 @@ class CertificateAimAutocomplete(autocomplete.Select2QuerySetView):
         if not self.request.user.is_authenticated():
             return CertificateAim.objects.none()
 
-        qs = CertificateAim.objects.all()
-
-        if self.q:
-            if self.q.isdigit():
-                qs = qs.filter(code=self.q)
-            else:
-                qs = qs.filter(description__icontains=self.q)
-
-        section = self.forwarded.get('section', None)
-        if section:
-            qs = qs.filter(section=section)
-
-        return qs
+        # The results are ranked from the in-memory index, no database query is done here.
+        return certificate_aim_index.search(self.q, section=self.forwarded.get('section', None))
 
     def get_result_label(self, result):
         return format_html('{} - {} {}', result.section, result.code, result.description)
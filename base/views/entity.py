@@ -27,6 +27,7 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 
+from base.business.entity_synchronization import synchronize_entities
 from base.business.entity_version import update_entity, create_versions_of_existing_entity, \
     update_end_date_of_existing_versions
 from base.models import entity
@@ -78,3 +79,13 @@ def update_existing_entity(existing_entity, request):
     data['new_versions_count'] = new_versions_count
     data['updated_versions_count'] = updated_versions_count
     return Response(data=data, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+def post_entities_bulk(request):
+    """ Synchronize the whole organisational chart: the body is the list of all the entities """
+    if not isinstance(request.data, list):
+        return Response(data={'error': 'A list of entities is expected'}, status=status.HTTP_400_BAD_REQUEST)
+
+    result = synchronize_entities(request.data)
+    return Response(data=result._asdict(), status=status.HTTP_200_OK)
@@ -0,0 +1,89 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2018 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import os
+
+import waffle
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.utils.translation import ugettext_lazy as _
+
+from base.business import export_job as export_job_business
+from base.business.xls_stream import XLSX_CONTENT_TYPE, get_xls_filename
+from base.models import export_job as mdl_export_job
+from base.models.export_job import ExportJob
+from base.views.common import display_success_messages
+
+BACKGROUND_EXPORTS_FLAG = "background_exports"
+
+
+def is_background_export_active(request):
+    return waffle.flag_is_active(request, BACKGROUND_EXPORTS_FLAG)
+
+
+def start_export_job(request, an_export_type, search_data, filters, extra=None):
+    """ Register the export job and redirect the user to the search page he comes from """
+    export_job_business.start_export_job(request.user, an_export_type, search_data, filters, extra)
+    display_success_messages(request, _("The export has been started. You will be notified when it is ready."))
+    return redirect(_get_search_url(request))
+
+
+def stream_xls_response(filename, stream):
+    """ Send a workbook saved by a StreamingWorkbook, the stream is closed with the response """
+    response = FileResponse(stream, content_type=XLSX_CONTENT_TYPE)
+    response['Content-Disposition'] = 'attachment; filename={}'.format(get_xls_filename(filename))
+    return response
+
+
+def _get_search_url(request):
+    search_data = request.GET.copy()
+    search_data.pop('xls_status', None)
+    return "{}?{}".format(request.path, search_data.urlencode())
+
+
+@login_required
+def my_export_jobs(request):
+    return JsonResponse({
+        'export_jobs': [
+            {
+                'id': job.pk,
+                'export_type': job.get_export_type_display(),
+                'status': job.status,
+                'created': job.created,
+                'finished': job.finished,
+            } for job in mdl_export_job.find_by_user(request.user)
+        ]
+    })
+
+
+@login_required
+def export_job_download(request, export_job_id):
+    job = get_object_or_404(ExportJob, pk=export_job_id, user=request.user)
+    if not job.is_done or not job.file:
+        raise Http404
+    response = FileResponse(job.file.open('rb'), content_type='application/vnd.ms-excel')
+    response['Content-Disposition'] = 'attachment; filename={}'.format(os.path.basename(job.file.name))
+    return response
@@ -39,6 +39,7 @@ from base.forms.entity import EntitySearchForm
 from base.forms.entity_calendar import EntityCalendarEducationalInformationForm
 from base.models import entity_version as entity_version_mdl
 from base.models.entity_version import EntityVersion
+from base.utils.db_router import read_only_view
 from base.views.common import display_success_messages, paginate_queryset
 from . import layout
 
@@ -104,6 +105,7 @@ def entities_version(request, entity_version_id):
 
 
 @login_required
+@read_only_view
 def entity_diagram(request, entity_version_id):
     entity_version = mdl.entity_version.find_by_id(entity_version_id)
     entities_version_as_json = json.dumps(entity_version.get_organogram_data())
@@ -33,6 +33,7 @@ from django.utils.translation import ugettext_lazy as _
 from waffle.decorators import waffle_flag
 
 from base.business.learning_unit import get_learning_units_and_summary_status
+from base.business.learning_unit_year_with_context import iter_with_latest_entities
 from base.business.learning_units.educational_information import get_responsible_and_learning_unit_yr_list
 from base.business.learning_units.perms import can_learning_unit_year_educational_information_be_udpated
 from base.business.learning_units.xls_comparison import get_academic_year_of_reference
@@ -40,15 +41,14 @@ from base.business.learning_units.xls_generator import generate_xls_teaching_mat
 from base.forms.common import TooManyResultsException
 from base.forms.learning_unit.comparison import SelectComparisonYears
 from base.forms.learning_unit.educational_information.mail_reminder import MailReminderRow, MailReminderFormset
-from base.forms.learning_unit.search_form import LearningUnitYearForm
+from base.forms.learning_unit.search_form import LearningUnitYearForm, check_max_records
 from base.models import academic_calendar
 from base.models.academic_year import current_academic_year
 from base.models.enums.academic_calendar_type import SUMMARY_COURSE_SUBMISSION
 from base.models.person import Person, find_by_user
 from base.utils.send_mail import send_mail_for_educational_information_update
 from base.views import layout
-from base.views.common import check_if_display_message, display_warning_messages
-from base.views.common import display_error_messages
+from base.views.common import check_if_display_message, display_warning_messages, display_error_messages
 from base.views.learning_units.search import SUMMARY_LIST
 
 SUCCESS_MESSAGE = _('success_mail_reminder')
@@ -90,10 +90,15 @@ def learning_units_summary_list(request):
                 requirement_entities=a_user_person.find_main_entities_version,
                 luy_status=True
             )
+            # The summary status, the permissions and the responsibles are computed row by row
+            check_max_records(learning_units_found_search)
 
-            # TODO refactoring : too many queries
-            learning_units_found = get_learning_units_and_summary_status(learning_units_found_search)
             check_if_display_message(request, learning_units_found_search)
+
+            # TODO refactoring : too many queries
+            learning_units_found = get_learning_units_and_summary_status(
+                iter_with_latest_entities(learning_units_found_search)
+            )
     except TooManyResultsException:
         display_error_messages(request, 'too_many_results')
     responsible_and_learning_unit_yr_list = get_responsible_and_learning_unit_yr_list(learning_units_found)
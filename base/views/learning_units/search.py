@@ -26,30 +26,33 @@
 import itertools
 
 import collections
-from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.messages import WARNING
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
-from attribution.business.xls_build import create_xls_attribution
+from attribution.business import xls_build as attribution_xls
 from base.utils.cache import cache_filter
-from base.business.learning_unit import create_xls
-from base.business.learning_unit_xls import create_xls_with_parameters, WITH_ATTRIBUTIONS, WITH_GRP
-from base.business.proposal_xls import create_xls_proposal
+from base.utils.db_router import read_only_view
+from base.business import learning_unit as learning_unit_business, proposal_xls
+from base.business.learning_unit_xls import create_xls_with_parameters_stream, WITH_ATTRIBUTIONS, WITH_GRP
+from base.business.learning_unit_year_with_context import iter_with_latest_entities
 from base.forms.common import TooManyResultsException
 from base.forms.learning_unit.comparison import SelectComparisonYears
 from base.forms.learning_unit.search_form import LearningUnitYearForm, ExternalLearningUnitYearForm
 from base.forms.proposal.learning_unit_proposal import LearningUnitProposalForm, ProposalStateModelForm
 from base.models.academic_year import current_academic_year, get_last_academic_years, starting_academic_year
-from base.models.enums import learning_container_year_types, learning_unit_year_subtypes
+from base.models.enums import learning_container_year_types, learning_unit_year_subtypes, export_type
 from base.models.person import Person, find_by_user
 from base.models.proposal_learning_unit import ProposalLearningUnit
 from base.views import layout
-from base.views.common import check_if_display_message, display_error_messages, display_messages_by_level
+from base.views.common import check_if_display_message, display_messages_by_level, paginate_queryset, \
+    display_error_messages
+from base.views.export_job import is_background_export_active, start_export_job, stream_xls_response
 from base.business import learning_unit_proposal as proposal_business
 from base.forms.search.search_form import get_research_criteria
-from base.business.learning_units.xls_comparison import create_xls_comparison, get_academic_year_of_reference
+from base.business.learning_units import xls_comparison
+from base.business.learning_units.xls_comparison import get_academic_year_of_reference
 
 SIMPLE_SEARCH = 1
 SERVICE_COURSES_SEARCH = 2
@@ -62,6 +65,13 @@ ACTION_BACK_TO_INITIAL = "back_to_initial"
 ACTION_CONSOLIDATE = "consolidate"
 ACTION_FORCE_STATE = "force_state"
 
+LEARNING_UNIT_EXPORT_TYPES = {
+    "xls": export_type.LEARNING_UNITS,
+    "xls_attribution": export_type.LEARNING_UNITS_ATTRIBUTIONS,
+    "xls_comparison": export_type.LEARNING_UNITS_COMPARISON,
+    "xls_with_parameters": export_type.LEARNING_UNITS_WITH_PARAMETERS,
+}
+
 
 def learning_units_search(request, search_type):
     service_course_search = search_type == SERVICE_COURSES_SEARCH
@@ -71,41 +81,67 @@ def learning_units_search(request, search_type):
                                 service_course_search=service_course_search,
                                 borrowed_course_search=borrowed_course_search,
                                 initial={'academic_year_id': starting_academic_year()})
+    xls_status = request.POST.get('xls_status')
+    if xls_status in LEARNING_UNIT_EXPORT_TYPES and is_background_export_active(request) and form.is_valid():
+        return start_export_job(
+            request,
+            LEARNING_UNIT_EXPORT_TYPES[xls_status],
+            request.GET,
+            _get_filter(form, search_type),
+            {
+                'service_course_search': service_course_search,
+                'borrowed_course_search': borrowed_course_search,
+                'comparison_year': request.POST.get('comparison_year'),
+                WITH_GRP: request.POST.get('with_grp') == 'true',
+                WITH_ATTRIBUTIONS: request.POST.get('with_attributions') == 'true',
+            }
+        )
+
     found_learning_units = []
     try:
         if form.is_valid():
             found_learning_units = form.get_activity_learning_units()
-            check_if_display_message(request, found_learning_units)
     except TooManyResultsException:
-        messages.add_message(request, messages.ERROR, _('too_many_results'))
+        display_error_messages(request, 'too_many_results')
 
+    # The rows are written to the workbook as they are fetched, whatever the number of results
     if request.POST.get('xls_status') == "xls":
-        return create_xls(request.user, found_learning_units, _get_filter(form, search_type))
+        return stream_xls_response(learning_unit_business.XLS_FILENAME, learning_unit_business.create_xls_stream(
+            request.user, iter_with_latest_entities(found_learning_units), _get_filter(form, search_type)
+        ))
     if request.POST.get('xls_status') == "xls_attribution":
-        return create_xls_attribution(request.user, found_learning_units, _get_filter(form, search_type))
+        return stream_xls_response(attribution_xls.XLS_FILENAME, attribution_xls.create_xls_attribution_stream(
+            request.user, iter_with_latest_entities(found_learning_units), _get_filter(form, search_type)
+        ))
     if request.POST.get('xls_status') == "xls_comparison":
-        return create_xls_comparison(
+        return stream_xls_response(xls_comparison.XLS_FILENAME, xls_comparison.create_xls_comparison_stream(
             request.user,
             found_learning_units,
             _get_filter(form, search_type),
             request.POST.get('comparison_year')
-        )
+        ))
 
     if request.POST.get('xls_status') == "xls_with_parameters":
-        return create_xls_with_parameters(request.user,
-                                          found_learning_units,
-                                          _get_filter(form, search_type),
-                                          {WITH_GRP: request.POST.get('with_grp') == 'true',
-                                           WITH_ATTRIBUTIONS: request.POST.get('with_attributions') == 'true'})
+        return stream_xls_response(learning_unit_business.XLS_FILENAME, create_xls_with_parameters_stream(
+            request.user,
+            iter_with_latest_entities(found_learning_units),
+            _get_filter(form, search_type),
+            {WITH_GRP: request.POST.get('with_grp') == 'true',
+             WITH_ATTRIBUTIONS: request.POST.get('with_attributions') == 'true'}
+        ))
+
+    learning_units = paginate_queryset(found_learning_units, request.GET)
+    if form.is_valid():
+        check_if_display_message(request, learning_units)
 
     a_person = find_by_user(request.user)
-    form_comparison = SelectComparisonYears(academic_year=get_academic_year_of_reference(found_learning_units))
+    form_comparison = SelectComparisonYears(academic_year=get_academic_year_of_reference(learning_units))
     context = {
         'form': form,
         'academic_years': get_last_academic_years(),
         'container_types': learning_container_year_types.LEARNING_CONTAINER_YEAR_TYPES,
         'types': learning_unit_year_subtypes.LEARNING_UNIT_YEAR_SUBTYPES,
-        'learning_units': found_learning_units,
+        'learning_units': learning_units,
         'current_academic_year': starting_academic_year(),
         'experimental_phase': True,
         'search_type': search_type,
@@ -119,6 +155,7 @@ def learning_units_search(request, search_type):
 @login_required
 @permission_required('base.can_access_learningunit', raise_exception=True)
 @cache_filter()
+@read_only_view
 def learning_units(request):
     return learning_units_search(request, SIMPLE_SEARCH)
 
@@ -126,6 +163,7 @@ def learning_units(request):
 @login_required
 @permission_required('base.can_access_learningunit', raise_exception=True)
 @cache_filter()
+@read_only_view
 def learning_units_service_course(request):
     return learning_units_search(request, SERVICE_COURSES_SEARCH)
 
@@ -133,6 +171,7 @@ def learning_units_service_course(request):
 @login_required
 @permission_required('base.can_access_learningunit', raise_exception=True)
 @cache_filter()
+@read_only_view
 def learning_units_borrowed_course(request):
     return learning_units_search(request, BORROWED_COURSE)
 
@@ -145,24 +184,32 @@ def learning_units_proposal_search(request):
     user_person = get_object_or_404(Person, user=request.user)
     proposals = []
     research_criteria = []
-    try:
-        if search_form.is_valid():
-            research_criteria = get_research_criteria(search_form)
-            proposals = search_form.get_proposal_learning_units()
-            check_if_display_message(request, proposals)
-    except TooManyResultsException:
-        display_error_messages(request, 'too_many_results')
+    if request.GET.get('xls_status') == "xls" and is_background_export_active(request) and search_form.is_valid():
+        return start_export_job(request, export_type.PROPOSALS, request.GET, _get_filter(search_form, PROPOSAL_SEARCH))
+
+    if search_form.is_valid():
+        research_criteria = get_research_criteria(search_form)
+        proposals = search_form.get_proposal_learning_units()
 
     if request.GET.get('xls_status') == "xls":
-        return create_xls_proposal(request.user, proposals, _get_filter(search_form, PROPOSAL_SEARCH))
+        proposals = iter_with_latest_entities(proposals, learning_unit_year_attr='learning_unit_year')
+        return stream_xls_response(proposal_xls.XLS_FILENAME, proposal_xls.create_xls_proposal_stream(
+            request.user, proposals, _get_filter(search_form, PROPOSAL_SEARCH)
+        ))
 
     if request.POST:
         selected_proposals_id = request.POST.getlist("selected_action", default=[])
-        selected_proposals = ProposalLearningUnit.objects.filter(id__in=selected_proposals_id)
+        selected_proposals = ProposalLearningUnit.objects.filter(id__in=selected_proposals_id).select_related(
+            'learning_unit_year__academic_year', 'learning_unit_year__learning_container_year'
+        )
         messages_by_level = apply_action_on_proposals(selected_proposals, user_person, request.POST, research_criteria)
         display_messages_by_level(request, messages_by_level)
         return redirect(reverse("learning_unit_proposal_search") + "?{}".format(request.GET.urlencode()))
 
+    proposals = paginate_queryset(proposals, request.GET)
+    if search_form.is_valid():
+        check_if_display_message(request, proposals)
+
     context = {
         'form': search_form,
         'form_proposal_state': ProposalStateModelForm(),
@@ -212,21 +259,22 @@ def _get_search_type_label(search_type):
 @login_required
 @permission_required('base.can_access_externallearningunityear', raise_exception=True)
 @cache_filter()
+@read_only_view
 def learning_units_external_search(request):
     search_form = ExternalLearningUnitYearForm(request.GET or None,
                                                initial={'academic_year_id': current_academic_year()})
     user_person = get_object_or_404(Person, user=request.user)
     external_learning_units = []
-    try:
-        if search_form.is_valid():
-            external_learning_units = search_form.get_learning_units()
-            check_if_display_message(request, external_learning_units)
-    except TooManyResultsException:
-        display_error_messages(request, 'too_many_results')
+    if search_form.is_valid():
+        external_learning_units = search_form.get_learning_units()
 
     if request.POST:
         return redirect(reverse("learning_unit_proposal_search") + "?{}".format(request.GET.urlencode()))
 
+    external_learning_units = paginate_queryset(external_learning_units, request.GET)
+    if search_form.is_valid():
+        check_if_display_message(request, external_learning_units)
+
     context = {
         'form': search_form,
         'academic_years': get_last_academic_years(),
@@ -35,13 +35,12 @@ from django.utils.translation import ugettext_lazy as _
 from waffle.decorators import waffle_flag
 
 from base.business import learning_unit_year_with_context
+from base.business.autocomplete import entity_version_index
 from base.business.learning_unit_year_with_context import ENTITY_TYPES_VOLUME
 from base.business.learning_units.edition import ConsistencyError
 from base.forms.learning_unit.edition import LearningUnitEndDateForm
 from base.forms.learning_unit.edition_volume import VolumeEditionFormsetContainer
 from base.forms.learning_unit.learning_unit_postponement import LearningUnitPostponementForm
-from base.models.entity_version import find_pedagogical_entities_version, \
-    find_all_current_entities_version, EntityVersion
 from base.models.enums import learning_unit_year_subtypes
 from base.models.learning_unit_year import LearningUnitYear
 from base.models.person import Person
@@ -183,16 +182,8 @@ def _save_form_and_display_messages(request, form):
 
 class EntityAutocomplete(LoginRequiredMixin, autocomplete.Select2QuerySetView):
     def get_queryset(self):
-        country = self.forwarded.get('country', None)
-        if country and country == "all":
-            qs = find_all_current_entities_version().order_by('acronym')
-        elif country:
-            qs = find_all_current_entities_version().filter(entity__country__id=country).order_by('acronym')
-        else:
-            qs = find_pedagogical_entities_version()
-        if self.q:
-            qs = qs.filter(acronym__icontains=self.q).order_by('acronym')
-        return qs
+        # The results are ranked from the in-memory index, no database query is done here.
+        return entity_version_index.search(self.q, country=self.forwarded.get('country', None))
 
     def get_result_label(self, result):
         return format_html(result.verbose_title)
@@ -39,6 +39,7 @@ from cms.enums.entity_name import OFFER_YEAR
 from cms.tests.factories.text_label import TextLabelFactory
 from cms.tests.factories.translated_text import TranslatedTextRandomFactory
 from cms.tests.factories.translated_text_label import TranslatedTextLabelFactory
+from base.tests.mixin.query_budget import QueryBudgetMixin
 from webservices.tests.helper import Helper
 from webservices.utils import convert_sections_list_of_dict_to_dict
 from webservices.views import new_context
@@ -56,7 +57,7 @@ def remove_conditions_admission(sections):
     return result, condition_admission_section
 
 
-class WsCatalogOfferPostTestCase(TestCase, Helper):
+class WsCatalogOfferPostTestCase(QueryBudgetMixin, TestCase, Helper):
     URL_NAME = 'v0.1-ws_catalog_offer'
     maxDiff = None
 
@@ -166,6 +167,34 @@ class WsCatalogOfferPostTestCase(TestCase, Helper):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.content_type, 'application/json')
 
+    def test_query_budget(self):
+        # The queries of this web service grow with the requested sections, not with the data: the budget is
+        # checked on the full request of the portal, all its sections having a text
+        education_group_year = EducationGroupYearFactory(acronym='actu2m')
+        EducationGroupYearFactory(acronym='common', academic_year=education_group_year.academic_year)
+        sections = ['welcome_job', 'welcome_profil', 'welcome_programme', 'welcome_introduction', 'cond_admission',
+                    'infos_pratiques', 'caap', 'caap-commun', 'contacts', 'structure', 'acces_professions',
+                    'comp_acquis', 'pedagogie', 'formations_accessibles', 'evaluation', 'mobilite',
+                    'programme_detaille', 'certificats', 'module_complementaire', 'module_complementaire-commun',
+                    'prerequis', 'prerequis-commun', 'intro-lactu200t', 'intro-lactu200s', 'options',
+                    'intro-lactu200o', 'intro-lsst100o']
+        labels = {section for section in sections if '-' not in section}
+        for label in labels | {'intro'}:
+            text_label = TextLabelFactory(entity=OFFER_YEAR, label=label)
+            TranslatedTextLabelFactory(text_label=text_label, language='fr-be')
+            TranslatedTextRandomFactory(text_label=text_label, language='fr-be', reference=education_group_year.id,
+                                        entity=text_label.entity)
+        message = {
+            'anac': str(education_group_year.academic_year.year),
+            'code_offre': education_group_year.acronym,
+            'sections': sections,
+        }
+
+        with self.assertQueryBudget('v0.1-ws_catalog_offer'):
+            response = self.post(education_group_year.academic_year.year, 'fr', education_group_year.acronym,
+                                 data=message)
+        self.assertEqual(response.status_code, 200)
+
     def test_without_any_sections(self):
         education_group_year = EducationGroupYearFactory(acronym='actu2m')
 
@@ -37,6 +37,7 @@ from rest_framework.response import Response
 
 from base.models.admission_condition import AdmissionCondition, AdmissionConditionLine
 from base.models.education_group_year import EducationGroupYear
+from base.utils.db_router import read_only_view
 from cms.enums.entity_name import OFFER_YEAR
 from cms.models.text_label import TextLabel
 from cms.models.translated_text import TranslatedText
@@ -96,6 +97,7 @@ def validate_json_request(request, year, acronym):
         raise SuspiciousOperation('Invalid JSON')
 
 
+@read_only_view
 @api_view(['POST'])
 @renderer_classes((JSONRenderer,))
 def ws_catalog_offer(request, year, language, acronym):